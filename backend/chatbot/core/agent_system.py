@@ -9,9 +9,10 @@ import math
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 try:
-    from openai_service import OpenAIService
+    from modules.core.services.openai_service import OpenAIService
 except ImportError:
     OpenAIService = None
+from modules.core.services.llm_gateway import get_llm_gateway
 import os
 from dotenv import load_dotenv
 from .context_classifier import classify_context, is_recruitment_text
@@ -386,15 +387,9 @@ class RecruitmentNode:
             
             if openai_service:
                 try:
-                    # 새로운 이벤트 루프 생성하여 사용
-                    import asyncio
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        response = loop.run_until_complete(openai_service.generate_response(prompt))
-                        return response
-                    finally:
-                        loop.close()
+                    # 동기 노드이므로 게이트웨이 이벤트 루프에 위임 (이벤트 루프에서는 to_thread로 호출)
+                    response = get_llm_gateway().run_sync(openai_service.generate_response(prompt, call_site="chatbot_recruitment_agent"))
+                    return response
                 except Exception as e:
                     print(f"AI 호출 중 오류: {e}")
                     return "죄송합니다. AI 서비스 호출 중 오류가 발생했습니다."
@@ -721,15 +716,9 @@ class FallbackNode:
                     )
                     if openai_service:
                         try:
-                            # 새로운 이벤트 루프 생성하여 사용
-                            import asyncio
-                            loop = asyncio.new_event_loop()
-                            asyncio.set_event_loop(loop)
-                            try:
-                                response = loop.run_until_complete(openai_service.generate_response(prompt))
-                                result = response or "네, 알겠습니다. 더 구체적으로 말씀해 주실 수 있을까요?"
-                            finally:
-                                loop.close()
+                            # 동기 노드이므로 게이트웨이 이벤트 루프에 위임 (이벤트 루프에서는 to_thread로 호출)
+                            response = get_llm_gateway().run_sync(openai_service.generate_response(prompt, call_site="chatbot_chat_agent"))
+                            result = response or "네, 알겠습니다. 더 구체적으로 말씀해 주실 수 있을까요?"
                         except Exception as e:
                             print(f"AI 호출 중 오류: {e}")
                             result = "네, 알겠습니다. 더 구체적으로 말씀해 주실 수 있을까요?"
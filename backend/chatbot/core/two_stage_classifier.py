@@ -8,9 +8,10 @@ import re
 import json
 from typing import Dict, Any, Tuple, Optional
 try:
-    from openai_service import OpenAIService
+    from modules.core.services.openai_service import OpenAIService
 except ImportError:
     OpenAIService = None
+from modules.core.services.llm_gateway import get_llm_gateway
 import os
 from dotenv import load_dotenv
 from .suggestion_generator import suggestion_generator
@@ -253,15 +254,9 @@ class TwoStageClassifier:
 
             if openai_service:
                 try:
-                    # 새로운 이벤트 루프 생성하여 사용
-                    import asyncio
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        response = loop.run_until_complete(openai_service.generate_json_response(prompt))
-                        result_text = response.strip() if response else ""
-                    finally:
-                        loop.close()
+                    # 동기 함수이므로 게이트웨이 이벤트 루프에 위임 (이벤트 루프에서는 to_thread로 호출)
+                    response = get_llm_gateway().run_sync(openai_service.generate_json_response(prompt, call_site="chatbot_intent_classification"))
+                    result_text = response.strip() if response else ""
                 except Exception as e:
                     print(f"AI 호출 중 오류: {e}")
                     result_text = ""
@@ -2,7 +2,7 @@
 메인 챗봇 라우터
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import List, Dict, Any, Optional
 import uuid
 import asyncio
@@ -29,6 +29,7 @@ from ..services.field_service import FieldService
 from ..utils.text_processor import TextProcessor
 from ..utils.field_mapper import FieldMapper
 from ..utils.validation import ValidationUtils
+from modules.core.services.sse import sse_response
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
@@ -98,6 +99,11 @@ async def ask_chatbot(request: ChatbotRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/ask/stream")
+async def ask_chatbot_stream(request: ChatbotRequest, http_request: Request):
+    """챗봇 질문 처리 (SSE 스트리밍: token 이벤트 → message 이벤트 → done)"""
+    return sse_response(ai_service.stream_request(request), http_request)
+
 @router.post("/conversation")
 async def conversation(request: ConversationRequest):
     """대화형 챗봇 처리"""
@@ -4,6 +4,7 @@
 
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
+import asyncio
 import uuid
 
 from ..core.agent_system import AgentSystem
@@ -25,8 +26,9 @@ async def langgraph_agent_endpoint(request: dict):
         session_id = request.get("session_id", str(uuid.uuid4()))
         mode = request.get("mode", "langgraph")
         
-        # Agent 시스템 호출
-        result = agent_system.process_request(
+        # Agent 시스템 호출 (동기 노드가 LLM을 기다리는 동안 이벤트 루프가 멈추지 않도록 스레드에서 실행)
+        result = await asyncio.to_thread(
+            agent_system.process_request,
             user_input=user_input,
             conversation_history=conversation_history,
             session_id=session_id,
@@ -35,7 +37,7 @@ async def langgraph_agent_endpoint(request: dict):
         # 백업: 추출 필드가 비어있으면 규칙 기반 추출 보강
         try:
             if not result.get("extracted_fields"):
-                fallback_fields = enhanced_extractor.extract_fields_enhanced(user_input)
+                fallback_fields = await asyncio.to_thread(enhanced_extractor.extract_fields_enhanced, user_input)
                 if fallback_fields:
                     result["extracted_fields"] = fallback_fields
                     result["intent"] = "recruit"
@@ -98,7 +100,8 @@ async def langgraph_chat_endpoint(payload: Dict[str, Any]) -> Dict[str, Any]:
         conversation_history = payload.get("conversation_history", [])
         session_id = payload.get("session_id", str(uuid.uuid4()))
 
-        result = agent_system.process_request(
+        result = await asyncio.to_thread(
+            agent_system.process_request,
             user_input=user_input,
             conversation_history=conversation_history,
             session_id=session_id,
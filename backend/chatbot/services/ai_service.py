@@ -3,15 +3,16 @@ AI 서비스 클래스
 """
 
 import os
-from typing import Dict, Any, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 try:
-    from openai_service import OpenAIService
+    from modules.core.services.openai_service import OpenAIService
 except ImportError:
     OpenAIService = None
 
 from ..models.request_models import ChatbotRequest, ConversationRequest
 from ..models.response_models import ChatbotResponse, ConversationResponse
+from modules.core.services.sse import stream_tokens_of
 
 load_dotenv()
 
@@ -112,11 +113,28 @@ class AIService:
                 confidence=0.5
             )
     
-    async def _call_ai_api(self, prompt: str, conversation_history: List[Dict[str, Any]] = None) -> str:
+    async def stream_request(self, request: ChatbotRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """챗봇 질문 스트리밍 처리 (token 이벤트 후 최종 ChatbotResponse를 message 이벤트로 반환)"""
+        if request.mode == "modal":
+            response = await self.handle_modal_request(request)
+            yield "message", response.dict()
+            return
+
+        confidence = 0.9 if request.mode == "ai_assistant" else 0.7
+        async for event, data in stream_tokens_of(
+            self._call_ai_api(request.user_input, request.conversation_history, stream_tokens=True), "message"
+        ):
+            if event == "message":
+                data = ChatbotResponse(message=data, confidence=confidence).dict()
+            yield event, data
+
+    async def _call_ai_api(self, prompt: str, conversation_history: List[Dict[str, Any]] = None,
+                           stream_tokens: bool = False) -> str:
         """AI API 호출"""
         try:
             if self.openai_service:
-                response = await self.openai_service.generate_response(prompt)
+                response = await self.openai_service.generate_response(prompt, stream_tokens=stream_tokens,
+                                                                       call_site="chatbot_answer")
                 return response
             else:
                 return "AI 서비스를 사용할 수 없습니다. 기본 응답을 제공합니다."
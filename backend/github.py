@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 import httpx
 import os
@@ -19,6 +19,10 @@ load_dotenv()
 
 # MongoDB 저장소 서비스와 해시 유틸리티 import
 from services.github_storage_service import github_storage_service
+from modules.core.services.llm_gateway import get_llm_gateway
+from modules.core.services.llm_telemetry import current_usage, usage_scope
+from modules.core.services.prompt_budget import compact_json, compact_sections, compact_text
+from modules.core.services.sse import sse_response, stream_tokens_of
 from utils.github_hash_utils import (
     generate_file_hashes_from_github,
     compare_file_hashes,
@@ -1818,25 +1822,22 @@ async def fetch_github_file_content(owner: str, repo: str, file_path: str, token
 
 
 
-# 토큰 사용량 추적을 위한 전역 변수
+# GitHub API 호출 수 추적을 위한 전역 변수
 github_api_calls = 0
-openai_api_calls = 0
-openai_tokens_used = 0
 
 def reset_token_usage():
-    """토큰 사용량 초기화"""
-    global github_api_calls, openai_api_calls, openai_tokens_used
+    """토큰 사용량 초기화 (LLM 사용량은 현재 요청 범위로 새로 합산)"""
+    global github_api_calls
     github_api_calls = 0
-    openai_api_calls = 0
-    openai_tokens_used = 0
+    usage_scope()
 
 def get_token_usage():
     """현재 토큰 사용량 반환"""
-    global github_api_calls, openai_api_calls, openai_tokens_used
+    usage = current_usage() or {}
     return {
         "github_api_calls": github_api_calls,
-        "openai_api_calls": openai_api_calls,
-        "openai_tokens_used": openai_tokens_used
+        "openai_api_calls": usage.get("calls", 0),
+        "openai_tokens_used": usage.get("total_tokens", 0)
     }
 
 async def fetch_github(url: str, token: Optional[str] = None) -> Dict:
@@ -3189,16 +3190,28 @@ async def generate_detailed_analysis(repo_data: Dict, languages: Dict, files: Li
         'deployment_info': deployment_info
     }
 
+# 요약 프롬프트에 넣을 README 토큰 예산과 관련 부분 선택 질의
+SUMMARY_PROFILE_README_TOKENS = 2500
+SUMMARY_REPO_README_TOKENS = 250
+SUMMARY_README_QUERY = "프로젝트 소개 기능 기술 스택 아키텍처 구조 라이브러리 프레임워크 모델 API features tech stack architecture framework library model llm openai"
+# README의 배지/이미지 링크와 HTML 태그 (요약에 쓸 내용 없이 토큰만 차지)
+_README_NOISE = re.compile(r'!\[[^\]]*\]\([^)]*\)|<[^>]+>')
+
+
+def _compact_readme(text: str, max_tokens: int) -> str:
+    """README에서 배지/HTML을 걷어내고 요약에 필요한 부분만 예산 안에서 남깁니다."""
+    return compact_text(_README_NOISE.sub(' ', text or ''), SUMMARY_README_QUERY, max_tokens, model='gpt-4o')
+
+
 async def generate_unified_summary(username: str, repo_name: Optional[str] = None, profile_readme: Optional[Dict] = None, repos_data: Optional[List[Dict]] = None) -> List[Dict]:
     """통합된 요약 생성 함수 - GPT-4o 최적화"""
     
     # OpenAI API 키 확인
     api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
+    if not api_key and get_llm_gateway().api_key_required:
         raise HTTPException(status_code=500, detail="OpenAI API 키가 설정되지 않았습니다.")
     
     model = 'gpt-4o'  # GPT-4o로 업그레이드
-    endpoint = 'https://api.openai.com/v1/chat/completions'
     
     # 입력 데이터 구성
     input_data = {
@@ -3214,7 +3227,7 @@ async def generate_unified_summary(username: str, repo_name: Optional[str] = Non
     elif profile_readme and profile_readme.get('text'):
         # 프로필 README 분석
         input_data["analysis_type"] = "profile_readme"
-        input_data["readme_text"] = profile_readme['text']
+        input_data["readme_text"] = _compact_readme(profile_readme['text'], SUMMARY_PROFILE_README_TOKENS)
     elif repos_data:
         # 여러 레포지토리 분석
         input_data["analysis_type"] = "multiple_repos"
@@ -3343,8 +3356,15 @@ async def generate_unified_summary(username: str, repo_name: Optional[str] = Non
     
     else:  # multiple_repos
         repos = input_data["repos"]
+        # README 발췌는 앞 500자 대신 레포별 예산 안에서 관련 부분을 골라 넣음 (짧은 README가 남긴 예산은 긴 README로)
+        readmes = compact_sections(
+            {str(index): _README_NOISE.sub(' ', repo.get('readme_excerpt') or '') for index, repo in enumerate(repos)},
+            SUMMARY_REPO_README_TOKENS * len(repos),
+            SUMMARY_README_QUERY,
+            model='gpt-4o'
+        )
         repos_info = []
-        for repo in repos:
+        for index, repo in enumerate(repos):
             repos_info.append({
                 "name": repo.get('name', ''),
                 "description": repo.get('description', '설명 없음'),
@@ -3352,7 +3372,7 @@ async def generate_unified_summary(username: str, repo_name: Optional[str] = Non
                 "stars": repo.get('stargazers_count', 0),
                 "forks": repo.get('forks_count', 0),
                 "url": repo.get('html_url', ''),
-                "readme_excerpt": repo.get('readme_excerpt', '')[:500] if repo.get('readme_excerpt') else '',
+                "readme_excerpt": readmes[str(index)],
                 "toplevel_files": repo.get('toplevel_files', []),
                 "external_libraries_hint": repo.get('external_libraries_hint', []),
                 "llm_hints": repo.get('llm_hints', [])
@@ -3365,7 +3385,7 @@ async def generate_unified_summary(username: str, repo_name: Optional[str] = Non
 다음 {len(repos)}개의 레포지토리 데이터를 분석하여 각 레포지토리별로 '주제', '기술 스택', '주요 기능', '레포 주소', '아키텍처 구조', '외부 라이브러리', 'LLM 모델 정보'를 추출해주세요:
 
 **레포지토리 목록:**
-{json.dumps(repos_info, indent=2, ensure_ascii=False)}
+{compact_json(repos_info)}
 
 **GPT-4o 정확도 향상 분석 지침:**
 1. **개별 레포지토리 분석**:
@@ -3420,85 +3440,81 @@ async def generate_unified_summary(username: str, repo_name: Optional[str] = Non
 
 각 레포지토리를 개별적으로 분석하여 배열 형태로 제공해주세요."""
     
-    payload = {
-        "model": model,
-        "messages": [
-            {
-                "role": "system",
-                "content": "당신은 GitHub 레포지토리 분석 전문가입니다. GPT-4o의 강력한 분석 능력을 활용하여 실제 레포지토리 내용과 정확히 일치하는 분석을 제공해주세요. 제공된 데이터만을 기반으로 분석하고 추측하지 마세요. 항상 JSON 형식으로 응답해주세요."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "temperature": 0.05,  # 최고 정확도를 위해 매우 낮은 temperature
-        "max_tokens": 10000,  # 더 상세한 분석을 위해 토큰 수 증가
-        "response_format": {"type": "json_object"}  # JSON 응답 강제
-    }
+    messages = [
+        {
+            "role": "system",
+            "content": "당신은 GitHub 레포지토리 분석 전문가입니다. GPT-4o의 강력한 분석 능력을 활용하여 실제 레포지토리 내용과 정확히 일치하는 분석을 제공해주세요. 제공된 데이터만을 기반으로 분석하고 추측하지 마세요. 항상 JSON 형식으로 응답해주세요."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
     
-    async with httpx.AsyncClient(timeout=httpx.Timeout(120.0)) as client:  # GPT-4o는 더 긴 응답 시간 필요
-        response = await client.post(endpoint, json=payload, headers={
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {api_key}'
-        })
-        response.raise_for_status()
-        data = response.json()
-        
-        # 토큰 사용량 추적
-        global openai_api_calls, openai_tokens_used
-        openai_api_calls += 1
-        if 'usage' in data:
-            usage = data['usage']
-            openai_tokens_used += usage.get('total_tokens', 0)
-            print(f"[TOKEN USAGE] API 호출: {openai_api_calls}, 총 토큰: {openai_tokens_used}")
-        
-        response_text = data.get('choices', [{}])[0].get('message', {}).get('content', '').strip()
-        
-        try:
-            # GPT-4o의 response_format: json_object를 사용하므로 직접 파싱 가능
-            result = json.loads(response_text.strip())
-            
-            # 단일 레포지토리나 프로필 README인 경우 배열 형태로 변환
-            if input_data["analysis_type"] in ["single_repo", "profile_readme"]:
-                if "repositories" not in result:
-                    # 단일 객체를 배열로 변환
-                    return [result]
-                else:
-                    return result["repositories"]
+    # 공유 LLM 게이트웨이 호출 (연결 풀, rate limit, 재시도)
+    response = await get_llm_gateway().chat(
+        messages,
+        model=model,
+        temperature=0.05,  # 최고 정확도를 위해 매우 낮은 temperature
+        max_tokens=10000,  # 더 상세한 분석을 위해 토큰 수 증가
+        response_format={"type": "json_object"},  # JSON 응답 강제
+        timeout=120.0,  # GPT-4o는 더 긴 응답 시간 필요
+        deadline=300.0,
+        stream_tokens=True,  # 스트리밍 요청이면 생성 중인 JSON 토큰을 바로 전달
+        call_site="github_summary"
+    )
+    
+    # 토큰 사용량은 게이트웨이 텔레메트리가 요청 단위로 합산
+    usage = current_usage()
+    if usage:
+        print(f"[TOKEN USAGE] API 호출: {usage['calls']}, 총 토큰: {usage['total_tokens']}")
+    
+    response_text = (response.content or '').strip()
+    
+    try:
+        # GPT-4o의 response_format: json_object를 사용하므로 직접 파싱 가능
+        result = json.loads(response_text.strip())
+        
+        # 단일 레포지토리나 프로필 README인 경우 배열 형태로 변환
+        if input_data["analysis_type"] in ["single_repo", "profile_readme"]:
+            if "repositories" not in result:
+                # 단일 객체를 배열로 변환
+                return [result]
             else:
-                # 여러 레포지토리인 경우 - 정보 부족한 항목 필터링
-                repositories = result.get("repositories", [])
-                filtered_repos = []
-                for repo in repositories:
-                    # 정보가 충분한지 확인 (기본 필드만 필수, 새로운 필드는 선택사항)
-                    has_sufficient_info = (
-                        repo.get('주제') and 
-                        repo.get('주제') != '설명이 부족하여 주제를 특정할 수 없음' and
-                        repo.get('주제') != '정보 부족으로 주제 파악 불가' and
-                        repo.get('기술 스택') and 
-                        len(repo.get('기술 스택', [])) > 0 and
-                        repo.get('주요 기능') and 
-                        len(repo.get('주요 기능', [])) > 0
-                    )
-                    if has_sufficient_info:
-                        filtered_repos.append(repo)
-                return filtered_repos
-                
-        except json.JSONDecodeError as e:
-            # JSON 파싱 실패 시 텍스트 형태로 반환
-            print(f"JSON 파싱 오류: {e}")
-            print(f"응답 텍스트: {response_text}")
-            return [{
-                "주제": "AI 분석 결과",
-                "기술 스택": ["분석 중"],
-                "주요 기능": ["분석 중"],
-                "레포 주소": input_data["profile_url"],
-                "아키텍처 구조": "분석 중",
-                "외부 라이브러리": ["분석 중"],
-                "LLM 모델 정보": "분석 중",
-                "raw_response": response_text
-            }]
+                return result["repositories"]
+        else:
+            # 여러 레포지토리인 경우 - 정보 부족한 항목 필터링
+            repositories = result.get("repositories", [])
+            filtered_repos = []
+            for repo in repositories:
+                # 정보가 충분한지 확인 (기본 필드만 필수, 새로운 필드는 선택사항)
+                has_sufficient_info = (
+                    repo.get('주제') and 
+                    repo.get('주제') != '설명이 부족하여 주제를 특정할 수 없음' and
+                    repo.get('주제') != '정보 부족으로 주제 파악 불가' and
+                    repo.get('기술 스택') and 
+                    len(repo.get('기술 스택', [])) > 0 and
+                    repo.get('주요 기능') and 
+                    len(repo.get('주요 기능', [])) > 0
+                )
+                if has_sufficient_info:
+                    filtered_repos.append(repo)
+            return filtered_repos
+            
+    except json.JSONDecodeError as e:
+        # JSON 파싱 실패 시 텍스트 형태로 반환
+        print(f"JSON 파싱 오류: {e}")
+        print(f"응답 텍스트: {response_text}")
+        return [{
+            "주제": "AI 분석 결과",
+            "기술 스택": ["분석 중"],
+            "주요 기능": ["분석 중"],
+            "레포 주소": input_data["profile_url"],
+            "아키텍처 구조": "분석 중",
+            "외부 라이브러리": ["분석 중"],
+            "LLM 모델 정보": "분석 중",
+            "raw_response": response_text
+        }]
 
 # 기존 함수들을 새로운 통합 함수로 교체
 async def generate_summary_with_llm(analysis_data: Dict, repo_name: str) -> List[Dict]:
@@ -4142,6 +4158,12 @@ async def github_repo_analysis(request: GithubSummaryRequest):
         raise HTTPException(status_code=500, detail=f"저장소 분석 중 오류가 발생했습니다: {str(error)}")
 
 
+@router.post("/github/repo-analysis/stream")
+async def github_repo_analysis_stream(request: GithubSummaryRequest, http_request: Request):
+    """GitHub 저장소 상세 분석 (SSE 스트리밍: 요약 token/partial(부분 JSON) 이벤트 → summary 이벤트(GithubSummaryResponse) → done)"""
+    return sse_response(stream_tokens_of(github_repo_analysis(request), "summary", partial_json=True), http_request)
+
+
 @router.get("/github/analysis-status/{username}")
 async def get_analysis_status(username: str, repo_name: Optional[str] = None):
     """분석 상태 및 히스토리 조회"""
@@ -1,3 +1,4 @@
+import asyncio
 import codecs
 import csv
 import locale
@@ -16,7 +17,7 @@ from chatbot.routers.chatbot_router import router as chatbot_router
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 # chatbot 라우터 추가
 try:
@@ -27,6 +28,8 @@ except ImportError as e:
     github_router = None
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel
+from routers.analysis_jobs import register_analysis_handlers
+from routers.analysis_jobs import router as analysis_jobs_router
 from routers.applicants import get_mongo_service, get_similarity_service
 from routers.applicants import router as applicants_router
 from routers.integrated_ocr import router as integrated_ocr_router
@@ -74,9 +77,22 @@ except ImportError as e:
     hybrid_router = None
 
 
+from modules.core.services.analysis_queue import get_analysis_queue
 from modules.core.services.embedding_service import EmbeddingService
+from modules.core.services.io_pool import shutdown_io_pool
+from modules.core.services.keyword_search_service import close_es_clients
+from modules.core.services.llm_gateway import close_llm_gateway, get_llm_gateway
+from modules.core.services.llm_telemetry import set_endpoint
+from modules.core.services.prompt_budget import preload_encodings
+from modules.core.services.search_cache import bump_generation
+from modules.core.services.search_filters import (
+    SearchFilters,
+    backfill_experience_years,
+    with_experience_years,
+)
 from modules.core.services.mongo_service import MongoService
 from modules.core.services.similarity_service import SimilarityService
+from modules.core.services.tokenizer_service import get_tokenizer_service
 from modules.core.services.vector_service import VectorService
 
 # Python 환경 인코딩 설정
@@ -122,6 +138,13 @@ async def add_charset_header(request, call_next):
 
     return response
 
+# LLM 호출을 엔드포인트별로 집계하기 위한 미들웨어
+@app.middleware("http")
+async def tag_llm_endpoint(request, call_next):
+    # 요청 안에서 일어나는 LLM 호출에 라우트 정보를 연결 (라우트 경로는 LLM 호출 시에만 계산)
+    set_endpoint(request.scope)
+    return await call_next(request)
+
 # 라우터 등록
 if github_router:
     app.include_router(github_router, prefix="/api", tags=["github"])
@@ -136,6 +159,7 @@ app.include_router(job_posting_router, tags=["job-postings"])
 app.include_router(applicants_router, tags=["applicants"])
 app.include_router(sample_data_router, tags=["sample-data"])
 app.include_router(chatbot_router, prefix="/chatbot", tags=["chatbot"])
+app.include_router(analysis_jobs_router, tags=["analysis-jobs"])
 
 # 회사 인재상 라우터 등록
 if company_culture_router:
@@ -220,6 +244,58 @@ except Exception as e:
     print(f"⚠️ 유사도 서비스 초기화 실패: {e}")
     similarity_service = None
 
+
+@app.on_event("startup")
+async def load_keyword_index():
+    """내장 BM25 키워드 인덱스를 MongoDB 기준으로 준비 (서버 기동을 막지 않도록 백그라운드 실행)"""
+    if similarity_service:
+        asyncio.create_task(similarity_service.keyword_search_service.rebuild_local_index(db.applicants))
+
+
+@app.on_event("startup")
+async def backfill_applicant_experience_years():
+    """경력 범위 필터용 experience_years가 없는 기존 지원자 문서 보강 (백그라운드 실행)"""
+    async def _backfill():
+        try:
+            updated = await backfill_experience_years(db.applicants)
+            if updated:
+                print(f"[STARTUP] experience_years 보강: {updated}명")
+        except Exception as e:
+            print(f"[STARTUP] experience_years 보강 실패: {e}")
+
+    asyncio.create_task(_backfill())
+
+
+@app.on_event("startup")
+async def start_llm_gateway():
+    """워커 스레드의 동기 LLM 호출도 앱 이벤트 루프의 공유 연결 풀을 사용하도록 게이트웨이 연결"""
+    gateway = get_llm_gateway()
+    await gateway.start()
+    # 프롬프트 예산 계산용 tiktoken 인코딩 (첫 로드는 다운로드라 이벤트 루프 밖에서)
+    await asyncio.to_thread(preload_encodings, (None, gateway.default_model))
+    # LLM 응답 캐시 영구 저장소 (재시작 후에도 같은 분석 결과 재사용)
+    await gateway.cache.attach_store(db.llm_response_cache)
+
+
+@app.on_event("startup")
+async def start_analysis_queue():
+    """이력서/자소서/종합 분석 작업 큐 워커 시작 (요청과 분리된 일괄 평가)"""
+    queue = get_analysis_queue()
+    register_analysis_handlers(queue, db)
+    await queue.start(db.analysis_jobs)
+
+
+@app.on_event("shutdown")
+async def save_keyword_index():
+    """증분 반영된 내장 BM25 키워드 인덱스를 디스크에 저장"""
+    if similarity_service:
+        await similarity_service.keyword_search_service.persist_local_index()
+    await get_analysis_queue().stop()
+    get_tokenizer_service().shutdown()
+    await close_es_clients()
+    await close_llm_gateway()
+    shutdown_io_pool()
+
 # Pydantic 모델들
 class User(BaseModel):
     id: Optional[str] = None
@@ -335,11 +411,12 @@ async def seed_applicants_from_csv_if_empty() -> None:
                     except Exception:
                         document["created_at"] = datetime.now()
 
-                documents_to_insert.append(document)
+                documents_to_insert.append(with_experience_years(document))
 
         if documents_to_insert:
             print(f"🔎 시드 대상 문서 수: {len(documents_to_insert)}")
             await db.applicants.insert_many(documents_to_insert)
+            bump_generation()
             new_count = await db.applicants.count_documents({})
             print(f"📥 CSV에서 {len(documents_to_insert)}건 임포트 완료 → 현재 총 문서 수: {new_count}")
     except Exception as seed_error:
@@ -813,6 +890,7 @@ async def search_resumes_multi_hybrid(data: Dict[str, Any]):
         query = data.get("query", "")
         search_type = data.get("type", "resume")
         limit = data.get("limit", 10)
+        filters = SearchFilters.from_dict(data.get("filters"))
 
         print(f"[API] 다중 하이브리드 검색 요청 - 쿼리: '{query}', 제한: {limit}")
 
@@ -824,7 +902,8 @@ async def search_resumes_multi_hybrid(data: Dict[str, Any]):
             query=query,
             collection=db.applicants,
             search_type=search_type,
-            limit=limit
+            limit=limit,
+            filters=filters
         )
 
         if not result["success"]:
@@ -849,6 +928,7 @@ async def search_resumes_keyword(data: Dict[str, Any]):
     try:
         query = data.get("query", "")
         limit = data.get("limit", 10)
+        filters = SearchFilters.from_dict(data.get("filters"))
 
         print(f"[API] 키워드 검색 요청 - 쿼리: '{query}', 제한: {limit}")
 
@@ -859,7 +939,8 @@ async def search_resumes_keyword(data: Dict[str, Any]):
         result = await similarity_service.keyword_search_service.search_by_keywords(
             query=query,
             collection=db.applicants,
-            limit=limit
+            limit=limit,
+            filters=filters
         )
 
         if not result["success"]:
@@ -894,13 +975,16 @@ async def rebuild_keyword_index():
         result = await similarity_service.keyword_search_service.build_index(db.applicants)
 
         if not result["success"]:
-            raise HTTPException(status_code=500, detail=result.get("message", "인덱스 재구축에 실패했습니다."))
+            status_code = 409 if result.get("in_progress") else 500
+            raise HTTPException(status_code=status_code, detail=result.get("message", "인덱스 재구축에 실패했습니다."))
 
         return {
             "success": True,
             "message": result["message"],
             "data": {
                 "total_documents": result["total_documents"],
+                "failed_documents": result.get("failed_documents", 0),
+                "index_name": result.get("index_name"),
                 "index_created_at": result["index_created_at"]
             }
         }
@@ -911,6 +995,34 @@ async def rebuild_keyword_index():
         print(f"[API] 키워드 인덱스 재구축 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"키워드 인덱스 재구축 실패: {str(e)}")
 
+# 벡터 검색 필터 메타데이터 동기화 API (필터 필드 추가 이전에 저장된 지원자/이력서 청크 벡터용)
+@app.post("/api/resume/search/vector/sync-filter-metadata")
+async def sync_vector_filter_metadata():
+    """지원자 벡터와 이력서 청크 벡터의 검색 필터 메타데이터 갱신"""
+    try:
+        print(f"[API] 벡터 필터 메타데이터 동기화 요청")
+
+        result = await similarity_service.sync_applicant_filter_metadata(db.applicants)
+
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail=result.get("message", "필터 메타데이터 갱신에 실패했습니다."))
+
+        return {
+            "success": True,
+            "message": result["message"],
+            "data": {
+                "updated": result["updated"],
+                "failed": result["failed"],
+                "chunks_updated": result["chunks_updated"]
+            }
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[API] 벡터 필터 메타데이터 동기화 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"벡터 필터 메타데이터 동기화 실패: {str(e)}")
+
 @app.get("/api/resume/search/keyword/stats")
 async def get_keyword_search_stats():
     """키워드 검색 인덱스 통계 조회"""
@@ -926,6 +1038,57 @@ async def get_keyword_search_stats():
         print(f"[API] 키워드 검색 통계 조회 실패: {str(e)}")
         raise HTTPException(status_code=500, detail=f"키워드 검색 통계 조회 실패: {str(e)}")
 
+@app.get("/api/llm/stats")
+async def get_llm_gateway_stats():
+    """LLM 게이트웨이 통계 조회 (요청/재시도/rate limit, 응답 캐시 적중률)"""
+    try:
+        return {
+            "success": True,
+            "data": get_llm_gateway().stats()
+        }
+
+    except Exception as e:
+        print(f"[API] LLM 게이트웨이 통계 조회 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"LLM 게이트웨이 통계 조회 실패: {str(e)}")
+
+@app.get("/api/llm/usage")
+async def get_llm_usage_summary(group_by: str = "call_site", sort_by: str = "latency"):
+    """LLM 사용량 요약 (호출 지점/엔드포인트/모델별 토큰, 비용, 지연 시간, 캐시 적중률, 오류율)"""
+    try:
+        return {
+            "success": True,
+            "data": get_llm_gateway().telemetry.summary(group_by=group_by, sort_by=sort_by)
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_llm_metrics():
+    """Prometheus 형식 LLM 메트릭"""
+    return PlainTextResponse(
+        get_llm_gateway().telemetry.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+@app.get("/api/resume/search/keyword/suggest")
+async def suggest_keywords(q: str, limit: int = 5):
+    """키워드 자동완성 (접두어 기준, 문서 빈도 순)"""
+    try:
+        suggestions = await similarity_service.keyword_search_service.suggest_keywords(q, min(max(limit, 1), 20))
+
+        return {
+            "success": True,
+            "data": {
+                "query": q,
+                "suggestions": suggestions
+            }
+        }
+
+    except Exception as e:
+        print(f"[API] 키워드 자동완성 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"키워드 자동완성 실패: {str(e)}")
+
 # 이력서 유사도 체크 API
 @app.post("/api/resume/similarity-check/{resume_id}")
 async def check_resume_similarity(resume_id: str):
@@ -943,23 +1106,15 @@ async def check_resume_similarity(resume_id: str):
         # 청킹 기반 API 응답 형식에 맞게 변환
         similarity_results = []
         for similar in result["data"]["similar_resumes"]:
-            # 청킹 상세 정보에서 필드별 유사도 추출
+            # 랭킹 단계에서 계산된 필드(청크 타입)별 점수 사용
             chunk_details = similar.get("chunk_details", {})
+            field_scores = similar.get("field_scores", {})
             field_similarities = {
-                "growthBackground": 0.0,
-                "motivation": 0.0,
-                "careerHistory": 0.0
+                "growthBackground": field_scores.get("growth_background", 0.0),
+                "motivation": field_scores.get("motivation", 0.0),
+                "careerHistory": field_scores.get("career_history", 0.0)
             }
 
-            # 청크 매칭에서 필드별 최고 점수 추출
-            for chunk_key, chunk_info in chunk_details.items():
-                if "growth_background" in chunk_key:
-                    field_similarities["growthBackground"] = max(field_similarities["growthBackground"], chunk_info["score"])
-                elif "motivation" in chunk_key:
-                    field_similarities["motivation"] = max(field_similarities["motivation"], chunk_info["score"])
-                elif "career_history" in chunk_key:
-                    field_similarities["careerHistory"] = max(field_similarities["careerHistory"], chunk_info["score"])
-
             similarity_result = {
                 "resume_id": str(similar["resume"]["_id"]),
                 "applicant_name": similar["resume"].get("name", "알 수 없음"),
@@ -980,114 +1135,6 @@ async def check_resume_similarity(resume_id: str):
             }
             similarity_results.append(similarity_result)
 
-        # 다른 모든 이력서 조회 (현재 이력서 제외)
-        other_resumes = await db.applicants.find({"_id": {"$ne": ObjectId(resume_id)}}).to_list(1000)
-
-        # 현재 이력서의 비교 텍스트 (유사도 계산 필드)
-        current_fields = {
-            "growthBackground": current_resume.get("growthBackground", ""),
-            "motivation": current_resume.get("motivation", ""),
-            "careerHistory": current_resume.get("careerHistory", "")
-        }
-
-        # 전체 텍스트 조합
-        current_text = " ".join([text for text in current_fields.values() if text])
-
-        similarity_results = []
-
-        for other_resume in other_resumes:
-            other_id = str(other_resume["_id"])
-
-            # 다른 이력서의 비교 텍스트
-            other_fields = {
-                "growthBackground": other_resume.get("growthBackground", ""),
-                "motivation": other_resume.get("motivation", ""),
-                "careerHistory": other_resume.get("careerHistory", "")
-            }
-            other_text = " ".join([text for text in other_fields.values() if text])
-
-            # 실제 유사도 계산 사용
-            try:
-                print(f"💫 이력서 간 유사도 계산 시작: {resume_id} vs {other_id}")
-
-                # SimilarityService의 텍스트 유사도 계산 메서드 직접 호출
-                text_similarity = similarity_service._calculate_text_similarity(current_resume, other_resume)
-                overall_similarity = text_similarity if text_similarity is not None else 0.0
-
-                print(f"📊 텍스트 유사도 결과: {overall_similarity:.3f}")
-
-                # 필드별 유사도 계산
-                field_similarities = {}
-                for field_name in current_fields.keys():
-                    if current_fields[field_name] and other_fields[field_name]:
-                        # 필드별 개별 텍스트 유사도 계산
-                        field_sim = similarity_service._calculate_text_similarity(
-                            {field_name: current_fields[field_name]},
-                            {field_name: other_fields[field_name]}
-                        )
-                        field_similarities[field_name] = field_sim if field_sim is not None else 0.0
-                        print(f"📋 {field_name} 유사도: {field_similarities[field_name]:.3f}")
-                    else:
-                        field_similarities[field_name] = 0.0
-
-            except Exception as e:
-                print(f"[ERROR] 유사도 계산 중 오류 발생: {e}")
-                import traceback
-                traceback.print_exc()
-
-                # 오류 시 기본값 사용
-                import random
-                overall_similarity = random.uniform(0.1, 0.9)
-                field_similarities = {}
-                for field_name in current_fields.keys():
-                    if current_fields[field_name] and other_fields[field_name]:
-                        field_similarities[field_name] = random.uniform(0.0, 1.0)
-                    else:
-                        field_similarities[field_name] = 0.0
-
-            # LLM 분석 추가 (유사도가 일정 수준 이상일 때만)
-            llm_analysis = None
-
-            if overall_similarity >= 0.3:  # 30% 이상 유사할 때만 LLM 분석
-                try:
-                    print(f"[API] LLM 분석 시작 - 유사도: {overall_similarity:.3f}")
-                    llm_analysis = await similarity_service.llm_service.analyze_plagiarism_suspicion(
-                        similarity_score=overall_similarity,
-                        similar_documents=[{
-                            "similarity_score": overall_similarity,
-                            "name": other_resume.get("name", "Unknown"),
-                            "basic_info_names": other_resume.get("name", "Unknown")
-                        }],
-                        document_type="resume"
-                    )
-                    print(f"[API] LLM 분석 완료")
-                except Exception as llm_error:
-                    print(f"[API] LLM 분석 중 오류: {llm_error}")
-                    llm_analysis = {
-                        "success": False,
-                        "error": str(llm_error),
-                        "analysis": "LLM 분석에 실패했습니다."
-                    }
-
-            similarity_result = {
-                "resume_id": other_id,
-                "applicant_name": other_resume.get("name", "알 수 없음"),
-                "position": other_resume.get("position", ""),
-                "department": other_resume.get("department", ""),
-                "overall_similarity": round(overall_similarity, 4),
-                "field_similarities": {
-                    "growthBackground": round(field_similarities["growthBackground"], 4),
-                    "motivation": round(field_similarities["motivation"], 4),
-                    "careerHistory": round(field_similarities["careerHistory"], 4)
-                },
-                "is_high_similarity": overall_similarity > 0.7,
-                "is_moderate_similarity": 0.4 <= overall_similarity <= 0.7,
-                "is_low_similarity": overall_similarity < 0.4,
-                "llm_analysis": llm_analysis
-            }
-
-            similarity_results.append(similarity_result)
-
         # 유사도 높은 순으로 정렬
         similarity_results.sort(key=lambda x: x["overall_similarity"], reverse=True)
 
@@ -18,6 +18,8 @@ except ImportError as e:
 from elasticsearch import Elasticsearch
 from pinecone import Pinecone
 
+from modules.core.services.local_embeddings import get_local_embeddings, use_local_embeddings
+
 
 class LangChainHybridService:
     def __init__(self):
@@ -36,7 +38,7 @@ class LangChainHybridService:
         self.es_username = os.getenv("ELASTICSEARCH_USERNAME", "elastic")
         self.es_password = os.getenv("ELASTICSEARCH_PASSWORD", "changeme123")
 
-        if not self.openai_api_key:
+        if not self.openai_api_key and not use_local_embeddings():
             raise Exception("OPENAI_API_KEY가 설정되지 않았습니다.")
         if not self.pinecone_api_key:
             raise Exception("PINECONE_API_KEY가 설정되지 않았습니다.")
@@ -49,11 +51,14 @@ class LangChainHybridService:
     def _initialize_langchain_components(self):
         """LangChain 컴포넌트들 초기화"""
         try:
-            # OpenAI 임베딩 (기본 1536차원 사용)
-            self.embeddings = OpenAIEmbeddings(
-                openai_api_key=self.openai_api_key,
-                model="text-embedding-3-small"  # 1536차원
-            )
+            # OpenAI 임베딩 (기본 1536차원 사용, 부하 테스트/CI는 같은 차원의 로컬 임베딩)
+            if use_local_embeddings():
+                self.embeddings = get_local_embeddings()
+            else:
+                self.embeddings = OpenAIEmbeddings(
+                    openai_api_key=self.openai_api_key,
+                    model="text-embedding-3-small"  # 1536차원
+                )
 
             # Pinecone 벡터 스토어
             self.vector_store = PineconeVectorStore(
@@ -10,10 +10,11 @@ import os
 import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Annotated, Any, Dict, List, Optional, TypedDict
+from typing import Annotated, Any, AsyncIterator, Dict, List, Optional, Tuple, TypedDict
 
 from dotenv import load_dotenv
 from modules.core.services.openai_service import OpenAIService
+from modules.core.services.sse import stream_tokens_of
 
 # LangGraph 관련 import
 try:
@@ -347,7 +348,7 @@ async def intent_detection_node(state: AgentState) -> AgentState:
 
         prompt = f"{system_prompt}\n\n사용자 입력: {user_input}"
         if openai_service:
-            response = await openai_service.generate_response(prompt)
+            response = await openai_service.generate_response(prompt, call_site="agent_intent_detection")
             intent = response.strip().lower()
         else:
             intent = "chat"
@@ -381,7 +382,7 @@ async def info_handler_node(state: AgentState) -> AgentState:
 
         prompt = f"{system_prompt}\n\n사용자 질문: {user_input}"
         if openai_service:
-            response = await openai_service.generate_response(prompt)
+            response = await openai_service.generate_response(prompt, stream_tokens=True, call_site="agent_info")
         else:
             response = "죄송합니다. AI 서비스를 사용할 수 없습니다."
 
@@ -481,7 +482,7 @@ async def resume_analyzer_node(state: AgentState) -> AgentState:
 
         prompt = f"{system_prompt}\n\n분석 요청: {user_input}"
         if openai_service:
-            response = await openai_service.generate_response(prompt)
+            response = await openai_service.generate_response(prompt, stream_tokens=True, call_site="agent_resume_analysis")
         else:
             response = "죄송합니다. AI 서비스를 사용할 수 없습니다."
 
@@ -643,7 +644,7 @@ async def recruitment_node(state: AgentState) -> AgentState:
 """
 
         if openai_service:
-            result = await openai_service.generate_response(prompt)
+            result = await openai_service.generate_response(prompt, call_site="agent_recruitment")
         else:
             result = "죄송합니다. AI 서비스를 사용할 수 없습니다."
 
@@ -841,7 +842,7 @@ UI 액션:
         )
 
         if openai_service:
-            response = await openai_service.generate_response(prompt)
+            response = await openai_service.generate_response(prompt, call_site="agent_intent_revalidation")
             revalidated_intent = response.strip().lower()
         else:
             revalidated_intent = current_intent
@@ -1584,6 +1585,16 @@ class LangGraphAgentSystem:
                 "workflow_trace": "error"
             }
 
+    async def stream_request(self, user_input: str, conversation_history: List[Dict[str, str]] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        process_request의 스트리밍 버전
+
+        답변을 생성하는 노드(info_handler, resume_analyzer)의 LLM 토큰을 token 이벤트로,
+        워크플로우 완료 후 process_request와 같은 결과 dict를 result 이벤트로 반환합니다.
+        """
+        async for event, data in stream_tokens_of(self.process_request(user_input, conversation_history)):
+            yield event, data
+
     def get_workflow_info(self) -> Dict[str, Any]:
         """워크플로우 정보 반환"""
         return {
@@ -0,0 +1,483 @@
+"""
+분석 작업 큐 (MongoDB 영구 저장 + 워커 풀)
+
+이력서/자소서/종합 분석처럼 오래 걸리는 LLM 분석을 요청과 분리해 백그라운드에서 처리합니다.
+
+- 작업은 MongoDB 컬렉션에 저장 (서버 재시작/다른 워커 프로세스와 공유)
+- 우선순위 클래스: interactive(화면에서 바로 기다리는 요청) > bulk(공고 마감 후 일괄 평가)
+  bulk 작업은 워커 일부를 interactive용으로 남겨두어 일괄 평가 중에도 개별 요청이 밀리지 않음
+- 작업 키(기본: 종류 + payload 해시)로 중복 제출 방지 (같은 작업은 한 번만 실행, 배치에는 함께 포함)
+  실패/취소된 작업은 다시 제출하면 새로 실행하고, 완료된 작업은 force=True일 때만 다시 실행
+- 배치별 진행률과 예상 완료 시간(ETA) 제공
+- rate limit(429) 감지 시 동시 실행 수를 절반으로 줄이고 잠시 멈춘 뒤, 성공이 이어지면 1씩 회복
+- 실패한 작업은 지수 백오프로 재시도, 처리 중 워커가 죽은 작업은 lease 만료 후 다시 가져감
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+from .llm_gateway import _status_code, get_llm_gateway
+from .llm_telemetry import set_endpoint
+
+logger = logging.getLogger(__name__)
+
+# 숫자가 작을수록 먼저 처리
+PRIORITIES = {"interactive": 0, "bulk": 10}
+
+# 다시 제출하면 초기화해서 새로 실행하는 종료 상태 (done은 force=True일 때만)
+RESUBMITTABLE_STATUSES = ("failed", "cancelled")
+# 작업 초기화 시 지우는 이전 실행 필드
+_RUN_FIELDS = ("result", "error", "started_at", "finished_at", "duration", "expires_at", "lease_until", "worker")
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class JobRejected(Exception):
+    """재시도해도 결과가 같은 작업 오류 (대상 문서 없음, 잘못된 payload 등) - 즉시 실패 처리"""
+
+
+def make_job_key(kind: str, payload: Dict[str, Any]) -> str:
+    """작업 종류 + payload로 멱등 작업 키 생성"""
+    raw = json.dumps([kind, payload], sort_keys=True, ensure_ascii=False, default=str)
+    return f"{kind}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}"
+
+
+class AnalysisJobQueue:
+    """MongoDB 기반 분석 작업 큐와 워커 풀"""
+
+    def __init__(self, max_workers: int = 4, reserved_interactive: int = 1, max_attempts: int = 3,
+                 lease_seconds: float = 900.0, poll_interval: float = 2.0,
+                 backoff_base: float = 5.0, backoff_max: float = 300.0,
+                 result_ttl_seconds: float = 1209600.0):
+        self.max_workers = max(1, max_workers)
+        self.reserved_interactive = min(reserved_interactive, self.max_workers - 1)
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.result_ttl_seconds = result_ttl_seconds
+
+        self._collection = None
+        self._handlers: Dict[str, JobHandler] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker_prefix = uuid.uuid4().hex[:8]
+
+        # 현재 동시 실행 한도 (rate limit 시 절반으로 줄이고 성공이 이어지면 1씩 회복)
+        self._limit = self.max_workers
+        self._successes_since_throttle = 0
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._bulk_in_flight = 0
+        self._gateway_rate_limited = 0
+        self._counters = {"submitted": 0, "deduplicated": 0, "resubmitted": 0, "completed": 0, "failed": 0,
+                          "retried": 0, "rate_limited": 0, "reclaimed": 0}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def register_handler(self, kind: str, handler: JobHandler) -> None:
+        """작업 종류별 처리 함수 등록 (payload dict → 결과)"""
+        self._handlers[kind] = handler
+
+    async def start(self, collection) -> None:
+        """작업 컬렉션을 연결하고 인덱스를 만든 뒤 워커를 띄웁니다."""
+        if self.running:
+            return
+        self._collection = collection
+        try:
+            await collection.create_index([("status", 1), ("priority", 1), ("created_at", 1)])
+            await collection.create_index("batch_ids")
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            logger.warning(f"분석 작업 큐 인덱스 생성 실패: {e}")
+
+        self._wakeup = asyncio.Event()
+        self._gateway_rate_limited = get_llm_gateway().stats().get("rate_limited", 0)
+        self._workers = [
+            asyncio.create_task(self._worker(f"{self._worker_prefix}-{index}"))
+            for index in range(self.max_workers)
+        ]
+        logger.info(f"분석 작업 큐 시작: 워커 {self.max_workers}개 (interactive 예약 {self.reserved_interactive}개)")
+
+    async def stop(self) -> None:
+        """워커 종료 (실행 중이던 작업은 대기 상태로 되돌림)"""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # 제출 / 조회
+    # ------------------------------------------------------------------
+
+    def _new_job(self, kind: str, payload: Dict[str, Any], priority: str, now: datetime) -> Dict[str, Any]:
+        if priority not in PRIORITIES:
+            raise ValueError(f"알 수 없는 우선순위: {priority} (interactive 또는 bulk)")
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류: {kind}")
+        return {
+            "kind": kind,
+            "payload": payload,
+            "priority": PRIORITIES[priority],
+            "status": "queued",
+            "attempts": 0,
+            "not_before": now,
+            "created_at": now
+        }
+
+    @staticmethod
+    def _reset_filter(key: str, force: bool) -> Dict[str, Any]:
+        statuses = RESUBMITTABLE_STATUSES + (("done",) if force else ())
+        return {"_id": key, "status": {"$in": list(statuses)}}
+
+    @staticmethod
+    def _reset_update(job: Dict[str, Any]) -> Dict[str, Any]:
+        """종료된 작업을 새 작업 상태로 되돌리는 업데이트 (배치 소속은 유지)"""
+        return {"$set": job, "$unset": {field: "" for field in _RUN_FIELDS}}
+
+    def _require_store(self):
+        if self._collection is None:
+            raise RuntimeError("분석 작업 큐가 시작되지 않았습니다.")
+        return self._collection
+
+    async def submit(self, kind: str, payload: Dict[str, Any], priority: str = "interactive",
+                     job_key: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        작업 하나를 제출합니다. 같은 키의 작업이 이미 있으면 새로 만들지 않고 기존 작업을 반환합니다.
+        (대기 중인 bulk 작업을 interactive로 다시 제출하면 우선순위만 올림)
+        실패/취소된 작업은 새로 실행하고, 완료된 작업은 force=True일 때만 새로 실행합니다.
+        """
+        collection = self._require_store()
+        now = datetime.utcnow()
+        job = self._new_job(kind, payload, priority, now)
+        key = job_key or make_job_key(kind, payload)
+
+        reset = await collection.update_one(self._reset_filter(key, force), self._reset_update(job))
+        if reset.modified_count:
+            self._counters["resubmitted"] += 1
+            self._wakeup.set()
+            return {"job_id": key, "created": True, "resubmitted": True}
+
+        result = await collection.update_one({"_id": key}, {"$setOnInsert": job}, upsert=True)
+        created = result.upserted_id is not None
+        if created:
+            self._counters["submitted"] += 1
+            self._wakeup.set()
+        else:
+            self._counters["deduplicated"] += 1
+            await collection.update_one(
+                {"_id": key, "status": "queued", "priority": {"$gt": job["priority"]}},
+                {"$set": {"priority": job["priority"]}}
+            )
+        return {"job_id": key, "created": created}
+
+    async def submit_batch(self, kind: str, payloads: List[Dict[str, Any]], priority: str = "bulk",
+                           job_keys: Optional[List[Optional[str]]] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        여러 작업을 한 번에 제출하고 배치 ID를 반환합니다.
+        이미 있는 작업(같은 키)은 다시 실행하지 않고 배치 진행률에만 포함합니다.
+        (실패/취소된 작업과 force=True일 때의 완료된 작업은 초기화해서 다시 실행)
+        """
+        collection = self._require_store()
+        now = datetime.utcnow()
+        batch_id = uuid.uuid4().hex
+        keys = [
+            (job_keys[index] if job_keys and job_keys[index] else make_job_key(kind, payload))
+            for index, payload in enumerate(payloads)
+        ]
+        # 같은 요청 안의 중복 항목 제거
+        unique = dict(zip(keys, payloads))
+        if not unique:
+            return {"batch_id": batch_id, "total": 0, "created": 0, "resubmitted": 0, "deduplicated": 0}
+
+        # 종료된 작업 초기화를 먼저 적용한 뒤 배치 소속 추가/신규 작업 생성
+        reset = await collection.bulk_write([
+            UpdateOne(self._reset_filter(key, force), self._reset_update(self._new_job(kind, payload, priority, now)))
+            for key, payload in unique.items()
+        ], ordered=False)
+        resubmitted = reset.modified_count
+
+        operations = [
+            UpdateOne(
+                {"_id": key},
+                {"$setOnInsert": self._new_job(kind, payload, priority, now), "$addToSet": {"batch_ids": batch_id}},
+                upsert=True
+            )
+            for key, payload in unique.items()
+        ]
+        result = await collection.bulk_write(operations, ordered=False)
+        created = len(result.upserted_ids)
+        deduplicated = len(unique) - created - resubmitted
+        self._counters["submitted"] += created
+        self._counters["resubmitted"] += resubmitted
+        self._counters["deduplicated"] += deduplicated
+        self._wakeup.set()
+
+        logger.info(f"분석 배치 제출: {batch_id} ({kind}, {len(unique)}건, 신규 {created}건, 재실행 {resubmitted}건)")
+        return {"batch_id": batch_id, "total": len(unique), "created": created,
+                "resubmitted": resubmitted, "deduplicated": deduplicated}
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._require_store().find_one({"_id": job_id})
+
+    async def batch_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """배치 진행률과 예상 남은 시간(초)"""
+        pipeline = [
+            {"$match": {"batch_ids": batch_id}},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}, "avg_duration": {"$avg": "$duration"}}}
+        ]
+        counts: Dict[str, int] = {}
+        avg_duration = None
+        async for row in self._require_store().aggregate(pipeline):
+            counts[row["_id"]] = row["count"]
+            if row["_id"] == "done":
+                avg_duration = row["avg_duration"]
+        total = sum(counts.values())
+        if total == 0:
+            return None
+
+        finished = counts.get("done", 0) + counts.get("failed", 0) + counts.get("cancelled", 0)
+        remaining = total - finished
+        # 남은 작업 × 평균 처리 시간 ÷ 현재 동시 실행 한도 (rate limit으로 한도가 줄면 ETA도 늘어남)
+        eta_seconds = round(remaining * avg_duration / self._limit, 1) if remaining and avg_duration else None
+        return {
+            "batch_id": batch_id,
+            "total": total,
+            "queued": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "cancelled": counts.get("cancelled", 0),
+            "progress": round(finished / total, 4),
+            "eta_seconds": 0.0 if remaining == 0 else eta_seconds
+        }
+
+    async def batch_results(self, batch_id: str, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+        cursor = self._require_store().find(
+            {"batch_ids": batch_id},
+            {"kind": 1, "payload": 1, "status": 1, "result": 1, "error": 1, "finished_at": 1}
+        ).sort("created_at", 1).skip(skip).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def cancel_batch(self, batch_id: str) -> int:
+        """배치의 대기 중 작업 취소 (다른 배치에도 속한 작업은 유지)"""
+        result = await self._require_store().update_many(
+            {"batch_ids": [batch_id], "status": "queued"},
+            {"$set": {"status": "cancelled", "finished_at": datetime.utcnow(),
+                      "expires_at": datetime.utcnow() + timedelta(seconds=self.result_ttl_seconds)}}
+        )
+        return result.modified_count
+
+    # ------------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------------
+
+    async def _wait(self, timeout: Optional[float] = None) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout or self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _worker(self, worker_id: str) -> None:
+        while True:
+            try:
+                pause = self._paused_until - time.time()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                if self._in_flight >= self._limit:
+                    await self._wait()
+                    continue
+
+                job = await self._claim(worker_id)
+                if job is None:
+                    await self._wait()
+                    continue
+                await self._execute(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 저장소 오류 등으로 워커가 죽지 않도록 잠시 쉬고 계속
+                logger.error(f"분석 작업 워커 오류 ({worker_id}): {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """우선순위 순으로 실행 가능한 작업 하나를 가져옵니다 (lease 만료된 실행 중 작업 포함)."""
+        # 자리를 먼저 잡아두어 같은 루프의 다른 워커가 한도를 넘겨 가져가지 않도록 함
+        allow_bulk = self._bulk_in_flight < max(1, self._limit - self.reserved_interactive)
+        self._in_flight += 1
+        if allow_bulk:
+            self._bulk_in_flight += 1
+
+        now = datetime.utcnow()
+        query: Dict[str, Any] = {"$or": [
+            {"status": "queued", "not_before": {"$lte": now}},
+            {"status": "running", "lease_until": {"$lt": now}}
+        ]}
+        if not allow_bulk:
+            query["priority"] = {"$lt": PRIORITIES["bulk"]}
+
+        claim = {"status": "running", "started_at": now, "worker": worker_id,
+                 "lease_until": now + timedelta(seconds=self.lease_seconds)}
+        try:
+            previous = await self._collection.find_one_and_update(
+                query,
+                {"$set": claim, "$inc": {"attempts": 1}},
+                sort=[("priority", 1), ("created_at", 1)],
+                return_document=ReturnDocument.BEFORE
+            )
+        except BaseException:
+            self._release(allow_bulk, wake=False)
+            raise
+
+        if previous is None:
+            self._release(allow_bulk, wake=False)
+            return None
+        if allow_bulk and previous["priority"] < PRIORITIES["bulk"]:
+            self._bulk_in_flight -= 1
+        if previous["status"] == "running":
+            self._counters["reclaimed"] += 1
+            logger.warning(f"lease가 만료된 분석 작업 재실행: {previous['_id']} (이전 워커 {previous.get('worker')})")
+        return {**previous, **claim, "attempts": previous["attempts"] + 1}
+
+    def _release(self, bulk: bool, wake: bool = True) -> None:
+        """실행 자리 반환 (작업이 끝나 자리가 났으면 대기 중인 워커를 깨움)"""
+        self._in_flight -= 1
+        if bulk:
+            self._bulk_in_flight -= 1
+        if wake:
+            self._wakeup.set()
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        job_id = job["_id"]
+        owner = {"_id": job_id, "worker": job["worker"], "attempts": job["attempts"]}
+        start_time = time.time()
+        try:
+            handler = self._handlers.get(job["kind"])
+            if handler is None:
+                raise ValueError(f"등록되지 않은 작업 종류: {job['kind']}")
+            # 작업 안의 LLM 호출은 job:<종류> 엔드포인트로 집계
+            set_endpoint(f"job:{job['kind']}")
+            result = await handler(job["payload"])
+        except asyncio.CancelledError:
+            # 서버 종료: 시도 횟수를 되돌리고 대기 상태로 복귀
+            await asyncio.shield(self._collection.update_one(
+                owner, {"$set": {"status": "queued", "not_before": datetime.utcnow()},
+                        "$inc": {"attempts": -1}, "$unset": {"lease_until": "", "worker": ""}}
+            ))
+            raise
+        except Exception as e:
+            await self._handle_failure(job, owner, e)
+        else:
+            now = datetime.utcnow()
+            await self._collection.update_one(owner, {
+                "$set": {"status": "done", "result": result, "finished_at": now,
+                         "duration": round(time.time() - start_time, 3),
+                         "expires_at": now + timedelta(seconds=self.result_ttl_seconds)},
+                "$unset": {"lease_until": "", "error": ""}
+            })
+            self._counters["completed"] += 1
+            self._on_success()
+        finally:
+            self._observe_gateway_rate_limits()
+            self._release(job["priority"] >= PRIORITIES["bulk"])
+
+    async def _handle_failure(self, job: Dict[str, Any], owner: Dict[str, Any], error: Exception) -> None:
+        rate_limited = _status_code(error) == 429
+        if rate_limited:
+            self._throttle()
+
+        now = datetime.utcnow()
+        message = f"{type(error).__name__}: {error}"
+        # rate limit은 작업 자체의 실패가 아니므로 시도 횟수에 넣지 않음
+        if rate_limited or (job["attempts"] < self.max_attempts and not isinstance(error, JobRejected)):
+            delay = min(self.backoff_max, self.backoff_base * 2 ** max(0, job["attempts"] - 1))
+            delay = random.uniform(delay / 2, delay)
+            update = {"$set": {"status": "queued", "error": message,
+                               "not_before": now + timedelta(seconds=delay)},
+                      "$unset": {"lease_until": "", "worker": ""}}
+            if rate_limited:
+                update["$inc"] = {"attempts": -1}
+            await self._collection.update_one(owner, update)
+            self._counters["retried"] += 1
+            logger.warning(f"분석 작업 재시도 예정 ({delay:.1f}초 후): {job['_id']} - {message}")
+        else:
+            await self._collection.update_one(owner, {
+                "$set": {"status": "failed", "error": message, "finished_at": now,
+                         "expires_at": now + timedelta(seconds=self.result_ttl_seconds)},
+                "$unset": {"lease_until": ""}
+            })
+            self._counters["failed"] += 1
+            logger.error(f"분석 작업 실패: {job['_id']} - {message}")
+
+    # ------------------------------------------------------------------
+    # rate limit 대응 (동시 실행 한도 조절)
+    # ------------------------------------------------------------------
+
+    def _observe_gateway_rate_limits(self) -> None:
+        """게이트웨이가 내부 재시도로 흡수한 429도 혼잡 신호로 보고 한도를 줄입니다."""
+        rate_limited = get_llm_gateway().stats().get("rate_limited", 0)
+        if rate_limited > self._gateway_rate_limited:
+            self._throttle()
+        self._gateway_rate_limited = rate_limited
+
+    def _throttle(self) -> None:
+        now = time.time()
+        if self._paused_until > now:
+            return  # 이미 같은 혼잡으로 줄인 상태
+        self._limit = max(1, self._limit // 2)
+        self._successes_since_throttle = 0
+        self._paused_until = now + random.uniform(self.backoff_base / 2, self.backoff_base)
+        self._counters["rate_limited"] += 1
+        logger.warning(f"LLM rate limit 감지 - 분석 작업 동시 실행 한도 {self._limit}로 축소")
+
+    def _on_success(self) -> None:
+        if self._limit >= self.max_workers:
+            return
+        self._successes_since_throttle += 1
+        # 현재 한도만큼 연속 성공하면 한도 1 증가
+        if self._successes_since_throttle >= self._limit:
+            self._limit += 1
+            self._successes_since_throttle = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_workers": self.max_workers,
+            "reserved_interactive": self.reserved_interactive,
+            "concurrency_limit": self._limit,
+            "in_flight": self._in_flight,
+            "bulk_in_flight": self._bulk_in_flight,
+            "paused_seconds": round(max(0.0, self._paused_until - time.time()), 2),
+            "handlers": sorted(self._handlers),
+            **self._counters
+        }
+
+
+_queue: Optional[AnalysisJobQueue] = None
+
+
+def get_analysis_queue() -> AnalysisJobQueue:
+    """환경 변수(ANALYSIS_QUEUE_WORKERS, ANALYSIS_QUEUE_RESERVED_INTERACTIVE, ANALYSIS_QUEUE_MAX_ATTEMPTS)로 만든 공유 큐"""
+    global _queue
+    if _queue is None:
+        _queue = AnalysisJobQueue(
+            max_workers=int(os.getenv("ANALYSIS_QUEUE_WORKERS", "4")),
+            reserved_interactive=int(os.getenv("ANALYSIS_QUEUE_RESERVED_INTERACTIVE", "1")),
+            max_attempts=int(os.getenv("ANALYSIS_QUEUE_MAX_ATTEMPTS", "3"))
+        )
+    return _queue
@@ -0,0 +1,419 @@
+"""
+Elasticsearch 없이 동작하는 프로세스 내장 BM25 역색인
+
+- 용어 → (문서 슬롯 배열, 가중 tf 배열) 형태의 배열 기반 포스팅
+- 필드 가중치(BM25F 방식)는 Elasticsearch multi_match 가중치와 동일하게 맞춤
+- 문서 단위 증분 추가/삭제 (삭제는 tombstone 후 compaction 시 정리)
+- 넘파이 .npy 파일로 저장하여 np.load(mmap_mode="r")로 바로 매핑 가능
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .suggestion_index import PrefixSuggester
+
+logger = logging.getLogger(__name__)
+
+# Elasticsearch multi_match 필드 가중치와 동일하게 유지
+FIELD_BOOSTS: Dict[str, float] = {
+    "name": 3.0,
+    "skills": 2.0,
+    "position": 1.5,
+    "all_content": 1.0,
+}
+
+# 저장 형식 또는 토큰화 규칙(tokenizer_service)이 바뀌면 올림 → 기존 스냅샷 무시 후 재구축
+INDEX_FORMAT_VERSION = 2
+
+
+class BM25Index:
+    """
+    증분 갱신 가능한 BM25F 역색인
+
+    포스팅은 두 구간으로 관리합니다.
+    - base: CSR 형태의 넘파이 배열 (디스크에서 mmap으로 로드 가능, 읽기 전용)
+    - delta: 이후 추가된 문서의 포스팅 (array 기반, compaction 시 base로 병합)
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75,
+                 field_boosts: Optional[Dict[str, float]] = None,
+                 compact_threshold: int = 5000):
+        self.k1 = k1
+        self.b = b
+        self.field_boosts = dict(field_boosts or FIELD_BOOSTS)
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # 문서 슬롯 정보
+        self._doc_keys: List[Optional[str]] = []
+        self._key_to_slot: Dict[str, int] = {}
+        self._doc_len = array("f")
+        self._alive = bytearray()
+        self._live_count = 0
+        self._total_len = 0.0
+        # base 구간 (CSR)
+        self._base_terms: Dict[str, int] = {}
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        self._base_slots = np.zeros(0, dtype=np.int32)
+        self._base_tf = np.zeros(0, dtype=np.float32)
+        # delta 구간
+        self._delta: Dict[str, Tuple[array, array]] = {}
+        self._delta_postings = 0
+        # 살아있는 문서 기준 문서 빈도
+        self._df: Dict[str, int] = {}
+        # 삭제 시 df 감소를 위해 슬롯별 용어 목록 보관
+        self._slot_terms: List[Tuple[str, ...]] = []
+        # 자동완성 인덱스 (대량 색인 중에는 만들지 않고 첫 조회/warm_suggestions 때 구성)
+        self._suggester: Optional[PrefixSuggester] = None
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+    def _weighted_terms(self, field_tokens: Dict[str, Iterable[str]]) -> Tuple[Dict[str, float], float]:
+        weights: Dict[str, float] = {}
+        length = 0.0
+        for field, tokens in field_tokens.items():
+            boost = self.field_boosts.get(field)
+            if not boost:
+                continue
+            for token in tokens:
+                weights[token] = weights.get(token, 0.0) + boost
+                length += boost
+        return weights, length
+
+    def add(self, key: str, field_tokens: Dict[str, Iterable[str]]) -> int:
+        """
+        문서를 추가합니다. 같은 key가 있으면 교체합니다.
+
+        Args:
+            key: 문서 ID (이력서 ID)
+            field_tokens: 필드명 → 토큰 리스트
+
+        Returns:
+            int: 색인된 고유 용어 수
+        """
+        weights, length = self._weighted_terms(field_tokens)
+        with self._lock:
+            self._remove_locked(key)
+            slot = len(self._doc_keys)
+            self._doc_keys.append(key)
+            self._key_to_slot[key] = slot
+            self._doc_len.append(length)
+            self._alive.append(1)
+            self._slot_terms.append(tuple(weights))
+            self._live_count += 1
+            self._total_len += length
+            for term, tf in weights.items():
+                postings = self._delta.get(term)
+                if postings is None:
+                    postings = (array("i"), array("f"))
+                    self._delta[term] = postings
+                postings[0].append(slot)
+                postings[1].append(tf)
+                self._df[term] = self._df.get(term, 0) + 1
+            if self._suggester is not None:
+                self._suggester.update_many(weights, 1)
+            self._delta_postings += len(weights)
+            # base 크기에 비례해 병합 주기를 늘려 대량 색인 시에도 분할상환 O(1) 유지
+            if self._delta_postings >= max(self.compact_threshold, self._base_slots.shape[0]):
+                self._compact_locked()
+            return len(weights)
+
+    def remove(self, key: str) -> bool:
+        """문서를 삭제합니다. 존재하지 않으면 False를 반환합니다."""
+        with self._lock:
+            return self._remove_locked(key)
+
+    def _remove_locked(self, key: str) -> bool:
+        slot = self._key_to_slot.pop(key, None)
+        if slot is None:
+            return False
+        self._alive[slot] = 0
+        self._doc_keys[slot] = None
+        self._live_count -= 1
+        self._total_len -= self._doc_len[slot]
+        for term in self._slot_terms[slot]:
+            remaining = self._df.get(term, 0) - 1
+            if remaining > 0:
+                self._df[term] = remaining
+            else:
+                self._df.pop(term, None)
+        if self._suggester is not None:
+            self._suggester.update_many(self._slot_terms[slot], -1)
+        self._slot_terms[slot] = ()
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset()
+
+    def compact(self) -> None:
+        """delta 포스팅을 base로 병합하고 삭제된 문서 슬롯을 정리합니다."""
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        # 살아있는 슬롯만 0..n-1로 재배치
+        old_to_new = np.full(len(self._doc_keys), -1, dtype=np.int32)
+        new_keys: List[Optional[str]] = []
+        new_len = array("f")
+        new_slot_terms: List[Tuple[str, ...]] = []
+        for slot, key in enumerate(self._doc_keys):
+            if key is None:
+                continue
+            old_to_new[slot] = len(new_keys)
+            new_keys.append(key)
+            new_len.append(self._doc_len[slot])
+            new_slot_terms.append(self._slot_terms[slot])
+
+        terms = sorted(self._df)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        slot_parts: List[np.ndarray] = []
+        tf_parts: List[np.ndarray] = []
+        cursor = 0
+        for i, term in enumerate(terms):
+            slots, tfs = self._postings_locked(term)
+            mapped = old_to_new[slots]
+            keep = mapped >= 0
+            slot_parts.append(mapped[keep])
+            tf_parts.append(tfs[keep])
+            cursor += int(keep.sum())
+            offsets[i + 1] = cursor
+
+        self._base_terms = {term: i for i, term in enumerate(terms)}
+        self._base_offsets = offsets
+        self._base_slots = np.concatenate(slot_parts).astype(np.int32) if slot_parts else np.zeros(0, dtype=np.int32)
+        self._base_tf = np.concatenate(tf_parts).astype(np.float32) if tf_parts else np.zeros(0, dtype=np.float32)
+        self._delta = {}
+        self._delta_postings = 0
+        self._doc_keys = new_keys
+        self._key_to_slot = {key: i for i, key in enumerate(new_keys)}
+        self._doc_len = new_len
+        self._alive = bytearray(b"\x01" * len(new_keys))
+        self._slot_terms = new_slot_terms
+
+    def _postings_locked(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        slot_parts = []
+        tf_parts = []
+        idx = self._base_terms.get(term)
+        if idx is not None:
+            start, end = self._base_offsets[idx], self._base_offsets[idx + 1]
+            slot_parts.append(np.asarray(self._base_slots[start:end]))
+            tf_parts.append(np.asarray(self._base_tf[start:end]))
+        delta = self._delta.get(term)
+        if delta is not None:
+            # 복사본 사용 (array가 버퍼를 export 중이면 이후 append가 실패함)
+            slot_parts.append(np.array(delta[0], dtype=np.int32))
+            tf_parts.append(np.array(delta[1], dtype=np.float32))
+        if not slot_parts:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        if len(slot_parts) == 1:
+            return slot_parts[0], tf_parts[0]
+        return np.concatenate(slot_parts), np.concatenate(tf_parts)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+    def search(self, query_tokens: Iterable[str], limit: int = 10,
+               candidates: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        BM25 점수 상위 문서를 반환합니다.
+
+        Args:
+            query_tokens: 전처리된 검색 토큰
+            limit: 반환할 최대 결과 수
+            candidates: 지정하면 이 문서 ID들 안에서만 검색 (필터 조건)
+
+        Returns:
+            List[Tuple[str, float]]: (문서 ID, 점수) 리스트 (점수 내림차순)
+        """
+        with self._lock:
+            n_slots = len(self._doc_keys)
+            if not n_slots or not self._live_count or limit <= 0:
+                return []
+            n_docs = self._live_count
+            avg_len = self._total_len / n_docs if self._total_len > 0 else 1.0
+            doc_len = np.array(self._doc_len, dtype=np.float32)
+            alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+            scores = np.zeros(n_slots, dtype=np.float32)
+            matched = False
+            for term in dict.fromkeys(query_tokens):
+                df = self._df.get(term, 0)
+                if not df:
+                    continue
+                slots, tfs = self._postings_locked(term)
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * doc_len[slots] / avg_len)
+                # 삭제된 슬롯의 포스팅은 아래 alive 마스크로 제외됨 (중복 슬롯 없음)
+                scores[slots] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+                matched = True
+            if not matched:
+                return []
+            if candidates is not None:
+                allowed = np.zeros(n_slots, dtype=bool)
+                allowed[[self._key_to_slot[key] for key in candidates if key in self._key_to_slot]] = True
+                alive &= allowed
+            scores[~alive] = 0.0
+            candidates = np.flatnonzero(scores > 0)
+            if candidates.size > limit:
+                top = np.argpartition(scores[candidates], -limit)[-limit:]
+                candidates = candidates[top]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self._doc_keys[slot], float(scores[slot])) for slot in order]
+
+    # ------------------------------------------------------------------
+    # 자동완성
+    # ------------------------------------------------------------------
+    def warm_suggestions(self) -> None:
+        """현재 문서 빈도로 자동완성 인덱스를 구성합니다."""
+        with self._lock:
+            suggester = PrefixSuggester()
+            suggester.build(self._df)
+            self._suggester = suggester
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[str]:
+        """접두어로 시작하는 용어를 문서 빈도 순으로 반환합니다."""
+        with self._lock:
+            if self._suggester is None:
+                self.warm_suggestions()
+            return self._suggester.suggest(prefix, limit)
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._live_count
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_to_slot
+
+    def document_frequencies(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._df)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "total_documents": self._live_count,
+                "vocabulary_size": len(self._df),
+                "base_postings": int(self._base_slots.shape[0]),
+                "delta_postings": self._delta_postings,
+                "avg_doc_length": round(self._total_len / self._live_count, 2) if self._live_count else 0.0,
+            }
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+    def save(self, directory: str) -> None:
+        """
+        인덱스를 디렉터리에 저장합니다 (compaction 후 .npy + json).
+        임시 디렉터리에 쓴 뒤 교체하므로 저장 도중 읽기가 깨지지 않습니다.
+        """
+        target = Path(directory)
+        tmp = target.with_name(target.name + ".tmp")
+        with self._lock:
+            self._compact_locked()
+            tmp.mkdir(parents=True, exist_ok=True)
+            terms = sorted(self._base_terms, key=self._base_terms.get)
+            np.save(tmp / "offsets.npy", self._base_offsets)
+            np.save(tmp / "slots.npy", np.ascontiguousarray(self._base_slots))
+            np.save(tmp / "tf.npy", np.ascontiguousarray(self._base_tf))
+            np.save(tmp / "doc_len.npy", np.frombuffer(self._doc_len, dtype=np.float32))
+            meta = {
+                "version": INDEX_FORMAT_VERSION,
+                "k1": self.k1,
+                "b": self.b,
+                "field_boosts": self.field_boosts,
+                "terms": terms,
+                "doc_keys": self._doc_keys,
+                "slot_terms": [list(t) for t in self._slot_terms],
+            }
+            with open(tmp / "meta.json", "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+        if target.exists():
+            for child in target.iterdir():
+                child.unlink()
+            target.rmdir()
+        os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "BM25Index":
+        """
+        저장된 인덱스를 로드합니다. mmap=True이면 포스팅 배열을 메모리 매핑합니다.
+        필드 가중치가 현재 설정과 다르면 ValueError를 발생시킵니다 (재구축 필요).
+        """
+        path = Path(directory)
+        with open(path / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 버전: {meta.get('version')}")
+        if meta.get("field_boosts") != FIELD_BOOSTS:
+            raise ValueError("필드 가중치가 변경되어 인덱스 재구축이 필요합니다.")
+        mode = "r" if mmap else None
+        index = cls(k1=meta["k1"], b=meta["b"], field_boosts=meta["field_boosts"])
+        index._base_offsets = np.load(path / "offsets.npy", mmap_mode=mode)
+        index._base_slots = np.load(path / "slots.npy", mmap_mode=mode)
+        index._base_tf = np.load(path / "tf.npy", mmap_mode=mode)
+        index._base_terms = {term: i for i, term in enumerate(meta["terms"])}
+        index._doc_keys = list(meta["doc_keys"])
+        index._key_to_slot = {key: i for i, key in enumerate(index._doc_keys)}
+        index._doc_len = array("f", np.load(path / "doc_len.npy").tolist())
+        index._alive = bytearray(b"\x01" * len(index._doc_keys))
+        index._slot_terms = [tuple(t) for t in meta["slot_terms"]]
+        index._live_count = len(index._doc_keys)
+        index._total_len = float(sum(index._doc_len))
+        offsets = np.asarray(index._base_offsets)
+        index._df = {term: int(offsets[i + 1] - offsets[i]) for term, i in index._base_terms.items()}
+        return index
+
+
+# 프로세스 전역 인덱스 (KeywordSearchService 인스턴스가 여러 개여도 공유)
+_shared_index: Optional[BM25Index] = None
+_shared_lock = threading.Lock()
+
+
+def get_local_index() -> BM25Index:
+    """프로세스 전역 BM25 인덱스를 반환합니다 (최초 호출 시 디스크 스냅샷 로드 시도)."""
+    global _shared_index
+    if _shared_index is not None:
+        return _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            path = get_index_path()
+            index = None
+            if (Path(path) / "meta.json").exists():
+                try:
+                    index = BM25Index.load(path)
+                    logger.info(f"로컬 BM25 인덱스 로드 완료: {len(index)}개 문서 ({path})")
+                except Exception as e:
+                    logger.warning(f"로컬 BM25 인덱스 로드 실패, 빈 인덱스로 시작합니다: {str(e)}")
+            _shared_index = index or BM25Index()
+    return _shared_index
+
+
+# 기본 인덱스 디렉터리 (실행 위치와 관계없이 backend/data/keyword_index)
+_DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+    "data", "keyword_index"
+)
+
+
+def get_index_path() -> str:
+    return os.getenv("KEYWORD_INDEX_PATH", _DEFAULT_INDEX_PATH)
+
+
+def set_local_index(index: BM25Index) -> None:
+    """재구축이 끝난 인덱스로 프로세스 전역 인덱스를 교체합니다 (검색 중단 없음)."""
+    global _shared_index
+    with _shared_lock:
+        _shared_index = index
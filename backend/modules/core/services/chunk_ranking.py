@@ -0,0 +1,131 @@
+"""
+청크 단위 유사도 → 문서 단위 점수 집계 (랭킹 단계)
+
+(검색 청크 × 후보 청크) 점수 행렬을 받아 (후보 문서, 청크 타입 쌍)별로 max / mean / top-m 집계하고,
+문서 점수(청크 타입 쌍 점수 평균)와 필드(후보 청크 타입)별 점수를 NumPy로 한 번에 계산합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+AGGREGATIONS = ("max", "mean", "top_m")
+
+
+def rank_documents(scores: np.ndarray,
+                   query_fields: Sequence[str],
+                   candidate_doc_ids: Sequence[str],
+                   candidate_fields: Sequence[str],
+                   aggregation: str = "max",
+                   field_aggregations: Optional[Dict[str, str]] = None,
+                   top_m: int = 3,
+                   min_score: float = 0.0,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    청크 점수 행렬로 문서 순위를 계산합니다.
+
+    Args:
+        scores: (검색 청크 수 × 후보 청크 수) 유사도 행렬, 비교하지 않은 칸은 NaN
+        query_fields: 검색 청크별 청크 타입
+        candidate_doc_ids: 후보 청크별 문서 ID
+        candidate_fields: 후보 청크별 청크 타입
+        aggregation: 청크 타입 쌍 안에서의 기본 집계 방식 ("max", "mean", "top_m")
+        field_aggregations: 후보 청크 타입별 집계 방식 (기본값 대신 사용)
+        top_m: top_m 집계 시 평균할 상위 점수 개수
+        min_score: 문서 점수 최소값 (미만은 제외)
+        limit: 반환할 최대 문서 수
+
+    Returns:
+        List[Dict[str, Any]]: 문서 점수 내림차순 목록
+            - document_id, score, chunk_matches(청크 타입 쌍 수)
+            - field_scores: 후보 청크 타입별 최고 쌍 점수
+            - pairs: 청크 타입 쌍별 점수와 최고 점수 청크 위치(query_index, candidate_index)
+    """
+    field_aggregations = field_aggregations or {}
+    for method in (aggregation, *field_aggregations.values()):
+        if method not in AGGREGATIONS:
+            raise ValueError(f"지원하지 않는 집계 방식입니다: {method}")
+
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.ndim != 2 or scores.size == 0:
+        return []
+    rows, cols = np.nonzero(~np.isnan(scores))
+    if not rows.size:
+        return []
+    values = scores[rows, cols]
+
+    # 필드(청크 타입)와 문서를 정수 인덱스로 변환
+    field_names = list(dict.fromkeys([*query_fields, *candidate_fields]))
+    field_index = {name: i for i, name in enumerate(field_names)}
+    n_fields = len(field_names)
+    n_pairs = n_fields * n_fields
+    query_field_idx = np.array([field_index[name] for name in query_fields], dtype=np.int64)
+    candidate_field_idx = np.array([field_index[name] for name in candidate_fields], dtype=np.int64)
+    doc_ids = list(dict.fromkeys(candidate_doc_ids))
+    doc_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+    candidate_doc_idx = np.array([doc_index[doc_id] for doc_id in candidate_doc_ids], dtype=np.int64)
+
+    # (문서, 검색 청크 타입, 후보 청크 타입) 그룹 → 그룹 내 점수 내림차순 정렬
+    groups = (candidate_doc_idx[cols] * n_pairs
+              + query_field_idx[rows] * n_fields
+              + candidate_field_idx[cols])
+    order = np.lexsort((-values, groups))
+    sorted_groups = groups[order]
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    counts = np.diff(np.r_[starts, sorted_groups.size])
+    group_ids = sorted_groups[starts]
+    best_entries = order[starts]
+
+    # 그룹별 max / mean / top-m 집계
+    group_max = sorted_values[starts]
+    group_mean = np.add.reduceat(sorted_values, starts) / counts
+    rank_in_group = np.arange(sorted_values.size) - np.repeat(starts, counts)
+    top_values = np.where(rank_in_group < top_m, sorted_values, 0.0)
+    group_top_m = np.add.reduceat(top_values, starts) / np.minimum(counts, top_m)
+
+    group_candidate_field = group_ids % n_fields
+    method_by_field = np.array(
+        [AGGREGATIONS.index(field_aggregations.get(name, aggregation)) for name in field_names]
+    )
+    group_scores = np.choose(method_by_field[group_candidate_field], [group_max, group_mean, group_top_m])
+
+    # 문서 점수 = 청크 타입 쌍 점수 평균, 필드 점수 = 후보 청크 타입별 최고 쌍 점수
+    group_docs = group_ids // n_pairs
+    n_docs = len(doc_ids)
+    pair_counts = np.bincount(group_docs, minlength=n_docs)
+    doc_scores = np.bincount(group_docs, weights=group_scores, minlength=n_docs) / np.maximum(pair_counts, 1)
+    field_scores = np.full((n_docs, n_fields), -np.inf)
+    np.maximum.at(field_scores, (group_docs, group_candidate_field), group_scores)
+
+    ranked = np.flatnonzero((pair_counts > 0) & (doc_scores >= min_score))
+    ranked = ranked[np.argsort(-doc_scores[ranked], kind="stable")]
+    if limit is not None:
+        ranked = ranked[:limit]
+
+    # 그룹은 문서 순으로 정렬되어 있으므로 문서별 그룹 범위를 이진 탐색으로 찾음
+    doc_group_starts = np.searchsorted(group_docs, np.arange(n_docs + 1))
+    results = []
+    for doc in ranked:
+        begin, end = doc_group_starts[doc], doc_group_starts[doc + 1]
+        pairs = [
+            {
+                "query_field": field_names[(group_ids[g] % n_pairs) // n_fields],
+                "match_field": field_names[group_candidate_field[g]],
+                "score": float(group_scores[g]),
+                "query_index": int(rows[best_entries[g]]),
+                "candidate_index": int(cols[best_entries[g]])
+            }
+            for g in range(begin, end)
+        ]
+        results.append({
+            "document_id": doc_ids[doc],
+            "score": float(doc_scores[doc]),
+            "chunk_matches": int(pair_counts[doc]),
+            "field_scores": {
+                field_names[f]: float(field_scores[doc, f])
+                for f in np.flatnonzero(np.isfinite(field_scores[doc]))
+            },
+            "pairs": pairs
+        })
+    return results
@@ -2,11 +2,10 @@
 자소서 자동 분석 서비스
 """
 
-import json
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Type
 
 from models.cover_letter_models import (
     CoverLetterAnalysis,
@@ -17,13 +16,16 @@ from models.cover_letter_models import (
     STARAnalysis,
     TopStrength,
 )
-from modules.core.services.llm_providers.base_provider import (
-    LLMProviderFactory,
-    LLMResponse,
+from modules.core.services.llm_gateway import get_llm_gateway
+from modules.core.services.structured_output import ModelT, StructuredOutputError
+from utils.text_extractor import (
+    FileSource,
+    extract_text_from_file,
+    get_upload_file_size,
+    validate_upload_file,
 )
-from utils.text_extractor import extract_text_from_file, validate_upload_file
 
-from .prompts import get_analysis_prompt
+from .prompts import MaskingOutput, get_analysis_prompt, get_output_model
 
 logger = logging.getLogger(__name__)
 
@@ -33,26 +35,34 @@ class CoverLetterAnalyzer:
 
     def __init__(self, llm_config: Dict[str, Any]):
         self.llm_config = llm_config
-        self.llm_provider = None
-        self._initialize_llm_provider()
-
-    def _initialize_llm_provider(self) -> None:
-        """LLM 프로바이더 초기화"""
+        # 프로바이더는 공유 LLM 게이트웨이가 관리 (연결 풀, rate limit, 재시도)
+        self.llm_gateway = get_llm_gateway()
+
+    async def _generate(self, prompt: str, output_model: Type[ModelT]) -> Optional[ModelT]:
+        """설정된 모델로 output_model 스키마에 맞는 응답 생성 (실패하거나 검증에 실패하면 None)"""
+        messages = [
+            {"role": "system", "content": self.llm_config.get("system_message", "You are a helpful HR assistant.")},
+            {"role": "user", "content": prompt}
+        ]
         try:
-            provider_name = self.llm_config.get("provider", "openai")
-            self.llm_provider = LLMProviderFactory.create_provider(provider_name, self.llm_config)
-
-            if self.llm_provider and self.llm_provider.is_healthy():
-                logger.info(f"LLM 프로바이더 초기화 성공: {provider_name}")
-            else:
-                logger.error(f"LLM 프로바이더 초기화 실패: {provider_name}")
-
+            return await self.llm_gateway.chat_structured(
+                messages,
+                output_model,
+                model=self.llm_config.get("model_name"),
+                max_tokens=self.llm_config.get("max_tokens"),
+                temperature=self.llm_config.get("temperature"),
+                cache=True,  # 같은 자소서/직무 설명이면 분석 결과 재사용
+                call_site="cover_letter_analysis"
+            )
+        except StructuredOutputError as e:
+            logger.error(f"LLM 응답 스키마 검증 실패: {str(e)}")
         except Exception as e:
-            logger.error(f"LLM 프로바이더 초기화 중 오류: {str(e)}")
+            logger.error(f"LLM 응답 생성 중 오류 발생: {str(e)}")
+        return None
 
     async def analyze_cover_letter(
         self,
-        file_bytes: bytes,
+        file_bytes: FileSource,
         filename: str,
         job_description: str = "",
         analysis_type: str = "comprehensive"
@@ -61,7 +71,7 @@ class CoverLetterAnalyzer:
         자소서 분석 실행
 
         Args:
-            file_bytes: 파일 바이트 데이터
+            file_bytes: 파일 바이트 데이터 또는 업로드 임시 파일 경로
             filename: 파일명
             job_description: 직무 설명
             analysis_type: 분석 유형
@@ -79,8 +89,59 @@ class CoverLetterAnalyzer:
             # 2. 텍스트 추출
             extracted_text, file_type = extract_text_from_file(file_bytes, filename)
 
+        except Exception as e:
+            logger.error(f"자소서 분석 실패: {filename}, 오류: {str(e)}")
+            # 에러 상태로 분석 객체 생성
+            return CoverLetterAnalysis(
+                filename=filename,
+                original_text="",
+                job_description=job_description,
+                file_size=get_upload_file_size(file_bytes, filename),
+                file_type="unknown",
+                processing_time=time.time() - start_time,
+                status="error"
+            )
+
+        return await self.analyze_cover_letter_text(
+            extracted_text,
+            filename=filename,
+            job_description=job_description,
+            analysis_type=analysis_type,
+            file_size=get_upload_file_size(file_bytes, filename),
+            file_type=file_type,
+            start_time=start_time
+        )
+
+    async def analyze_cover_letter_text(
+        self,
+        text: str,
+        filename: str,
+        job_description: str = "",
+        analysis_type: str = "comprehensive",
+        file_size: int = 0,
+        file_type: str = "text",
+        start_time: Optional[float] = None
+    ) -> CoverLetterAnalysis:
+        """
+        이미 추출된 자소서 텍스트 분석 (DB에 저장된 자소서 일괄 분석 등 파일이 없는 경우)
+
+        Args:
+            text: 자소서 텍스트
+            filename: 파일명 (결과 표시용)
+            job_description: 직무 설명
+            analysis_type: 분석 유형
+            file_size: 원본 파일 크기
+            file_type: 원본 파일 형식
+            start_time: 처리 시간 계산 기준 시각 (없으면 지금)
+
+        Returns:
+            분석 결과
+        """
+        start_time = start_time or time.time()
+
+        try:
             # 3. 개인정보 마스킹 (선택사항)
-            masked_text = await self._mask_personal_info(extracted_text)
+            masked_text = await self._mask_personal_info(text)
 
             # 4. LLM 분석 실행
             analysis_result = await self._run_llm_analysis(
@@ -95,7 +156,7 @@ class CoverLetterAnalyzer:
                 filename=filename,
                 original_text=masked_text,
                 job_description=job_description,
-                file_size=len(file_bytes),
+                file_size=file_size,
                 file_type=file_type,
                 processing_time=time.time() - start_time,
                 llm_model_used=self.llm_config.get("model_name", "unknown"),
@@ -113,7 +174,7 @@ class CoverLetterAnalyzer:
                 filename=filename,
                 original_text="",
                 job_description=job_description,
-                file_size=len(file_bytes),
+                file_size=file_size,
                 file_type="unknown",
                 processing_time=time.time() - start_time,
                 status="error"
@@ -122,20 +183,13 @@ class CoverLetterAnalyzer:
     async def _mask_personal_info(self, text: str) -> str:
         """개인정보 마스킹 처리"""
         try:
-            if not self.llm_provider:
-                return text
-
             prompt = get_analysis_prompt("masking", text=text)
-            response = await self.llm_provider.safe_generate(prompt)
-
-            if response:
-                try:
-                    result = json.loads(response)
-                    return result.get("masked_text", text)
-                except json.JSONDecodeError:
-                    logger.warning("개인정보 마스킹 응답 파싱 실패, 원본 텍스트 사용")
+            result = await self._generate(prompt, MaskingOutput)
 
-            return text
+            if result is None:
+                logger.warning("개인정보 마스킹 응답을 받지 못해 원본 텍스트 사용")
+                return text
+            return result.masked_text or text
 
         except Exception as e:
             logger.warning(f"개인정보 마스킹 실패: {str(e)}, 원본 텍스트 사용")
@@ -149,9 +203,6 @@ class CoverLetterAnalyzer:
     ) -> Dict[str, Any]:
         """LLM을 사용한 분석 실행"""
         try:
-            if not self.llm_provider:
-                raise RuntimeError("LLM 프로바이더가 초기화되지 않았습니다.")
-
             # 프롬프트 생성
             prompt = get_analysis_prompt(
                 analysis_type,
@@ -159,20 +210,13 @@ class CoverLetterAnalyzer:
                 job_description=job_description
             )
 
-            # LLM 응답 생성
-            response = await self.llm_provider.safe_generate(prompt)
+            # LLM 응답 생성 (분석 유형별 스키마로 검증된 결과)
+            result = await self._generate(prompt, get_output_model(analysis_type))
 
-            if not response:
-                raise RuntimeError("LLM 응답을 받지 못했습니다.")
+            if result is None:
+                raise RuntimeError("LLM 분석 결과를 받지 못했습니다.")
 
-            # JSON 파싱
-            try:
-                result = json.loads(response)
-                return result
-            except json.JSONDecodeError as e:
-                logger.error(f"LLM 응답 JSON 파싱 실패: {str(e)}")
-                logger.error(f"응답 내용: {response[:500]}...")
-                raise ValueError("LLM 응답을 JSON으로 파싱할 수 없습니다.")
+            return result.dict()
 
         except Exception as e:
             logger.error(f"LLM 분석 실행 실패: {str(e)}")
@@ -299,11 +343,15 @@ class CoverLetterAnalyzer:
         return summary
 
     def is_healthy(self) -> bool:
-        """서비스 상태 확인"""
-        return self.llm_provider is not None and self.llm_provider.is_healthy()
+        """서비스 상태 확인 (LLM 프로바이더 사용 가능 여부)"""
+        return self.llm_gateway.is_available
 
     def get_provider_info(self) -> Dict[str, Any]:
         """LLM 프로바이더 정보 반환"""
-        if self.llm_provider:
-            return self.llm_provider.get_config()
-        return {"error": "프로바이더가 초기화되지 않았습니다."}
+        return {
+            "provider": self.llm_config.get("provider", "openai"),
+            "model_name": self.llm_config.get("model_name"),
+            "max_tokens": self.llm_config.get("max_tokens"),
+            "temperature": self.llm_config.get("temperature"),
+            "gateway": self.llm_gateway.stats()
+        }
@@ -1,7 +1,11 @@
 """
-자소서 자동 분석을 위한 프롬프트 템플릿
+자소서 자동 분석을 위한 프롬프트 템플릿과 응답 스키마
 """
 
+from typing import List, Type
+
+from pydantic import BaseModel
+
 # 1. 요약 & 핵심강점 추출 프롬프트
 SUMMARY_AND_STRENGTHS_PROMPT = """
 당신은 10년 경력의 시니어 채용담당자 역할을 한다. 
@@ -26,18 +30,19 @@ SUMMARY_AND_STRENGTHS_PROMPT = """
 # 2. STAR 추출 프롬프트
 STAR_EXTRACTION_PROMPT = """
 다음 텍스트에서 STAR(상황, 과제, 행동, 결과) 구조의 사례를 찾아 각각을 분리해서 반환하라. 
-찾을 수 없으면 "not_found" 반환.
 
 텍스트:
 {cover_letter_text}
 
-응답은 반드시 다음 JSON 배열 형식으로만 출력하라:
-[
-  {{"s":"상황 설명", "t":"과제/목표", "a":"구체적 행동", "r":"결과/성과", "evidence_sentence_indices":[2,3]}},
-  {{"s":"다른 상황", "t":"다른 과제", "a":"다른 행동", "r":"다른 결과", "evidence_sentence_indices":[5,6]}}
-]
+응답은 반드시 다음 JSON 형식으로만 출력하라:
+{{
+  "star_cases": [
+    {{"s":"상황 설명", "t":"과제/목표", "a":"구체적 행동", "r":"결과/성과", "evidence_sentence_indices":[2,3]}},
+    {{"s":"다른 상황", "t":"다른 과제", "a":"다른 행동", "r":"다른 결과", "evidence_sentence_indices":[5,6]}}
+  ]
+}}
 
-STAR 구조가 명확하지 않으면 빈 배열 []을 반환하라.
+STAR 구조가 명확하지 않으면 star_cases를 빈 배열 []로 반환하라.
 """
 
 # 3. 직무 적합성 점수 + 키워드 매칭 프롬프트
@@ -53,10 +58,12 @@ JOB_SUITABILITY_PROMPT = """
 
 응답은 반드시 다음 JSON 형식으로만 출력하라:
 {{
- "score": 78,
- "matched_skills":["Python", "팀리딩", "프로젝트 관리"],
- "missing_skills":["클라우드","데이터 파이프라인", "머신러닝"],
- "explanation":"지원자는 Python과 팀리딩 경험이 우수하지만, 클라우드 기술과 데이터 파이프라인 경험이 부족합니다."
+  "job_suitability": {{
+    "score": 78,
+    "matched_skills":["Python", "팀리딩", "프로젝트 관리"],
+    "missing_skills":["클라우드","데이터 파이프라인", "머신러닝"],
+    "explanation":"지원자는 Python과 팀리딩 경험이 우수하지만, 클라우드 기술과 데이터 파이프라인 경험이 부족합니다."
+  }}
 }}
 """
 
@@ -68,11 +75,13 @@ SENTENCE_IMPROVEMENT_PROMPT = """
 자소서:
 {cover_letter_text}
 
-응답은 반드시 다음 JSON 배열 형식으로만 출력하라:
-[
-  {{"original":"원본 문장", "improved":"개선된 문장 (한 줄)", "improvement_type":"간결성"}},
-  {{"original":"다른 원본 문장", "improved":"다른 개선 문장", "improvement_type":"적극성"}}
-]
+응답은 반드시 다음 JSON 형식으로만 출력하라:
+{{
+  "sentence_improvements": [
+    {{"original":"원본 문장", "improved":"개선된 문장 (한 줄)", "improvement_type":"간결성"}},
+    {{"original":"다른 원본 문장", "improved":"다른 개선 문장", "improvement_type":"적극성"}}
+  ]
+}}
 
 개선 유형은 "간결성", "적극성", "문법", "전문성" 중에서 선택하라.
 """
@@ -99,14 +108,16 @@ EVALUATION_RUBRIC_PROMPT = """
 
 응답은 반드시 다음 JSON 형식으로만 출력하라:
 {{
-  "job_relevance": 8.5,
-  "problem_solving": 7.0,
-  "impact": 6.5,
-  "clarity": 8.0,
-  "professionalism": 7.5,
-  "grammar": 9.0,
-  "keyword_coverage": 7.5,
-  "overall_score": 7.7
+  "evaluation_rubric": {{
+    "job_relevance": 8.5,
+    "problem_solving": 7.0,
+    "impact": 6.5,
+    "clarity": 8.0,
+    "professionalism": 7.5,
+    "grammar": 9.0,
+    "keyword_coverage": 7.5,
+    "overall_score": 7.7
+  }}
 }}
 """
 
@@ -171,6 +182,86 @@ PERSONAL_INFO_MASKING_PROMPT = """
 }}
 """
 
+# 분석 유형별 응답 스키마 (JSON Schema 구조화 출력으로 요청, 키 이름은 위 프롬프트의 JSON 형식과 동일)
+class StrengthOutput(BaseModel):
+    strength: str
+    evidence: str
+    confidence: float
+
+
+class StarCaseOutput(BaseModel):
+    s: str
+    t: str
+    a: str
+    r: str
+    evidence_sentence_indices: List[int]
+
+
+class JobSuitabilityOutput(BaseModel):
+    score: int
+    matched_skills: List[str]
+    missing_skills: List[str]
+    explanation: str
+
+
+class EvaluationRubricOutput(BaseModel):
+    job_relevance: float
+    problem_solving: float
+    impact: float
+    clarity: float
+    professionalism: float
+    grammar: float
+    keyword_coverage: float
+    overall_score: float
+
+
+class SentenceImprovementOutput(BaseModel):
+    original: str
+    improved: str
+    improvement_type: str
+
+
+class SummaryOutput(BaseModel):
+    summary: str
+    top_strengths: List[StrengthOutput]
+
+
+class StarOutput(BaseModel):
+    star_cases: List[StarCaseOutput]
+
+
+class SuitabilityOutput(BaseModel):
+    job_suitability: JobSuitabilityOutput
+
+
+class ImprovementOutput(BaseModel):
+    sentence_improvements: List[SentenceImprovementOutput]
+
+
+class RubricOutput(BaseModel):
+    evaluation_rubric: EvaluationRubricOutput
+
+
+class ComprehensiveOutput(BaseModel):
+    summary: str
+    top_strengths: List[StrengthOutput]
+    star_cases: List[StarCaseOutput]
+    job_suitability: JobSuitabilityOutput
+    evaluation_rubric: EvaluationRubricOutput
+    sentence_improvements: List[SentenceImprovementOutput]
+
+
+class MaskedItemOutput(BaseModel):
+    type: str
+    original: str
+    masked: str
+
+
+class MaskingOutput(BaseModel):
+    masked_text: str
+    masked_items: List[MaskedItemOutput]
+
+
 # 프롬프트 유틸리티 함수
 def format_prompt(template: str, **kwargs) -> str:
     """프롬프트 템플릿에 변수를 적용하여 완성된 프롬프트를 반환"""
@@ -195,3 +286,20 @@ def get_analysis_prompt(analysis_type: str, **kwargs) -> str:
         raise ValueError(f"지원하지 않는 분석 유형입니다: {analysis_type}")
     
     return format_prompt(prompts[analysis_type], **kwargs)
+
+def get_output_model(analysis_type: str) -> Type[BaseModel]:
+    """분석 유형에 따른 응답 스키마(pydantic 모델)를 반환"""
+    output_models = {
+        "summary": SummaryOutput,
+        "star": StarOutput,
+        "suitability": SuitabilityOutput,
+        "improvement": ImprovementOutput,
+        "rubric": RubricOutput,
+        "comprehensive": ComprehensiveOutput,
+        "masking": MaskingOutput
+    }
+    
+    if analysis_type not in output_models:
+        raise ValueError(f"지원하지 않는 분석 유형입니다: {analysis_type}")
+    
+    return output_models[analysis_type]
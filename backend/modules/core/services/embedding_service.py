@@ -5,6 +5,8 @@ from datetime import datetime
 from enum import Enum
 import openai
 
+from .local_embeddings import get_local_embeddings, use_local_embeddings
+
 class EmbeddingType(Enum):
     QUERY = "query"
     DOCUMENT = "document"
@@ -12,6 +14,14 @@ class EmbeddingType(Enum):
 class EmbeddingService:
     def __init__(self):
         """임베딩 서비스 초기화"""
+        # 로컬 임베딩 (부하 테스트/CI): OpenAI 키와 백업 모델 없이 동작
+        self.local_embeddings = get_local_embeddings() if use_local_embeddings() else None
+        if self.local_embeddings is not None:
+            self.client = None
+            self.fallback_model = None
+            print(f"로컬 임베딩 사용 ({self.local_embeddings.dimension}차원)")
+            return
+        
         # OpenAI API 키 설정
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
@@ -44,6 +54,9 @@ class EmbeddingService:
             # 임베딩 타입에 따른 전처리
             processed_text = self._preprocess_text(text, embedding_type)
             
+            if self.local_embeddings is not None:
+                return await self.local_embeddings.aembed_query(processed_text)
+            
             # OpenAI API를 사용한 임베딩 생성
             try:
                 response = self.client.embeddings.create(
@@ -0,0 +1,40 @@
+"""
+블로킹 네트워크 클라이언트(Pinecone 등) 호출용 전용 스레드 풀
+
+이벤트 루프에서 직접 호출하면 왕복 시간 동안 워커 전체가 멈추므로
+전용 풀에서 실행하고 호출별 deadline을 적용합니다.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SEARCH_IO_POOL_SIZE", "32")),
+    thread_name_prefix="search-io"
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, deadline: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    func를 전용 스레드 풀에서 실행합니다.
+
+    Args:
+        func: 블로킹 함수
+        deadline: 최대 대기 시간(초). 초과 시 asyncio.TimeoutError
+
+    Returns:
+        func의 반환값
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+    if deadline is None:
+        return await future
+    return await asyncio.wait_for(future, deadline)
+
+
+def shutdown_io_pool() -> None:
+    """앱 종료 시 스레드 풀 정리"""
+    _executor.shutdown(wait=False, cancel_futures=True)
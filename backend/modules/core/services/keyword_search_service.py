@@ -1,4 +1,5 @@
 from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 from bson import ObjectId
 from pymongo.collection import Collection
 import re
@@ -7,25 +8,75 @@ import logging
 import os
 from dotenv import load_dotenv
 
+from .bm25_index import BM25Index, FIELD_BOOSTS, get_index_path, get_local_index, set_local_index
+from .search_cache import bump_generation, get_search_cache
+from .search_filters import SearchFilters, filter_metadata
+from .tokenizer_service import get_tokenizer_service
+
 load_dotenv()
-try:
-    from kiwipiepy import Kiwi
-    KIWI_AVAILABLE = True
-except ImportError:
-    print("Warning: kiwipiepy not available, using fallback tokenizer")
-    Kiwi = None
-    KIWI_AVAILABLE = False
 
 try:
-    from elasticsearch import Elasticsearch
+    from elasticsearch import AsyncElasticsearch, Elasticsearch
     from elasticsearch.exceptions import ConnectionError, NotFoundError
+    from elasticsearch.helpers import async_streaming_bulk
     ELASTICSEARCH_AVAILABLE = True
 except ImportError:
     print("Warning: elasticsearch not available, install with: pip install elasticsearch")
     Elasticsearch = None
+    AsyncElasticsearch = None
+    async_streaming_bulk = None
     ELASTICSEARCH_AVAILABLE = False
 
+# 인덱스 매핑 버전 (매핑이 바뀌면 올리고 rebuild-index로 재색인)
+ES_MAPPING_VERSION = 4
+
+# Kiwi로 미리 토큰화한 필드 (공백으로 이어 붙여 저장, whitespace 분석기로 색인)
+ES_TOKEN_FIELDS = {field: f"{field}_tokens" for field in FIELD_BOOSTS}
+
+# 프로세스 전역 Elasticsearch 클라이언트 (서비스 인스턴스가 여러 개여도 커넥션 풀 공유)
+# 동기 클라이언트는 초기 연결/매핑 확인에만, 요청 경로는 비동기 클라이언트를 사용
+_es_clients: Dict[Tuple[str, Optional[str]], Tuple[Any, Any]] = {}
+
+
+def _get_es_clients(host: str, auth: Optional[Tuple[str, str]]) -> Tuple[Any, Any]:
+    key = (host, auth[0] if auth else None)
+    if key in _es_clients:
+        return _es_clients[key]
+    
+    connections_per_node = int(os.getenv("ELASTICSEARCH_CONNECTIONS_PER_NODE", "25"))
+    client_kwargs = dict(
+        verify_certs=False,
+        ssl_show_warn=False,
+        basic_auth=auth,
+        request_timeout=30,
+        connections_per_node=connections_per_node
+    )
+    sync_client = Elasticsearch(host, **client_kwargs)
+    # 연결 테스트 (실패 시 예외 → 내장 BM25 인덱스 사용)
+    info = sync_client.info()
+    async_client = AsyncElasticsearch(host, **client_kwargs)
+    _es_clients[key] = (sync_client, async_client)
+    logging.getLogger(__name__).info(f"Elasticsearch 연결 성공: {host}, 버전: {info['version']['number']}")
+    return _es_clients[key]
+
+
+async def close_es_clients() -> None:
+    """공유 Elasticsearch 클라이언트 종료 (앱 종료 시 호출)"""
+    for sync_client, async_client in _es_clients.values():
+        await async_client.close()
+        sync_client.close()
+    _es_clients.clear()
+
 class KeywordSearchService:
+    # 재색인 중인 새 인덱스 이름 (인스턴스 간 공유, 재색인 중 쓰기를 양쪽에 반영)
+    _pending_reindex: Optional[str] = None
+    # 재색인 중 들어온 Elasticsearch 변경 (문서 ID → 최신 문서, 삭제는 None). 벌크 색인 후 새 인덱스에 재적용
+    _pending_changes: Dict[str, Optional[Dict[str, Any]]] = {}
+    # 재색인은 한 번에 하나만 (동시에 두 번 실행되면 _pending_reindex가 서로 덮어씀)
+    _reindex_running: bool = False
+    # 재구축 중인 내장 BM25 인덱스별 변경 기록 (문서 ID → 필드 토큰, 삭제는 None). 교체 직전에 새 인덱스에 재적용
+    _local_change_logs: List[Dict[str, Optional[Dict[str, List[str]]]]] = []
+    
     def __init__(self):
         """
         키워드 검색 서비스 초기화
@@ -47,6 +98,20 @@ class KeywordSearchService:
         self.logger.info(f"ES_PASSWORD: {'*' * len(self.es_password) if self.es_password else None}")
         
         self.es_client = None
+        self.es_async = None
+        self.es_index_outdated = False
+        
+        # 요청별 타임아웃(초): 느린 Elasticsearch 응답이 다른 요청을 붙잡지 않도록 제한
+        self.es_request_timeout = float(os.getenv("ELASTICSEARCH_REQUEST_TIMEOUT", "5"))
+        
+        # 내장 BM25 인덱스 경로 (인덱스 자체는 local_index 프로퍼티로 프로세스 전역 공유)
+        self.local_index_path = get_index_path()
+        
+        # 재색인 설정
+        self.reindex_batch_size = int(os.getenv("KEYWORD_REINDEX_BATCH_SIZE", "500"))
+        
+        # 자동완성 백엔드: local(내장 접두어 인덱스, 기본값) 또는 elasticsearch(completion 필드)
+        self.suggest_backend = os.getenv("KEYWORD_SUGGEST_BACKEND", "local").lower()
         
         # Elasticsearch 연결 초기화
         if ELASTICSEARCH_AVAILABLE:
@@ -54,57 +119,14 @@ class KeywordSearchService:
                 self._initialize_elasticsearch()
                 self.logger.info("Elasticsearch 연결 성공")
             except Exception as e:
-                self.logger.warning(f"Elasticsearch 연결 실패: {str(e)}. 키워드 검색 기능이 비활성화됩니다.")
+                self.logger.warning(f"Elasticsearch 연결 실패: {str(e)}. 내장 BM25 인덱스를 사용합니다.")
                 self.es_client = None
+                self.es_async = None
         else:
-            self.logger.warning("Elasticsearch가 설치되지 않았습니다. 키워드 검색 기능이 비활성화됩니다.")
+            self.logger.warning("Elasticsearch가 설치되지 않았습니다. 내장 BM25 인덱스를 사용합니다.")
         
-        # Kiwi 형태소 분석기 초기화
-        if KIWI_AVAILABLE:
-            try:
-                self.kiwi = Kiwi()
-                self.logger.info("Kiwi 형태소 분석기 초기화 완료")
-            except Exception as e:
-                self.logger.error(f"Kiwi 초기화 실패: {str(e)}")
-                self.kiwi = None
-        else:
-            self.kiwi = None
-            self.logger.warning("Kiwi를 사용할 수 없습니다. Fallback 토크나이저를 사용합니다.")
-        
-        # 불용어 리스트 (조사, 어미, 의미없는 단어들)
-        self.stopwords = {
-            # 조사
-            '은', '는', '이', '가', '을', '를', '에', '에서', '로', '으로', '와', '과', '도', '만', '까지', '부터',
-            '의', '도', '나', '이나', '든지', '라도', '마저', '조차', '뿐', '밖에', '처럼', '같이', '보다',
-            # 어미
-            '습니다', '했습니다', '입니다', '였습니다', '었습니다', '하다', '되다', '있다', '없다',
-            # 의미없는 단어
-            '저', '제', '저희', '우리', '그', '그것', '이것', '저것', '여기', '거기', '저기',
-            '때문', '위해', '통해', '대해', '관해', '따라', '위한', '위해서',
-            # 단위/시간
-            '년', '월', '일', '시', '분', '초', '개', '번', '차례', '번째',
-            # 기타
-            '등', '및', '또는', '그리고', '하지만', '그러나', '따라서', '그래서'
-        }
-        
-        # IT 복합어 사전 (쪼개진 단어들을 다시 합치기 위함)
-        self.compound_words = {
-            ('프론트', '엔드'): '프론트엔드',
-            ('백', '엔드'): '백엔드', 
-            ('풀', '스택'): '풀스택',
-            ('데이터', '베이스'): '데이터베이스',
-            ('소프트', '웨어'): '소프트웨어',
-            ('하드', '웨어'): '하드웨어',
-            ('클라우드', '컴퓨팅'): '클라우드컴퓨팅',
-            ('머신', '러닝'): '머신러닝',
-            ('딥', '러닝'): '딥러닝',
-            ('인공', '지능'): '인공지능',
-            ('웹', '개발'): '웹개발',
-            ('앱', '개발'): '앱개발',
-            ('모바일', '앱'): '모바일앱',
-            ('데이터', '분석'): '데이터분석',
-            ('시스템', '개발'): '시스템개발'
-        }
+        # 형태소 분석기 (Kiwi 모델은 프로세스 전역 토크나이저 서비스에서 한 번만 로드)
+        self.tokenizer = get_tokenizer_service()
     
     def _initialize_elasticsearch(self):
         """Elasticsearch 클라이언트 초기화 및 인덱스 설정"""
@@ -117,94 +139,121 @@ class KeywordSearchService:
             else:
                 self.logger.info("No auth credentials found")
             
-            self.es_client = Elasticsearch(
-                self.es_host,
-                verify_certs=False,
-                ssl_show_warn=False,
-                basic_auth=auth,
-                request_timeout=30
-            )
-            
-            # 연결 테스트
-            info = self.es_client.info()
-            self.logger.info(f"Elasticsearch 연결 성공: {self.es_host}, 버전: {info['version']['number']}")
+            self.es_client, self.es_async = _get_es_clients(self.es_host, auth)
             
             # 인덱스 매핑 설정
             self._create_index_mapping()
             
         except Exception as e:
-            self.logger.warning(f"Elasticsearch 연결 실패: {e}. 키워드 검색 기능이 비활성화됩니다. 다른 검색 기능은 정상 작동합니다.")
+            self.logger.warning(f"Elasticsearch 연결 실패: {e}. 내장 BM25 인덱스로 키워드 검색을 수행합니다.")
             self.es_client = None
+            self.es_async = None
+    
+    @property
+    def local_index(self) -> BM25Index:
+        """프로세스 전역 내장 BM25 인덱스 (재구축 시 통째로 교체되므로 매번 조회)"""
+        return get_local_index()
+    
+    def _index_body(self) -> Dict[str, Any]:
+        """
+        Elasticsearch 인덱스 매핑/설정 정의
+        
+        한국어 형태소 분석은 Kiwi로 미리 수행하고(*_tokens 필드), Elasticsearch는
+        공백 단위로만 나눕니다. 원문 필드는 저장만 하고 all_content만 오타 대응용으로 색인합니다.
+        """
+        stored_text = {"type": "text", "index": False}
+        token_field = {"type": "text", "analyzer": "kiwi_pretokenized"}
+        return {
+            "mappings": {
+                "_meta": {"mapping_version": ES_MAPPING_VERSION},
+                "properties": {
+                    "resume_id": {"type": "keyword"},
+                    "name": stored_text,
+                    "position": stored_text,
+                    "department": stored_text,
+                    "skills": stored_text,
+                    "experience": stored_text,
+                    "growth_background": stored_text,
+                    "motivation": stored_text,
+                    "career_history": stored_text,
+                    "resume_text": stored_text,
+                    "all_content": {
+                        "type": "text",
+                        "analyzer": "standard"
+                    },
+                    **{es_field: token_field for es_field in ES_TOKEN_FIELDS.values()},
+                    "tokens": {
+                        "type": "keyword"
+                    },
+                    "token_suggest": {
+                        "type": "completion",
+                        "analyzer": "kiwi_pretokenized"
+                    },
+                    # 검색 필터용 필드 (search_filters.filter_metadata)
+                    "job_posting_id": {"type": "keyword"},
+                    "status": {"type": "keyword"},
+                    "position_key": {"type": "keyword"},
+                    "department_key": {"type": "keyword"},
+                    "skills_list": {"type": "keyword"},
+                    "experience_years": {"type": "float"},
+                    "created_at": {"type": "date"},
+                    "indexed_at": {"type": "date"}
+                }
+            },
+            "settings": {
+                "number_of_shards": 1,
+                "number_of_replicas": 0,
+                "analysis": {
+                    "analyzer": {
+                        "kiwi_pretokenized": {
+                            "type": "custom",
+                            "tokenizer": "whitespace",
+                            "filter": ["lowercase"]
+                        }
+                    }
+                }
+            }
+        }
+    
+    def _es(self, timeout: Optional[float] = None):
+        """요청 타임아웃이 적용된 비동기 Elasticsearch 클라이언트"""
+        return self.es_async.options(request_timeout=timeout or self.es_request_timeout)
+    
+    def _new_index_name(self) -> str:
+        """별칭(es_index) 뒤에 붙는 버전별 실제 인덱스 이름"""
+        return f"{self.es_index}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
     
     def _create_index_mapping(self):
-        """Elasticsearch 인덱스 매핑 설정"""
+        """
+        Elasticsearch 인덱스 매핑 설정
+        실제 인덱스는 버전 이름으로 만들고 es_index는 별칭으로 연결합니다.
+        """
         try:
-            # 인덱스가 이미 존재하는지 확인
+            # 인덱스(또는 별칭)가 이미 존재하는지 확인
             if self.es_client.indices.exists(index=self.es_index):
-                self.logger.info(f"기존 인덱스 사용: {self.es_index}")
-                return
-            
-            # 인덱스 매핑 정의
-            mapping = {
-                "mappings": {
-                    "properties": {
-                        "resume_id": {"type": "keyword"},
-                        "name": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "position": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "department": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "skills": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "experience": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "growth_background": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "motivation": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "career_history": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "resume_text": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "all_content": {
-                            "type": "text",
-                            "analyzer": "standard"
-                        },
-                        "tokens": {
-                            "type": "keyword"
-                        },
-                        "created_at": {"type": "date"},
-                        "indexed_at": {"type": "date"}
-                    }
-                },
-                "settings": {
-                    "number_of_shards": 1,
-                    "number_of_replicas": 0
+                mappings = self.es_client.indices.get_mapping(index=self.es_index)
+                versions = {
+                    (index_mapping.get("mappings", {}).get("_meta") or {}).get("mapping_version")
+                    for index_mapping in mappings.body.values()
                 }
-            }
+                self.es_index_outdated = versions != {ES_MAPPING_VERSION}
+                if self.es_index_outdated:
+                    self.logger.warning(
+                        f"기존 인덱스 매핑 버전 {versions} ≠ {ES_MAPPING_VERSION}. "
+                        f"재색인 전까지 내장 BM25 인덱스로 검색합니다. (/api/resume/search/keyword/rebuild-index)"
+                    )
+                else:
+                    self.logger.info(f"기존 인덱스 사용: {self.es_index}")
+                return
             
+            index_name = self._new_index_name()
             # 인덱스 생성 (8.x 버전 호환)
-            self.es_client.indices.create(index=self.es_index, **mapping)
-            self.logger.info(f"Elasticsearch 인덱스 생성 완료: {self.es_index}")
+            self.es_client.indices.create(
+                index=index_name,
+                aliases={self.es_index: {}},
+                **self._index_body()
+            )
+            self.logger.info(f"Elasticsearch 인덱스 생성 완료: {index_name} (별칭: {self.es_index})")
             
         except Exception as e:
             self.logger.error(f"인덱스 매핑 생성 실패: {str(e)}")
@@ -212,6 +261,7 @@ class KeywordSearchService:
     def _preprocess_text(self, text: str) -> List[str]:
         """
         Kiwi 형태소 분석기를 사용하여 의미있는 키워드만 추출합니다.
+        (공유 토크나이저 서비스의 LRU 캐시 사용)
         
         Args:
             text (str): 원본 텍스트
@@ -219,169 +269,7 @@ class KeywordSearchService:
         Returns:
             List[str]: 의미있는 키워드 리스트
         """
-        if not text or not self.kiwi:
-            # Kiwi가 없으면 기존 방식으로 fallback
-            return self._fallback_preprocess(text)
-        
-        try:
-            # Kiwi로 형태소 분석
-            result = self.kiwi.analyze(text)
-            
-            keywords = []
-            for sentence_result in result:
-                for token_info in sentence_result[0]:  # 첫 번째 분석 결과 사용
-                    word = token_info.form.strip()
-                    pos = token_info.tag
-                    
-                    # 의미있는 품사만 선택
-                    if self._is_meaningful_pos(pos) and self._is_valid_keyword(word):
-                        keywords.append(word.lower())
-            
-            # 복합어 복원
-            restored_keywords = self._restore_compound_words(keywords)
-            
-            # 중복 제거하면서 순서 유지
-            unique_keywords = []
-            seen = set()
-            for keyword in restored_keywords:
-                if keyword not in seen:
-                    unique_keywords.append(keyword)
-                    seen.add(keyword)
-            
-            self.logger.debug(f"키워드 추출: '{text}' → {unique_keywords}")
-            return unique_keywords
-            
-        except Exception as e:
-            self.logger.warning(f"Kiwi 분석 실패, fallback 사용: {str(e)}")
-            return self._fallback_preprocess(text)
-    
-    def _is_meaningful_pos(self, pos: str) -> bool:
-        """
-        의미있는 품사인지 확인합니다.
-        
-        Args:
-            pos (str): 품사 태그
-            
-        Returns:
-            bool: 의미있는 품사 여부
-        """
-        # Kiwi 품사 태그 기준
-        meaningful_pos = {
-            'NNG',  # 일반명사 (회사, 개발, 프로그래밍)
-            'NNP',  # 고유명사 (React, Python, 삼성)
-            'NNB',  # 의존명사 (것, 수, 등)
-            'VV',   # 동사 (개발하다, 사용하다)
-            'VA',   # 형용사 (좋다, 빠르다)
-            'VX',   # 보조용언
-            'SL',   # 외국어 (React, JavaScript)
-            'SH',   # 한자
-            'SN'    # 숫자 (2000, 3년)
-        }
-        
-        # 앞 2글자로 비교 (세부 태그 무시)
-        return pos[:2] in meaningful_pos or pos[:3] in meaningful_pos
-    
-    def _is_valid_keyword(self, word: str) -> bool:
-        """
-        유효한 키워드인지 확인합니다.
-        
-        Args:
-            word (str): 검사할 단어
-            
-        Returns:
-            bool: 유효한 키워드 여부
-        """
-        if not word or len(word.strip()) < 2:
-            return False
-        
-        word = word.strip().lower()
-        
-        # 불용어 제거
-        if word in self.stopwords:
-            return False
-        
-        # 숫자만 있는 경우 제외 (단, 연도는 포함)
-        if word.isdigit() and len(word) < 4:
-            return False
-        
-        # 특수문자만 있는 경우 제외
-        if re.match(r'^[^\w가-힣]+$', word):
-            return False
-        
-        return True
-    
-    def _fallback_preprocess(self, text: str) -> List[str]:
-        """
-        Kiwi 실패 시 사용하는 기본 전처리 방법
-        
-        Args:
-            text (str): 원본 텍스트
-            
-        Returns:
-            List[str]: 기본 토큰 리스트
-        """
-        if not text:
-            return []
-        
-        # 소문자 변환
-        text = text.lower()
-        
-        # 특수문자 제거 (한글, 영문, 숫자만 유지)
-        text = re.sub(r'[^\w\s가-힣ㄱ-ㅎㅏ-ㅣ]', ' ', text)
-        
-        # 공백 정리
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # 토큰화 (공백 기준 분할)
-        tokens = text.split()
-        
-        # 유효한 토큰만 선택
-        valid_tokens = []
-        for token in tokens:
-            if self._is_valid_keyword(token):
-                valid_tokens.append(token)
-        
-        return valid_tokens
-    
-    def _restore_compound_words(self, keywords: List[str]) -> List[str]:
-        """
-        분리된 키워드들을 복합어로 복원합니다.
-        
-        Args:
-            keywords (List[str]): 원본 키워드 리스트
-            
-        Returns:
-            List[str]: 복합어가 복원된 키워드 리스트
-        """
-        if not keywords:
-            return keywords
-        
-        restored = []
-        i = 0
-        
-        while i < len(keywords):
-            current_word = keywords[i]
-            
-            # 다음 단어와 복합어를 이룰 수 있는지 확인
-            compound_found = False
-            if i + 1 < len(keywords):
-                next_word = keywords[i + 1]
-                compound_key = (current_word, next_word)
-                
-                if compound_key in self.compound_words:
-                    # 복합어로 교체
-                    compound_word = self.compound_words[compound_key]
-                    restored.append(compound_word)
-                    i += 2  # 두 단어를 모두 처리했으므로 2만큼 증가
-                    compound_found = True
-                    self.logger.debug(f"복합어 복원: '{current_word}' + '{next_word}' → '{compound_word}'")
-            
-            if not compound_found:
-                # 복합어가 아니면 그대로 추가
-                restored.append(current_word)
-                i += 1
-        
-        return restored
+        return self.tokenizer.tokenize(text)
     
     def _extract_searchable_text(self, resume: Dict[str, Any]) -> str:
         """
@@ -416,9 +304,93 @@ class KeywordSearchService:
         combined_text = " ".join(text_parts)
         return combined_text
     
+    def _extract_field_texts(self, resume: Dict[str, Any]) -> Dict[str, str]:
+        """내장 BM25 인덱스 필드별 원문 텍스트 (all_content는 검색 가능한 전체 텍스트)"""
+        field_texts = {"all_content": self._extract_searchable_text(resume)}
+        for field in FIELD_BOOSTS:
+            if field == "all_content":
+                continue
+            value = resume.get(field, "")
+            if isinstance(value, list):
+                value = " ".join(str(v) for v in value)
+            if value and isinstance(value, str) and value.strip():
+                field_texts[field] = value
+        return field_texts
+    
+    def _extract_field_tokens(self, resume: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        내장 BM25 인덱스용 필드별 토큰을 추출합니다.
+        all_content 토큰은 Elasticsearch tokens 필드 값으로도 그대로 사용됩니다.
+        
+        Args:
+            resume (Dict[str, Any]): 이력서 데이터
+            
+        Returns:
+            Dict[str, List[str]]: 필드명 → 토큰 리스트
+        """
+        field_texts = self._extract_field_texts(resume)
+        return dict(zip(field_texts, self.tokenizer.tokenize_many(list(field_texts.values()))))
+    
+    def _build_es_document(self, resume: Dict[str, Any], searchable_text: str,
+                           field_tokens: Dict[str, List[str]]) -> Dict[str, Any]:
+        """이력서를 Elasticsearch 문서 형태로 변환합니다."""
+        filter_fields = filter_metadata(resume)
+        filter_fields.pop("filter_version", None)
+        return {
+            **filter_fields,
+            **{
+                es_field: " ".join(field_tokens.get(field, []))
+                for field, es_field in ES_TOKEN_FIELDS.items()
+            },
+            "resume_id": str(resume["_id"]),
+            "name": resume.get("name", ""),
+            "position": resume.get("position", ""),
+            "department": resume.get("department", ""),
+            "skills": resume.get("skills", ""),
+            "experience": resume.get("experience", ""),
+            "growth_background": resume.get("growthBackground", ""),
+            "motivation": resume.get("motivation", ""),
+            "career_history": resume.get("careerHistory", ""),
+            "resume_text": resume.get("resume_text", ""),
+            "all_content": searchable_text,
+            "tokens": field_tokens.get("all_content", []),
+            "token_suggest": {"input": field_tokens.get("all_content", [])},
+            "created_at": resume.get("created_at", datetime.now()),
+            "indexed_at": datetime.now()
+        }
+    
+    async def _tokenize_batch(self, resumes: List[Dict[str, Any]]) -> List[Tuple[str, Dict[str, List[str]]]]:
+        """
+        배치 단위 형태소 분석 (검색 텍스트, 필드별 토큰)
+        모든 필드 텍스트를 한 번에 토크나이저 서비스로 넘겨 프로세스 풀에서 병렬 처리합니다.
+        """
+        field_texts_list = [self._extract_field_texts(resume) for resume in resumes]
+        flat_texts = [text for field_texts in field_texts_list for text in field_texts.values()]
+        flat_tokens = await self.tokenizer.tokenize_many_async(flat_texts)
+        
+        results = []
+        offset = 0
+        for field_texts in field_texts_list:
+            fields = list(field_texts)
+            field_tokens = dict(zip(fields, flat_tokens[offset:offset + len(fields)]))
+            offset += len(fields)
+            results.append((field_texts["all_content"], field_tokens))
+        return results
+    
+    async def _iter_resume_batches(self, collection: Collection, batch_size: int):
+        """MongoDB 커서를 batch_size 단위로 끊어서 순회합니다 (전체를 메모리에 올리지 않음)."""
+        batch: List[Dict[str, Any]] = []
+        async for resume in collection.find({}).batch_size(batch_size):
+            batch.append(resume)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
     async def index_document(self, resume: Dict[str, Any]) -> Dict[str, Any]:
         """
-        단일 이력서를 Elasticsearch에 인덱싱합니다.
+        단일 이력서를 내장 BM25 인덱스와 Elasticsearch(연결된 경우)에 인덱싱합니다.
         
         Args:
             resume (Dict[str, Any]): 이력서 데이터
@@ -426,44 +398,43 @@ class KeywordSearchService:
         Returns:
             Dict[str, Any]: 인덱싱 결과
         """
-        if not self.es_client:
-            return {
-                "success": False,
-                "message": "Elasticsearch 연결이 없습니다."
-            }
-        
         try:
             resume_id = str(resume["_id"])
             
-            # 검색 가능한 텍스트 추출
-            searchable_text = self._extract_searchable_text(resume)
-            tokens = self._preprocess_text(searchable_text)
+            # 검색 가능한 텍스트 추출 (형태소 분석은 한 번만, 이벤트 루프 밖에서 수행)
+            (searchable_text, field_tokens), = await self._tokenize_batch([resume])
+            tokens = field_tokens["all_content"]
+            
+            # 내장 BM25 인덱스 갱신 (재구축 중이면 변경 기록에도 남김)
+            self.local_index.add(resume_id, field_tokens)
+            self._record_local_change(resume_id, field_tokens)
+            
+            if not self.es_client:
+                self.logger.info(f"문서 인덱싱 완료 (내장 BM25): {resume.get('name', 'Unknown')} ({len(tokens)} 토큰)")
+                return {
+                    "success": True,
+                    "message": "문서 인덱싱이 완료되었습니다. (내장 BM25)",
+                    "resume_id": resume_id,
+                    "tokens_count": len(tokens),
+                    "backend": "local_bm25"
+                }
             
             # Elasticsearch 문서 생성
-            doc = {
-                "resume_id": resume_id,
-                "name": resume.get("name", ""),
-                "position": resume.get("position", ""),
-                "department": resume.get("department", ""),
-                "skills": resume.get("skills", ""),
-                "experience": resume.get("experience", ""),
-                "growth_background": resume.get("growthBackground", ""),
-                "motivation": resume.get("motivation", ""),
-                "career_history": resume.get("careerHistory", ""),
-                "resume_text": resume.get("resume_text", ""),
-                "all_content": searchable_text,
-                "tokens": tokens,
-                "created_at": resume.get("created_at", datetime.now()),
-                "indexed_at": datetime.now()
-            }
+            doc = self._build_es_document(resume, searchable_text, field_tokens)
             
             # Elasticsearch에 문서 인덱싱 (8.x 버전 호환)
-            response = self.es_client.index(
+            response = await self._es().index(
                 index=self.es_index,
                 id=resume_id,
                 document=doc
             )
             
+            # 재색인 중이면 새 인덱스에도 반영하고 변경 기록에 남김 (벌크 색인이 이전 버전으로 덮어쓰지 않도록)
+            pending_index = KeywordSearchService._pending_reindex
+            if pending_index:
+                KeywordSearchService._pending_changes[resume_id] = doc
+                await self._es().index(index=pending_index, id=resume_id, document=doc)
+            
             self.logger.info(f"문서 인덱싱 완료: {resume.get('name', 'Unknown')} ({len(tokens)} 토큰)")
             
             return {
@@ -471,6 +442,7 @@ class KeywordSearchService:
                 "message": "문서 인덱싱이 완료되었습니다.",
                 "resume_id": resume_id,
                 "tokens_count": len(tokens),
+                "backend": "elasticsearch",
                 "es_response": response
             }
             
@@ -480,10 +452,17 @@ class KeywordSearchService:
                 "success": False,
                 "message": f"문서 인덱싱 중 오류가 발생했습니다: {str(e)}"
             }
+        finally:
+            # 색인이 바뀌었으므로 이전 검색 결과 캐시 무효화
+            bump_generation()
     
     async def build_index(self, collection: Collection) -> Dict[str, Any]:
         """
-        모든 이력서에 대한 Elasticsearch 인덱스를 구축합니다.
+        모든 이력서에 대해 키워드 검색 인덱스를 무중단(blue/green)으로 재구축합니다.
+        
+        새 버전 인덱스를 streaming_bulk로 채운 뒤 별칭을 원자적으로 교체하고 이전 인덱스를 삭제합니다.
+        재구축 중에도 기존 인덱스(및 내장 BM25 인덱스)로 검색이 계속 동작합니다.
+        재구축 중 색인/삭제된 문서는 벌크 색인 후 새 인덱스에 다시 반영하고, 이미 재구축 중이면 실행하지 않습니다.
         
         Args:
             collection (Collection): MongoDB 이력서 컬렉션
@@ -491,82 +470,305 @@ class KeywordSearchService:
         Returns:
             Dict[str, Any]: 인덱스 구축 결과
         """
-        if not self.es_client:
+        if KeywordSearchService._reindex_running:
             return {
                 "success": False,
-                "message": "Elasticsearch 연결이 없습니다.",
+                "in_progress": True,
+                "message": "이미 키워드 검색 인덱스를 재구축하고 있습니다.",
                 "total_documents": 0
             }
+        KeywordSearchService._reindex_running = True
         
+        new_index = None
+        change_log = None
         try:
-            self.logger.info("=== Elasticsearch 인덱스 구축 시작 ===")
-            
-            # 기존 인덱스 삭제 후 재생성
-            if self.es_client.indices.exists(index=self.es_index):
-                self.es_client.indices.delete(index=self.es_index)
-                self.logger.info(f"기존 인덱스 삭제: {self.es_index}")
-            
-            # 인덱스 매핑 재생성
-            self._create_index_mapping()
-            
-            # 모든 이력서 조회 (비동기)
-            resumes = await collection.find({}).to_list(1000)
+            self.logger.info("=== 키워드 검색 인덱스 구축 시작 ===")
+            
+            if self.es_client:
+                # 새 버전 인덱스 생성 (대량 색인 중에는 refresh 비활성화)
+                new_index = self._new_index_name()
+                body = self._index_body()
+                body["settings"] = {**body["settings"], "refresh_interval": "-1"}
+                await self._es(timeout=30).indices.create(index=new_index, **body)
+                KeywordSearchService._pending_changes = {}
+                KeywordSearchService._pending_reindex = new_index
+                self.logger.info(f"새 인덱스 생성: {new_index}")
+            
+            new_local_index = BM25Index()
+            change_log = self._start_local_change_log()
+            indexed_count = 0
+            failed_count = 0
+            errors: List[Any] = []
             
-            if not resumes:
+            async for batch in self._iter_resume_batches(collection, self.reindex_batch_size):
+                tokenized = await self._tokenize_batch(batch)
+                for resume, (_, field_tokens) in zip(batch, tokenized):
+                    new_local_index.add(str(resume["_id"]), field_tokens)
+                
+                if not new_index:
+                    indexed_count += len(batch)
+                    continue
+                
+                actions = [
+                    {
+                        "_index": new_index,
+                        "_id": str(resume["_id"]),
+                        "_source": self._build_es_document(resume, searchable_text, field_tokens)
+                    }
+                    for resume, (searchable_text, field_tokens) in zip(batch, tokenized)
+                ]
+                ok_count, batch_failed, batch_errors = await self._bulk_index(actions)
+                indexed_count += ok_count
+                failed_count += batch_failed
+                errors.extend(batch_errors[:max(0, 10 - len(errors))])
+                self.logger.info(f"벌크 인덱싱 진행: {indexed_count}개 성공, {failed_count}개 실패")
+            
+            if indexed_count == 0 and failed_count == 0:
+                if new_index:
+                    await self._drop_index(new_index)
                 return {
                     "success": False,
                     "message": "인덱싱할 이력서가 없습니다.",
                     "total_documents": 0
                 }
             
-            # 배치 인덱싱
-            indexed_count = 0
-            failed_count = 0
-            
-            for resume in resumes:
-                result = await self.index_document(resume)
-                if result["success"]:
-                    indexed_count += 1
-                else:
-                    failed_count += 1
+            if new_index:
+                # 벌크 색인이 읽은 이전 버전 문서를 재구축 중 변경 사항으로 덮어씀
+                await self._replay_pending_changes(new_index)
+                # refresh 설정 복원 후 별칭 교체
+                await self._es(timeout=30).indices.put_settings(index=new_index, settings={"index": {"refresh_interval": None}})
+                await self._es(timeout=60).indices.refresh(index=new_index)
+                old_indices = await self._swap_alias(new_index)
+                self.es_index_outdated = False
+                self.logger.info(f"별칭 교체 완료: {self.es_index} → {new_index} (이전 인덱스 {old_indices} 삭제)")
             
-            # 인덱스 새로고침
-            self.es_client.indices.refresh(index=self.es_index)
+            # 내장 BM25 인덱스도 완성된 새 인덱스로 교체 (재구축 중 변경 사항을 반영한 뒤 교체)
+            await asyncio.to_thread(new_local_index.warm_suggestions)
+            self._swap_local_index(new_local_index, change_log)
+            await self.persist_local_index()
             
-            self.logger.info(f"Elasticsearch 인덱스 구축 완료: {indexed_count}개 성공, {failed_count}개 실패")
+            backend = "Elasticsearch" if self.es_client else "내장 BM25"
+            self.logger.info(f"{backend} 인덱스 구축 완료: {indexed_count}개 성공, {failed_count}개 실패")
             
             return {
                 "success": True,
-                "message": "Elasticsearch 인덱스 구축이 완료되었습니다.",
+                "message": f"{backend} 인덱스 구축이 완료되었습니다.",
                 "total_documents": indexed_count,
                 "failed_documents": failed_count,
+                "errors": errors,
+                "index_name": new_index or "local_bm25",
                 "index_created_at": datetime.now().isoformat()
             }
             
         except Exception as e:
-            self.logger.error(f"Elasticsearch 인덱스 구축 실패: {str(e)}")
+            self.logger.error(f"키워드 검색 인덱스 구축 실패: {str(e)}")
+            # 실패 시 새 인덱스만 정리 (별칭은 기존 인덱스를 그대로 가리킴)
+            if new_index:
+                await self._drop_index(new_index)
             return {
                 "success": False,
                 "message": f"인덱스 구축 중 오류가 발생했습니다: {str(e)}",
                 "total_documents": 0
             }
+        finally:
+            self._stop_local_change_log(change_log)
+            if new_index and KeywordSearchService._pending_reindex == new_index:
+                KeywordSearchService._pending_reindex = None
+                KeywordSearchService._pending_changes = {}
+            KeywordSearchService._reindex_running = False
+    
+    async def _bulk_index(self, actions: List[Dict[str, Any]]) -> Tuple[int, int, List[Any]]:
+        """streaming_bulk로 문서를 색인하고 (성공 수, 실패 수, 오류 샘플)을 반환합니다."""
+        ok_count = 0
+        failed_count = 0
+        errors: List[Any] = []
+        async for ok, item in async_streaming_bulk(
+            self._es(timeout=60),
+            actions,
+            chunk_size=self.reindex_batch_size,
+            max_retries=3,
+            raise_on_error=False,
+            raise_on_exception=False
+        ):
+            if ok:
+                ok_count += 1
+            else:
+                failed_count += 1
+                if len(errors) < 10:
+                    errors.append(item)
+        return ok_count, failed_count, errors
+    
+    async def _replay_pending_changes(self, new_index: str) -> None:
+        """
+        재구축 중 들어온 색인/삭제를 새 인덱스에 다시 적용합니다.
+        (벌크 색인이 끝난 뒤의 쓰기는 새 인덱스에 바로 반영되므로, 기록이 빌 때까지만 반복)
+        """
+        replayed = 0
+        while KeywordSearchService._pending_changes:
+            changes = KeywordSearchService._pending_changes
+            KeywordSearchService._pending_changes = {}
+            actions = [
+                {"_op_type": "delete", "_index": new_index, "_id": resume_id}
+                if doc is None else
+                {"_index": new_index, "_id": resume_id, "_source": doc}
+                for resume_id, doc in changes.items()
+            ]
+            _, _, errors = await self._bulk_index(actions)
+            # 이미 없는 문서 삭제(404)는 정상
+            errors = [error for error in errors if error.get("delete", {}).get("status") != 404]
+            if errors:
+                raise RuntimeError(f"재구축 중 변경 사항 반영 실패: {errors[:3]}")
+            replayed += len(actions)
+        if replayed:
+            self.logger.info(f"재구축 중 변경 {replayed}건을 새 Elasticsearch 인덱스에 반영")
+    
+    async def _swap_alias(self, new_index: str) -> List[str]:
+        """별칭을 새 인덱스로 원자적으로 교체하고 이전 인덱스를 삭제합니다."""
+        es = self._es(timeout=30)
+        old_indices: List[str] = []
+        actions: List[Dict[str, Any]] = []
+        if await es.indices.exists_alias(name=self.es_index):
+            old_indices = list((await es.indices.get_alias(name=self.es_index)).body)
+            actions.extend({"remove": {"index": index, "alias": self.es_index}} for index in old_indices)
+        elif await es.indices.exists(index=self.es_index):
+            # 별칭 도입 이전에 만든 실제 인덱스는 별칭 추가와 같은 요청에서 제거
+            actions.append({"remove_index": {"index": self.es_index}})
+        actions.append({"add": {"index": new_index, "alias": self.es_index}})
+        await es.indices.update_aliases(actions=actions)
+        
+        for index in old_indices:
+            if index != new_index:
+                await self._drop_index(index)
+        return old_indices
+    
+    async def _drop_index(self, index: str) -> None:
+        try:
+            await self._es(timeout=30).options(ignore_status=404).indices.delete(index=index)
+        except Exception as e:
+            self.logger.warning(f"인덱스 삭제 실패: {index}, 오류: {str(e)}")
+    
+    async def rebuild_local_index(self, collection: Collection, batch_size: int = 200) -> Dict[str, Any]:
+        """
+        MongoDB에서 내장 BM25 인덱스만 재구축합니다 (애플리케이션 시작 시 사용).
+        디스크 스냅샷의 문서 수가 컬렉션과 같으면 재구축을 건너뜁니다.
+        재구축이 끝날 때까지는 기존 인덱스로 검색합니다.
+        
+        Args:
+            collection (Collection): MongoDB 이력서 컬렉션
+            batch_size (int): 한 번에 토큰화할 문서 수
+            
+        Returns:
+            Dict[str, Any]: 재구축 결과
+        """
+        change_log = None
+        try:
+            total = await collection.count_documents({})
+            if total and len(self.local_index) == total:
+                self.logger.info(f"내장 BM25 인덱스 스냅샷 사용: {total}개 문서")
+                return {"success": True, "message": "기존 인덱스 스냅샷을 사용합니다.", "total_documents": total}
+            
+            self.logger.info(f"내장 BM25 인덱스 재구축 시작: {total}개 문서")
+            new_local_index = BM25Index()
+            change_log = self._start_local_change_log()
+            indexed_count = 0
+            
+            async for batch in self._iter_resume_batches(collection, batch_size):
+                tokenized = await self._tokenize_batch(batch)
+                for resume, (_, field_tokens) in zip(batch, tokenized):
+                    new_local_index.add(str(resume["_id"]), field_tokens)
+                indexed_count += len(batch)
+            
+            await asyncio.to_thread(new_local_index.warm_suggestions)
+            self._swap_local_index(new_local_index, change_log)
+            await self.persist_local_index()
+            self.logger.info(f"내장 BM25 인덱스 재구축 완료: {indexed_count}개 문서")
+            return {
+                "success": True,
+                "message": "내장 BM25 인덱스 재구축이 완료되었습니다.",
+                "total_documents": indexed_count,
+                "index_created_at": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            self.logger.error(f"내장 BM25 인덱스 재구축 실패: {str(e)}")
+            return {
+                "success": False,
+                "message": f"내장 BM25 인덱스 재구축 중 오류가 발생했습니다: {str(e)}",
+                "total_documents": 0
+            }
+        finally:
+            self._stop_local_change_log(change_log)
+    
+    @staticmethod
+    def _start_local_change_log() -> Dict[str, Optional[Dict[str, List[str]]]]:
+        """재구축 시작: 이후 index_document/delete_document 변경을 기록합니다."""
+        change_log: Dict[str, Optional[Dict[str, List[str]]]] = {}
+        KeywordSearchService._local_change_logs.append(change_log)
+        return change_log
+    
+    @staticmethod
+    def _stop_local_change_log(change_log: Optional[Dict[str, Optional[Dict[str, List[str]]]]]) -> None:
+        if change_log is not None and change_log in KeywordSearchService._local_change_logs:
+            KeywordSearchService._local_change_logs.remove(change_log)
+    
+    @staticmethod
+    def _record_local_change(resume_id: str, field_tokens: Optional[Dict[str, List[str]]]) -> None:
+        for change_log in KeywordSearchService._local_change_logs:
+            change_log[resume_id] = field_tokens
+    
+    def _swap_local_index(self, new_local_index: BM25Index,
+                          change_log: Dict[str, Optional[Dict[str, List[str]]]]) -> None:
+        """
+        재구축 중 들어온 색인/삭제를 새 인덱스에 재적용한 뒤 교체합니다.
+        (배치로 읽은 이전 버전 문서를 최신 상태로 덮어씀. 재적용과 교체 사이에 await가 없어 변경이 끼어들지 않음)
+        """
+        for resume_id, field_tokens in change_log.items():
+            if field_tokens is None:
+                new_local_index.remove(resume_id)
+            else:
+                new_local_index.add(resume_id, field_tokens)
+        if change_log:
+            self.logger.info(f"재구축 중 변경 {len(change_log)}건을 새 내장 BM25 인덱스에 반영")
+        set_local_index(new_local_index)
+        bump_generation()
+    
+    async def persist_local_index(self) -> None:
+        """내장 BM25 인덱스를 디스크에 저장합니다 (다음 시작 시 mmap으로 로드)."""
+        try:
+            await asyncio.to_thread(self.local_index.save, self.local_index_path)
+        except Exception as e:
+            self.logger.warning(f"내장 BM25 인덱스 저장 실패: {str(e)}")
     
     async def search_by_keywords(self, query: str, collection: Collection, 
-                               limit: int = 10) -> Dict[str, Any]:
+                               limit: int = 10, filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
         """
         Elasticsearch를 사용한 키워드 기반 이력서 검색
+        동일한 검색어/조건의 반복 검색은 결과 캐시에서 반환합니다 (색인 변경 시 무효화).
         
         Args:
             query (str): 검색 쿼리
             collection (Collection): MongoDB 이력서 컬렉션 (호환성)
             limit (int): 반환할 최대 결과 수
+            filters (Optional[SearchFilters]): 검색 필터 (검색 단계에서 적용)
             
         Returns:
             Dict[str, Any]: 검색 결과
         """
-        if not self.es_client:
-            self.logger.warning("Elasticsearch 연결이 없습니다. MongoDB fallback 검색을 사용합니다.")
-            return await self._fallback_search(query, collection, limit)
+        filters = filters if filters and not filters.is_empty() else None
+        cache = get_search_cache()
+        cache_key = cache.make_key(
+            "keyword", query, limit=limit, collection=getattr(collection, "name", None),
+            filters=filters.to_dict() if filters else None
+        )
+        return await cache.get_or_compute(
+            cache_key, lambda: self._search_by_keywords(query, collection, limit, filters)
+        )
+    
+    async def _search_by_keywords(self, query: str, collection: Collection, limit: int,
+                                  filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
+        """캐시를 거치지 않는 키워드 검색 (Elasticsearch 우선, 불가 시 내장 BM25)"""
+        if not self.es_client or self.es_index_outdated:
+            return await self._local_search(query, collection, limit, filters)
         
         try:
             if not query or not query.strip():
@@ -579,7 +781,7 @@ class KeywordSearchService:
             self.logger.info(f"Elasticsearch 키워드 검색 시작: '{query}'")
             
             # 쿼리 토큰화
-            query_tokens = self._preprocess_text(query)
+            query_tokens = await self.tokenizer.tokenize_query(query)
             
             if not query_tokens:
                 return {
@@ -590,114 +792,30 @@ class KeywordSearchService:
             
             self.logger.info(f"검색 토큰: {query_tokens}")
             
-            # Elasticsearch 검색 쿼리 구성
-            search_body = {
-                "query": {
-                    "bool": {
-                        "should": [
-                            # 멀티 필드 검색 (BM25 기본 사용)
-                            {
-                                "multi_match": {
-                                    "query": query,
-                                    "fields": [
-                                        "basic_info_names^3",  # 이름에 가중치 3
-                                        "keywords^2",          # 키워드에 가중치 2
-                                        "summary^1.5",         # 요약에 가중치 1.5
-                                        "extracted_text",      # 추출된 텍스트
-                                        "all_content"          # 전체 내용
-                                    ],
-                                    "type": "best_fields",
-                                    "fuzziness": "AUTO"
-                                }
-                            },
-                            # 토큰 기반 정확 매칭
-                            {
-                                "terms": {
-                                    "tokens": query_tokens,
-                                    "boost": 1.5
-                                }
-                            }
-                        ]
-                    }
-                },
-                "highlight": {
-                    "fields": {
-                        "all_content": {},
-                        "basic_info_names": {},
-                        "keywords": {},
-                        "summary": {},
-                        "extracted_text": {}
-                    },
-                    "pre_tags": ["**"],
-                    "post_tags": ["**"]
-                },
-                "size": limit,
-                "_source": ["resume_id", "basic_info_names", "applicant_id", "keywords", "summary", "extracted_text", "indexed_at"]
-            }
-            
-            # Elasticsearch 검색 실행 (8.x 버전 호환)
-            response = self.es_client.search(
-                index=self.es_index,
-                **search_body
-            )
-            
-            hits = response["hits"]["hits"]
+            hits, search_plan = await self._es_search_hits(query, query_tokens, limit, filters)
             
             if not hits:
                 return {
                     "success": True,
                     "message": "검색 결과가 없습니다.",
                     "results": [],
-                    "total": 0
+                    "total": 0,
+                    "query": query,
+                    "query_tokens": query_tokens,
+                    "search_plan": search_plan
                 }
             
             # MongoDB에서 상세 정보 조회
-            resume_ids = [ObjectId(hit["_source"]["resume_id"]) for hit in hits]
-            resume_cursor = collection.find({"_id": {"$in": resume_ids}})
-            resume_list = await resume_cursor.to_list(length=None)
-            resumes = {str(r["_id"]): r for r in resume_list}
+            resumes = await self._load_resumes(collection, [hit["_source"]["resume_id"] for hit in hits])
             
-            # 결과 매핑
+            # 결과 매핑 (하이라이트는 MongoDB 원문 기준으로 생성)
             results = []
             for hit in hits:
-                resume_id = hit["_source"]["resume_id"]
-                score = hit["_score"]
-                
-                resume = resumes.get(resume_id)
+                resume = resumes.get(hit["_source"]["resume_id"])
                 if resume:
-                    # ObjectId를 문자열로 변환
-                    resume["_id"] = str(resume["_id"])
-                    if "resume_id" in resume:
-                        resume["resume_id"] = str(resume["resume_id"])
-                    else:
-                        resume["resume_id"] = str(resume["_id"])
-                    
-                    # 날짜 변환
-                    if "created_at" in resume:
-                        resume["created_at"] = resume["created_at"].isoformat()
-                    
-                    # 하이라이트 텍스트 추출
-                    highlight_text = ""
-                    if "highlight" in hit:
-                        highlight_parts = []
-                        for field, highlights in hit["highlight"].items():
-                            highlight_parts.extend(highlights)
-                        highlight_text = " ... ".join(highlight_parts)
-                    
-                    # 하이라이트가 없으면 기본 방식 사용
-                    if not highlight_text:
-                        highlight_text = self._highlight_query_terms(
-                            self._extract_searchable_text(resume), 
-                            query_tokens
-                        )
-                    
-                    results.append({
-                        "bm25_score": round(score, 4),
-                        "resume": resume,
-                        "highlight": highlight_text[:200] + "..." if len(highlight_text) > 200 else highlight_text
-                    })
-            
-            self.logger.info(f"Elasticsearch 검색 완료: {len(results)}개 결과")
+                    results.append(self._build_search_result(resume, hit["_score"], query_tokens))
+            
+            self.logger.info(f"Elasticsearch 검색 완료 ({search_plan}): {len(results)}개 결과")
             
             return {
                 "success": True,
@@ -705,16 +823,157 @@ class KeywordSearchService:
                 "results": results,
                 "total": len(results),
                 "query": query,
-                "query_tokens": query_tokens
+                "query_tokens": query_tokens,
+                "search_plan": search_plan
             }
             
         except Exception as e:
-            self.logger.error(f"Elasticsearch 검색 실패: {str(e)}")
-            return {
-                "success": False,
-                "message": f"검색 중 오류가 발생했습니다: {str(e)}",
-                "results": []
-            }
+            self.logger.error(f"Elasticsearch 검색 실패, 내장 BM25 인덱스로 재시도: {str(e)}")
+            return await self._local_search(query, collection, limit, filters)
+    
+    async def _es_search_hits(self, query: str, query_tokens: List[str], limit: int,
+                              filters: Optional[SearchFilters] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Elasticsearch 검색 hit 목록과 사용한 검색 계획을 반환합니다."""
+        filter_clauses = filters.to_es() if filters else []
+        
+        # 1차: 미리 토큰화한 필드에 대한 combined_fields (term 기반, 저렴)
+        response = await self._es().search(
+            index=self.es_index,
+            **self._build_token_query(query_tokens, limit, filter_clauses)
+        )
+        if response["hits"]["hits"]:
+            return response["hits"]["hits"], "combined_fields"
+        
+        # 2차: 결과가 없을 때만 원문에 fuzziness 적용 (오타 대응)
+        response = await self._es().search(
+            index=self.es_index,
+            **self._build_fuzzy_query(query, limit, filter_clauses)
+        )
+        return response["hits"]["hits"], "fuzzy_fallback"
+    
+    async def search_ids(self, query: str, limit: int = 10, filters: Optional[SearchFilters] = None,
+                         collection: Optional[Collection] = None) -> List[Tuple[str, float]]:
+        """
+        키워드 검색 결과를 (문서 ID, BM25 점수) 목록으로만 반환합니다.
+        MongoDB 조회 없이 점수만 필요한 경우(하이브리드 융합 등)에 사용합니다.
+        
+        Args:
+            query (str): 검색 쿼리
+            limit (int): 반환할 최대 결과 수
+            filters (Optional[SearchFilters]): 검색 필터
+            collection (Optional[Collection]): 내장 BM25로 필터 검색할 때 후보를 조회할 컬렉션
+            
+        Returns:
+            List[Tuple[str, float]]: 점수 내림차순 (문서 ID, 점수) 목록
+        """
+        if not query or not query.strip():
+            return []
+        query_tokens = await self.tokenizer.tokenize_query(query)
+        if not query_tokens:
+            return []
+        
+        filters = filters if filters and not filters.is_empty() else None
+        
+        if self.es_client and not self.es_index_outdated:
+            try:
+                hits, _ = await self._es_search_hits(query, query_tokens, limit, filters)
+                return [(hit["_source"]["resume_id"], hit["_score"]) for hit in hits]
+            except Exception as e:
+                self.logger.error(f"Elasticsearch 검색 실패, 내장 BM25 인덱스로 재시도: {str(e)}")
+        
+        candidates = None
+        if filters:
+            if collection is None:
+                self.logger.warning("내장 BM25 필터 검색에는 컬렉션이 필요합니다.")
+                return []
+            candidates = await self._filter_candidates(collection, filters)
+        return self.local_index.search(query_tokens, limit, candidates=candidates)
+    
+    @staticmethod
+    def _with_filters(query: Dict[str, Any], filter_clauses: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """필터 절이 있으면 bool.filter로 감싸 점수 계산 없이 검색 단계에서 거릅니다."""
+        if not filter_clauses:
+            return query
+        return {"bool": {"must": [query], "filter": filter_clauses}}
+    
+    def _build_token_query(self, query_tokens: List[str], limit: int,
+                           filter_clauses: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Kiwi 토큰 필드 대상 combined_fields 쿼리 (필드 가중치는 내장 BM25와 동일)"""
+        return {
+            "query": self._with_filters({
+                "combined_fields": {
+                    "query": " ".join(query_tokens),
+                    "fields": [
+                        f"{ES_TOKEN_FIELDS[field]}^{boost:g}"
+                        for field, boost in FIELD_BOOSTS.items()
+                    ],
+                    "operator": "or"
+                }
+            }, filter_clauses),
+            "size": limit,
+            "track_total_hits": False,
+            "timeout": f"{int(self.es_request_timeout * 1000)}ms",
+            "_source": ["resume_id"]
+        }
+    
+    def _build_fuzzy_query(self, query: str, limit: int,
+                           filter_clauses: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """1차 검색 결과가 없을 때 사용하는 원문 fuzzy 매칭 쿼리"""
+        return {
+            "query": self._with_filters({
+                "match": {
+                    "all_content": {
+                        "query": query,
+                        "fuzziness": "AUTO",
+                        "prefix_length": 1
+                    }
+                }
+            }, filter_clauses),
+            "size": limit,
+            "track_total_hits": False,
+            "timeout": f"{int(self.es_request_timeout * 1000)}ms",
+            "_source": ["resume_id"]
+        }
+    
+    async def _filter_candidates(self, collection: Collection, filters: SearchFilters) -> set:
+        """필터 조건을 만족하는 문서 ID 집합 (내장 BM25 검색 범위 제한용, ID만 조회)"""
+        docs = await collection.find(filters.to_mongo(), {"_id": 1}).to_list(length=None)
+        return {str(doc["_id"]) for doc in docs}
+    
+    async def _load_resumes(self, collection: Collection, resume_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """검색 결과 ID 목록으로 MongoDB에서 이력서를 한 번에 조회합니다."""
+        object_ids = [ObjectId(resume_id) for resume_id in resume_ids if ObjectId.is_valid(resume_id)]
+        if not object_ids:
+            return {}
+        resume_list = await collection.find({"_id": {"$in": object_ids}}).to_list(length=None)
+        return {str(r["_id"]): r for r in resume_list}
+    
+    def _build_search_result(self, resume: Dict[str, Any], score: float,
+                             query_tokens: List[str], highlight_text: str = "") -> Dict[str, Any]:
+        """검색 결과 항목(bm25_score, resume, highlight)을 생성합니다."""
+        # ObjectId를 문자열로 변환
+        resume["_id"] = str(resume["_id"])
+        if "resume_id" in resume:
+            resume["resume_id"] = str(resume["resume_id"])
+        else:
+            resume["resume_id"] = str(resume["_id"])
+        
+        # 날짜 변환
+        if isinstance(resume.get("created_at"), datetime):
+            resume["created_at"] = resume["created_at"].isoformat()
+        
+        # 하이라이트가 없으면 기본 방식 사용
+        if not highlight_text:
+            highlight_text = self._highlight_query_terms(
+                self._extract_searchable_text(resume),
+                query_tokens
+            )
+        
+        return {
+            "bm25_score": round(score, 4),
+            "resume": resume,
+            "highlight": highlight_text[:200] + "..." if len(highlight_text) > 200 else highlight_text
+        }
     
     def _highlight_query_terms(self, text: str, query_tokens: List[str]) -> str:
         """
@@ -749,14 +1008,24 @@ class KeywordSearchService:
         Returns:
             Dict[str, Any]: 삭제 결과
         """
+        removed = self.local_index.remove(str(resume_id))
+        self._record_local_change(str(resume_id), None)
+        
         if not self.es_client:
+            bump_generation()
             return {
-                "success": False,
-                "message": "Elasticsearch 연결이 없습니다."
+                "success": True,
+                "message": "문서 삭제가 완료되었습니다." if removed else "삭제할 문서가 존재하지 않습니다.",
+                "resume_id": resume_id
             }
         
         try:
-            response = self.es_client.delete(
+            pending_index = KeywordSearchService._pending_reindex
+            if pending_index:
+                KeywordSearchService._pending_changes[str(resume_id)] = None
+                await self._es().options(ignore_status=404).delete(index=pending_index, id=resume_id)
+            
+            response = await self._es().delete(
                 index=self.es_index,
                 id=resume_id
             )
@@ -782,6 +1051,8 @@ class KeywordSearchService:
                 "success": False,
                 "message": f"문서 삭제 중 오류가 발생했습니다: {str(e)}"
             }
+        finally:
+            bump_generation()
     
     async def get_index_stats(self) -> Dict[str, Any]:
         """
@@ -790,17 +1061,21 @@ class KeywordSearchService:
         Returns:
             Dict[str, Any]: 인덱스 통계
         """
+        local_stats = self.local_index.stats()
+        
         if not self.es_client:
             return {
-                "indexed": False,
-                "total_documents": 0,
-                "index_created_at": None,
-                "message": "Elasticsearch 연결이 없습니다."
+                "indexed": local_stats["total_documents"] > 0,
+                "total_documents": local_stats["total_documents"],
+                "index_name": "local_bm25",
+                "backend": "local_bm25",
+                "local_index": local_stats,
+                "search_cache": get_search_cache().stats()
             }
         
         try:
             # 인덱스 존재 확인
-            if not self.es_client.indices.exists(index=self.es_index):
+            if not await self._es().indices.exists(index=self.es_index):
                 return {
                     "indexed": False,
                     "total_documents": 0,
@@ -809,15 +1084,21 @@ class KeywordSearchService:
                 }
             
             # 인덱스 통계 조회
-            stats = self.es_client.indices.stats(index=self.es_index)
-            count_result = self.es_client.count(index=self.es_index)
+            stats, count_result = await asyncio.gather(
+                self._es().indices.stats(index=self.es_index),
+                self._es().count(index=self.es_index)
+            )
             
             return {
                 "indexed": True,
                 "total_documents": count_result["count"],
                 "index_name": self.es_index,
-                "index_size": stats["indices"][self.es_index]["total"]["store"]["size_in_bytes"],
-                "shard_count": stats["indices"][self.es_index]["total"]["docs"]["count"]
+                "physical_indices": list(stats["indices"].keys()),
+                "index_size": stats["_all"]["total"]["store"]["size_in_bytes"],
+                "shard_count": stats["_all"]["total"]["docs"]["count"],
+                "backend": "elasticsearch",
+                "local_index": local_stats,
+                "search_cache": get_search_cache().stats()
             }
             
         except Exception as e:
@@ -830,7 +1111,10 @@ class KeywordSearchService:
     
     async def suggest_keywords(self, partial_query: str, limit: int = 5) -> List[str]:
         """
-        Elasticsearch를 사용한 키워드 자동완성 제안
+        키워드 자동완성 제안 (문서 빈도 순)
+        
+        기본은 내장 접두어 인덱스를 사용하고, KEYWORD_SUGGEST_BACKEND=elasticsearch이면
+        Elasticsearch completion suggester를 사용합니다.
         
         Args:
             partial_query (str): 부분 검색어
@@ -839,64 +1123,49 @@ class KeywordSearchService:
         Returns:
             List[str]: 제안 키워드 리스트
         """
-        if not self.es_client or not partial_query:
+        if not partial_query or not partial_query.strip():
             return []
         
-        try:
-            # Elasticsearch suggest API 사용
-            suggest_body = {
-                "suggest": {
-                    "keyword_suggest": {
-                        "prefix": partial_query.lower(),
-                        "completion": {
-                            "field": "tokens",
-                            "size": limit
-                        }
-                    }
-                }
-            }
-            
-            # 간단한 terms aggregation으로 대체
-            search_body = {
-                "size": 0,
-                "aggs": {
-                    "keywords": {
-                        "terms": {
-                            "field": "tokens",
-                            "include": f"{partial_query.lower()}.*",
-                            "size": limit
+        if self.suggest_backend == "elasticsearch" and self.es_client and not self.es_index_outdated:
+            try:
+                response = await self._es().search(
+                    index=self.es_index,
+                    suggest={
+                        "keyword_suggest": {
+                            "prefix": partial_query.strip().lower(),
+                            "completion": {
+                                "field": "token_suggest",
+                                "size": limit,
+                                "skip_duplicates": True
+                            }
                         }
-                    }
-                }
-            }
-            
-            response = self.es_client.search(
-                index=self.es_index,
-                **search_body
-            )
-            
-            suggestions = []
-            if "aggregations" in response and "keywords" in response["aggregations"]:
-                buckets = response["aggregations"]["keywords"]["buckets"]
-                suggestions = [bucket["key"] for bucket in buckets]
-            
-            return suggestions
-            
+                    },
+                    source=False
+                )
+                options = response["suggest"]["keyword_suggest"][0]["options"]
+                return [option["text"] for option in options]
+            except Exception as e:
+                self.logger.warning(f"Elasticsearch 키워드 제안 실패, 내장 인덱스 사용: {str(e)}")
+        
+        try:
+            return self.local_index.suggest(partial_query, limit)
         except Exception as e:
             self.logger.error(f"키워드 제안 실패: {str(e)}")
             return []
     
-    async def _fallback_search(self, query: str, collection: Collection, limit: int = 10) -> Dict[str, Any]:
+    async def _local_search(self, query: str, collection: Collection, limit: int = 10,
+                            filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
         """
-        Elasticsearch 연결 실패 시 MongoDB fallback 검색
+        내장 BM25 인덱스를 사용한 키워드 검색 (Elasticsearch 미연결/오류 시)
         
         Args:
             query (str): 검색 쿼리
-            collection (Collection): MongoDB 컬렉션
+            collection (Collection): MongoDB 이력서 컬렉션
             limit (int): 반환할 최대 결과 수
+            filters (Optional[SearchFilters]): 검색 필터 (MongoDB에서 후보 ID를 구해 검색 범위 제한)
             
         Returns:
-            Dict[str, Any]: 검색 결과
+            Dict[str, Any]: 검색 결과 (Elasticsearch 검색과 동일한 형식)
         """
         try:
             if not query or not query.strip():
@@ -906,41 +1175,52 @@ class KeywordSearchService:
                     "results": []
                 }
             
-            self.logger.info(f"MongoDB fallback 검색 시작: '{query}'")
+            self.logger.info(f"내장 BM25 키워드 검색 시작: '{query}'")
             
-            # MongoDB 텍스트 검색 쿼리
-            search_query = {
-                "$text": {
-                    "$search": query
+            query_tokens = await self.tokenizer.tokenize_query(query)
+            if not query_tokens:
+                return {
+                    "success": False,
+                    "message": "유효한 검색 토큰이 없습니다.",
+                    "results": []
                 }
-            }
             
-            # MongoDB에서 검색 실행
-            cursor = collection.find(search_query).limit(limit)
-            results = []
+            candidates = await self._filter_candidates(collection, filters) if filters else None
+            hits = self.local_index.search(query_tokens, limit, candidates=candidates)
+            if not hits:
+                return {
+                    "success": True,
+                    "message": "검색 결과가 없습니다.",
+                    "results": [],
+                    "total": 0,
+                    "query": query,
+                    "query_tokens": query_tokens,
+                    "search_type": "local_bm25"
+                }
             
-            for doc in cursor:
-                results.append({
-                    "resume_id": str(doc.get("_id")),
-                    "name": doc.get("name", ""),
-                    "position": doc.get("position", ""),
-                    "department": doc.get("department", ""),
-                    "skills": doc.get("skills", []),
-                    "score": doc.get("score", 0)
-                })
+            resumes = await self._load_resumes(collection, [resume_id for resume_id, _ in hits])
+            results = [
+                self._build_search_result(resumes[resume_id], score, query_tokens)
+                for resume_id, score in hits
+                if resume_id in resumes
+            ]
+            
+            self.logger.info(f"내장 BM25 검색 완료: {len(results)}개 결과")
             
             return {
                 "success": True,
-                "message": f"MongoDB fallback 검색 완료 (Elasticsearch 연결 없음)",
+                "message": f"'{query}' 검색 결과입니다.",
                 "results": results,
                 "total": len(results),
-                "search_type": "fallback"
+                "query": query,
+                "query_tokens": query_tokens,
+                "search_type": "local_bm25"
             }
             
         except Exception as e:
-            self.logger.error(f"MongoDB fallback 검색 실패: {str(e)}")
+            self.logger.error(f"내장 BM25 검색 실패: {str(e)}")
             return {
                 "success": False,
                 "message": f"검색 중 오류가 발생했습니다: {str(e)}",
                 "results": []
-            }
\ No newline at end of file
+            }
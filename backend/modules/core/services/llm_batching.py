@@ -0,0 +1,159 @@
+"""
+LLM 마이크로 배치 처리
+
+후보마다 LLM을 한 번씩 호출하는 대신 여러 후보 비교를 하나의 JSON 출력 프롬프트로 묶어 호출합니다.
+
+- 토큰 예산(입력/출력)과 최대 항목 수에 맞춰 배치를 자동 분할
+- 배치는 동시에 실행 (전체 동시 요청 수는 게이트웨이가 제한)
+- 응답은 항목 id별 JSON 결과로 받아 입력 순서대로 정렬
+- 배치 호출/파싱이 실패하면 반으로 나눠 재시도, 응답에서 빠진 항목은 한 번 더 모아서 재요청
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from .llm_gateway import get_llm_gateway
+from .llm_telemetry import estimate_tokens, llm_call_site
+
+logger = logging.getLogger(__name__)
+
+
+class LLMBatchScorer:
+    """여러 항목을 하나의 프롬프트로 묶어 항목별 JSON 결과를 받는 배치 처리기"""
+
+    def __init__(self, model: Optional[str] = None, max_input_tokens: int = 6000,
+                 max_items_per_batch: int = 8, output_tokens_per_item: int = 200,
+                 max_concurrency: int = 4, temperature: float = 0.2):
+        self.gateway = get_llm_gateway()
+        self.model = model
+        self.max_input_tokens = max_input_tokens
+        self.max_items_per_batch = max_items_per_batch
+        self.output_tokens_per_item = output_tokens_per_item
+        self.max_concurrency = max_concurrency
+        self.temperature = temperature
+        self.last_call_count = 0
+
+    def _build_prompt(self, instruction: str, fields: Dict[str, str], batch: List[int], items: Sequence[str]) -> str:
+        field_lines = "\n".join(f'  - "{name}": {description}' for name, description in fields.items())
+        item_blocks = "\n\n".join(f"[항목 id={index}]\n{items[index]}" for index in batch)
+        return f"""{instruction}
+
+아래 {len(batch)}개 항목을 각각 독립적으로 분석하고, 모든 항목의 결과를 하나의 JSON으로 응답하세요.
+
+항목별 결과 필드:
+  - "id": 항목 id (정수, 그대로 사용)
+{field_lines}
+
+{item_blocks}
+
+응답 형식 (JSON만 출력):
+{{"results": [{{"id": 항목 id, ...필드}}, ...]}}"""
+
+    def plan_batches(self, instruction: str, fields: Dict[str, str], items: Sequence[str]) -> List[List[int]]:
+        """입력 토큰 예산과 최대 항목 수를 넘지 않도록 항목 인덱스를 순서대로 묶습니다."""
+        base_tokens = estimate_tokens(self._build_prompt(instruction, fields, [], items))
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = base_tokens
+        for index, item in enumerate(items):
+            item_tokens = estimate_tokens(item) + 10
+            if current and (len(current) >= self.max_items_per_batch
+                            or current_tokens + item_tokens > self.max_input_tokens):
+                batches.append(current)
+                current, current_tokens = [], base_tokens
+            current.append(index)
+            current_tokens += item_tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _call_batch(self, instruction: str, fields: Dict[str, str], batch: List[int], items: Sequence[str],
+                          system_message: Optional[str]) -> Dict[int, Dict[str, Any]]:
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": self._build_prompt(instruction, fields, batch, items)})
+
+        self.last_call_count += 1
+        response = await self.gateway.chat(
+            messages,
+            model=self.model,
+            temperature=self.temperature,
+            max_tokens=self.output_tokens_per_item * len(batch) + 100,
+            response_format={"type": "json_object"},
+            cache=True
+        )
+        parsed = json.loads(response.content or "{}")
+        results = parsed.get("results", []) if isinstance(parsed, dict) else []
+
+        by_index: Dict[int, Dict[str, Any]] = {}
+        for result in results:
+            if not isinstance(result, dict):
+                continue
+            try:
+                index = int(result.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if index in batch:
+                by_index[index] = {name: result.get(name) for name in fields}
+        return by_index
+
+    async def _run_batch(self, semaphore: asyncio.Semaphore, instruction: str, fields: Dict[str, str],
+                         batch: List[int], items: Sequence[str], system_message: Optional[str]) -> Dict[int, Dict[str, Any]]:
+        """배치 호출이 실패하면 반으로 나눠 다시 시도합니다 (항목 1개까지 실패하면 결과 없음)."""
+        try:
+            async with semaphore:
+                return await self._call_batch(instruction, fields, batch, items, system_message)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.warning(f"LLM 배치 항목 {batch[0]} 처리 실패: {e}")
+                return {}
+            logger.warning(f"LLM 배치({len(batch)}개) 처리 실패, 분할 재시도: {e}")
+            middle = len(batch) // 2
+            halves = await asyncio.gather(
+                self._run_batch(semaphore, instruction, fields, batch[:middle], items, system_message),
+                self._run_batch(semaphore, instruction, fields, batch[middle:], items, system_message)
+            )
+            return {**halves[0], **halves[1]}
+
+    async def score(self, instruction: str, items: Sequence[str], fields: Dict[str, str],
+                    system_message: Optional[str] = None, call_site: str = "batch_scoring") -> List[Optional[Dict[str, Any]]]:
+        """
+        항목들을 배치로 묶어 분석합니다.
+
+        Args:
+            instruction: 모든 항목에 공통으로 적용할 분석 지시문 (기준 정보 포함)
+            items: 항목별 설명 텍스트
+            fields: 항목별 결과 필드명 → 설명
+            system_message: 시스템 메시지
+            call_site: 텔레메트리 집계용 호출 지점 이름
+
+        Returns:
+            List[Optional[Dict]]: items 순서의 항목별 결과 (끝내 결과를 받지 못한 항목은 None)
+        """
+        self.last_call_count = 0
+        if not items:
+            return []
+
+        with llm_call_site(call_site):
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results: Dict[int, Dict[str, Any]] = {}
+            pending = list(range(len(items)))
+            # 첫 시도 + 응답에서 빠진 항목 재요청 1회
+            for _ in range(2):
+                batches = self.plan_batches(instruction, fields, [items[index] for index in pending])
+                batches = [[pending[position] for position in batch] for batch in batches]
+                batch_results = await asyncio.gather(*(
+                    self._run_batch(semaphore, instruction, fields, batch, items, system_message)
+                    for batch in batches
+                ))
+                for batch_result in batch_results:
+                    results.update(batch_result)
+                pending = [index for index in pending if index not in results]
+                if not pending:
+                    break
+
+        logger.info(f"LLM 배치 처리: 항목 {len(items)}개, 호출 {self.last_call_count}회, 누락 {len(pending)}개")
+        return [results.get(index) for index in range(len(items))]
@@ -0,0 +1,246 @@
+"""
+LLM 응답 캐시
+
+입력이 같으면 결과도 같은 분석 프롬프트(낮은 temperature 또는 명시적 요청)의 응답을 재사용합니다.
+
+- 키: (모델, 공백 정규화된 메시지, 생성 파라미터)의 SHA-256
+- 1단계: 프로세스 메모리 LRU (TTL)
+- 2단계: MongoDB 컬렉션 (expires_at TTL 인덱스, 서버 재시작/다른 워커와 공유)
+- 같은 키의 동시 요청은 하나의 LLM 호출을 함께 기다림
+- 저장소 오류는 캐시 미스로 취급하고 LLM 호출은 그대로 진행
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .llm_providers.base_provider import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+# 캐시 키에 포함하지 않는 요청 파라미터 (응답 내용에 영향 없음)
+_NON_KEY_PARAMS = ("timeout",)
+# 정상 종료된 응답만 캐시 (length/content_filter 등으로 잘린 응답은 저장하지 않음)
+_COMPLETE_FINISH_REASONS = (None, "stop", "tool_calls")
+
+
+def _normalize_text(text: Any) -> str:
+    return " ".join(str(text or "").split())
+
+
+class LLMResponseCache:
+    """메모리 LRU + MongoDB 2단계 LLM 응답 캐시"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 604800.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # 키 → (만료 시각(epoch), 응답 payload)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._store = None
+        self._counters = {"memory_hits": 0, "store_hits": 0, "coalesced": 0, "misses": 0, "stores": 0, "store_errors": 0,
+                          "rejected": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    async def attach_store(self, collection) -> None:
+        """영구 저장소(Motor 컬렉션)를 연결하고 만료 TTL 인덱스를 만듭니다."""
+        try:
+            await collection.create_index("expires_at", expireAfterSeconds=0)
+            self._store = collection
+            logger.info("LLM 응답 캐시 영구 저장소 연결")
+        except Exception as e:
+            logger.warning(f"LLM 응답 캐시 저장소 연결 실패 (메모리 캐시만 사용): {e}")
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """모델 + 정규화된 메시지 + 생성 파라미터로 캐시 키 생성"""
+        payload = [
+            model,
+            [[message.get("role"), _normalize_text(message.get("content"))] for message in messages],
+            {key: value for key, value in params.items() if key not in _NON_KEY_PARAMS}
+        ]
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _to_payload(response: LLMResponse) -> Dict[str, Any]:
+        return {
+            "content": response.content,
+            "provider": response.provider,
+            "model": response.model,
+            "metadata": response.metadata
+        }
+
+    @staticmethod
+    def _to_response(payload: Dict[str, Any], source: str) -> LLMResponse:
+        return LLMResponse(
+            content=payload["content"],
+            provider=payload["provider"],
+            model=payload["model"],
+            metadata={**(payload.get("metadata") or {}), "cached": source}
+        )
+
+    def _get_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def _put_memory(self, key: str, payload: Dict[str, Any], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[LLMResponse]:
+        payload = self._get_memory(key)
+        if payload is not None:
+            self._counters["memory_hits"] += 1
+            return self._to_response(payload, "memory")
+
+        if self._store is not None:
+            try:
+                document = await self._store.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+            except Exception as e:
+                self._counters["store_errors"] += 1
+                logger.warning(f"LLM 응답 캐시 조회 실패: {e}")
+                document = None
+            if document:
+                expires_at = min(document["expires_at"].replace(tzinfo=timezone.utc).timestamp(), time.time() + self.ttl_seconds)
+                self._put_memory(key, document["payload"], expires_at)
+                self._counters["store_hits"] += 1
+                return self._to_response(document["payload"], "store")
+
+        return None
+
+    async def put(self, key: str, response: LLMResponse, ttl_seconds: Optional[float] = None) -> None:
+        ttl = ttl_seconds or self.ttl_seconds
+        payload = self._to_payload(response)
+        self._put_memory(key, payload, time.time() + ttl)
+        self._counters["stores"] += 1
+
+        if self._store is not None:
+            now = datetime.utcnow()
+            try:
+                await self._store.replace_one(
+                    {"_id": key},
+                    {"_id": key, "model": response.model, "payload": payload,
+                     "created_at": now, "expires_at": now + timedelta(seconds=ttl)},
+                    upsert=True
+                )
+            except Exception as e:
+                self._counters["store_errors"] += 1
+                logger.warning(f"LLM 응답 캐시 저장 실패: {e}")
+
+    async def evict(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        self._counters["evictions"] += 1
+
+        if self._store is not None:
+            try:
+                await self._store.delete_one({"_id": key})
+            except Exception as e:
+                self._counters["store_errors"] += 1
+                logger.warning(f"LLM 응답 캐시 삭제 실패: {e}")
+
+    @staticmethod
+    def is_cacheable(response: LLMResponse) -> bool:
+        """정상 종료(finish_reason이 stop/tool_calls)되고 내용이나 함수 호출이 있는 응답인지"""
+        if response.metadata.get("finish_reason") not in _COMPLETE_FINISH_REASONS:
+            return False
+        return bool(response.content and response.content.strip()) or bool(response.tool_calls)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[LLMResponse]],
+                             ttl_seconds: Optional[float] = None,
+                             validate: Optional[Callable[[LLMResponse], Any]] = None) -> LLMResponse:
+        """
+        캐시에 있으면 반환하고, 없으면 compute()를 한 번만 실행해 정상 종료된 응답을 저장합니다.
+
+        validate가 있으면 저장 전에 호출하고, 예외가 나면 저장하지 않고 그대로 전파합니다.
+        이미 저장된 응답이 validate를 통과하지 못하면 캐시에서 지우고 다시 호출합니다.
+        """
+        if not self.enabled:
+            return await compute()
+
+        cached = await self.get(key)
+        if cached is not None:
+            try:
+                if validate is not None:
+                    validate(cached)
+                return cached
+            except Exception as e:
+                logger.warning(f"캐시된 LLM 응답 검증 실패, 삭제 후 재호출: {e}")
+                await self.evict(key)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self._counters["coalesced"] += 1
+            payload = await asyncio.shield(pending)
+            return self._to_response(payload, "coalesced")
+
+        self._counters["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        # 함께 기다리는 요청이 없을 때 예외 미확인 경고 방지
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._pending[key] = future
+        try:
+            response = await compute()
+            if validate is not None:
+                validate(response)
+            future.set_result(self._to_payload(response))
+            if self.is_cacheable(response):
+                await self.put(key, response, ttl_seconds)
+            else:
+                self._counters["rejected"] += 1
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._counters["memory_hits"] + self._counters["store_hits"] + self._counters["coalesced"]
+        lookups = hits + self._counters["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "persistent": self._store is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self._counters
+        }
+
+
+def create_llm_cache() -> LLMResponseCache:
+    """환경 변수(LLM_CACHE_SIZE, LLM_CACHE_TTL)로 캐시를 만듭니다."""
+    return LLMResponseCache(
+        max_entries=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "604800"))
+    )
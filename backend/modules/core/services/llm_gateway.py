@@ -0,0 +1,683 @@
+"""
+LLM 호출 게이트웨이
+
+모든 LLM 호출이 하나의 비동기 경로를 거치도록 합니다.
+
+- LLMProviderFactory로 만든 프로바이더 하나를 공유 (HTTP/2 연결 풀 재사용)
+- 모델별 토큰 버킷으로 분당 요청 수 제한 (429 응답 시 버킷을 비워 다른 요청도 함께 대기)
+- 전역 세마포어로 동시 요청 수 제한
+- 429/5xx/타임아웃은 지터를 준 지수 백오프로 재시도 (Retry-After 헤더 우선)
+- 재시도를 포함한 호출 전체에 deadline 적용
+- 동기 코드(워커 스레드)에서는 run_sync()로 게이트웨이 이벤트 루프에 위임
+- temperature가 낮거나 cache=True인 호출은 응답 캐시(llm_cache) 사용
+- stream()으로 토큰 단위 스트리밍 (첫 토큰 전까지만 재시도, 소비자가 닫으면 업스트림 요청 중단)
+- 스트리밍 엔드포인트가 set_token_sink()로 등록한 콜백에 stream_tokens=True 호출의 토큰 전달
+- chat_structured()/call_function()/stream_structured()로 JSON Schema 구조화 출력과 함수 호출 (pydantic 검증은 structured_output)
+- 호출마다 토큰/비용/지연 시간/캐시/재시도를 호출 지점(call_site)과 엔드포인트별로 집계 (llm_telemetry)
+
+환경 변수:
+    LLM_PROVIDER (openai, 오프라인 부하 테스트는 local), LLM_DEFAULT_MODEL (gpt-4o)
+    LLM_MAX_CONCURRENCY (16), LLM_MAX_RETRIES (3)
+    LLM_REQUEST_TIMEOUT (60), LLM_REQUEST_DEADLINE (120)
+    LLM_DEFAULT_RPM (500), LLM_MODEL_RPM ("gpt-4o=500,gpt-4o-mini=1000"), LLM_RATE_BURST (10)
+    LLM_CACHE_SIZE (1024), LLM_CACHE_TTL (604800), LLM_CACHE_MAX_TEMPERATURE (0.3)
+    LLM_PRICING ("gpt-4o=2.5/10,gpt-4o-mini=0.15/0.6", 100만 토큰당 USD)
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, List, Optional, Tuple, Type
+
+from .llm_cache import create_llm_cache
+from .llm_providers import local_provider, openai_provider  # noqa: F401 (프로바이더 등록)
+from .llm_providers.base_provider import LLMProvider, LLMProviderFactory, LLMResponse
+from .llm_telemetry import CallRecord, carry_context, create_llm_telemetry
+from .structured_output import (
+    ModelT, StreamingJSONParser, StructuredOutputError, response_format_for, tool_for, validate_output
+)
+
+from pydantic import BaseModel
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from openai import APIConnectionError
+except ImportError:
+    APIConnectionError = None
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 HTTP 상태 코드 (그 외 5xx 포함)
+RETRYABLE_STATUS = {408, 409, 429}
+
+# 현재 요청(태스크)의 토큰 전달 대상. stream_tokens=True인 chat() 호출이 생성 중인 토큰을 넘김
+_token_sink: contextvars.ContextVar[Optional[Callable[[str], None]]] = contextvars.ContextVar(
+    "llm_token_sink", default=None
+)
+
+
+def set_token_sink(sink: Optional[Callable[[str], None]]) -> None:
+    """현재 태스크 컨텍스트에서 stream_tokens=True 호출의 토큰을 받을 콜백을 지정합니다."""
+    _token_sink.set(sink)
+
+
+def _parse_model_limits(value: str) -> Dict[str, float]:
+    """'gpt-4o=500,gpt-4o-mini=1000' 형식의 모델별 분당 요청 수를 파싱합니다."""
+    limits = {}
+    for item in value.split(","):
+        model, _, rpm = item.partition("=")
+        if model.strip() and rpm.strip():
+            limits[model.strip()] = float(rpm)
+    return limits
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_retryable(error: Exception) -> bool:
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS or status >= 500
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if APIConnectionError is not None and isinstance(error, APIConnectionError):
+        return True
+    return HTTPX_AVAILABLE and isinstance(error, httpx.TransportError)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Retry-After 헤더(초)가 있으면 반환합니다."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    분당 rate_per_minute개씩 채워지는 토큰 버킷 (최대 capacity개까지 버스트 허용)
+
+    토큰 수는 스레드 락으로 보호해 게이트웨이가 다른 이벤트 루프에 다시 연결돼도 그대로 이어서 사용합니다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._state_lock = threading.Lock()
+        # 대기 순서 보장용 락 (asyncio.Lock은 루프에 묶이므로 루프마다 따로 생성)
+        self._queue_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _queue_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            lock = self._queue_locks.get(loop)
+            if lock is None:
+                lock = self._queue_locks[loop] = asyncio.Lock()
+            return lock
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """토큰이 생길 때까지 기다린 뒤 차감합니다 (대기 순서대로 처리)."""
+        async with self._queue_lock():
+            while True:
+                with self._state_lock:
+                    self._refill()
+                    if self.tokens >= amount:
+                        self.tokens -= amount
+                        return
+                    wait = (amount - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def drain(self) -> None:
+        """rate limit 응답을 받았을 때 남은 버스트를 없애 후속 요청을 늦춥니다."""
+        with self._state_lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class ConcurrencyLimiter:
+    """
+    이벤트 루프에 묶이지 않는 동시 호출 제한 (async with로 사용)
+
+    asyncio.Semaphore는 루프에 묶여 루프를 바꿀 때마다 새로 만들어야 하고, 그러면 진행 중인 호출 수가 초기화됩니다.
+    진행 중인 호출 수를 스레드 락으로 관리하고 대기자는 자기 루프의 Future로 깨웁니다.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return self
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # 취소와 동시에 자리를 넘겨받았으면 다음 대기자에게 넘김
+            self._release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if not loop.is_closed():
+                    # 진행 중인 호출 수는 그대로 두고 자리를 대기자에게 넘김
+                    loop.call_soon_threadsafe(self._hand_over, future)
+                    return
+            self.in_flight -= 1
+
+    def _hand_over(self, future: asyncio.Future) -> None:
+        if future.done():
+            # 넘기기 전에 대기자가 취소됨
+            self._release()
+        else:
+            future.set_result(None)
+
+
+class LLMGateway:
+    """프로세스 전역 LLM 호출 게이트웨이"""
+
+    def __init__(self, provider_name: Optional[str] = None, config: Optional[Dict[str, Any]] = None):
+        self.provider_name = provider_name or os.getenv("LLM_PROVIDER", "openai")
+        self.max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.request_timeout = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+        self.default_deadline = float(os.getenv("LLM_REQUEST_DEADLINE", "120"))
+        self.default_rpm = float(os.getenv("LLM_DEFAULT_RPM", "500"))
+        self.model_rpm = _parse_model_limits(os.getenv("LLM_MODEL_RPM", ""))
+        self.rate_burst = float(os.getenv("LLM_RATE_BURST", "10"))
+        self.cache_max_temperature = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.3"))
+        self.cache = create_llm_cache()
+        self.telemetry = create_llm_telemetry()
+        self.backoff_base = 0.5
+        self.backoff_max = 20.0
+        self.config = {
+            "model_name": os.getenv("LLM_DEFAULT_MODEL", "gpt-4o"),
+            "max_tokens": 2000,
+            "temperature": 0.1,
+            "request_timeout": self.request_timeout,
+            "timeout": self.request_timeout,
+            **(config or {}),
+            # 재시도는 게이트웨이에서만 수행
+            "max_retries": 0
+        }
+
+        # 이벤트 루프에 묶이는 자원 (처음 사용하는 루프에서 생성)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._provider: Optional[LLMProvider] = None
+        self._http_client = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # 동시 호출 제한과 rate limit 상태는 루프를 다시 연결해도 유지
+        self._limiter = ConcurrencyLimiter(self.max_concurrency)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._closing_tasks: set = set()
+        self._thread_lock = threading.Lock()
+        self._counters = {"requests": 0, "streams": 0, "retries": 0, "rate_limited": 0, "deadline_exceeded": 0, "failures": 0}
+
+    @property
+    def default_model(self) -> str:
+        return self.config["model_name"]
+
+    @property
+    def api_key_required(self) -> bool:
+        """설정된 프로바이더가 OpenAI API 키를 필요로 하는지 (로컬 프로바이더는 키 없이 동작)"""
+        provider_class = LLMProviderFactory.get_provider_class(self.provider_name)
+        return getattr(provider_class, "requires_api_key", True)
+
+    @property
+    def is_available(self) -> bool:
+        """LLM 호출이 가능한지 (연결된 프로바이더 상태, 아직 연결 전이면 API 키 설정 여부로 판단)"""
+        if self._provider is not None:
+            return self._provider.is_healthy()
+        return not self.api_key_required or bool(self.config.get("api_key") or os.getenv("OPENAI_API_KEY"))
+
+    def _create_http_client(self):
+        """모든 요청이 공유하는 HTTP/2 연결 풀 (h2 미설치 시 HTTP/1.1 keep-alive)"""
+        if not HTTPX_AVAILABLE:
+            return None
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            ),
+            timeout=httpx.Timeout(self.request_timeout, connect=10.0)
+        )
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """현재 이벤트 루프에 연결 풀과 프로바이더를 만듭니다 (이전 루프의 연결 풀은 닫음)."""
+        self._discard_http_client(self._http_client, self._http_client_loop, loop)
+        self._loop = loop
+        self._http_client = self._create_http_client()
+        self._http_client_loop = loop
+        self._provider = LLMProviderFactory.create_provider(
+            self.provider_name, {**self.config, "http_client": self._http_client}
+        )
+        logger.info(
+            f"LLM 게이트웨이 초기화: provider={self.provider_name}, http2={HTTP2_AVAILABLE}, "
+            f"concurrency={self.max_concurrency}"
+        )
+
+    def _discard_http_client(self, client: Any, client_loop: Optional[asyncio.AbstractEventLoop],
+                             loop: asyncio.AbstractEventLoop) -> None:
+        """이전 연결 풀을 닫습니다 (만든 루프가 아직 돌고 있으면 그 루프에서, 아니면 새 루프에서 시도)."""
+        if client is None:
+            return
+        if client_loop is not None and client_loop is not loop and client_loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._close_http_client(client), client_loop)
+            return
+        task = loop.create_task(self._close_http_client(client))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    @staticmethod
+    async def _close_http_client(client: Any) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            # 이미 닫힌 루프의 연결은 정리 중 오류가 날 수 있음
+            logger.debug(f"이전 LLM 연결 풀 종료 실패: {e}")
+
+    def _bucket(self, model: str) -> TokenBucket:
+        with self._thread_lock:
+            if model not in self._buckets:
+                rpm = self.model_rpm.get(model, self.default_rpm)
+                self._buckets[model] = TokenBucket(rpm, min(rpm, self.rate_burst))
+            return self._buckets[model]
+
+    async def start(self) -> None:
+        """앱 이벤트 루프에 게이트웨이를 연결합니다 (네트워크 호출 없음)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._bind(loop)
+
+    async def chat(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                   max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                   deadline: Optional[float] = None, cache: Optional[bool] = None,
+                   cache_ttl: Optional[float] = None, stream_tokens: bool = False,
+                   call_site: Optional[str] = None, validate: Optional[Callable[[LLMResponse], Any]] = None,
+                   **params: Any) -> LLMResponse:
+        """
+        Chat Completion 호출
+
+        Args:
+            messages: 대화 메시지 리스트
+            model: 모델 이름 (기본값: LLM_DEFAULT_MODEL)
+            max_tokens, temperature: 생성 옵션 (None이면 프로바이더 기본값)
+            deadline: 재시도를 포함한 최대 대기 시간(초). 초과 시 asyncio.TimeoutError
+            cache: 응답 캐시 사용 여부 (None이면 temperature가 LLM_CACHE_MAX_TEMPERATURE 이하일 때 사용)
+            cache_ttl: 캐시 보관 시간(초, 기본값: LLM_CACHE_TTL)
+            stream_tokens: 현재 컨텍스트에 토큰 콜백(set_token_sink)이 있으면 스트리밍으로 호출해 토큰을 전달
+            call_site: 텔레메트리 집계용 호출 지점 이름 (None이면 llm_call_site() 컨텍스트 값)
+            validate: 응답 검증 함수. 예외가 나면 캐시에 저장하지 않고 전파 (캐시된 응답이 실패하면 삭제 후 재호출)
+            **params: response_format, top_p 등 추가 요청 파라미터
+
+        Returns:
+            LLMResponse: 응답 (metadata에 usage 포함, 캐시 응답이면 metadata["cached"])
+        """
+        request = {"max_tokens": max_tokens, "temperature": temperature, **params}
+        request = {key: value for key, value in request.items() if value is not None}
+        if cache is None:
+            cache = request.get("temperature", self.config["temperature"]) <= self.cache_max_temperature
+        model = model or self.default_model
+        record = self.telemetry.start_call(model, call_site)
+        loop = asyncio.get_running_loop()
+        bound = self._loop
+        sink = _token_sink.get() if stream_tokens else None
+        try:
+            if sink is not None and (bound is None or bound is loop or not bound.is_running()):
+                if bound is not loop:
+                    self._bind(loop)
+                record.streamed = True
+                response = await self._stream_to_sink(messages, model, deadline, request, sink, record)
+            else:
+                coro = self._chat(messages, model, deadline, request, cache, cache_ttl, record, validate)
+                if bound is not None and bound is not loop and bound.is_running():
+                    # 다른 이벤트 루프(워커 스레드의 임시 루프 등)에서 호출 → 게이트웨이 루프에 위임
+                    response = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, bound))
+                else:
+                    if bound is not loop:
+                        self._bind(loop)
+                    response = await coro
+        except BaseException as error:
+            self.telemetry.finish_call(record, messages, error=error)
+            raise
+        self.telemetry.finish_call(record, messages, response=response)
+        return response
+
+    async def complete(self, prompt: str, system_message: Optional[str] = None, **kwargs: Any) -> LLMResponse:
+        """단일 프롬프트 호출 (system_message가 있으면 앞에 추가)"""
+        messages = [{"role": "system", "content": system_message}] if system_message else []
+        messages.append({"role": "user", "content": prompt})
+        return await self.chat(messages, **kwargs)
+
+    async def chat_structured(self, messages: List[Dict[str, str]], output_model: Type[ModelT],
+                              name: Optional[str] = None, **kwargs: Any) -> ModelT:
+        """
+        JSON Schema 구조화 출력 호출 (response_format=json_schema)
+
+        모델이 output_model 스키마에 맞는 JSON만 생성하므로 응답 텍스트에서 JSON을 찾거나
+        파싱 실패 시 다시 호출할 필요가 없습니다. 검증에 실패하면 StructuredOutputError.
+        """
+        response = await self.chat(messages, response_format=response_format_for(output_model, name),
+                                   validate=lambda r: validate_output(r.content, output_model), **kwargs)
+        return validate_output(response.content, output_model)
+
+    async def call_function(self, messages: List[Dict[str, str]], functions: Dict[str, Type[BaseModel]],
+                            tool_choice: str = "auto", **kwargs: Any) -> Optional[Tuple[str, BaseModel]]:
+        """
+        함수 호출 (tools)
+
+        Args:
+            messages: 대화 메시지 리스트
+            functions: 함수 이름 → 인자 pydantic 모델 (모델 docstring이 함수 설명)
+            tool_choice: "auto" (호출하지 않을 수도 있음), "required", "none" 또는 반드시 호출할 함수 이름
+            **kwargs: chat()과 같은 옵션
+
+        Returns:
+            (함수 이름, 검증된 인자 모델). 모델이 함수를 호출하지 않으면 None.
+            모르는 함수를 호출했거나 인자 검증에 실패하면 StructuredOutputError.
+        """
+        tools = [tool_for(model, name) for name, model in functions.items()]
+        if tool_choice in functions:
+            tool_choice = {"type": "function", "function": {"name": tool_choice}}
+
+        def parse_call(response: LLMResponse) -> Optional[Tuple[str, BaseModel]]:
+            if not response.tool_calls:
+                return None
+            call = response.tool_calls[0]
+            if call["name"] not in functions:
+                raise StructuredOutputError(f"정의되지 않은 함수 호출: {call['name']}")
+            return call["name"], validate_output(call["arguments"], functions[call["name"]])
+
+        response = await self.chat(messages, tools=tools, tool_choice=tool_choice, validate=parse_call, **kwargs)
+        return parse_call(response)
+
+    async def stream(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                     max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+                     deadline: Optional[float] = None, call_site: Optional[str] = None,
+                     **params: Any) -> AsyncIterator[str]:
+        """
+        Chat Completion 스트리밍 호출 (생성되는 텍스트 조각을 순서대로 반환)
+
+        첫 토큰을 받기 전의 오류만 재시도합니다. 소비자가 반복을 멈추고 제너레이터를 닫으면
+        (클라이언트 연결 종료 등) 업스트림 스트림도 닫혀 생성이 중단됩니다.
+        게이트웨이 이벤트 루프(앱 루프)에서만 사용할 수 있습니다.
+        """
+        model = model or self.default_model
+        request = {"max_tokens": max_tokens, "temperature": temperature, **params}
+        request = {key: value for key, value in request.items() if value is not None}
+        record = self.telemetry.start_call(model, call_site, streamed=True)
+        parts: List[str] = []
+        error: Optional[BaseException] = None
+        chunks = self._stream(messages, model, deadline, request, record)
+        try:
+            async for delta in chunks:
+                parts.append(delta)
+                yield delta
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            await chunks.aclose()
+            self.telemetry.finish_call(record, messages, content="".join(parts), error=error)
+
+    async def stream_structured(self, messages: List[Dict[str, str]], output_model: Type[ModelT],
+                                name: Optional[str] = None, **kwargs: Any) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        JSON Schema 구조화 출력 스트리밍
+
+        생성 중인 JSON을 파싱할 수 있을 때마다 ("partial", dict)를, 완료되면 검증된 모델을 ("result", 모델)로 반환합니다.
+        """
+        parser = StreamingJSONParser()
+        chunks = self.stream(messages, response_format=response_format_for(output_model, name), **kwargs)
+        try:
+            async for delta in chunks:
+                value = parser.feed(delta)
+                if value is not None:
+                    yield "partial", value
+            value = parser.flush()
+            if value is not None:
+                yield "partial", value
+        finally:
+            await chunks.aclose()
+        yield "result", validate_output(parser.buffer, output_model)
+
+    async def _stream(self, messages: List[Dict[str, str]], model: str, deadline: Optional[float],
+                      request: Dict[str, Any], record: CallRecord) -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None and self._loop.is_running():
+                raise RuntimeError("LLM 스트리밍은 게이트웨이 이벤트 루프에서만 사용할 수 있습니다.")
+            self._bind(loop)
+        if self._provider is None or not self._provider.is_healthy():
+            raise RuntimeError(f"LLM 프로바이더를 사용할 수 없습니다: {self.provider_name}")
+        if not hasattr(self._provider, "generate_streaming_response"):
+            raise RuntimeError(f"스트리밍을 지원하지 않는 프로바이더입니다: {self.provider_name}")
+
+        request = {"timeout": self.request_timeout, **request}
+        bucket = self._bucket(model)
+        deadline_at = loop.time() + (deadline or self.default_deadline)
+
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            started = False
+            try:
+                async with self._limiter:
+                    self._counters["requests"] += 1
+                    self._counters["streams"] += 1
+                    chunks = self._provider.generate_streaming_response("", messages=messages, model=model, **request)
+                    try:
+                        while True:
+                            remaining = deadline_at - loop.time()
+                            if remaining <= 0:
+                                raise asyncio.TimeoutError()
+                            try:
+                                delta = await asyncio.wait_for(chunks.__anext__(), remaining)
+                            except StopAsyncIteration:
+                                return
+                            started = True
+                            yield delta
+                    finally:
+                        await chunks.aclose()
+            except asyncio.TimeoutError:
+                self._counters["deadline_exceeded"] += 1
+                logger.warning(f"LLM 스트리밍 deadline 초과: model={model}")
+                raise
+            except Exception as error:
+                if started or attempt >= self.max_retries or not _is_retryable(error):
+                    self._counters["failures"] += 1
+                    raise
+                await self._backoff(error, attempt, bucket, record)
+
+    async def _stream_to_sink(self, messages: List[Dict[str, str]], model: str, deadline: Optional[float],
+                              request: Dict[str, Any], sink: Callable[[str], None], record: CallRecord) -> LLMResponse:
+        """스트리밍으로 호출해 토큰을 sink에 넘기고, 모은 전체 응답을 반환합니다 (캐시 미사용)."""
+        parts: List[str] = []
+        chunks = self._stream(messages, model, deadline, request, record)
+        try:
+            async for delta in chunks:
+                parts.append(delta)
+                sink(delta)
+        finally:
+            await chunks.aclose()
+        return LLMResponse(content="".join(parts), provider=self.provider_name, model=model,
+                           metadata={"streamed": True})
+
+    async def _chat(self, messages: List[Dict[str, str]], model: str, deadline: Optional[float],
+                    request: Dict[str, Any], cache: bool, cache_ttl: Optional[float], record: CallRecord,
+                    validate: Optional[Callable[[LLMResponse], Any]] = None) -> LLMResponse:
+        if cache and not request.get("stream"):
+            key = self.cache.make_key(model, messages, request)
+            return await self.cache.get_or_compute(
+                key, lambda: self._call(messages, model, deadline, request, record), cache_ttl, validate
+            )
+        response = await self._call(messages, model, deadline, request, record)
+        if validate is not None:
+            validate(response)
+        return response
+
+    async def _call(self, messages: List[Dict[str, str]], model: str, deadline: Optional[float],
+                    request: Dict[str, Any], record: CallRecord) -> LLMResponse:
+        try:
+            return await asyncio.wait_for(
+                self._chat_with_retries(messages, model, request, record),
+                deadline or self.default_deadline
+            )
+        except asyncio.TimeoutError:
+            self._counters["deadline_exceeded"] += 1
+            logger.warning(f"LLM 요청 deadline 초과: model={model}")
+            raise
+
+    async def _chat_with_retries(self, messages: List[Dict[str, str]], model: str,
+                                 request: Dict[str, Any], record: CallRecord) -> LLMResponse:
+        if self._provider is None or not self._provider.is_healthy():
+            raise RuntimeError(f"LLM 프로바이더를 사용할 수 없습니다: {self.provider_name}")
+
+        bucket = self._bucket(model)
+        request = {"timeout": self.request_timeout, **request}
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            try:
+                async with self._limiter:
+                    self._counters["requests"] += 1
+                    return await self._provider.generate_response("", messages=messages, model=model, **request)
+            except Exception as error:
+                if attempt >= self.max_retries or not _is_retryable(error):
+                    self._counters["failures"] += 1
+                    raise
+                await self._backoff(error, attempt, bucket, record)
+
+    async def _backoff(self, error: Exception, attempt: int, bucket: TokenBucket, record: CallRecord) -> None:
+        """재시도 전 대기 (429면 버킷을 비우고, Retry-After가 없으면 full jitter 지수 백오프)"""
+        record.retries += 1
+        if _status_code(error) == 429:
+            self._counters["rate_limited"] += 1
+            record.rate_limited += 1
+            bucket.drain()
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        self._counters["retries"] += 1
+        logger.warning(
+            f"LLM 요청 재시도 {attempt + 1}/{self.max_retries} ({delay:.2f}초 후): "
+            f"{type(error).__name__}: {error}"
+        )
+        await asyncio.sleep(min(delay, self.backoff_max))
+
+    def _start_background_loop(self) -> asyncio.AbstractEventLoop:
+        """실행 중인 게이트웨이 루프가 없을 때(스크립트, 워커 프로세스) 전용 루프 스레드를 띄웁니다."""
+        with self._thread_lock:
+            if self._loop is not None and self._loop.is_running():
+                return self._loop
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+            self._loop = loop
+            loop.call_soon_threadsafe(self._bind, loop)
+            return loop
+
+    def run_sync(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """
+        동기 코드에서 게이트웨이 코루틴을 실행하고 결과를 기다립니다.
+
+        이벤트 루프 스레드에서는 사용할 수 없습니다 (루프가 멈추므로 await 사용).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coro.close()
+            raise RuntimeError("이벤트 루프 안에서는 run_sync 대신 await를 사용하세요.")
+
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            loop = self._start_background_loop()
+        # 호출 스레드의 호출 지점/엔드포인트 라벨을 게이트웨이 루프 태스크로 전달
+        return asyncio.run_coroutine_threadsafe(carry_context(coro), loop).result(timeout or self.default_deadline)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider_name,
+            "default_model": self.default_model,
+            "http2": HTTP2_AVAILABLE,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._limiter.in_flight,
+            "rate_limits_rpm": {model: bucket.rate * 60 for model, bucket in self._buckets.items()},
+            **self._counters,
+            "cache": self.cache.stats()
+        }
+
+    async def close(self) -> None:
+        """연결 풀 정리 (앱 종료 시)"""
+        if self._http_client is not None and self._http_client_loop is asyncio.get_running_loop():
+            await self._http_client.aclose()
+        self._http_client = None
+        self._http_client_loop = None
+        self._provider = None
+        self._loop = None
+
+
+_llm_gateway: Optional[LLMGateway] = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """프로세스 전역 LLM 게이트웨이를 반환합니다."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        with _llm_gateway_lock:
+            if _llm_gateway is None:
+                _llm_gateway = LLMGateway()
+    return _llm_gateway
+
+
+async def close_llm_gateway() -> None:
+    if _llm_gateway is not None:
+        await _llm_gateway.close()
@@ -3,16 +3,21 @@ LLM 프로바이더 기본 인터페이스
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
 
+from ..structured_output import StructuredOutputError, parse_json
+
 logger = logging.getLogger(__name__)
 
 
 class LLMProvider(ABC):
     """LLM 프로바이더 기본 클래스"""
     
+    # 외부 API 키가 있어야 동작하는지 (로컬 프로바이더는 False)
+    requires_api_key = True
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.model_name = config.get("model_name", "")
@@ -110,24 +115,24 @@ class LLMResponse:
             return (self.end_time - self.start_time).total_seconds()
         return 0.0
     
+    @property
+    def tool_calls(self) -> List[Dict[str, Any]]:
+        """함수 호출 응답의 호출 목록 ([{"id", "name", "arguments"}], 없으면 빈 리스트)"""
+        return self.metadata.get("tool_calls") or []
+
     def is_valid_json(self) -> bool:
-        """응답이 유효한 JSON인지 확인"""
-        import json
+        """응답이 유효한 JSON인지 확인 (```json 코드 펜스 허용)"""
         try:
-            json.loads(self.content)
+            parse_json(self.content)
             return True
-        except (json.JSONDecodeError, ValueError):
+        except StructuredOutputError:
             return False
     
     def get_json(self) -> Optional[Dict[str, Any]]:
-        """JSON 응답 파싱"""
-        if not self.is_valid_json():
-            return None
-        
-        import json
+        """JSON 응답 파싱 (유효하지 않으면 None)"""
         try:
-            return json.loads(self.content)
-        except Exception:
+            return parse_json(self.content)
+        except StructuredOutputError:
             return None
     
     def __str__(self) -> str:
@@ -160,6 +165,11 @@ class LLMProviderFactory:
             logger.error(f"프로바이더 생성 실패: {name}, 오류: {str(e)}")
             return None
     
+    @classmethod
+    def get_provider_class(cls, name: str) -> Optional[type]:
+        """등록된 프로바이더 클래스 반환"""
+        return cls._providers.get(name)
+    
     @classmethod
     def get_available_providers(cls) -> list:
         """사용 가능한 프로바이더 목록 반환"""
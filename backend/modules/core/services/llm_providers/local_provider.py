@@ -0,0 +1,436 @@
+"""
+로컬 LLM 프로바이더 (부하 테스트/벤치마크/CI용)
+
+외부 API 없이 OpenAI 프로바이더와 같은 인터페이스로 응답합니다. LLM_PROVIDER=local로 사용합니다.
+
+- 응답 내용은 요청 메시지로 결정 (같은 요청이면 항상 같은 응답)
+- response_format이 json_schema면 스키마에 맞는 JSON, json_object면 프롬프트의 JSON 예시 형식을 채운 JSON
+- tools가 있으면 tool_choice로 지정된 함수, 없으면 프롬프트와 이름/설명이 가장 많이 겹치는 함수를 스키마에 맞는 인자로 호출
+- LLMBatchScorer 배치 프롬프트([항목 id=N])는 항목별 결과 JSON으로 응답
+- LOCAL_LLM_RESPONSES 파일의 정규식 → 고정 응답 목록이 있으면 우선 사용
+- 첫 토큰 지연(로그 정규 분포) + 프롬프트 처리 시간 + 생성 토큰 수 / 초당 토큰 수로 실제와 비슷한 지연 시간
+- 429/5xx/타임아웃 오류를 지정한 비율로 주입 (게이트웨이 재시도/백오프 경로 확인용)
+
+환경 변수:
+    LOCAL_LLM_LATENCY_MS (600, 첫 토큰까지 지연 중앙값), LOCAL_LLM_LATENCY_JITTER (0.4, 로그 정규 sigma)
+    LOCAL_LLM_PREFILL_MS_PER_1K (40, 프롬프트 1000토큰당 추가 지연), LOCAL_LLM_TOKENS_PER_SECOND (80)
+    LOCAL_LLM_RATE_LIMIT_RATE (0), LOCAL_LLM_ERROR_RATE (0), LOCAL_LLM_TIMEOUT_RATE (0)
+    LOCAL_LLM_SEED (지연/오류 난수 시드, 없으면 매번 다름), LOCAL_LLM_RESPONSES (고정 응답 JSON 파일 경로)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .base_provider import LLMProvider, LLMResponse, LLMProviderFactory
+from ..llm_telemetry import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 일반 텍스트 응답 문장 (프롬프트 키워드로 채움)
+SENTENCE_TEMPLATES = (
+    "{0} 관련 경험이 확인되며 실무 적용 사례가 구체적으로 제시되어 있습니다.",
+    "{0}와 {1}을 함께 다룬 이력이 있어 직무 적합도가 높은 편입니다.",
+    "{1} 측면에서는 추가 확인이 필요하며 면접에서 세부 내용을 검증하는 것을 권장합니다.",
+    "전반적으로 {0} 역량이 강점이며 {2} 분야로의 확장 가능성도 보입니다.",
+    "제시된 정보를 바탕으로 볼 때 {2} 경험은 보통 수준으로 판단됩니다.",
+    "{0} 중심의 성과가 수치로 드러나 있어 신뢰도가 높습니다.",
+    "협업과 커뮤니케이션 측면에서 {1} 관련 사례가 언급되어 있습니다."
+)
+DEFAULT_KEYWORDS = ("직무", "경험", "역량")
+# 프롬프트 지시문에 흔한 단어 (응답 키워드에서 제외)
+TEMPLATE_WORDS = frozenset({
+    "json", "id", "null", "true", "false", "항목", "다음", "응답", "형식", "결과", "분석", "정보", "텍스트",
+    "추출", "작성", "해주세요", "주세요", "입니다", "합니다", "있습니다", "경우", "반드시", "필드"
+})
+_WORD = re.compile(r'[A-Za-z][A-Za-z0-9+#.]{1,}|[가-힣]{2,}')
+_BATCH_ITEM = re.compile(r'\[항목 id=(\d+)\]')
+_BATCH_FIELD = re.compile(r'^\s*-\s*"([^"]+)":\s*(.*)$', re.MULTILINE)
+_JSON_KEY = re.compile(r'"([^"\n]{1,60})"\s*:')
+
+
+class LocalProviderError(Exception):
+    """주입된 API 오류 (게이트웨이가 status_code/Retry-After를 실제 API 오류처럼 읽음)"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = _InjectedResponse(status_code, retry_after)
+
+
+class _InjectedResponse:
+    def __init__(self, status_code: int, retry_after: Optional[float]):
+        self.status_code = status_code
+        self.headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+
+
+class LatencyModel:
+    """첫 토큰 지연(로그 정규 분포) + 프롬프트 처리 시간 + 생성 속도로 응답 시간을 계산합니다."""
+
+    def __init__(self, median_ms: float = 600.0, jitter: float = 0.4, prefill_ms_per_1k: float = 40.0,
+                 tokens_per_second: float = 80.0, seed: Optional[int] = None):
+        self.median_ms = median_ms
+        self.jitter = jitter
+        self.prefill_ms_per_1k = prefill_ms_per_1k
+        self.tokens_per_second = tokens_per_second
+        self.rng = random.Random(seed)
+
+    def first_token(self, prompt_tokens: int = 0) -> float:
+        """첫 토큰까지 걸리는 시간(초)"""
+        base = self.median_ms * math.exp(self.rng.gauss(0.0, self.jitter)) if self.median_ms > 0 else 0.0
+        return (base + self.prefill_ms_per_1k * prompt_tokens / 1000) / 1000
+
+    def per_token(self) -> float:
+        """생성 토큰 하나당 시간(초)"""
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+def _env_float(config: Dict[str, Any], key: str, env: str, default: float) -> float:
+    value = config.get(key)
+    if value is None:
+        value = os.getenv(env)
+    return float(value) if value not in (None, "") else default
+
+
+def _request_seed(messages: List[Dict[str, Any]], model: str) -> int:
+    digest = hashlib.sha256(json.dumps([model, messages], ensure_ascii=False, sort_keys=True, default=str).encode())
+    return int.from_bytes(digest.digest()[:8], "big")
+
+
+def _keywords(text: str, limit: int = 3) -> List[str]:
+    """응답 문장에 넣을 프롬프트 키워드 (영문 기술 용어 우선, 지시문 단어 제외)"""
+    counts = Counter(word.lower() if word.isascii() else word for word in _WORD.findall(text))
+    candidates = [
+        word for word, _ in counts.most_common()
+        if word not in TEMPLATE_WORDS and not any(word.startswith(common) for common in TEMPLATE_WORDS if not common.isascii())
+    ]
+    words = sorted(candidates, key=lambda word: not word.isascii())[:limit]
+    return words + list(DEFAULT_KEYWORDS[len(words):limit])
+
+
+def _text_value(key: str, rng: random.Random, keywords: List[str]) -> str:
+    return f"{rng.choice(keywords)} 기반 {key} 요약"
+
+
+def _fill_like(example: Any, key: str, rng: random.Random, keywords: List[str]) -> Any:
+    """JSON 예시 값과 같은 타입/모양의 값을 만듭니다."""
+    if isinstance(example, dict):
+        return {child_key: _fill_like(child, child_key, rng, keywords) for child_key, child in example.items()}
+    if isinstance(example, list):
+        template = example[0] if example else ""
+        return [_fill_like(template, key, rng, keywords) for _ in range(rng.randint(2, 3))]
+    if isinstance(example, bool):
+        return rng.random() < 0.5
+    if isinstance(example, int):
+        return rng.randint(0, 100) if example <= 100 else rng.randint(example // 2, example * 2)
+    if isinstance(example, float):
+        return round(rng.random(), 2) if example <= 1 else round(rng.uniform(0, 100), 1)
+    return _text_value(key, rng, keywords)
+
+
+def _sample_schema(schema: Dict[str, Any], key: str, rng: random.Random, keywords: List[str],
+                   definitions: Dict[str, Any]) -> Any:
+    """JSON Schema에 맞는 값을 만듭니다 (object/array/string/number/integer/boolean/enum/$ref/anyOf)."""
+    if "$ref" in schema:
+        return _sample_schema(definitions.get(schema["$ref"].rsplit("/", 1)[-1], {}), key, rng, keywords, definitions)
+    for combinator in ("anyOf", "oneOf"):
+        if schema.get(combinator):
+            options = [option for option in schema[combinator] if option.get("type") != "null"] or schema[combinator]
+            return _sample_schema(options[0], key, rng, keywords, definitions)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+
+    schema_type = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(schema_type, list):
+        schema_type = next((item for item in schema_type if item != "null"), "string")
+    if schema_type == "object":
+        return {
+            name: _sample_schema(child, name, rng, keywords, definitions)
+            for name, child in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        low = schema.get("minItems", 1)
+        high = max(low, min(schema.get("maxItems", 3), 3))
+        return [_sample_schema(schema.get("items", {}), key, rng, keywords, definitions) for _ in range(rng.randint(low, high))]
+    if schema_type == "integer":
+        return rng.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 100)))
+    if schema_type == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 1.0)), 3)
+    if schema_type == "boolean":
+        return rng.random() < 0.5
+    text = _text_value(key, rng, keywords)
+    return text[:schema["maxLength"]] if schema.get("maxLength") else text
+
+
+def _json_blocks(text: str) -> List[str]:
+    """텍스트 안의 균형 잡힌 최상위 {...} 블록들"""
+    blocks, depth, start = [], 0, None
+    for index, char in enumerate(text):
+        if char == "{":
+            if depth == 0:
+                start = index
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                blocks.append(text[start:index + 1])
+    return blocks
+
+
+class LocalProvider(LLMProvider):
+    """외부 API 없이 결정적인 응답을 만드는 로컬 프로바이더"""
+
+    requires_api_key = False
+
+    def __init__(self, config: Dict[str, Any]):
+        self.latency: Optional[LatencyModel] = None
+        self.rate_limit_rate = 0.0
+        self.error_rate = 0.0
+        self.timeout_rate = 0.0
+        self.request_timeout = 30.0
+        self.canned_responses: List[Tuple[re.Pattern, str]] = []
+        super().__init__(config)
+
+    def _initialize(self) -> None:
+        seed = self.config.get("seed", os.getenv("LOCAL_LLM_SEED"))
+        self.latency = LatencyModel(
+            median_ms=_env_float(self.config, "latency_ms", "LOCAL_LLM_LATENCY_MS", 600.0),
+            jitter=_env_float(self.config, "latency_jitter", "LOCAL_LLM_LATENCY_JITTER", 0.4),
+            prefill_ms_per_1k=_env_float(self.config, "prefill_ms_per_1k", "LOCAL_LLM_PREFILL_MS_PER_1K", 40.0),
+            tokens_per_second=_env_float(self.config, "tokens_per_second", "LOCAL_LLM_TOKENS_PER_SECOND", 80.0),
+            seed=int(seed) if seed not in (None, "") else None
+        )
+        self.rate_limit_rate = _env_float(self.config, "rate_limit_rate", "LOCAL_LLM_RATE_LIMIT_RATE", 0.0)
+        self.error_rate = _env_float(self.config, "error_rate", "LOCAL_LLM_ERROR_RATE", 0.0)
+        self.timeout_rate = _env_float(self.config, "timeout_rate", "LOCAL_LLM_TIMEOUT_RATE", 0.0)
+        self.request_timeout = float(self.config.get("request_timeout", 30.0))
+        self.canned_responses = self._load_canned_responses(
+            self.config.get("responses_path") or os.getenv("LOCAL_LLM_RESPONSES")
+        )
+        self.is_available = True
+        logger.info(
+            f"로컬 LLM 프로바이더 초기화: latency={self.latency.median_ms}ms, "
+            f"429={self.rate_limit_rate}, 5xx={self.error_rate}, timeout={self.timeout_rate}"
+        )
+
+    @staticmethod
+    def _load_canned_responses(path: Optional[str]) -> List[Tuple[re.Pattern, str]]:
+        """[{"match": "정규식", "response": "문자열 또는 JSON 객체"}, ...] 형식의 고정 응답 파일"""
+        if not path:
+            return []
+        try:
+            with open(path, encoding="utf-8") as file:
+                entries = json.load(file)
+        except Exception as e:
+            logger.error(f"로컬 LLM 고정 응답 파일 로드 실패: {path}, 오류: {str(e)}")
+            return []
+        canned = []
+        for entry in entries:
+            response = entry.get("response", "")
+            if not isinstance(response, str):
+                response = json.dumps(response, ensure_ascii=False)
+            canned.append((re.compile(entry.get("match", ".*"), re.DOTALL), response))
+        return canned
+
+    def _messages(self, prompt: str, kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "messages" in kwargs:
+            return kwargs["messages"]
+        return [
+            {"role": "system", "content": kwargs.get("system_message", "You are a helpful HR assistant.")},
+            {"role": "user", "content": prompt}
+        ]
+
+    def render(self, messages: List[Dict[str, Any]], model: str, max_tokens: Optional[int] = None,
+               response_format: Optional[Dict[str, Any]] = None) -> str:
+        """요청 메시지로 결정되는 응답 내용을 만듭니다."""
+        prompt = "\n".join(str(message.get("content") or "") for message in messages if message.get("role") != "system")
+        for pattern, response in self.canned_responses:
+            if pattern.search(prompt):
+                return response
+
+        rng = random.Random(_request_seed(messages, model))
+        # JSON 예시의 키 이름이 키워드로 뽑히지 않도록 예시 블록은 제외
+        plain = prompt
+        for block in _json_blocks(prompt):
+            plain = plain.replace(block, " ")
+        keywords = _keywords(plain)
+        response_type = (response_format or {}).get("type")
+        if response_type == "json_schema":
+            json_schema = response_format.get("json_schema", {})
+            schema = json_schema.get("schema", json_schema)
+            value = _sample_schema(schema, "result", rng, keywords, schema.get("$defs") or schema.get("definitions") or {})
+            return json.dumps(value, ensure_ascii=False)
+        if response_type == "json_object" or ("JSON" in prompt.upper() and _json_blocks(prompt)):
+            return json.dumps(self._render_json(prompt, rng, keywords), ensure_ascii=False)
+
+        sentence_count = max(1, min(6, (max_tokens or self.max_tokens) // 60))
+        return " ".join(
+            rng.choice(SENTENCE_TEMPLATES).format(*rng.sample(keywords, len(keywords)))
+            for _ in range(sentence_count)
+        )
+
+    def render_tool_call(self, messages: List[Dict[str, Any]], model: str, tools: List[Dict[str, Any]],
+                         tool_choice: Any = "auto") -> Optional[Dict[str, Any]]:
+        """호출할 함수와 스키마에 맞는 인자 ({"id", "name", "arguments"}), 함수를 호출하지 않으면 None"""
+        functions = [tool.get("function", {}) for tool in tools if tool.get("type", "function") == "function"]
+        if not functions or tool_choice == "none":
+            return None
+        prompt = "\n".join(str(message.get("content") or "") for message in messages if message.get("role") != "system")
+        if isinstance(tool_choice, dict):
+            chosen_name = tool_choice.get("function", {}).get("name")
+            function = next((item for item in functions if item.get("name") == chosen_name), functions[0])
+        else:
+            prompt_words = set(_keywords(prompt, limit=50))
+            overlaps = [
+                len(prompt_words & set(_keywords(f"{item.get('name', '').replace('_', ' ')} {item.get('description', '')}", limit=50)))
+                for item in functions
+            ]
+            best = max(range(len(functions)), key=lambda index: overlaps[index])
+            if tool_choice != "required" and not overlaps[best]:
+                return None
+            function = functions[best]
+
+        rng = random.Random(_request_seed(messages, model))
+        schema = function.get("parameters") or {"type": "object", "properties": {}}
+        arguments = _sample_schema(schema, "arguments", rng, _keywords(prompt), schema.get("$defs") or schema.get("definitions") or {})
+        return {
+            "id": f"call_{rng.getrandbits(48):012x}",
+            "name": function.get("name", ""),
+            "arguments": json.dumps(arguments, ensure_ascii=False)
+        }
+
+    def _render_json(self, prompt: str, rng: random.Random, keywords: List[str]) -> Dict[str, Any]:
+        # LLMBatchScorer 배치 프롬프트: 항목별 결과
+        item_ids = _BATCH_ITEM.findall(prompt)
+        if item_ids:
+            fields = [(name, description) for name, description in _BATCH_FIELD.findall(prompt) if name != "id"]
+            return {"results": [
+                {"id": int(item_id), **{
+                    name: rng.randint(50, 95) if "점수" in description or "score" in name.lower()
+                    else _text_value(name, rng, keywords)
+                    for name, description in fields
+                }}
+                for item_id in item_ids
+            ]}
+
+        # 프롬프트의 JSON 예시 형식 (마지막으로 파싱되는 블록 우선, 파싱 안 되면 키만 사용)
+        blocks = _json_blocks(prompt)
+        for block in reversed(blocks):
+            try:
+                example = json.loads(block)
+            except ValueError:
+                continue
+            if isinstance(example, dict) and example:
+                return _fill_like(example, "result", rng, keywords)
+        for block in reversed(blocks):
+            keys = list(dict.fromkeys(_JSON_KEY.findall(block)))
+            if keys:
+                return {key: _text_value(key, rng, keywords) for key in keys}
+        return {"result": _text_value("result", rng, keywords)}
+
+    def _inject_error(self) -> Optional[str]:
+        """주입할 오류 종류 ("rate_limit", "error", "timeout") 또는 None"""
+        roll = self.latency.rng.random()
+        for kind, rate in (("rate_limit", self.rate_limit_rate), ("error", self.error_rate), ("timeout", self.timeout_rate)):
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    async def _wait_first_token(self, prompt_tokens: int, timeout: float) -> None:
+        """첫 토큰 지연만큼 기다리고, 주입된 오류가 있으면 발생시킵니다."""
+        injected = self._inject_error()
+        delay = self.latency.first_token(prompt_tokens)
+        if injected == "timeout" or delay > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError()
+        await asyncio.sleep(delay)
+        if injected == "rate_limit":
+            raise LocalProviderError(429, "Rate limit reached (local provider)", retry_after=round(self.latency.rng.uniform(0.5, 2.0), 2))
+        if injected == "error":
+            raise LocalProviderError(self.latency.rng.choice((500, 502, 503)), "Upstream error (local provider)")
+
+    async def generate_response(self, prompt: str, **kwargs) -> LLMResponse:
+        """지연 시간을 흉내 낸 뒤 결정적인 응답을 반환합니다."""
+        start_time = datetime.now()
+        messages = self._messages(prompt, kwargs)
+        model = kwargs.get("model", self.model_name)
+        max_tokens = kwargs.get("max_tokens", self.max_tokens)
+        prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) for message in messages)
+
+        await self._wait_first_token(prompt_tokens, kwargs.get("timeout", self.request_timeout))
+        tool_call = None
+        if kwargs.get("tools"):
+            tool_call = self.render_tool_call(messages, model, kwargs["tools"], kwargs.get("tool_choice", "auto"))
+        if tool_call:
+            content = ""
+            completion_tokens = estimate_tokens(tool_call["name"] + tool_call["arguments"])
+        else:
+            content = self.render(messages, model, max_tokens, kwargs.get("response_format"))
+            completion_tokens = estimate_tokens(content)
+        await asyncio.sleep(completion_tokens * self.latency.per_token())
+
+        metadata = {
+            "model": model,
+            "finish_reason": "tool_calls" if tool_call else "stop",
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+        if tool_call:
+            metadata["tool_calls"] = [tool_call]
+        return LLMResponse(
+            content=content,
+            provider="Local",
+            model=model,
+            metadata=metadata,
+            start_time=start_time,
+            end_time=datetime.now()
+        )
+
+    async def generate_streaming_response(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """응답을 단어 단위로 생성 속도에 맞춰 나눠 보냅니다."""
+        messages = self._messages(prompt, kwargs)
+        model = kwargs.get("model", self.model_name)
+        prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) for message in messages)
+
+        await self._wait_first_token(prompt_tokens, kwargs.get("timeout", self.request_timeout))
+        content = self.render(messages, model, kwargs.get("max_tokens", self.max_tokens), kwargs.get("response_format"))
+        for index, piece in enumerate(re.findall(r'\S+\s*', content)):
+            if index:
+                await asyncio.sleep(estimate_tokens(piece) * self.latency.per_token())
+            yield piece
+
+    def is_healthy(self) -> bool:
+        return self.is_available
+
+    async def health_check(self) -> Dict[str, Any]:
+        return {
+            "provider": "Local",
+            "is_available": self.is_available,
+            "is_healthy": self.is_healthy(),
+            "connection_status": "healthy",
+            "config": {
+                "latency_ms": self.latency.median_ms,
+                "tokens_per_second": self.latency.tokens_per_second,
+                "rate_limit_rate": self.rate_limit_rate,
+                "error_rate": self.error_rate,
+                "timeout_rate": self.timeout_rate,
+                "canned_responses": len(self.canned_responses)
+            }
+        }
+
+
+LLMProviderFactory.register_provider("local", LocalProvider)
@@ -8,7 +8,6 @@ Azure OpenAI와 OpenAI API 모두 지원합니다.
 import os
 import logging
 from typing import Dict, Any, Optional, List
-import asyncio
 import json
 from datetime import datetime
 
@@ -54,11 +53,9 @@ class OpenAIProvider(LLMProvider):
             # 클라이언트 설정 구성
             client_config = self._build_client_config()
             
-            # 클라이언트 생성
+            # 클라이언트 생성 (연결 확인은 health_check에서 비동기로 수행)
             self.client = AsyncOpenAI(**client_config)
-            
-            # 연결 테스트
-            self._test_connection()
+            self.is_available = True
             
         except Exception as e:
             logger.error(f"OpenAI 초기화 실패: {str(e)}")
@@ -113,33 +110,12 @@ class OpenAIProvider(LLMProvider):
             client_config["base_url"] = self.base_url
             client_config["api_version"] = self.api_version
         
+        # 공유 연결 풀 (LLM 게이트웨이에서 전달)
+        if self.config.get("http_client") is not None:
+            client_config["http_client"] = self.config["http_client"]
+        
         return client_config
     
-    def _test_connection(self) -> None:
-        """연결 테스트"""
-        try:
-            # 간단한 모델 목록 조회로 연결 테스트
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            async def test():
-                try:
-                    models = await self.client.models.list()
-                    available_models = [model.id for model in models.data]
-                    logger.info(f"OpenAI 연결 성공. 사용 가능한 모델: {len(available_models)}개")
-                    logger.debug(f"사용 가능한 모델: {available_models[:5]}...")
-                    self.is_available = True
-                except Exception as e:
-                    logger.error(f"OpenAI 연결 테스트 실패: {str(e)}")
-                    self.is_available = False
-            
-            loop.run_until_complete(test())
-            loop.close()
-            
-        except Exception as e:
-            logger.error(f"연결 테스트 중 오류: {str(e)}")
-            self.is_available = False
-    
     async def generate_response(self, prompt: str, **kwargs) -> LLMResponse:
         """OpenAI API를 사용한 응답 생성"""
         if not self.is_available or not self.client:
@@ -194,9 +170,18 @@ class OpenAIProvider(LLMProvider):
         if "stop" in kwargs:
             request_params["stop"] = kwargs["stop"]
         
+        if "response_format" in kwargs:
+            request_params["response_format"] = kwargs["response_format"]
+        
+        # 함수 호출 (tools 정의와 선택 방식)
+        if kwargs.get("tools"):
+            request_params["tools"] = kwargs["tools"]
+            if "tool_choice" in kwargs:
+                request_params["tool_choice"] = kwargs["tool_choice"]
+        
         return request_params
     
-    def _process_response(self, response: ChatCompletion, start_time: datetime) -> LLMResponse:
+    def _process_response(self, response: "ChatCompletion", start_time: datetime) -> LLMResponse:
         """API 응답 처리"""
         if not response.choices or len(response.choices) == 0:
             raise ValueError("OpenAI API에서 빈 응답을 받았습니다.")
@@ -222,6 +207,13 @@ class OpenAIProvider(LLMProvider):
             "created": response.created
         }
         
+        # 함수 호출 응답 (arguments는 JSON 문자열 그대로, 검증은 게이트웨이에서)
+        if choice.message.tool_calls:
+            metadata["tool_calls"] = [
+                {"id": call.id, "name": call.function.name, "arguments": call.function.arguments}
+                for call in choice.message.tool_calls
+            ]
+        
         return LLMResponse(
             content=content,
             provider="OpenAI",
@@ -242,11 +234,15 @@ class OpenAIProvider(LLMProvider):
             
             stream = await self.client.chat.completions.create(**request_params)
             
-            async for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta.content:
-                        yield delta.content
+            try:
+                async for chunk in stream:
+                    if chunk.choices and len(chunk.choices) > 0:
+                        delta = chunk.choices[0].delta
+                        if delta.content:
+                            yield delta.content
+            finally:
+                # 소비자가 중간에 닫아도 HTTP 응답을 닫아 업스트림 생성을 중단
+                await stream.close()
                         
         except Exception as e:
             logger.error(f"OpenAI 스트리밍 응답 생성 실패: {str(e)}")
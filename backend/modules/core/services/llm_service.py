@@ -1,7 +1,14 @@
-from typing import Dict, Any, Optional, List
-from openai import OpenAI
+from typing import Dict, Any, Optional, List, Tuple, Type
 import os
 from datetime import datetime
+from pydantic import BaseModel
+from .llm_batching import LLMBatchScorer
+from .llm_gateway import get_llm_gateway
+from .prompt_budget import compact_text
+from .structured_output import ModelT
+
+# 배치 표절 분석 프롬프트에 넣을 비교 문서 발췌 토큰 예산
+PLAGIARISM_EXCERPT_TOKENS = 120
 
 class LLMService:
     def __init__(self):
@@ -9,18 +16,24 @@ class LLMService:
         LLM 서비스 초기화
         """
         print(f"[LLMService] === LLM 서비스 초기화 시작 ===")
+        # 모든 호출은 공유 LLM 게이트웨이(연결 풀, rate limit, 재시도)를 통해 수행
+        self.gateway = get_llm_gateway()
         api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        if not self.gateway.api_key_required:
+            print(f"[LLMService] 로컬 LLM 프로바이더 사용 ({self.gateway.provider_name})")
+        elif not api_key:
             print(f"[LLMService] 경고: OPENAI_API_KEY 환경변수가 설정되지 않았습니다!")
         else:
             print(f"[LLMService] OPENAI_API_KEY 확인됨 (길이: {len(api_key)})")
-        
-        self.client = OpenAI(api_key=api_key)
         self.model_name = 'gpt-4o'
-        print(f"[LLMService] OpenAI 클라이언트 초기화 완료: {self.model_name}")
+        # 후보 여러 명의 분석을 묶어서 요청하는 배치 처리기
+        self.batch_scorer = LLMBatchScorer(model=self.model_name)
+        print(f"[LLMService] LLM 게이트웨이 연결 완료: {self.model_name}")
         print(f"[LLMService] === LLM 서비스 초기화 완료 ===")
     
-    async def chat_completion(self, messages: List[Dict[str, str]], max_tokens: int = 1000, temperature: float = 0.7) -> str:
+    async def chat_completion(self, messages: List[Dict[str, str]], max_tokens: int = 1000, temperature: float = 0.7,
+                              cache: Optional[bool] = None, stream_tokens: bool = False,
+                              call_site: Optional[str] = None) -> str:
         """
         OpenAI Chat Completion API를 사용하여 대화 응답을 생성합니다.
         
@@ -28,6 +41,9 @@ class LLMService:
             messages (List[Dict[str, str]]): 대화 메시지 리스트
             max_tokens (int): 최대 토큰 수
             temperature (float): 창의성 조절 (0.0 ~ 1.0)
+            cache (Optional[bool]): 응답 캐시 사용 여부 (None이면 temperature 기준으로 게이트웨이가 결정)
+            stream_tokens (bool): SSE 스트리밍 요청 안에서 호출된 경우 생성 중인 토큰을 클라이언트로 전달
+            call_site (Optional[str]): 토큰/비용/지연 시간 집계용 호출 지점 이름
             
         Returns:
             str: AI 응답 텍스트
@@ -37,14 +53,17 @@ class LLMService:
             print(f"[LLMService] 메시지 수: {len(messages)}")
             print(f"[LLMService] 모델: {self.model_name}")
             
-            response = self.client.chat.completions.create(
+            response = await self.gateway.chat(
+                messages,
                 model=self.model_name,
-                messages=messages,
                 max_tokens=max_tokens,
-                temperature=temperature
+                temperature=temperature,
+                cache=cache,
+                stream_tokens=stream_tokens,
+                call_site=call_site
             )
             
-            result = response.choices[0].message.content
+            result = response.content
             print(f"[LLMService] 응답 생성 완료 (길이: {len(result) if result else 0})")
             print(f"[LLMService] === Chat Completion 완료 ===")
             
@@ -55,6 +74,54 @@ class LLMService:
             print(f"[LLMService] 오류: {str(e)}")
             return f"죄송합니다. 응답 생성 중 오류가 발생했습니다: {str(e)}"
     
+    async def structured_completion(self, messages: List[Dict[str, str]], output_model: Type[ModelT],
+                                    max_tokens: int = 1000, temperature: float = 0.1,
+                                    cache: Optional[bool] = None, call_site: Optional[str] = None) -> Optional[ModelT]:
+        """
+        output_model 스키마에 맞는 JSON 응답을 검증된 모델로 받습니다 (JSON Schema 구조화 출력).
+        
+        Returns:
+            Optional[ModelT]: 검증된 응답 모델 (호출 또는 검증 실패 시 None)
+        """
+        try:
+            return await self.gateway.chat_structured(
+                messages,
+                output_model,
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                cache=cache,
+                call_site=call_site
+            )
+        except Exception as e:
+            print(f"[LLMService] 구조화 출력 실패 ({output_model.__name__}): {str(e)}")
+            return None
+    
+    async def function_call(self, messages: List[Dict[str, str]], functions: Dict[str, Type[BaseModel]],
+                            tool_choice: str = "auto", max_tokens: int = 500, temperature: float = 0.1,
+                            cache: Optional[bool] = None,
+                            call_site: Optional[str] = None) -> Optional[Tuple[str, BaseModel]]:
+        """
+        함수 호출로 (함수 이름, 검증된 인자 모델)을 받습니다.
+        
+        Returns:
+            Optional[Tuple[str, BaseModel]]: 모델이 함수를 호출하지 않았거나 호출/검증 실패 시 None
+        """
+        try:
+            return await self.gateway.call_function(
+                messages,
+                functions,
+                tool_choice=tool_choice,
+                model=self.model_name,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                cache=cache,
+                call_site=call_site
+            )
+        except Exception as e:
+            print(f"[LLMService] 함수 호출 실패: {str(e)}")
+            return None
+    
     async def analyze_plagiarism_suspicion(self, 
                                     original_resume: Dict[str, Any], 
                                     similar_resumes: List[Dict[str, Any]],
@@ -106,12 +173,7 @@ class LLMService:
             print(f"[LLMService] 최고 유사도 점수: {max_similarity:.3f}")
             
             # 의심도 레벨 결정
-            if max_similarity >= 0.8:
-                suspicion_level = "HIGH"
-            elif max_similarity >= 0.6:
-                suspicion_level = "MEDIUM"
-            else:
-                suspicion_level = "LOW"
+            suspicion_level = self._suspicion_level(max_similarity)
             
             suspicion_score = max_similarity
             
@@ -157,12 +219,14 @@ class LLMService:
         """
         유사 지원자들에 대한 LLM 분석 수행
         
+        지원자별 분석을 배치 프롬프트(JSON)로 받아 기존 마크다운 형식(### 1~3 섹션)으로 조합합니다.
+        
         Args:
             target_applicant (Dict): 기준 지원자 정보
             similar_applicants (List[Dict]): 유사한 지원자들 정보
             
         Returns:
-            Dict: LLM 분석 결과
+            Dict: LLM 분석 결과 (analysis: 마크다운, applicant_analyses: 지원자별 결과)
         """
         try:
             print(f"[LLMService] === 유사 지원자 LLM 분석 시작 ===")
@@ -175,30 +239,49 @@ class LLMService:
                     "message": "분석할 유사 지원자가 없습니다."
                 }
             
-            # LLM 프롬프트 구성
-            prompt = self._create_similar_applicants_analysis_prompt(target_applicant, similar_applicants)
-            
-            # OpenAI API 호출
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": "당신은 인재 채용 전문가입니다. 반드시 요청된 정확한 형식을 따라 응답해주세요. 특히 '### 3. 각 유사 지원자별 상세 분석' 섹션에서 각 지원자마다 🔍 핵심 공통점, 💡 주요 특징, ⭐ 추천 이유, 🎯 유사성 요인을 모두 포함해야 합니다."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,  # 더 일관된 응답을 위해 낮춤
-                max_tokens=1000
+            instruction = f"""다음 기준 지원자와 유사한 지원자들을 찾았습니다. 각 유사 지원자가 왜 유사한지 분석해주세요.
+
+**기준 지원자:**
+{self._format_applicant_profile(target_applicant)}"""
+            items = [
+                f"{applicant['rank']}순위. {applicant.get('name', 'N/A')}\n"
+                f"{self._format_applicant_profile(applicant)}\n"
+                f"- 유사도 점수: {applicant.get('final_score', 0):.3f} "
+                f"(벡터: {applicant.get('vector_score', 0):.3f}, 키워드: {applicant.get('keyword_score', 0):.3f})"
+                for applicant in similar_applicants
+            ]
+            results = await self.batch_scorer.score(
+                instruction,
+                items,
+                fields={
+                    "common_points": "기준 지원자와의 주요 공통점 1줄",
+                    "key_features": "핵심 역량이나 경력 요약 1줄",
+                    "recommendation_reason": "구체적인 추천 근거 1줄",
+                    "similarity_factor": "유사성에 가장 큰 영향을 미친 특성 1줄"
+                },
+                system_message="당신은 인재 채용 전문가입니다. 요청된 JSON 형식으로만 응답해주세요.",
+                call_site="similar_applicants"
             )
             
-            analysis_text = response.choices[0].message.content.strip()
-            
-            print(f"[LLMService] LLM 분석 완료")
-            print(f"[LLMService] === LLM 분석 결과 ===")
-            print(analysis_text[:500] + "..." if len(analysis_text) > 500 else analysis_text)
-            print(f"[LLMService] === LLM 분석 결과 끝 ===")
+            applicant_analyses = []
+            for applicant, result in zip(similar_applicants, results):
+                result = result or {}
+                applicant_analyses.append({
+                    "rank": applicant.get("rank"),
+                    "name": applicant.get("name", "N/A"),
+                    "common_points": result.get("common_points") or "분석 정보 없음",
+                    "key_features": result.get("key_features") or "분석 정보 없음",
+                    "recommendation_reason": result.get("recommendation_reason") or "분석 정보 없음",
+                    "similarity_factor": result.get("similarity_factor") or "분석 정보 없음"
+                })
+            analysis_text = self._render_similar_applicants_analysis(applicant_analyses)
+            
+            print(f"[LLMService] LLM 분석 완료 (LLM 호출 {self.batch_scorer.last_call_count}회)")
             
             return {
                 "success": True,
                 "analysis": analysis_text,
+                "applicant_analyses": applicant_analyses,
                 "target_applicant": target_applicant,
                 "similar_count": len(similar_applicants),
                 "analyzed_at": datetime.now().isoformat()
@@ -213,58 +296,120 @@ class LLMService:
                 "analyzed_at": datetime.now().isoformat()
             }
 
-    def _create_similar_applicants_analysis_prompt(self, target_applicant: Dict[str, Any], 
-                                                 similar_applicants: List[Dict[str, Any]]) -> str:
-        """유사 지원자 분석용 프롬프트 생성"""
-        
-        # 기준 지원자 정보
-        prompt = f"""다음 기준 지원자와 유사한 지원자들을 찾았습니다. 왜 유사한지 분석해주세요.
+    @staticmethod
+    def _format_applicant_profile(applicant: Dict[str, Any]) -> str:
+        return (
+            f"- 지원직무: {applicant.get('position', 'N/A')}\n"
+            f"- 경력: {applicant.get('experience', 'N/A')}\n"
+            f"- 기술스택: {applicant.get('skills', 'N/A')}\n"
+            f"- 부서: {applicant.get('department', 'N/A')}"
+        )
 
-**기준 지원자:**
-- 이름: {target_applicant.get('name', 'N/A')}
-- 지원직무: {target_applicant.get('position', 'N/A')}
-- 경력: {target_applicant.get('experience', 'N/A')}
-- 기술스택: {target_applicant.get('skills', 'N/A')}
-- 부서: {target_applicant.get('department', 'N/A')}
+    @staticmethod
+    def _render_similar_applicants_analysis(applicant_analyses: List[Dict[str, Any]]) -> str:
+        """지원자별 분석 결과를 화면에서 파싱하는 마크다운 형식으로 조합"""
+        lines = ["### 1. 기준 지원자와 각 유사 지원자 간의 공통점", ""]
+        lines += [f"- {item['name']}: {item['common_points']}" for item in applicant_analyses]
+        lines += ["", "### 2. 유사성에 가장 큰 영향을 미친 특성 분석", ""]
+        lines += [f"- {item['name']}: {item['similarity_factor']}" for item in applicant_analyses]
+        lines += ["", "### 3. 각 유사 지원자별 상세 분석", ""]
+        for item in applicant_analyses:
+            lines += [
+                f"- **{item['name']}**",
+                f"  - 🔍 **핵심 공통점**: {item['common_points']}",
+                f"  - 💡 **주요 특징**: {item['key_features']}",
+                f"  - ⭐ **추천 이유**: {item['recommendation_reason']}",
+                f"  - 🎯 **유사성 요인**: {item['similarity_factor']}",
+                ""
+            ]
+        return "\n".join(lines).strip()
 
-**유사한 지원자들:**
-"""
+    async def analyze_plagiarism_suspicion_batch(self,
+                                                 original_document: Dict[str, Any],
+                                                 similar_documents: List[Dict[str, Any]],
+                                                 document_type: str = "자소서") -> List[Dict[str, Any]]:
+        """
+        유사 문서 여러 개의 표절 의심도를 한 번에 분석합니다 (문서별 analyze_plagiarism_suspicion 결과와 같은 형식).
         
-        # 유사 지원자들 정보
-        for applicant in similar_applicants:
-            prompt += f"""
-{applicant['rank']}순위. {applicant.get('name', 'N/A')}
-- 지원직무: {applicant.get('position', 'N/A')}
-- 경력: {applicant.get('experience', 'N/A')}
-- 기술스택: {applicant.get('skills', 'N/A')}
-- 부서: {applicant.get('department', 'N/A')}
-- 유사도 점수: {applicant.get('final_score', 0):.3f} (벡터: {applicant.get('vector_score', 0):.3f}, 키워드: {applicant.get('keyword_score', 0):.3f})
-"""
+        Args:
+            original_document (Dict[str, Any]): 기준 문서
+            similar_documents (List[Dict[str, Any]]): 유사 문서들 (similarity_score, name, 선택적으로 text)
+            document_type (str): 문서 타입
+            
+        Returns:
+            List[Dict[str, Any]]: similar_documents 순서의 문서별 표절 의심도 분석 결과
+        """
+        if not similar_documents:
+            return []
         
-        prompt += """
-
-**중요: 반드시 아래 정확한 형식을 따라 응답해주세요.**
-
-### 1. 기준 지원자와 각 유사 지원자 간의 공통점
-
-### 2. 유사성에 가장 큰 영향을 미친 특성 분석
+        scores = [doc.get("similarity_score", doc.get("overall_similarity", 0.0)) for doc in similar_documents]
+        levels = [self._suspicion_level(score) for score in scores]
+        # 비교 문서 발췌는 앞부분 대신 기준 문서와 키워드가 겹치는 문장을 골라 넣음
+        original_text = str(original_document.get("extracted_text") or original_document.get("content") or "")
+        items = []
+        for doc, level in zip(similar_documents, levels):
+            item = f"- 비교 {document_type}: {doc.get('basic_info_names') or doc.get('name', 'Unknown')}\n- 유사도 레벨: {level}"
+            if doc.get("text"):
+                excerpt = compact_text(str(doc["text"]), original_text, PLAGIARISM_EXCERPT_TOKENS,
+                                       model=self.model_name, lead_chunks=0, chunk_tokens=30)
+                item += f"\n- 유사 판단된 문장: {excerpt}"
+            items.append(item)
+        
+        instruction = f"""[역할]
+당신은 {document_type}의 의미 기반 유사성을 평가하는 검토 보조자입니다.
+기준 {document_type}와 비교 {document_type}들 사이에서 의미 중복이 감지되었습니다.
 
-### 3. 각 유사 지원자별 상세 분석
+[작성 목표]
+- 유사도 수치나 유사 문서 개수는 말하지 마세요
+- 유사 문장과 유사 이유(표현 구조, 흐름, 키워드 등)를 간결하게 제시
+- 마지막 문장은 중립적 평가 문장("검토 권장" 등)으로 작성"""
+        results = await self.batch_scorer.score(
+            instruction,
+            items,
+            fields={"analysis": "표절 의심도 분석 (최대 3문장)"},
+            system_message="당신은 문서 표절 분석 전문가입니다. 요청된 JSON 형식으로만 응답해주세요.",
+            call_site="plagiarism"
+        )
+        
+        analyzed_at = datetime.now().isoformat()
+        analyses = []
+        for score, level, result in zip(scores, levels, results):
+            analysis = (result or {}).get("analysis")
+            if analysis:
+                analysis = "\n".join(str(analysis).strip().split("\n")[:3])
+            else:
+                analysis = self._fallback_plagiarism_analysis(score, level, 1, document_type)
+            analyses.append({
+                "success": True,
+                "suspicion_level": level,
+                "suspicion_score": score,
+                "suspicion_score_percent": int(score * 100),
+                "analysis": analysis,
+                "recommendations": [],
+                "similar_count": 1,
+                "analyzed_at": analyzed_at
+            })
+        print(f"[LLMService] 표절 의심도 배치 분석 완료: 문서 {len(analyses)}개, LLM 호출 {self.batch_scorer.last_call_count}회")
+        return analyses
 
-- **[지원자명]**
-  - 🔍 **핵심 공통점**: [기준 지원자와의 주요 공통점 1줄]
-  - 💡 **주요 특징**: [핵심 역량이나 경력 요약 1줄]  
-  - ⭐ **추천 이유**: [구체적인 추천 근거]
-  - 🎯 **유사성 요인**: [유사성에 가장 큰 영향을 미친 특성]
+    @staticmethod
+    def _suspicion_level(similarity: float) -> str:
+        if similarity >= 0.8:
+            return "HIGH"
+        if similarity >= 0.6:
+            return "MEDIUM"
+        return "LOW"
 
-**필수 준수사항:**
-1. 반드시 "### 3. 각 유사 지원자별 상세 분석" 섹션을 포함하세요
-2. 각 지원자마다 🔍, 💡, ⭐, 🎯 네 가지 항목을 모두 작성하세요
-3. 지원자 이름은 **[지원자명]** 형식으로 작성하세요
-4. 위 형식을 정확히 따르지 않으면 시스템에서 파싱이 실패합니다
-"""
-        
-        return prompt
+    @staticmethod
+    def _fallback_plagiarism_analysis(similarity_score: float, suspicion_level: str,
+                                      similar_count: int, document_type: str) -> str:
+        """LLM 분석을 받지 못했을 때의 규칙 기반 분석 문장"""
+        if suspicion_level == "HIGH":
+            return f"매우 높은 유사도({similarity_score:.1%})의 {document_type}가 {similar_count}개 발견되었습니다. 표절 의심도가 높아 추가 검토가 필요합니다."
+        elif suspicion_level == "MEDIUM":
+            return f"높은 유사도({similarity_score:.1%})의 {document_type}가 {similar_count}개 발견되었습니다. 표절 의심도가 보통 수준이므로 주의가 필요합니다."
+        else:
+            return f"적정 수준의 유사도({similarity_score:.1%})입니다. 유사한 {document_type} {similar_count}개가 발견되었으나 표절 의심도가 낮습니다."
 
     async def _generate_plagiarism_analysis(self, 
                                           similarity_score: float, 
@@ -323,8 +468,8 @@ class LLMService:
 
 """
 
-            # OpenAI API 호출
-            response = self.client.chat.completions.create(
+            # LLM 게이트웨이 호출
+            response = await self.gateway.chat(
                 model=self.model_name,
                 messages=[
                     {
@@ -337,10 +482,12 @@ class LLMService:
                     }
                 ],
                 temperature=0.3,  # 일관성 있는 분석을 위해 낮은 temperature 사용
-                max_tokens=200
+                max_tokens=200,
+                cache=True,
+                call_site="plagiarism"
             )
             
-            analysis_text = response.choices[0].message.content.strip()
+            analysis_text = response.content.strip()
             
             # 3줄 제한 처리
             lines = analysis_text.split('\n')
@@ -355,9 +502,4 @@ class LLMService:
         except Exception as e:
             print(f"[LLMService] LLM 기반 분석 생성 실패: {str(e)}")
             # 폴백: 기본 규칙 기반 분석
-            if suspicion_level == "HIGH":
-                return f"매우 높은 유사도({similarity_score:.1%})의 {document_type}가 {similar_count}개 발견되었습니다. 표절 의심도가 높아 추가 검토가 필요합니다."
-            elif suspicion_level == "MEDIUM":
-                return f"높은 유사도({similarity_score:.1%})의 {document_type}가 {similar_count}개 발견되었습니다. 표절 의심도가 보통 수준이므로 주의가 필요합니다."
-            else:
-                return f"적정 수준의 유사도({similarity_score:.1%})입니다. 유사한 {document_type} {similar_count}개가 발견되었으나 표절 의심도가 낮습니다."
\ No newline at end of file
+            return self._fallback_plagiarism_analysis(similarity_score, suspicion_level, similar_count, document_type)
\ No newline at end of file
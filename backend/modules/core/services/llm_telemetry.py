@@ -0,0 +1,391 @@
+"""
+LLM 호출 텔레메트리 (토큰/비용/지연 시간 집계)
+
+게이트웨이를 거치는 모든 LLM 호출을 (호출 지점, 엔드포인트, 모델)별로 집계합니다.
+
+- 호출 지점(call site): 게이트웨이 호출 시 call_site 인자 또는 llm_call_site() 컨텍스트로 지정
+  (채팅 도구 감지, 표절 분석, GitHub 요약, 자소서 분석 등 기능 단위)
+- 엔드포인트: HTTP 요청 미들웨어가 연결한 라우트 경로 (분석 작업 큐는 job:<종류>)
+- 기록 항목: 호출 수, 오류/타임아웃, 캐시 적중, 재시도, 429, 프롬프트/완성 토큰, 비용(USD), 지연 시간 히스토그램
+- 스트리밍 등 usage가 없는 응답은 토큰 수를 추정해 기록 (estimated_calls로 구분)
+- Prometheus 텍스트 형식과 그룹별 요약 제공
+- usage_scope(): 현재 요청(태스크 트리) 안의 토큰 사용량만 따로 합산 (응답에 사용량 포함 시)
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Coroutine, Dict, Iterator, List, Optional, Tuple
+
+from .llm_providers.base_provider import LLMResponse
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# 모델별 100만 토큰당 가격 (USD, 입력/출력). LLM_PRICING 환경 변수로 덮어쓰기
+DEFAULT_PRICING = {
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4": (30.0, 60.0),
+    "gpt-3.5-turbo": (0.5, 1.5)
+}
+
+GROUP_FIELDS = ("call_site", "endpoint", "model")
+
+_call_site: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("llm_call_site", default=None)
+# 엔드포인트 라벨 또는 라벨을 계산할 ASGI scope
+_endpoint: contextvars.ContextVar[Any] = contextvars.ContextVar("llm_endpoint", default=None)
+_usage: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar("llm_usage_scope", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (tokenizer 없이 보수적으로 계산)
+
+    영문/숫자/기호는 약 4자당 1토큰, 한글 등 비ASCII 문자는 약 1.5자당 1토큰으로 봅니다.
+    """
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5) + 1
+
+
+def _parse_pricing(value: str) -> Dict[str, Tuple[float, float]]:
+    """'gpt-4o=2.5/10,gpt-4o-mini=0.15/0.6' 형식의 모델별 가격을 파싱합니다."""
+    pricing = {}
+    for item in value.split(","):
+        model, _, prices = item.partition("=")
+        prompt_price, _, completion_price = prices.partition("/")
+        if model.strip() and prompt_price.strip():
+            pricing[model.strip()] = (float(prompt_price), float(completion_price or prompt_price))
+    return pricing
+
+
+@contextmanager
+def llm_call_site(name: str) -> Iterator[None]:
+    """블록 안의 LLM 호출(call_site 미지정)을 name 호출 지점으로 집계합니다."""
+    token = _call_site.set(name)
+    try:
+        yield
+    finally:
+        _call_site.reset(token)
+
+
+def set_endpoint(label_or_scope: Any) -> None:
+    """현재 태스크 컨텍스트의 엔드포인트 라벨(또는 ASGI scope)을 지정합니다."""
+    _endpoint.set(label_or_scope)
+
+
+def usage_scope() -> Dict[str, Any]:
+    """현재 태스크(와 이후 만드는 하위 태스크)의 LLM 사용량 합산을 새로 시작하고 그 dict를 반환합니다."""
+    usage = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0,
+             "cache_hits": 0, "cost_usd": 0.0}
+    _usage.set(usage)
+    return usage
+
+
+def current_usage() -> Optional[Dict[str, Any]]:
+    return _usage.get()
+
+
+def carry_context(coro: Coroutine[Any, Any, Any]) -> Coroutine[Any, Any, Any]:
+    """다른 스레드의 이벤트 루프에서 실행할 코루틴에 현재 호출 지점/엔드포인트/사용량 컨텍스트를 옮깁니다."""
+    call_site, endpoint, usage = _call_site.get(), _endpoint.get(), _usage.get()
+
+    async def run() -> Any:
+        _call_site.set(call_site)
+        _endpoint.set(endpoint)
+        _usage.set(usage)
+        return await coro
+
+    return run()
+
+
+def _resolve_endpoint() -> str:
+    """ASGI scope면 매칭되는 라우트 경로 템플릿으로 변환 (ID가 들어간 실제 경로는 라벨로 쓰지 않음)"""
+    value = _endpoint.get()
+    if value is None:
+        return "background"
+    if isinstance(value, str):
+        return value
+
+    cached = value.get("llm_endpoint")
+    if cached:
+        return cached
+    label = f"{value.get('method', '')} {value.get('path', '')}".strip()
+    app = value.get("app")
+    try:
+        from starlette.routing import Match
+
+        for route in getattr(app, "routes", []):
+            match, _ = route.matches(value)
+            if match == Match.FULL:
+                label = f"{value.get('method', '')} {route.path}".strip()
+                break
+    except Exception:
+        pass
+    value["llm_endpoint"] = label
+    return label
+
+
+class CallRecord:
+    """LLM 호출 한 건의 진행 정보 (재시도/429 횟수는 게이트웨이 내부에서 증가)"""
+
+    __slots__ = ("call_site", "endpoint", "model", "started_at", "retries", "rate_limited", "streamed")
+
+    def __init__(self, call_site: str, endpoint: str, model: str, streamed: bool = False):
+        self.call_site = call_site
+        self.endpoint = endpoint
+        self.model = model
+        self.started_at = time.perf_counter()
+        self.retries = 0
+        self.rate_limited = 0
+        self.streamed = streamed
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {
+        "calls": 0, "errors": 0, "timeouts": 0, "cancelled": 0,
+        "cache_hits": 0, "retries": 0, "rate_limited": 0, "streamed": 0, "estimated_calls": 0,
+        "prompt_tokens": 0, "completion_tokens": 0, "saved_tokens": 0,
+        "cost_usd": 0.0, "saved_cost_usd": 0.0,
+        "latency_sum": 0.0, "latency_max": 0.0,
+        "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1)
+    }
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class LLMTelemetry:
+    """(호출 지점, 엔드포인트, 모델)별 LLM 호출 집계"""
+
+    def __init__(self, pricing: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.pricing = {**DEFAULT_PRICING, **(pricing or {})}
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._started_at = time.time()
+
+    def start_call(self, model: str, call_site: Optional[str] = None, streamed: bool = False) -> CallRecord:
+        return CallRecord(call_site or _call_site.get() or "unspecified", _resolve_endpoint(), model, streamed)
+
+    def _price(self, model: str) -> Tuple[float, float]:
+        if model in self.pricing:
+            return self.pricing[model]
+        # 날짜가 붙은 모델명(gpt-4o-2024-08-06 등)은 가장 긴 접두사로 매칭
+        matches = [name for name in self.pricing if model.startswith(name)]
+        return self.pricing[max(matches, key=len)] if matches else (0.0, 0.0)
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
+        prompt_price, completion_price = self._price(model)
+        return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+    def finish_call(self, record: CallRecord, messages: List[Dict[str, str]],
+                    response: Optional[LLMResponse] = None, content: Optional[str] = None,
+                    error: Optional[BaseException] = None) -> None:
+        """호출 결과를 집계합니다 (usage가 없으면 메시지/응답 길이로 토큰 수 추정)."""
+        latency = time.perf_counter() - record.started_at
+        metadata = (response.metadata or {}) if response is not None else {}
+        usage = metadata.get("usage") or {}
+        cached = bool(metadata.get("cached"))
+        if response is not None:
+            content = response.content
+
+        estimated = False
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if prompt_tokens is None:
+            estimated = True
+            prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) for message in messages)
+        if completion_tokens is None:
+            estimated = True
+            completion_tokens = estimate_tokens(content) if content else 0
+        cost = self.cost(record.model, prompt_tokens, completion_tokens)
+
+        with self._lock:
+            stats = self._stats.setdefault((record.call_site, record.endpoint, record.model), _new_stats())
+            stats["calls"] += 1
+            stats["retries"] += record.retries
+            stats["rate_limited"] += record.rate_limited
+            stats["streamed"] += int(record.streamed)
+            stats["latency_sum"] += latency
+            stats["latency_max"] = max(stats["latency_max"], latency)
+            bucket = next((index for index, bound in enumerate(LATENCY_BUCKETS) if latency <= bound), len(LATENCY_BUCKETS))
+            stats["latency_buckets"][bucket] += 1
+
+            if error is not None:
+                if isinstance(error, TimeoutError):
+                    stats["timeouts"] += 1
+                elif isinstance(error, Exception):
+                    stats["errors"] += 1
+                else:
+                    # 클라이언트 연결 종료 등으로 취소 (CancelledError, GeneratorExit)
+                    stats["cancelled"] += 1
+                # 중간에 끊긴 스트리밍은 이미 생성된 토큰까지 과금되므로 기록
+                if record.streamed:
+                    stats["prompt_tokens"] += prompt_tokens
+                    stats["completion_tokens"] += completion_tokens
+                    stats["cost_usd"] += cost
+                return
+
+            if cached:
+                # 캐시 응답은 과금되지 않으므로 절약한 토큰/비용으로 기록
+                stats["cache_hits"] += 1
+                stats["saved_tokens"] += prompt_tokens + completion_tokens
+                stats["saved_cost_usd"] += cost
+            else:
+                stats["estimated_calls"] += int(estimated)
+                stats["prompt_tokens"] += prompt_tokens
+                stats["completion_tokens"] += completion_tokens
+                stats["cost_usd"] += cost
+
+        scoped = _usage.get()
+        if scoped is not None:
+            scoped["calls"] += 1
+            if cached:
+                scoped["cache_hits"] += 1
+            else:
+                scoped["prompt_tokens"] += prompt_tokens
+                scoped["completion_tokens"] += completion_tokens
+                scoped["total_tokens"] += prompt_tokens + completion_tokens
+                scoped["cost_usd"] += cost
+
+    def _snapshot(self) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+        with self._lock:
+            return {key: {**stats, "latency_buckets": list(stats["latency_buckets"])} for key, stats in self._stats.items()}
+
+    @staticmethod
+    def _percentile(buckets: List[int], total: int, quantile: float) -> Optional[float]:
+        """히스토그램 구간 상한으로 근사한 백분위 지연 시간"""
+        if total == 0:
+            return None
+        threshold = total * quantile
+        cumulative = 0
+        for index, count in enumerate(buckets):
+            cumulative += count
+            if cumulative >= threshold:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float("inf")
+        return None
+
+    def summary(self, group_by: str = "call_site", sort_by: str = "latency") -> Dict[str, Any]:
+        """
+        그룹별 요약 (어떤 기능/엔드포인트가 지연 시간과 비용을 가장 많이 쓰는지)
+
+        Args:
+            group_by: call_site, endpoint, model
+            sort_by: latency(총 지연 시간), cost, calls, tokens
+        """
+        if group_by not in GROUP_FIELDS:
+            raise ValueError(f"group_by는 {', '.join(GROUP_FIELDS)} 중 하나여야 합니다.")
+        position = GROUP_FIELDS.index(group_by)
+
+        groups: Dict[str, Dict[str, Any]] = {}
+        for key, stats in self._snapshot().items():
+            group = groups.setdefault(key[position], _new_stats())
+            for name, value in stats.items():
+                if name == "latency_buckets":
+                    group[name] = [left + right for left, right in zip(group[name], value)]
+                elif name == "latency_max":
+                    group[name] = max(group[name], value)
+                else:
+                    group[name] += value
+
+        rows = []
+        for name, stats in groups.items():
+            calls = stats["calls"]
+            rows.append({
+                group_by: name,
+                "calls": calls,
+                "errors": stats["errors"],
+                "timeouts": stats["timeouts"],
+                "error_rate": round((stats["errors"] + stats["timeouts"]) / calls, 4) if calls else 0.0,
+                "cache_hit_rate": round(stats["cache_hits"] / calls, 4) if calls else 0.0,
+                "retries": stats["retries"],
+                "rate_limited": stats["rate_limited"],
+                "prompt_tokens": stats["prompt_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "estimated_calls": stats["estimated_calls"],
+                "cost_usd": round(stats["cost_usd"], 6),
+                "saved_cost_usd": round(stats["saved_cost_usd"], 6),
+                "total_latency_seconds": round(stats["latency_sum"], 3),
+                "avg_latency_seconds": round(stats["latency_sum"] / calls, 3) if calls else 0.0,
+                "p95_latency_seconds": self._percentile(stats["latency_buckets"], calls, 0.95),
+                "max_latency_seconds": round(stats["latency_max"], 3)
+            })
+
+        sort_keys = {
+            "latency": "total_latency_seconds",
+            "cost": "cost_usd",
+            "calls": "calls",
+            "tokens": None
+        }
+        if sort_by not in sort_keys:
+            raise ValueError(f"sort_by는 {', '.join(sort_keys)} 중 하나여야 합니다.")
+        if sort_by == "tokens":
+            rows.sort(key=lambda row: row["prompt_tokens"] + row["completion_tokens"], reverse=True)
+        else:
+            rows.sort(key=lambda row: row[sort_keys[sort_by]], reverse=True)
+
+        return {
+            "group_by": group_by,
+            "since": self._started_at,
+            "total_calls": sum(row["calls"] for row in rows),
+            "total_cost_usd": round(sum(row["cost_usd"] for row in rows), 6),
+            "groups": rows
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        snapshot = self._snapshot()
+        lines: List[str] = []
+
+        def labels(key: Tuple[str, str, str], **extra: str) -> str:
+            pairs = list(zip(GROUP_FIELDS, key)) + list(extra.items())
+            return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+        counters = [
+            ("llm_requests_total", "LLM 호출 수", "calls"),
+            ("llm_errors_total", "LLM 호출 오류 수", "errors"),
+            ("llm_timeouts_total", "LLM 호출 deadline 초과 수", "timeouts"),
+            ("llm_cache_hits_total", "LLM 응답 캐시 적중 수", "cache_hits"),
+            ("llm_retries_total", "LLM 요청 재시도 수", "retries"),
+            ("llm_rate_limited_total", "LLM 429 응답 수", "rate_limited"),
+            ("llm_cost_usd_total", "LLM 추정 비용 (USD)", "cost_usd"),
+            ("llm_saved_cost_usd_total", "캐시로 절약한 LLM 추정 비용 (USD)", "saved_cost_usd")
+        ]
+        for metric, help_text, field in counters:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for key, stats in snapshot.items():
+                lines.append(f"{metric}{labels(key)} {stats[field]}")
+
+        lines.append("# HELP llm_tokens_total LLM 토큰 수")
+        lines.append("# TYPE llm_tokens_total counter")
+        for key, stats in snapshot.items():
+            lines.append(f"llm_tokens_total{labels(key, type='prompt')} {stats['prompt_tokens']}")
+            lines.append(f"llm_tokens_total{labels(key, type='completion')} {stats['completion_tokens']}")
+
+        lines.append("# HELP llm_request_duration_seconds LLM 호출 지연 시간 (재시도 포함)")
+        lines.append("# TYPE llm_request_duration_seconds histogram")
+        for key, stats in snapshot.items():
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats["latency_buckets"]):
+                cumulative += count
+                lines.append(f"llm_request_duration_seconds_bucket{labels(key, le=str(bound))} {cumulative}")
+            lines.append(f"llm_request_duration_seconds_bucket{labels(key, le='+Inf')} {stats['calls']}")
+            lines.append(f"llm_request_duration_seconds_sum{labels(key)} {stats['latency_sum']}")
+            lines.append(f"llm_request_duration_seconds_count{labels(key)} {stats['calls']}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._started_at = time.time()
+
+
+def create_llm_telemetry() -> LLMTelemetry:
+    """환경 변수(LLM_PRICING)로 텔레메트리를 만듭니다."""
+    return LLMTelemetry(pricing=_parse_pricing(os.getenv("LLM_PRICING", "")))
@@ -0,0 +1,93 @@
+"""
+로컬 임베딩 (부하 테스트/벤치마크/CI용 OpenAI 임베딩 대체)
+
+단어와 글자 3-gram을 해싱해 고정 차원 벡터에 누적하고 L2 정규화합니다.
+같은 단어를 많이 공유하는 텍스트일수록 코사인 유사도가 높아 검색/유사도 흐름을 실제처럼 확인할 수 있습니다.
+LangChain Embeddings와 같은 메서드(embed_documents, embed_query, aembed_*)를 제공합니다.
+
+환경 변수:
+    EMBEDDING_PROVIDER (openai | local, 기본값: LLM_PROVIDER=local이면 local)
+    LOCAL_EMBEDDING_DIMENSION (1536, text-embedding-3-small과 같은 차원)
+    LOCAL_EMBEDDING_LATENCY_MS (30, 요청당 지연 중앙값), LOCAL_EMBEDDING_LATENCY_JITTER (0.3)
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import re
+import time
+from typing import List, Optional
+
+from .llm_providers.local_provider import LatencyModel
+
+try:
+    from langchain_core.embeddings import Embeddings as EmbeddingsBase
+except ImportError:
+    EmbeddingsBase = object
+
+_WORD = re.compile(r'[\w가-힣]+')
+
+
+def use_local_embeddings() -> bool:
+    """OpenAI 대신 로컬 임베딩을 사용할지 (EMBEDDING_PROVIDER, 없으면 LLM_PROVIDER 기준)"""
+    provider = os.getenv("EMBEDDING_PROVIDER") or ("local" if os.getenv("LLM_PROVIDER") == "local" else "openai")
+    return provider == "local"
+
+
+class LocalEmbeddings(EmbeddingsBase):
+    """해싱 기반 결정적 로컬 임베딩"""
+
+    def __init__(self, dimension: Optional[int] = None, latency: Optional[LatencyModel] = None):
+        self.dimension = dimension or int(os.getenv("LOCAL_EMBEDDING_DIMENSION", "1536"))
+        self.latency = latency or LatencyModel(
+            median_ms=float(os.getenv("LOCAL_EMBEDDING_LATENCY_MS", "30")),
+            jitter=float(os.getenv("LOCAL_EMBEDDING_LATENCY_JITTER", "0.3")),
+            prefill_ms_per_1k=0.0,
+            tokens_per_second=0.0
+        )
+
+    def _features(self, text: str) -> List[str]:
+        words = [word.lower() for word in _WORD.findall(text or "")]
+        grams = [f"#{word[i:i + 3]}" for word in words for i in range(max(1, len(word) - 2))]
+        return words + grams
+
+    def embed(self, text: str) -> List[float]:
+        """텍스트 하나의 임베딩 (지연 없음)"""
+        vector = [0.0] * self.dimension
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "big") % self.dimension
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector))
+        if not norm:
+            # 빈 텍스트도 0벡터가 아닌 고정 단위 벡터로 (코사인 유사도 계산 시 0 나눗셈 방지)
+            vector[0], norm = 1.0, 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency.first_token())
+        return [self.embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency.first_token())
+        return self.embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency.first_token())
+        return [self.embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency.first_token())
+        return self.embed(text)
+
+
+_local_embeddings: Optional[LocalEmbeddings] = None
+
+
+def get_local_embeddings() -> LocalEmbeddings:
+    """프로세스 전역 로컬 임베딩"""
+    global _local_embeddings
+    if _local_embeddings is None:
+        _local_embeddings = LocalEmbeddings()
+    return _local_embeddings
@@ -5,6 +5,9 @@ from typing import Any, Dict, List, Optional
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from .search_cache import bump_generation
+from .search_filters import with_experience_years
+
 
 class MongoService:
     """MongoDB 서비스 클래스"""
@@ -85,7 +88,9 @@ class MongoService:
         """지원자 정보 저장"""
         try:
             applicant_data["created_at"] = datetime.now()
+            with_experience_years(applicant_data)
             result = await self.db.applicants.insert_one(applicant_data)
+            bump_generation()
             return str(result.inserted_id)
         except Exception as e:
             print(f"지원자 저장 오류: {e}")
@@ -94,6 +99,7 @@ class MongoService:
     async def update_applicant(self, applicant_id: str, update_data: Dict[str, Any]) -> bool:
         """지원자 정보 업데이트"""
         try:
+            with_experience_years(update_data)
             if len(applicant_id) == 24:
                 result = await self.db.applicants.update_one(
                     {"_id": ObjectId(applicant_id)},
@@ -104,6 +110,8 @@ class MongoService:
                     {"_id": applicant_id},
                     {"$set": update_data}
                 )
+            if result.modified_count:
+                bump_generation()
             return result.modified_count > 0
         except Exception as e:
             print(f"지원자 업데이트 오류: {e}")
@@ -191,6 +199,8 @@ class MongoService:
                 result = await self.db.applicants.delete_one({"_id": ObjectId(applicant_id)})
             else:
                 result = await self.db.applicants.delete_one({"_id": applicant_id})
+            if result.deleted_count:
+                bump_generation()
             return result.deleted_count > 0
         except Exception as e:
             print(f"지원자 삭제 오류: {e}")
@@ -276,8 +286,10 @@ class MongoService:
 
             # 새 지원자 생성
             applicant_dict["created_at"] = datetime.now()
+            with_experience_years(applicant_dict)
             result = await self.db.applicants.insert_one(applicant_dict)
             new_applicant_id = str(result.inserted_id)
+            bump_generation()
 
             # 생성된 지원자 정보 조회
             new_applicant = await self.db.applicants.find_one({"_id": result.inserted_id})
@@ -345,8 +357,10 @@ class MongoService:
 
             # 새 지원자 생성
             applicant_dict["created_at"] = datetime.now()
+            with_experience_years(applicant_dict)
             result = self.sync_db.applicants.insert_one(applicant_dict)
             new_applicant_id = str(result.inserted_id)
+            bump_generation()
 
             # 생성된 지원자 정보 조회
             new_applicant = self.sync_db.applicants.find_one({"_id": result.inserted_id})
@@ -368,6 +382,7 @@ class MongoService:
             if self.sync_db is None:
                 raise Exception("동기 MongoDB 클라이언트가 초기화되지 않았습니다.")
 
+            with_experience_years(update_data)
             if len(applicant_id) == 24:
                 result = self.sync_db.applicants.update_one(
                     {"_id": ObjectId(applicant_id)},
@@ -378,6 +393,8 @@ class MongoService:
                     {"_id": applicant_id},
                     {"$set": update_data}
                 )
+            if result.modified_count:
+                bump_generation()
             return result.modified_count > 0
         except Exception as e:
             print(f"지원자 업데이트 오류: {e}")
@@ -396,6 +413,8 @@ class MongoService:
                     {"_id": applicant_id},
                     {"$set": {"status": new_status, "updated_at": datetime.now()}}
                 )
+            if result.modified_count:
+                bump_generation()
             return result.modified_count > 0
         except Exception as e:
             print(f"지원자 상태 업데이트 오류: {e}")
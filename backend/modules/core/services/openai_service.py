@@ -1,8 +1,9 @@
-import openai
 import os
 from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 
+from .llm_gateway import get_llm_gateway
+
 load_dotenv()
 
 
@@ -18,24 +19,28 @@ class OpenAIService:
         self.api_key = os.getenv("OPENAI_API_KEY")
 
         try:
-            if not self.api_key:
+            # 공유 LLM 게이트웨이 사용 (연결 풀, rate limit, 재시도)
+            gateway = get_llm_gateway()
+            if not self.api_key and gateway.api_key_required:
                 raise Exception("OPENAI_API_KEY가 설정되지 않았습니다.")
 
-            openai.api_key = self.api_key
-            self.client = openai.AsyncOpenAI(api_key=self.api_key)
+            self.client = gateway
             print(f"[SUCCESS] OpenAI 서비스 초기화 성공 (모델: {model_name})")
         except Exception as e:
             print(f"[ERROR] OpenAI 서비스 초기화 실패: {e}")
             print("[INFO] OPENAI_API_KEY가 올바르게 설정되었는지 확인하세요")
             self.client = None
 
-    async def generate_response(self, prompt: str, conversation_history: Optional[List[Dict[str, Any]]] = None) -> str:
+    async def generate_response(self, prompt: str, conversation_history: Optional[List[Dict[str, Any]]] = None,
+                                stream_tokens: bool = False, call_site: Optional[str] = None) -> str:
         """
         OpenAI 모델을 사용하여 응답 생성
 
         Args:
             prompt: 사용자 입력 프롬프트
             conversation_history: 대화 히스토리 (role/content 형식)
+            stream_tokens: SSE 스트리밍 요청 안에서 호출된 경우 생성 중인 토큰을 클라이언트로 전달
+            call_site: 토큰/비용/지연 시간 집계용 호출 지점 이름
 
         Returns:
             생성된 응답 텍스트
@@ -90,28 +95,31 @@ class OpenAIService:
 
             messages.append({"role": "user", "content": prompt})
 
-            response = await self.client.chat.completions.create(
+            response = await self.client.chat(
+                messages,
                 model=self.model_name,
-                messages=messages,
                 temperature=0.7,
                 max_tokens=1000,
                 top_p=0.8,
+                stream_tokens=stream_tokens,
+                call_site=call_site,
             )
 
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content
+            if response.content:
+                return response.content
             return "응답을 생성할 수 없습니다."
 
         except Exception as e:
             print(f"[ERROR] OpenAI 응답 생성 실패: {e}")
             return f"OpenAI 서비스 오류가 발생했습니다: {str(e)}"
 
-    async def generate_json_response(self, prompt: str) -> str:
+    async def generate_json_response(self, prompt: str, call_site: Optional[str] = None) -> str:
         """
         JSON 형식 응답에 최적화된 OpenAI 응답 생성
         
         Args:
             prompt: JSON 응답을 요구하는 프롬프트
+            call_site: 토큰/비용/지연 시간 집계용 호출 지점 이름
             
         Returns:
             JSON 형식의 응답 텍스트
@@ -134,16 +142,17 @@ class OpenAIService:
                 {"role": "user", "content": prompt}
             ]
 
-            response = await self.client.chat.completions.create(
+            response = await self.client.chat(
+                messages,
                 model=self.model_name,
-                messages=messages,
                 temperature=0.3,  # JSON 일관성을 위해 낮은 temperature
                 max_tokens=1500,
-                response_format={"type": "json_object"}  # JSON 형식 강제
+                response_format={"type": "json_object"},  # JSON 형식 강제
+                call_site=call_site
             )
 
-            if response.choices and response.choices[0].message.content:
-                return response.choices[0].message.content
+            if response.content:
+                return response.content
             return '{"error": "응답을 생성할 수 없습니다."}'
 
         except Exception as e:
@@ -0,0 +1,374 @@
+"""
+프롬프트 압축 / 컨텍스트 예산
+
+긴 문서(OCR 원문, 이력서, README)를 프롬프트에 통째로 넣지 않고 작업에 필요한 부분만 토큰 예산 안에서 골라 넣습니다.
+
+- 토큰 수는 tiktoken이 있으면 모델 토크나이저로, 없으면 문자 기반 추정으로 계산
+  (tiktoken 인코딩 첫 로드는 네트워크 다운로드이므로 서버 시작 시 preload_encodings()를 스레드에서 호출하고,
+   이벤트 루프에서 아직 로드되지 않은 인코딩이 필요하면 백그라운드로 로드하는 동안 추정치 사용)
+- 페이지 번호/구분선 줄과 페이지마다 반복되는 머리글·바닥글 같은 상용구 줄 제거
+- 문단 단위 청크 중 작업 질의와 관련도가 높은 청크를 예산 안에서 선택
+  (임베딩 함수를 넘기면 코사인 유사도, 없으면 질의 키워드 가중 겹침)
+- 선택한 청크는 원래 순서대로 이어 붙이고 생략 구간은 [...]로 표시
+- 여러 섹션은 전체 예산을 섹션별로 나눠(짧은 섹션이 남긴 예산은 긴 섹션에 재분배) 압축
+"""
+
+import asyncio
+import json
+import logging
+import math
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Union
+
+from .llm_telemetry import estimate_tokens
+from .tokenizer_service import fallback_preprocess
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 생략 구간 표시
+OMISSION_MARK = "[...]"
+
+# 페이지 번호, 구분선 등 내용 없는 줄 ("- 3 -", "Page 2 of 5", "3 / 10", "-----")
+_NOISE_LINE = re.compile(
+    r'^\s*(?:[-–—=_*·.]{3,}|[-–—]?\s*\d{1,3}\s*[-–—]?|(?:page|p\.)\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d{1,3}\s*/\s*\d{1,3}|\d{1,3}\s*페이지)\s*$',
+    re.IGNORECASE
+)
+_SPACES = re.compile(r'[ \t ]+')
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+# 반복 줄 제거 대상 최소 길이 (짧은 줄은 날짜·기술명처럼 정상적으로 반복될 수 있음)
+MIN_BOILERPLATE_LINE = 12
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+# 알 수 없는 모델에 사용할 인코딩
+DEFAULT_ENCODING = "o200k_base"
+
+# 로드된 인코딩 (이름 → Encoding, 로드 실패 시 None) 과 백그라운드 로드 중인 이름
+_encodings: Dict[str, Any] = {}
+_loading: Set[str] = set()
+_encodings_lock = threading.Lock()
+
+
+def _encoding_name(model: Optional[str]) -> str:
+    if model:
+        try:
+            return tiktoken.encoding_name_for_model(model)
+        except KeyError:
+            pass
+    return DEFAULT_ENCODING
+
+
+def _load_encoding(name: str):
+    """인코딩을 로드합니다 (첫 로드는 BPE 파일 다운로드라 블로킹, 실패하면 None을 기록해 추정치 사용)."""
+    with _encodings_lock:
+        if name in _encodings:
+            return _encodings[name]
+    try:
+        encoding = tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"tiktoken 인코딩 로드 실패, 추정치 사용: {name} ({e})")
+        encoding = None
+    with _encodings_lock:
+        _encodings.setdefault(name, encoding)
+        _loading.discard(name)
+        return _encodings[name]
+
+
+def _load_in_background(name: str) -> None:
+    with _encodings_lock:
+        if name in _loading:
+            return
+        _loading.add(name)
+    threading.Thread(target=_load_encoding, args=(name,), name=f"tiktoken-{name}", daemon=True).start()
+
+
+def _get_encoding(model: Optional[str]):
+    """모델별 tiktoken 인코딩 (없거나 아직 로드 중이면 None → 추정치)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    name = _encoding_name(model)
+    encoding = _encodings.get(name)
+    if encoding is not None or name in _encodings:
+        return encoding
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # 이벤트 루프 밖(워커 스레드, 스크립트)에서는 바로 로드
+        return _load_encoding(name)
+    # 이벤트 루프에서는 네트워크 다운로드로 멈추지 않도록 백그라운드 로드
+    _load_in_background(name)
+    return None
+
+
+def preload_encodings(models: Sequence[Optional[str]] = (None,)) -> None:
+    """모델들의 tiktoken 인코딩을 미리 로드합니다 (서버 시작 시 asyncio.to_thread로 호출)."""
+    if not TIKTOKEN_AVAILABLE:
+        return
+    for name in dict.fromkeys(_encoding_name(model) for model in models):
+        _load_encoding(name)
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """프롬프트 토큰 수 (tiktoken이 없으면 estimate_tokens 추정치)"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    공백을 정리하고 내용 없는 줄과 반복되는 상용구 줄을 제거합니다.
+
+    페이지 번호/구분선 줄은 모두 제거하고, 충분히 긴 줄이 여러 번 나오면(페이지 머리글·바닥글,
+    복사된 안내 문구 등) 첫 번째만 남깁니다.
+    """
+    if not text:
+        return ""
+
+    seen = set()
+    lines = []
+    for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        line = _SPACES.sub(" ", line).strip()
+        if not line:
+            lines.append("")
+            continue
+        if _NOISE_LINE.match(line):
+            continue
+        if len(line) >= MIN_BOILERPLATE_LINE:
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def split_chunks(text: str, max_tokens: int = 100, model: Optional[str] = None) -> List[str]:
+    """문단 단위로 나누고, 예산을 넘는 문단은 줄 → 문장 → 글자 수 순서로 더 나눕니다."""
+    chunks: List[str] = []
+
+    def add(piece: str, separators: Sequence[str]) -> None:
+        piece = piece.strip()
+        if not piece:
+            return
+        if count_tokens(piece, model) <= max_tokens:
+            chunks.append(piece)
+            return
+        if not separators:
+            # 구분자로 더 나눌 수 없으면 토큰 비율로 글자 수를 잘라 분할
+            size = max(1, int(len(piece) * max_tokens / count_tokens(piece, model)))
+            for start in range(0, len(piece), size):
+                add(piece[start:start + size], ())
+            return
+
+        separator, rest = separators[0], separators[1:]
+        parts = piece.split(separator) if separator != "sentence" else re.split(r'(?<=[.!?다])\s+', piece)
+        joiner = "\n" if separator == "\n" else " "
+        current = ""
+        for part in parts:
+            candidate = f"{current}{joiner}{part}" if current else part
+            if current and count_tokens(candidate, model) > max_tokens:
+                add(current, rest)
+                current = part
+            else:
+                current = candidate
+        add(current, rest)
+
+    for paragraph in text.split("\n\n"):
+        add(paragraph, ("\n", "sentence"))
+    return chunks
+
+
+def _query_terms(query: str) -> List[str]:
+    return list(dict.fromkeys(term for term in fallback_preprocess(query) if len(term) >= 2))
+
+
+def _keyword_scores(chunks: Sequence[str], query: str) -> List[float]:
+    """질의 키워드가 청크에 포함되면 희소도(idf) 가중치만큼 점수 (한국어 조사가 붙어도 부분 문자열로 매칭)"""
+    terms = _query_terms(query)
+    if not terms:
+        return [0.0] * len(chunks)
+    lowered = [chunk.lower() for chunk in chunks]
+    weights = {}
+    for term in terms:
+        df = sum(1 for chunk in lowered if term in chunk)
+        if df:
+            weights[term] = 1.0 + math.log(len(chunks) / df)
+    return [sum(weight for term, weight in weights.items() if term in chunk) for chunk in lowered]
+
+
+def _embedding_scores(chunks: Sequence[str], query: str, embed_fn: EmbedFn) -> List[float]:
+    vectors = embed_fn([query, *chunks])
+    query_vector = vectors[0]
+    query_norm = math.sqrt(sum(value * value for value in query_vector)) or 1.0
+    scores = []
+    for vector in vectors[1:]:
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        scores.append(sum(a * b for a, b in zip(query_vector, vector)) / (query_norm * norm))
+    return scores
+
+
+def select_chunks(chunks: Sequence[Union[str, Dict[str, Any]]], query: str, max_tokens: int,
+                  model: Optional[str] = None, lead_chunks: int = 0,
+                  keep_patterns: Sequence[str] = (), embed_fn: Optional[EmbedFn] = None) -> str:
+    """
+    관련도가 높은 청크를 예산 안에서 골라 원래 순서대로 이어 붙입니다.
+
+    Args:
+        chunks: 텍스트 청크 (ChunkingService 출력처럼 "text" 키가 있는 dict도 가능)
+        query: 작업 질의 (무엇을 찾는 프롬프트인지 나타내는 키워드)
+        max_tokens: 선택할 청크 토큰 합계 상한
+        model: 토큰 수 계산 기준 모델
+        lead_chunks: 관련도와 무관하게 먼저 넣을 앞쪽 청크 수 (이름·연락처가 있는 문서 머리 등)
+        keep_patterns: 이 정규식에 맞는 청크는 앞쪽 청크 다음 우선순위로 선택
+        embed_fn: 텍스트 목록 → 임베딩 목록 함수 (있으면 키워드 대신 코사인 유사도 사용)
+
+    Returns:
+        str: 선택한 청크 (생략된 구간은 [...]로 표시)
+    """
+    texts = [chunk.get("text", "") if isinstance(chunk, dict) else chunk for chunk in chunks]
+    texts = [text.strip() for text in texts if text and text.strip()]
+    if not texts:
+        return ""
+
+    scores = None
+    if embed_fn is not None and query:
+        try:
+            scores = _embedding_scores(texts, query, embed_fn)
+        except Exception as e:
+            logger.warning(f"임베딩 관련도 계산 실패, 키워드 관련도 사용: {e}")
+    if scores is None:
+        scores = _keyword_scores(texts, query)
+
+    patterns = [re.compile(pattern, re.IGNORECASE) for pattern in keep_patterns]
+    # 우선순위: 앞쪽 청크 → 패턴 일치 청크 → 관련도 → 문서 앞쪽
+    order = sorted(
+        range(len(texts)),
+        key=lambda i: (
+            i >= lead_chunks,
+            not any(pattern.search(texts[i]) for pattern in patterns),
+            -scores[i],
+            i
+        )
+    )
+
+    selected = set()
+    used = 0
+    for index in order:
+        tokens = count_tokens(texts[index], model)
+        if used + tokens > max_tokens:
+            continue
+        selected.add(index)
+        used += tokens
+
+    parts = []
+    previous = -1
+    for index in sorted(selected):
+        if index != previous + 1:
+            parts.append(OMISSION_MARK)
+        parts.append(texts[index])
+        previous = index
+    if previous != len(texts) - 1 and parts:
+        parts.append(OMISSION_MARK)
+    return "\n\n".join(parts)
+
+
+def compact_text(text: str, query: str = "", max_tokens: int = 1500, model: Optional[str] = None,
+                 lead_chunks: int = 1, keep_patterns: Sequence[str] = (), chunk_tokens: int = 100,
+                 embed_fn: Optional[EmbedFn] = None) -> str:
+    """
+    문서를 상용구 제거 후 예산 안으로 압축합니다 (예산 안이면 상용구만 제거해 그대로 반환).
+
+    Args:
+        text: 원문
+        query: 작업 질의 키워드
+        max_tokens: 압축 결과 토큰 상한
+        model: 토큰 수 계산 기준 모델
+        lead_chunks: 항상 포함할 앞쪽 청크 수
+        keep_patterns: 우선 포함할 청크 정규식
+        chunk_tokens: 청크 하나의 최대 토큰 수
+        embed_fn: 임베딩 관련도 계산 함수
+
+    Returns:
+        str: 압축된 텍스트
+    """
+    cleaned = strip_boilerplate(text)
+    if count_tokens(cleaned, model) <= max_tokens:
+        return cleaned
+    if max_tokens <= 0:
+        return ""
+
+    compacted = select_chunks(
+        split_chunks(cleaned, min(chunk_tokens, max_tokens), model), query, max_tokens,
+        model=model, lead_chunks=lead_chunks, keep_patterns=keep_patterns, embed_fn=embed_fn
+    )
+    logger.debug(f"프롬프트 문서 압축: {count_tokens(text, model)} → {count_tokens(compacted, model)} 토큰")
+    return compacted
+
+
+def allocate_budget(sizes: Sequence[int], total: int, minimum: int = 0) -> List[int]:
+    """
+    섹션별 토큰 예산을 나눕니다.
+
+    균등 분배를 기준으로, 배분량보다 짧은 섹션은 필요한 만큼만 받고 남은 예산은 긴 섹션들에 다시 나눕니다.
+    minimum 때문에 모두 줄 수 없으면 앞 섹션부터 배분해 합계가 total을 넘지 않습니다.
+    """
+    budgets = [0] * len(sizes)
+    remaining = list(range(len(sizes)))
+    left = total
+    while remaining and left > 0:
+        share = max(minimum, left // len(remaining))
+        fitted = [index for index in remaining if sizes[index] <= share]
+        if not fitted:
+            for index in remaining:
+                budgets[index] = min(share, left)
+                left -= budgets[index]
+            break
+        for index in fitted:
+            budgets[index] = min(sizes[index], left)
+            left -= budgets[index]
+        remaining = [index for index in remaining if index not in fitted]
+    return budgets
+
+
+def compact_sections(sections: Dict[str, str], max_tokens: int, query: str = "",
+                     model: Optional[str] = None, minimum: int = 100, **options) -> Dict[str, str]:
+    """여러 문서 섹션을 전체 예산 안에서 섹션별 예산으로 나눠 압축합니다 (옵션은 compact_text로 전달)."""
+    cleaned = {name: strip_boilerplate(text or "") for name, text in sections.items()}
+    names = list(cleaned)
+    budgets = allocate_budget([count_tokens(cleaned[name], model) for name in names], max_tokens, minimum)
+    return {
+        name: compact_text(cleaned[name], query, budget, model=model, **options)
+        for name, budget in zip(names, budgets)
+    }
+
+
+def compact_json(value: Any, max_list_items: int = 20, max_string_chars: int = 300) -> str:
+    """프롬프트에 넣을 데이터를 공백 없는 JSON으로 직렬화합니다 (긴 목록/문자열은 잘라냄)."""
+    def shrink(item: Any) -> Any:
+        if isinstance(item, dict):
+            shrunk = {key: shrink(child) for key, child in item.items()}
+            return {key: child for key, child in shrunk.items() if child not in (None, "", [], {})}
+        if isinstance(item, (list, tuple)):
+            items = [shrink(child) for child in item[:max_list_items]]
+            if len(item) > max_list_items:
+                items.append(f"...외 {len(item) - max_list_items}개")
+            return items
+        if isinstance(item, str) and len(item) > max_string_chars:
+            return item[:max_string_chars] + "..."
+        return item
+
+    return json.dumps(shrink(value), ensure_ascii=False, separators=(",", ":"), default=str)
@@ -0,0 +1,132 @@
+"""
+검색 결과 캐시
+
+- 정규화된 검색어 + 검색 조건(필터, 가중치, limit 등)을 키로 결과를 보관 (TTL + LRU)
+- 색인/벡터 저장/삭제 시 증가하는 인덱스 세대(generation)를 함께 기록하고,
+  세대가 바뀐 항목은 조회 시 버려 색인 변경 이전 결과를 돌려주지 않음
+- 세대는 프로세스 단위이므로 다른 워커에서 발생한 변경은 TTL로 제한
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def bump_generation() -> int:
+    """검색 대상 데이터가 바뀌었음을 알립니다 (기존 캐시 항목 무효화)."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        return _generation
+
+
+def normalize_query(query: str) -> str:
+    """대소문자/공백 차이만 있는 검색어를 같은 키로 취급"""
+    return " ".join((query or "").lower().split())
+
+
+class SearchResultCache:
+    """TTL + LRU 검색 결과 캐시 (반환값은 복사본이므로 호출자가 수정해도 안전)"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # 키 → (세대, 만료 시각, 결과)
+        self._entries: "OrderedDict[str, Tuple[int, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(namespace: str, query: str, **params: Any) -> str:
+        """검색 종류 + 정규화된 검색어 + 검색 조건으로 캐시 키 생성"""
+        return json.dumps(
+            [namespace, normalize_query(query), params],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            generation, expires_at, value = entry
+            if generation != _generation or expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any, generation: int) -> None:
+        """
+        결과 저장
+
+        Args:
+            generation: 검색을 시작할 때의 세대 (검색 도중 색인이 바뀌었으면 저장하지 않음)
+        """
+        if not self.enabled or generation != _generation:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """캐시에 있으면 반환하고, 없으면 compute()를 실행해 성공한 결과만 저장합니다."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        generation = _generation
+        result = await compute()
+        if isinstance(result, dict) and result.get("success"):
+            self.put(key, result, generation)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "generation": _generation,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchResultCache:
+    """프로세스 전역 검색 결과 캐시를 반환합니다."""
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchResultCache(
+                    max_entries=int(os.getenv("SEARCH_CACHE_SIZE", "512")),
+                    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "60"))
+                )
+    return _search_cache
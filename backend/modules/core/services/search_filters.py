@@ -0,0 +1,201 @@
+"""
+검색 필터 DSL
+
+지원자 검색 조건(채용공고, 직무, 상태, 경력 범위, 부서, 기술)을 한 곳에서 정의하고
+각 검색 백엔드의 필터 형식으로 변환합니다.
+
+- to_pinecone(): Pinecone 메타데이터 필터
+- to_es(): Elasticsearch bool.filter 절
+- to_mongo(): MongoDB 쿼리 (경력은 지원자 저장 시 with_experience_years()로 채운 experience_years 숫자 필드 기준)
+
+벡터 메타데이터와 Elasticsearch 문서에는 색인 시 filter_metadata()로 만든 필드가 함께 저장되어
+검색 후 Python에서 다시 거르지 않아도 필터 조건을 만족하는 결과만 반환됩니다.
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+# 색인된 필터 메타데이터 형식 버전 (바뀌면 기존 벡터 메타데이터 갱신 필요)
+FILTER_METADATA_VERSION = 1
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+def normalize_skills(value: Any) -> List[str]:
+    """리스트 또는 콤마 구분 문자열의 기술스택을 소문자 목록으로 정규화합니다."""
+    if not value:
+        return []
+    items = value if isinstance(value, (list, tuple, set)) else str(value).split(",")
+    return list(dict.fromkeys(_normalize(item) for item in items if str(item).strip()))
+
+
+def parse_experience_years(value: Any) -> Optional[float]:
+    """경력 값('3', '3년', 3, '신입')을 연차 숫자로 변환합니다."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = str(value)
+    if "신입" in text:
+        return 0.0
+    match = _NUMBER.search(text)
+    return float(match.group()) if match else None
+
+
+def filter_metadata(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    색인 시 벡터 메타데이터 / Elasticsearch 문서에 함께 저장할 필터 필드를 만듭니다.
+    Pinecone 메타데이터는 null을 허용하지 않으므로 값이 없는 필드는 생략합니다.
+    """
+    metadata: Dict[str, Any] = {"filter_version": FILTER_METADATA_VERSION}
+    for key in ("job_posting_id", "status"):
+        if document.get(key):
+            metadata[key] = str(document[key])
+    for key in ("position", "department"):
+        if document.get(key):
+            metadata[f"{key}_key"] = _normalize(document[key])
+    skills = normalize_skills(document.get("skills"))
+    if skills:
+        metadata["skills_list"] = skills
+    experience_years = parse_experience_years(document.get("experience"))
+    if experience_years is not None:
+        metadata["experience_years"] = experience_years
+    return metadata
+
+
+def with_experience_years(document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    지원자 문서(또는 $set 업데이트)에 experience가 있으면 경력 범위 필터용 experience_years를 함께 채웁니다.
+    experience는 '3년', '신입' 같은 문자열로 저장되므로 MongoDB 범위 조건은 이 숫자 필드에 겁니다.
+    """
+    if "experience" in document:
+        document["experience_years"] = parse_experience_years(document["experience"])
+    return document
+
+
+async def backfill_experience_years(collection: Any, batch_size: int = 500) -> int:
+    """experience_years가 없는 기존 지원자 문서에 값을 채웁니다 (갱신한 문서 수 반환)."""
+    updated = 0
+    cursor = collection.find({"experience_years": {"$exists": False}}, {"experience": 1})
+    async for document in cursor.batch_size(batch_size):
+        await collection.update_one(
+            {"_id": document["_id"]},
+            {"$set": {"experience_years": parse_experience_years(document.get("experience"))}}
+        )
+        updated += 1
+    return updated
+
+
+@dataclass
+class SearchFilters:
+    """지원자 검색 필터 (지정한 조건은 모두 만족해야 함, 기술은 모두 보유)"""
+
+    job_posting_id: Optional[str] = None
+    position: Optional[str] = None
+    status: Optional[str] = None
+    department: Optional[str] = None
+    skills: List[str] = field(default_factory=list)
+    min_experience: Optional[float] = None
+    max_experience: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "SearchFilters":
+        """
+        API 요청 본문의 filters 객체를 변환합니다.
+
+        experience는 {"min": 2, "max": 5} 형태 또는 min_experience/max_experience 키를 사용합니다.
+        """
+        data = data or {}
+        experience = data.get("experience") if isinstance(data.get("experience"), dict) else {}
+        return cls(
+            job_posting_id=str(data["job_posting_id"]) if data.get("job_posting_id") else None,
+            position=data.get("position") or None,
+            status=data.get("status") or None,
+            department=data.get("department") or None,
+            skills=normalize_skills(data.get("skills")),
+            min_experience=parse_experience_years(data.get("min_experience", experience.get("min"))),
+            max_experience=parse_experience_years(data.get("max_experience", experience.get("max")))
+        )
+
+    def is_empty(self) -> bool:
+        return not any(self.to_dict().values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """지정된 조건만 담은 dict (캐시 키, 응답 표시용)"""
+        return {key: value for key, value in asdict(self).items() if value not in (None, [], "")}
+
+    def to_pinecone(self, chunk_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Pinecone 메타데이터 필터로 변환합니다 (조건이 없으면 None)."""
+        clauses = []
+        if chunk_type:
+            clauses.append({"chunk_type": {"$eq": chunk_type}})
+        if self.job_posting_id:
+            clauses.append({"job_posting_id": {"$eq": self.job_posting_id}})
+        if self.status:
+            clauses.append({"status": {"$eq": self.status}})
+        if self.position:
+            clauses.append({"position_key": {"$eq": _normalize(self.position)}})
+        if self.department:
+            clauses.append({"department_key": {"$eq": _normalize(self.department)}})
+        for skill in self.skills:
+            clauses.append({"skills_list": {"$in": [skill]}})
+        if self.min_experience is not None:
+            clauses.append({"experience_years": {"$gte": self.min_experience}})
+        if self.max_experience is not None:
+            clauses.append({"experience_years": {"$lte": self.max_experience}})
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def to_es(self) -> List[Dict[str, Any]]:
+        """Elasticsearch bool.filter 절 목록으로 변환합니다."""
+        clauses: List[Dict[str, Any]] = []
+        if self.job_posting_id:
+            clauses.append({"term": {"job_posting_id": self.job_posting_id}})
+        if self.status:
+            clauses.append({"term": {"status": self.status}})
+        if self.position:
+            clauses.append({"term": {"position_key": _normalize(self.position)}})
+        if self.department:
+            clauses.append({"term": {"department_key": _normalize(self.department)}})
+        for skill in self.skills:
+            clauses.append({"term": {"skills_list": skill}})
+        experience_range = {}
+        if self.min_experience is not None:
+            experience_range["gte"] = self.min_experience
+        if self.max_experience is not None:
+            experience_range["lte"] = self.max_experience
+        if experience_range:
+            clauses.append({"range": {"experience_years": experience_range}})
+        return clauses
+
+    def to_mongo(self) -> Dict[str, Any]:
+        """applicants 컬렉션 MongoDB 쿼리로 변환합니다."""
+        query: Dict[str, Any] = {}
+        if self.job_posting_id:
+            query["job_posting_id"] = self.job_posting_id
+        if self.status:
+            query["status"] = self.status
+        for key in ("position", "department"):
+            value = getattr(self, key)
+            if value:
+                query[key] = {"$regex": f"^\\s*{re.escape(value.strip())}\\s*$", "$options": "i"}
+        if self.skills:
+            # 배열 원소 또는 콤마 구분 문자열의 항목과 대소문자 무시 일치
+            query["$and"] = [
+                {"skills": {"$regex": f"(^|,)\\s*{re.escape(skill)}\\s*(,|$)", "$options": "i"}}
+                for skill in self.skills
+            ]
+        experience_range = {}
+        if self.min_experience is not None:
+            experience_range["$gte"] = self.min_experience
+        if self.max_experience is not None:
+            experience_range["$lte"] = self.max_experience
+        if experience_range:
+            query["experience_years"] = experience_range
+        return query
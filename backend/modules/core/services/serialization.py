@@ -0,0 +1,47 @@
+"""
+검색 결과 직렬화 유틸리티
+
+- MongoDB 문서의 ObjectId/datetime을 한 번의 재귀 순회로 JSON 호환 값으로 변환
+- 검색 결과 조회 시 사용할 최소 필드 projection
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict
+
+from bson import ObjectId
+
+# 검색 결과에 필요한 지원자 필드만 조회 (자기소개서 본문, 분석 원문, OCR 텍스트 등 대용량 필드 제외)
+SEARCH_RESULT_PROJECTION: Dict[str, int] = {
+    "name": 1,
+    "email": 1,
+    "phone": 1,
+    "position": 1,
+    "department": 1,
+    "experience": 1,
+    "skills": 1,
+    "status": 1,
+    "analysisScore": 1,
+    "resume_id": 1,
+    "cover_letter_id": 1,
+    "portfolio_id": 1,
+    "basic_info.names": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def to_jsonable(value: Any) -> Any:
+    """ObjectId → str, datetime/date → ISO 문자열로 변환한 사본을 반환합니다 (중첩 dict/list 포함)."""
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
@@ -6,10 +6,16 @@ from .vector_service import VectorService
 from .chunking_service import ChunkingService
 from .llm_service import LLMService
 from .keyword_search_service import KeywordSearchService
+from .search_cache import get_search_cache
+from .search_filters import FILTER_METADATA_VERSION, SearchFilters, filter_metadata
+from .serialization import SEARCH_RESULT_PROJECTION, to_jsonable
+from .chunk_ranking import rank_documents
 import re
 from collections import Counter
 from datetime import datetime
 import asyncio
+import heapq
+import numpy as np
 
 try:
     from modules.ai.services.langchain_hybrid_service import LangChainHybridService
@@ -45,12 +51,9 @@ class SimilarityService:
         
         # 유사도 임계값 설정
         self.similarity_threshold = 0.3   # 30%로 설정
-        # 필드별 최소 유사도 임계값 (성장배경, 지원동기, 경력사항만 사용)
-        self.field_thresholds = {
-            'growthBackground': 0.2,   # 성장배경 20% 이상
-            'motivation': 0.2,         # 지원동기 20% 이상
-            'careerHistory': 0.2,      # 경력사항 20% 이상
-        }
+        # 청크 기반 유사도: 같은 청크 타입 쌍 안의 점수 집계 방식 ("max", "mean", "top_m")
+        self.chunk_aggregation = "max"
+        self.chunk_top_m = 3
         
         # 다중 검색 가중치 설정 (벡터 + 키워드)
         self.search_weights = {
@@ -83,7 +86,9 @@ class SimilarityService:
                 }
             
             # 청크별 벡터 저장
-            stored_vector_ids = await self.vector_service.save_chunk_vectors(chunks, self.embedding_service)
+            stored_vector_ids = await self.vector_service.save_chunk_vectors(
+                chunks, self.embedding_service, extra_metadata=filter_metadata(resume)
+            )
             
             # Elasticsearch에 이력서 인덱싱
             try:
@@ -163,126 +168,122 @@ class SimilarityService:
             
             print(f"[SimilarityService] 검색 청크 수: {len(query_chunks)}")
             
-            # 각 청크별로 유사 벡터 검색
-            chunk_similarities = {}
-            for chunk in query_chunks:
-                print(f"[SimilarityService] 청크 '{chunk['chunk_type']}' 검색 중...")
-                
-                # 청크 텍스트로 쿼리 임베딩 생성
+            # 청크별 임베딩 생성 + 같은 청크 타입 벡터 검색을 동시에 수행
+            async def search_chunk(chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
                 query_embedding = await self.embedding_service.create_query_embedding(chunk["text"])
                 if not query_embedding:
-                    continue
-                
-                # Pinecone에서 유사한 벡터 검색
+                    return []
                 search_result = await self.vector_service.search_similar_vectors(
                     query_embedding=query_embedding,
                     top_k=limit * 3,  # 청크별로 더 많이 검색
-                    filter_type=document_type
+                    filter_type=chunk["chunk_type"]
                 )
-                
-                # 결과 저장
-                for match in search_result["matches"]:
+                return search_result["matches"]
+
+            chunk_matches = await asyncio.gather(*(search_chunk(chunk) for chunk in query_chunks))
+
+            # (검색 청크 × 후보 청크) 점수 행렬 구성
+            candidate_index: Dict[str, int] = {}
+            candidate_doc_ids: List[str] = []
+            candidate_fields: List[str] = []
+            candidate_texts: List[str] = []
+            entries = []
+            for query_index, matches in enumerate(chunk_matches):
+                for match in matches:
+                    metadata = match["metadata"]
                     # 문서 타입에 따라 적절한 ID 키 사용
                     if document_type == "cover_letter":
-                        match_document_id = match["metadata"].get("document_id", match["metadata"].get("resume_id"))
+                        match_document_id = metadata.get("document_id", metadata.get("resume_id"))
                     else:
-                        match_document_id = match["metadata"].get("resume_id", match["metadata"].get("document_id"))
-                    
-                    similarity_score = match["score"]
-                    chunk_type = match["metadata"]["chunk_type"]
-                    
+                        match_document_id = metadata.get("resume_id", metadata.get("document_id"))
+
                     # 자기 자신 제외
-                    if match_document_id == document_id:
+                    if not match_document_id or match_document_id == document_id:
                         continue
-                    
-                    # 문서별로 청크 유사도 누적
-                    if match_document_id not in chunk_similarities:
-                        chunk_similarities[match_document_id] = {
-                            "chunks": {},
-                            "total_score": 0.0,
-                            "chunk_count": 0
-                        }
-                    
-                    # 동일한 청크 타입에서 더 높은 점수만 유지
-                    key = f"{chunk['chunk_type']}_to_{chunk_type}"
-                    if key not in chunk_similarities[match_document_id]["chunks"] or \
-                       similarity_score > chunk_similarities[match_document_id]["chunks"][key]["score"]:
-                        
-                        chunk_similarities[match_document_id]["chunks"][key] = {
-                            "score": similarity_score,
-                            "query_chunk": chunk['chunk_type'],
-                            "match_chunk": chunk_type,
-                            "match_text": match["metadata"].get("text_preview", "")
-                        }
-            
-            # 문서별 종합 점수 계산
-            document_scores = []
-            for match_document_id, data in chunk_similarities.items():
-                if not data["chunks"]:
-                    continue
-                
-                # 청크 점수들의 평균 계산
-                chunk_scores = [chunk_data["score"] for chunk_data in data["chunks"].values()]
-                avg_score = sum(chunk_scores) / len(chunk_scores)
-                
-                # 임계값 체크
-                if avg_score >= self.similarity_threshold:
-                    document_scores.append({
-                        "document_id": match_document_id,
-                        "similarity_score": avg_score,
-                        "chunk_matches": len(data["chunks"]),
-                        "chunk_details": data["chunks"]
-                    })
-            
-            # 점수 순으로 정렬
-            document_scores.sort(key=lambda x: x["similarity_score"], reverse=True)
-            document_scores = document_scores[:limit]
-            
+
+                    if match["id"] not in candidate_index:
+                        candidate_index[match["id"]] = len(candidate_doc_ids)
+                        candidate_doc_ids.append(match_document_id)
+                        candidate_fields.append(metadata.get("chunk_type", ""))
+                        candidate_texts.append(metadata.get("text_preview", ""))
+                    entries.append((query_index, candidate_index[match["id"]], match["score"]))
+
+            scores = np.full((len(query_chunks), len(candidate_doc_ids)), np.nan)
+            for query_index, column, score in entries:
+                scores[query_index, column] = score
+
+            # 청크 타입 쌍별 집계 → 문서 점수 + 필드별 점수
+            ranked = rank_documents(
+                scores,
+                query_fields=[chunk["chunk_type"] for chunk in query_chunks],
+                candidate_doc_ids=candidate_doc_ids,
+                candidate_fields=candidate_fields,
+                aggregation=self.chunk_aggregation,
+                top_m=self.chunk_top_m,
+                min_score=self.similarity_threshold,
+                limit=limit
+            )
+            print(f"[SimilarityService] 후보 청크 수: {len(candidate_doc_ids)}, 임계값 통과 문서 수: {len(ranked)}")
+
             # MongoDB에서 상세 정보 조회
             results = []
-            if document_scores:
-                document_ids = [ObjectId(score["document_id"]) for score in document_scores]
+            if ranked:
+                document_ids = [ObjectId(item["document_id"]) for item in ranked]
                 if document_type == "cover_letter":
-                    documents_detail = await db.cover_letters.find({"_id": {"$in": document_ids}}).to_list(1000)
+                    documents_detail = await db.cover_letters.find({"_id": {"$in": document_ids}}).to_list(len(document_ids))
                 elif collection is not None:
-                    documents_detail = await collection.find({"_id": {"$in": document_ids}}).to_list(1000)
+                    documents_detail = await collection.find({"_id": {"$in": document_ids}}).to_list(len(document_ids))
                 else:
                     documents_detail = []
-                
-                for score_data in document_scores:
-                    document_detail = next((d for d in documents_detail if str(d["_id"]) == score_data["document_id"]), None)
+                documents_by_id = {str(d["_id"]): d for d in documents_detail}
+
+                # LLM 분석에 넘길 문서별 최고 점수 청크 텍스트
+                best_match_texts = []
+                for item in ranked:
+                    document_detail = documents_by_id.get(item["document_id"])
                     if document_detail:
-                        document_detail["_id"] = str(document_detail["_id"])
-                        if "created_at" in document_detail:
-                            document_detail["created_at"] = document_detail["created_at"].isoformat()
-                        
-                        # LLM을 통한 유사성 분석 추가 (표절 의심도 분석 사용)
-                        try:
-                            llm_analysis = await self.llm_service.analyze_plagiarism_suspicion(
-                                similarity_score=score_data["similarity_score"],
-                                similar_documents=[{
-                                    "similarity_score": score_data["similarity_score"],
-                                    "name": document_detail.get("name", "Unknown"),
-                                    "basic_info_names": document_detail.get("name", "Unknown")
-                                }],
-                                document_type=document_type
-                            )
-                        except Exception as llm_error:
-                            print(f"[SimilarityService] LLM 분석 실패: {str(llm_error)}")
-                            llm_analysis = {
-                                "success": False,
-                                "error": str(llm_error),
-                                "analysis": "LLM 분석을 수행할 수 없습니다."
+                        document_detail = to_jsonable(document_detail)
+                        chunk_details = {
+                            f"{pair['query_field']}_to_{pair['match_field']}": {
+                                "score": pair["score"],
+                                "query_chunk": pair["query_field"],
+                                "match_chunk": pair["match_field"],
+                                "match_text": candidate_texts[pair["candidate_index"]]
                             }
-                        
+                            for pair in item["pairs"]
+                        }
+
+                        best_pair = max(item["pairs"], key=lambda pair: pair["score"])
+                        best_match_texts.append(candidate_texts[best_pair["candidate_index"]])
                         results.append({
-                            "similarity_score": score_data["similarity_score"],
-                            "similarity_percentage": round(score_data["similarity_score"] * 100, 1),
-                            "chunk_matches": score_data["chunk_matches"],
+                            "similarity_score": item["score"],
+                            "similarity_percentage": round(item["score"] * 100, 1),
+                            "chunk_matches": item["chunk_matches"],
                             document_type: document_detail,
-                            "chunk_details": score_data["chunk_details"],
-                            "llm_analysis": llm_analysis
+                            "chunk_details": chunk_details,
+                            "field_scores": item["field_scores"]
                         })
+
+                # LLM을 통한 유사성 분석 (모든 유사 문서를 배치 프롬프트로 묶어서 요청)
+                try:
+                    llm_analyses = await self.llm_service.analyze_plagiarism_suspicion_batch(
+                        document,
+                        [{
+                            "similarity_score": result["similarity_score"],
+                            "name": result[document_type].get("name", "Unknown"),
+                            "text": text
+                        } for result, text in zip(results, best_match_texts)],
+                        document_type=document_type
+                    )
+                except Exception as llm_error:
+                    print(f"[SimilarityService] LLM 분석 실패: {str(llm_error)}")
+                    llm_analyses = [{
+                        "success": False,
+                        "error": str(llm_error),
+                        "analysis": "LLM 분석을 수행할 수 없습니다."
+                    }] * len(results)
+                for result, llm_analysis in zip(results, llm_analyses):
+                    result["llm_analysis"] = llm_analysis
             
             # 전체 결과에 대한 표절 위험도 분석 추가
             plagiarism_analysis = await self.llm_service.analyze_plagiarism_suspicion(
@@ -374,7 +375,7 @@ class SimilarityService:
             cover_letter_vector_id = f"cover_letter_{cover_letter_id}"
             try:
                 # Pinecone에서 현재 자소서 벡터 확인
-                existing_vector = self.vector_service.index.fetch([cover_letter_vector_id])
+                existing_vector = await self.vector_service.fetch_vectors([cover_letter_vector_id])
                 if not existing_vector.vectors or cover_letter_vector_id not in existing_vector.vectors:
                     print(f"[SimilarityService] 자소서 벡터 없음. 벡터 DB에 저장 중...")
                     
@@ -392,7 +393,7 @@ class SimilarityService:
                         }
                     }
                     
-                    self.vector_service.index.upsert(vectors=[vector_data])
+                    await self.vector_service.upsert_vectors([vector_data])
                     print(f"[SimilarityService] 자소서 벡터 저장 완료: {cover_letter_vector_id}")
                 else:
                     print(f"[SimilarityService] 자소서 벡터 이미 존재: {cover_letter_vector_id}")
@@ -413,7 +414,7 @@ class SimilarityService:
                     }
                 }
                 
-                self.vector_service.index.upsert(vectors=[vector_data])
+                await self.vector_service.upsert_vectors([vector_data])
                 print(f"[SimilarityService] 자소서 벡터 강제 저장 완료: {cover_letter_vector_id}")
             
             # Pinecone에서 유사한 벡터 검색 (표절 의심 수준으로 높은 임계값 사용)
@@ -446,6 +447,7 @@ class SimilarityService:
                 cover_letter_ids = [ObjectId(match["metadata"].get("document_id", match["metadata"].get("resume_id"))) for match in suspected_plagiarism]
                 cover_letters_detail = await collection.find({"_id": {"$in": cover_letter_ids}}).to_list(1000)
                 
+                matched = []
                 for match in suspected_plagiarism:
                     match_doc_id = match["metadata"].get("document_id", match["metadata"].get("resume_id"))
                     cover_letter_detail = next((cl for cl in cover_letters_detail if str(cl["_id"]) == match_doc_id), None)
@@ -459,19 +461,25 @@ class SimilarityService:
                             elif key == "_id":
                                 cover_letter_detail[key] = str(value)  # ObjectId도 문자열로
                         
-                        # 표절 위험도 분석
-                        plagiarism_analysis = await self.llm_service.analyze_plagiarism_suspicion(
-                            original_resume=cover_letter,
-                            similar_resumes=[{"resume": cover_letter_detail, "similarity_score": match["score"]}]
-                        )
-                        
-                        results.append({
-                            "similarity_score": match["score"],
-                            "similarity_percentage": round(match["score"] * 100, 1),
-                            "suspicion_risk": "HIGH" if match["score"] >= 0.85 else "MEDIUM",
-                            "cover_letter": cover_letter_detail,
-                            "suspicion_analysis": plagiarism_analysis
-                        })
+                        matched.append((match, cover_letter_detail))
+                
+                # 표절 위험도 분석 (의심 자소서 전체를 배치 프롬프트로 묶어서 요청)
+                plagiarism_analyses = await self.llm_service.analyze_plagiarism_suspicion_batch(
+                    cover_letter,
+                    [{
+                        "similarity_score": match["score"],
+                        "name": detail.get("basic_info_names") or detail.get("name", "Unknown"),
+                        "text": match["metadata"].get("text_preview", "")
+                    } for match, detail in matched]
+                )
+                for (match, cover_letter_detail), plagiarism_analysis in zip(matched, plagiarism_analyses):
+                    results.append({
+                        "similarity_score": match["score"],
+                        "similarity_percentage": round(match["score"] * 100, 1),
+                        "suspicion_risk": "HIGH" if match["score"] >= 0.85 else "MEDIUM",
+                        "cover_letter": cover_letter_detail,
+                        "suspicion_analysis": plagiarism_analysis
+                    })
             
             # 유사도 점수로 정렬
             results.sort(key=lambda x: x["similarity_score"], reverse=True)
@@ -750,7 +758,8 @@ class SimilarityService:
 
 
     async def search_resumes_multi_hybrid(self, query: str, collection: Collection, 
-                                        search_type: str = "resume", limit: int = 10) -> Dict[str, Any]:
+                                        search_type: str = "resume", limit: int = 10,
+                                        filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
         """
         다중 하이브리드 검색: LangChain EnsembleRetriever 또는 기존 방식을 사용합니다.
         
@@ -759,10 +768,28 @@ class SimilarityService:
             collection (Collection): MongoDB 컬렉션
             search_type (str): 검색할 타입
             limit (int): 반환할 최대 결과 수
+            filters (Optional[SearchFilters]): 검색 필터 (벡터/키워드 검색 단계에서 적용)
             
         Returns:
             Dict[str, Any]: 다중 하이브리드 검색 결과
         """
+        filters = filters if filters and not filters.is_empty() else None
+        
+        # 동일 검색어/조건/가중치의 반복 검색은 결과 캐시에서 반환 (색인 변경 시 무효화)
+        cache = get_search_cache()
+        cache_key = cache.make_key(
+            "multi_hybrid", query, search_type=search_type, limit=limit,
+            weights=self.search_weights, collection=getattr(collection, "name", None),
+            filters=filters.to_dict() if filters else None
+        )
+        return await cache.get_or_compute(
+            cache_key, lambda: self._search_resumes_multi_hybrid(query, collection, search_type, limit, filters)
+        )
+
+    async def _search_resumes_multi_hybrid(self, query: str, collection: Collection,
+                                         search_type: str, limit: int,
+                                         filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
+        """캐시를 거치지 않는 다중 하이브리드 검색"""
         try:
             print(f"[SimilarityService] === 다중 하이브리드 검색 시작 ===")
             print(f"[SimilarityService] 검색 쿼리: {query}")
@@ -770,14 +797,14 @@ class SimilarityService:
             if not query or not query.strip():
                 raise ValueError("검색어를 입력해주세요.")
             
-            # LangChain 하이브리드 서비스 우선 사용
-            if self.langchain_hybrid:
+            # LangChain 하이브리드 서비스 우선 사용 (필터 검색은 필터를 검색 단계에 적용하는 기존 방식 사용)
+            if self.langchain_hybrid and not filters:
                 print(f"[SimilarityService] LangChain 하이브리드 검색 사용")
                 return await self._search_with_langchain_hybrid(query, collection, search_type, limit)
             
             # 기존 방식 폴백
             print(f"[SimilarityService] 기존 하이브리드 검색 사용 (폴백)")
-            return await self._search_with_manual_hybrid(query, collection, search_type, limit)
+            return await self._search_with_manual_hybrid(query, collection, search_type, limit, filters)
             
         except Exception as e:
             print(f"[SimilarityService] 다중 하이브리드 검색 실패: {str(e)}")
@@ -809,7 +836,8 @@ class SimilarityService:
             return await self._search_with_manual_hybrid(query, collection, search_type, limit)
 
     async def _search_with_manual_hybrid(self, query: str, collection: Collection, 
-                                       search_type: str, limit: int) -> Dict[str, Any]:
+                                       search_type: str, limit: int,
+                                       filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
         """기존 수동 하이브리드 검색을 사용합니다."""
         try:
             print(f"[SimilarityService] 기존 하이브리드 검색 수행")
@@ -818,16 +846,16 @@ class SimilarityService:
             
             # 1. 벡터 검색 수행
             print(f"[SimilarityService] 1단계: 벡터 검색 수행")
-            vector_results = await self._perform_vector_search(query, collection, search_type, limit * 2)
+            vector_results = await self._perform_vector_search(query, collection, search_type, limit * 2, filters)
             
             # 2. 키워드 검색 수행
             print(f"[SimilarityService] 2단계: 키워드 검색 수행")
-            keyword_results = await self._perform_keyword_search(query, collection, limit * 2)
+            keyword_results = await self._perform_keyword_search(query, collection, limit * 2, filters)
             
             # 3. 검색 결과 융합
             print(f"[SimilarityService] 3단계: 검색 결과 융합")
             fused_results = await self._fuse_search_results(
-                vector_results, keyword_results, collection, query, limit
+                vector_results, keyword_results, collection, query, limit, filters
             )
             
             print(f"[SimilarityService] 최종 결과 수: {len(fused_results)}")
@@ -842,7 +870,8 @@ class SimilarityService:
                     "results": fused_results,
                     "total": len(fused_results),
                     "vector_count": len(vector_results),
-                    "keyword_count": len(keyword_results)
+                    "keyword_count": len(keyword_results),
+                    "filters": filters.to_dict() if filters else {}
                 }
             }
             
@@ -851,7 +880,8 @@ class SimilarityService:
             raise e
 
     async def _perform_vector_search(self, query: str, collection: Collection, 
-                                   search_type: str, limit: int) -> List[Dict[str, Any]]:
+                                   search_type: str, limit: int,
+                                   filters: Optional[SearchFilters] = None) -> List[Dict[str, Any]]:
         """벡터 검색을 수행합니다."""
         try:
             # 쿼리 임베딩 생성
@@ -880,7 +910,8 @@ class SimilarityService:
             search_result = await self.vector_service.search_similar_vectors(
                 query_embedding=query_embedding,
                 top_k=limit,
-                filter_type=search_type
+                filter_type=search_type,
+                filters=filters
             )
             
             # 결과 포맷팅
@@ -902,27 +933,19 @@ class SimilarityService:
             return []
 
     async def _perform_keyword_search(self, query: str, collection: Collection, 
-                                    limit: int) -> List[Dict[str, Any]]:
+                                    limit: int, filters: Optional[SearchFilters] = None) -> List[Dict[str, Any]]:
         """키워드 검색을 수행합니다."""
         try:
-            # BM25 키워드 검색
-            keyword_result = await self.keyword_search_service.search_by_keywords(
-                query=query,
-                collection=collection,
-                limit=limit
-            )
-            
-            if not keyword_result["success"]:
-                return []
+            # BM25 키워드 검색 (융합에는 ID와 점수만 필요하므로 MongoDB 조회 없음)
+            hits = await self.keyword_search_service.search_ids(query, limit, filters, collection)
             
             # 결과 포맷팅
             keyword_results = []
-            for result in keyword_result["results"]:
+            for resume_id, score in hits:
                 keyword_results.append({
-                    "resume_id": result["resume"]["_id"],
-                    "keyword_score": result["bm25_score"],
-                    "search_method": "keyword",
-                    "highlight": result.get("highlight", "")
+                    "resume_id": resume_id,
+                    "keyword_score": round(score, 4),
+                    "search_method": "keyword"
                 })
             
             print(f"[SimilarityService] 키워드 검색 결과: {len(keyword_results)}개")
@@ -935,36 +958,23 @@ class SimilarityService:
     async def _fuse_search_results(self, vector_results: List[Dict[str, Any]], 
                                  keyword_results: List[Dict[str, Any]], 
                                  collection: Collection, query: str, 
-                                 limit: int) -> List[Dict[str, Any]]:
-        """여러 검색 결과를 융합합니다."""
+                                 limit: int, filters: Optional[SearchFilters] = None) -> List[Dict[str, Any]]:
+        """여러 검색 결과를 융합합니다 (점수는 ID 기준으로 계산하고 상위 결과만 조회)."""
         try:
-            # 모든 unique resume_id 수집
-            all_resume_ids = set()
             vector_scores = {}
             keyword_scores = {}
             
             # 벡터 검색 결과 처리
             for result in vector_results:
-                resume_id = result["resume_id"]
-                all_resume_ids.add(resume_id)
-                vector_scores[resume_id] = result["vector_score"]
+                vector_scores[result["resume_id"]] = result["vector_score"]
             
             # 키워드 검색 결과 처리
             for result in keyword_results:
-                resume_id = result["resume_id"]
-                all_resume_ids.add(resume_id)
-                keyword_scores[resume_id] = result["keyword_score"]
-            
-            # MongoDB에서 상세 정보 조회
-            resume_ids_obj = [ObjectId(rid) for rid in all_resume_ids]
-            resumes = await collection.find({"_id": {"$in": resume_ids_obj}}).to_list(1000)
+                keyword_scores[result["resume_id"]] = result["keyword_score"]
             
             # 융합 점수 계산
-            fused_results = []
-            for resume in resumes:
-                resume_id = str(resume["_id"])
-                
-                # 각 검색 방법의 점수 가져오기 (없으면 0)
+            final_scores = {}
+            for resume_id in vector_scores.keys() | keyword_scores.keys():
                 v_score = vector_scores.get(resume_id, 0.0)
                 k_score = keyword_scores.get(resume_id, 0.0)
                 
@@ -972,48 +982,41 @@ class SimilarityService:
                 k_score_normalized = min(k_score / 10.0, 1.0) if k_score > 0 else 0.0
                 
                 # 가중 평균으로 최종 점수 계산 (벡터 + 키워드만)
-                final_score = (
+                final_scores[resume_id] = (
                     v_score * self.search_weights['vector'] +
                     k_score_normalized * self.search_weights['keyword']
                 )
-                
-                # 점수가 0보다 큰 경우만 포함
-                if final_score > 0:
-                    # 이력서 데이터 포맷팅
-                    resume["_id"] = str(resume["_id"])
-                    if "resume_id" in resume:
-                        resume["resume_id"] = str(resume["resume_id"])
-                    else:
-                        resume["resume_id"] = str(resume["_id"])
-                    
-                    # 모든 datetime 필드를 문자열로 변환 (JSON 직렬화를 위해)
-                    for key, value in list(resume.items()):
-                        if hasattr(value, 'isoformat'):  # datetime 객체인지 확인
-                            resume[key] = value.isoformat()
-                        elif key == "_id":
-                            resume[key] = str(value)  # ObjectId도 문자열로
-                    
-                    fused_results.append({
-                        "final_score": final_score,
-                        "vector_score": v_score,
-                        "keyword_score": k_score_normalized,
-                        "original_keyword_score": k_score,
-                        "resume": resume,
-                        "search_methods": [
-                            method for method, score in [
-                                ("vector", v_score), 
-                                ("keyword", k_score_normalized)
-                            ] if score > 0
-                        ]
-                    })
             
-            # 최종 점수 기준으로 정렬
-            fused_results.sort(key=lambda x: x["final_score"], reverse=True)
+            # 상위 limit개만 MongoDB에서 필요한 필드로 조회
+            winners = await self._hydrate_top_k(
+                collection, final_scores, limit, filters.to_mongo() if filters else None
+            )
             
-            # 상위 결과만 반환
-            final_results = fused_results[:limit]
+            final_results = []
+            for resume_id, resume in winners:
+                v_score = vector_scores.get(resume_id, 0.0)
+                k_score = keyword_scores.get(resume_id, 0.0)
+                k_score_normalized = min(k_score / 10.0, 1.0) if k_score > 0 else 0.0
+                
+                # 이력서 데이터 포맷팅
+                resume = to_jsonable(resume)
+                resume["resume_id"] = resume.get("resume_id") or resume["_id"]
+                
+                final_results.append({
+                    "final_score": final_scores[resume_id],
+                    "vector_score": v_score,
+                    "keyword_score": k_score_normalized,
+                    "original_keyword_score": k_score,
+                    "resume": resume,
+                    "search_methods": [
+                        method for method, score in [
+                            ("vector", v_score), 
+                            ("keyword", k_score_normalized)
+                        ] if score > 0
+                    ]
+                })
             
-            print(f"[SimilarityService] 융합 결과: {len(final_results)}개 (전체 후보: {len(fused_results)}개)")
+            print(f"[SimilarityService] 융합 결과: {len(final_results)}개 (전체 후보: {len(final_scores)}개)")
             for i, result in enumerate(final_results[:3]):  # 상위 3개만 로그
                 # name 필드 처리 (실제 DB 구조에 맞게)
                 name = '이름미상'
@@ -1037,6 +1040,38 @@ class SimilarityService:
                 print(f"[SimilarityService] 첫번째 벡터 결과: {vector_results[0]}")
             return []
 
+    async def _hydrate_top_k(self, collection: Collection, scores: Dict[str, float],
+                             limit: int, mongo_filter: Optional[Dict[str, Any]] = None) -> List[tuple]:
+        """
+        점수 상위 문서부터 limit개만 MongoDB에서 조회합니다.
+        
+        후보 전체를 정렬하지 않고 힙에서 필요한 만큼만 꺼내며, 삭제되어 조회되지 않은
+        문서가 있으면 다음 후보로 채웁니다.
+        
+        Args:
+            collection (Collection): MongoDB 컬렉션
+            scores (Dict[str, float]): 문서 ID → 최종 점수 (0 이하는 제외)
+            limit (int): 반환할 최대 결과 수
+            mongo_filter (Optional[Dict[str, Any]]): 함께 적용할 MongoDB 조건 (검색 필터)
+            
+        Returns:
+            List[tuple]: 점수 내림차순 (문서 ID, 문서) 목록
+        """
+        heap = [(-score, doc_id) for doc_id, score in scores.items()
+                if score > 0 and ObjectId.is_valid(doc_id)]
+        heapq.heapify(heap)
+        
+        winners = []
+        while heap and len(winners) < limit:
+            batch = [heapq.heappop(heap)[1] for _ in range(min(limit - len(winners), len(heap)))]
+            docs = await collection.find(
+                {**(mongo_filter or {}), "_id": {"$in": [ObjectId(doc_id) for doc_id in batch]}},
+                SEARCH_RESULT_PROJECTION
+            ).to_list(length=None)
+            found = {str(doc["_id"]): doc for doc in docs}
+            winners.extend((doc_id, found[doc_id]) for doc_id in batch if doc_id in found)
+        return winners
+
     async def _store_applicant_vector_if_needed(self, applicant: Dict[str, Any]) -> bool:
         """
         지원자 정보를 벡터로 저장 (없는 경우에만)
@@ -1053,10 +1088,15 @@ class SimilarityService:
             
             # 이미 벡터가 존재하는지 확인 (text 필드가 있는지도 확인)
             try:
-                existing_vector = self.vector_service.index.fetch(ids=[vector_id])
+                existing_vector = await self.vector_service.fetch_vectors([vector_id])
                 if existing_vector and existing_vector.get("vectors"):
                     vector_info = existing_vector["vectors"].get(vector_id)
-                    if vector_info and vector_info.get("metadata", {}).get("text"):
+                    existing_metadata = vector_info.get("metadata", {}) if vector_info else {}
+                    if existing_metadata.get("text"):
+                        # 검색 필터 필드가 이전 형식이면 재임베딩 없이 메타데이터만 갱신
+                        if existing_metadata.get("filter_version") != FILTER_METADATA_VERSION:
+                            await self.vector_service.update_vector_metadata(vector_id, filter_metadata(applicant))
+                            print(f"[SimilarityService] 지원자 벡터 필터 메타데이터 갱신: {vector_id}")
                         print(f"[SimilarityService] 지원자 벡터 이미 존재 (text 필드 포함): {vector_id}")
                         return True
                     else:
@@ -1104,11 +1144,13 @@ class SimilarityService:
                     "skills": applicant.get("skills", ""),
                     "text": applicant_text,  # LangChain이 필요로 하는 text 필드
                     "text_preview": applicant_text[:100] + "..." if len(applicant_text) > 100 else applicant_text,
-                    "created_at": datetime.now().isoformat()
+                    "created_at": datetime.now().isoformat(),
+                    # 검색 필터 필드 (채용공고, 상태, 직무/부서 키, 기술 목록, 경력 연차)
+                    **filter_metadata(applicant)
                 }
             }
             
-            self.vector_service.index.upsert(vectors=[vector_data])
+            await self.vector_service.upsert_vectors([vector_data])
             print(f"[SimilarityService] 지원자 벡터 저장 완료: {applicant.get('name', 'Unknown')} ({vector_id})")
             return True
             
@@ -1198,6 +1240,23 @@ class SimilarityService:
         Returns:
             Dict[str, Any]: 유사 지원자 검색 결과
         """
+        # 기준 지원자의 검색 관련 필드가 같으면 같은 결과이므로 캐시 키에 포함
+        cache = get_search_cache()
+        cache_key = cache.make_key(
+            "similar_applicants", str(target_applicant.get("_id", "")), limit=limit,
+            weights=self.search_weights,
+            applicant={field: target_applicant.get(field) for field in (
+                "position", "experience", "skills", "resume_id",
+                "growthBackground", "motivation", "careerHistory"
+            )}
+        )
+        return await cache.get_or_compute(
+            cache_key, lambda: self._search_similar_applicants_hybrid(target_applicant, applicants_collection, limit)
+        )
+
+    async def _search_similar_applicants_hybrid(self, target_applicant: Dict[str, Any],
+                                              applicants_collection: Collection, limit: int) -> Dict[str, Any]:
+        """캐시를 거치지 않는 유사 인재 추천"""
         try:
             print(f"[SimilarityService] === 지원자 기반 유사 인재 추천 시작 ===")
             print(f"[SimilarityService] 기준 지원자: {target_applicant.get('name', 'N/A')}")
@@ -1291,26 +1350,12 @@ class SimilarityService:
             keyword_results = []
             if keyword_query_text:
                 print(f"[SimilarityService] 키워드 검색 수행 (이력서 내용 기반)...")
-                # Elasticsearch 기반 BM25 검색 실행
-                es_result = await self.keyword_search_service.search_by_keywords(
-                    query=keyword_query_text,
-                    collection=applicants_collection,
-                    limit=limit * 2
-                )
-                # 융합 로직에서 기대하는 형식({_id, _score})으로 변환
-                if es_result and es_result.get("success"):
-                    for item in es_result.get("results", []):
-                        try:
-                            resume_doc = item.get("resume", {})
-                            resume_id = resume_doc.get("_id")
-                            bm25_score = item.get("bm25_score", 0)
-                            if resume_id:
-                                keyword_results.append({
-                                    "_id": resume_id,
-                                    "_score": bm25_score
-                                })
-                        except Exception:
-                            continue
+                # BM25 검색 (ID와 점수만), 융합 로직에서 기대하는 형식({_id, _score})으로 변환
+                hits = await self.keyword_search_service.search_ids(keyword_query_text, limit * 2)
+                keyword_results = [
+                    {"_id": resume_id, "_score": round(score, 4)}
+                    for resume_id, score in hits
+                ]
             else:
                 print(f"[SimilarityService] 키워드 검색 스킵 (이력서 내용 없음)")
             
@@ -1369,95 +1414,76 @@ class SimilarityService:
         try:
             print(f"[SimilarityService] === 지원자 기반 결과 융합 시작 ===")
             
-            # 벡터 결과를 지원자 ID 기반으로 변환
+            target_id = str(target_applicant.get("_id"))
+            
+            # 벡터 결과를 지원자 ID 기반으로 변환 (지원자 벡터의 document_id가 applicant_id, 첫 매치가 최고 점수)
             vector_applicant_scores = {}
             for match in vector_results:
-                # 지원자 벡터의 경우 document_id가 applicant_id임
                 applicant_id = match["metadata"].get("document_id")
-                if applicant_id and applicant_id != str(target_applicant.get("_id")):
-                    # applicant_id로 지원자 찾기
-                    from bson import ObjectId
-                    applicant = await applicants_collection.find_one({"_id": ObjectId(applicant_id)})
-                    if applicant:
-                        if applicant_id not in vector_applicant_scores:
-                            vector_applicant_scores[applicant_id] = {
-                                "score": match["score"],
-                                "applicant": applicant
-                            }
+                if applicant_id and applicant_id != target_id and applicant_id not in vector_applicant_scores:
+                    vector_applicant_scores[applicant_id] = match["score"]
             
             print(f"[SimilarityService] 벡터 검색으로 매칭된 지원자 수: {len(vector_applicant_scores)}")
             
-            # 키워드 결과를 지원자 ID 기반으로 변환  
-            keyword_applicant_scores = {}
+            # 키워드 결과를 지원자 ID 기반으로 변환 (resume_id → 지원자 ID를 한 번의 조회로, ID 필드만)
+            keyword_hits = {}
             for result in keyword_results:
                 resume_id = result.get("_id")
-                if resume_id and resume_id != target_applicant.get("resume_id"):
-                    # resume_id로 지원자 찾기
-                    applicant = await applicants_collection.find_one({"resume_id": resume_id})
-                    if applicant:
-                        applicant_id = str(applicant["_id"])
-                        bm25_score = result.get("_score", 0)
-                        # BM25 점수를 0-1 범위로 정규화
-                        normalized_score = min(bm25_score / 10.0, 1.0)
-                        
-                        if applicant_id not in keyword_applicant_scores:
-                            keyword_applicant_scores[applicant_id] = {
-                                "score": normalized_score,
-                                "original_score": bm25_score,
-                                "applicant": applicant
-                            }
+                if resume_id and resume_id != target_applicant.get("resume_id") and resume_id not in keyword_hits:
+                    keyword_hits[resume_id] = result.get("_score", 0)
             
-            print(f"[SimilarityService] 키워드 검색으로 매칭된 지원자 수: {len(keyword_applicant_scores)}")
+            applicant_by_resume = {}
+            if keyword_hits:
+                linked = await applicants_collection.find(
+                    {"resume_id": {"$in": list(keyword_hits)}}, {"resume_id": 1}
+                ).to_list(length=None)
+                for applicant in linked:
+                    applicant_by_resume.setdefault(applicant["resume_id"], str(applicant["_id"]))
             
-            # 결과 융합
-            fused_results = []
-            all_applicant_ids = set(vector_applicant_scores.keys()) | set(keyword_applicant_scores.keys())
+            keyword_applicant_scores = {}
+            for resume_id, bm25_score in keyword_hits.items():
+                applicant_id = applicant_by_resume.get(resume_id)
+                if applicant_id and applicant_id not in keyword_applicant_scores:
+                    keyword_applicant_scores[applicant_id] = bm25_score
+            
+            print(f"[SimilarityService] 키워드 검색으로 매칭된 지원자 수: {len(keyword_applicant_scores)}")
             
-            for applicant_id in all_applicant_ids:
-                v_score = vector_applicant_scores.get(applicant_id, {}).get("score", 0)
-                k_score_data = keyword_applicant_scores.get(applicant_id, {})
-                k_score_normalized = k_score_data.get("score", 0)
-                k_score = k_score_data.get("original_score", 0)
+            # 결과 융합: 점수는 ID 기준으로 계산하고 상위 limit명만 조회
+            final_scores = {}
+            for applicant_id in vector_applicant_scores.keys() | keyword_applicant_scores.keys():
+                v_score = vector_applicant_scores.get(applicant_id, 0)
+                # BM25 점수를 0-1 범위로 정규화
+                k_score_normalized = min(keyword_applicant_scores.get(applicant_id, 0) / 10.0, 1.0)
                 
                 # 가중 평균으로 최종 점수 계산
-                final_score = (v_score * self.search_weights['vector']) + (k_score_normalized * self.search_weights['keyword'])
+                final_scores[applicant_id] = (v_score * self.search_weights['vector']) + (k_score_normalized * self.search_weights['keyword'])
+            
+            final_results = []
+            for applicant_id, applicant in await self._hydrate_top_k(applicants_collection, final_scores, limit):
+                v_score = vector_applicant_scores.get(applicant_id, 0)
+                k_score = keyword_applicant_scores.get(applicant_id, 0)
+                k_score_normalized = min(k_score / 10.0, 1.0)
                 
-                # 지원자 정보 가져오기
-                applicant = vector_applicant_scores.get(applicant_id, {}).get("applicant") or \
-                           keyword_applicant_scores.get(applicant_id, {}).get("applicant")
+                # ID와 datetime 필드 처리
+                applicant = to_jsonable(applicant)
                 
-                if applicant and final_score > 0:
-                    # ID와 datetime 필드 처리
-                    applicant["_id"] = str(applicant["_id"])
-                    
-                    # 모든 datetime 필드를 문자열로 변환
-                    for key, value in list(applicant.items()):
-                        if hasattr(value, 'isoformat'):
-                            applicant[key] = value.isoformat()
-                        elif key == "_id":
-                            applicant[key] = str(value)
-                    
-                    # 이름 필드 확보 (이미 지원자 정보에 있음)
-                    if not applicant.get('name'):
-                        applicant['name'] = '이름미상'
-                    
-                    fused_results.append({
-                        "final_score": final_score,
-                        "vector_score": v_score,
-                        "keyword_score": k_score_normalized,
-                        "original_keyword_score": k_score,
-                        "applicant": applicant,
-                        "search_methods": [
-                            method for method, score in [
-                                ("vector", v_score), 
-                                ("keyword", k_score_normalized)
-                            ] if score > 0
-                        ]
-                    })
-            
-            # 최종 점수 기준으로 정렬
-            fused_results.sort(key=lambda x: x["final_score"], reverse=True)
-            final_results = fused_results[:limit]
+                # 이름 필드 확보 (이미 지원자 정보에 있음)
+                if not applicant.get('name'):
+                    applicant['name'] = '이름미상'
+                
+                final_results.append({
+                    "final_score": final_scores[applicant_id],
+                    "vector_score": v_score,
+                    "keyword_score": k_score_normalized,
+                    "original_keyword_score": k_score,
+                    "applicant": applicant,
+                    "search_methods": [
+                        method for method, score in [
+                            ("vector", v_score), 
+                            ("keyword", k_score_normalized)
+                        ] if score > 0
+                    ]
+                })
             
             print(f"[SimilarityService] 융합 결과: {len(final_results)}개 지원자")
             for i, result in enumerate(final_results[:3]):
@@ -1537,6 +1563,77 @@ class SimilarityService:
                 "message": "이력서 데이터 삭제 중 오류가 발생했습니다."
             }
 
+    async def sync_applicant_filter_metadata(self, applicants_collection: Collection,
+                                             concurrency: int = 16) -> Dict[str, Any]:
+        """
+        기존 지원자 벡터와 이력서 청크 벡터에 검색 필터 메타데이터를 채웁니다 (재임베딩 없이 메타데이터만 갱신).
+        
+        청크 벡터 ID는 지원자 문서를 다시 청킹해서 구합니다 (임베딩은 만들지 않음).
+        
+        Args:
+            applicants_collection (Collection): 지원자 컬렉션
+            concurrency (int): 동시 갱신 요청 수
+            
+        Returns:
+            Dict[str, Any]: 갱신 결과 (updated/failed는 지원자 수, chunks_updated는 청크 벡터 수)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        updated = 0
+        failed = 0
+        chunks_updated = 0
+        
+        async def update_one(vector_id: str, metadata: Dict[str, Any]) -> None:
+            async with semaphore:
+                await self.vector_service.update_vector_metadata(vector_id, metadata)
+        
+        async def update(applicant: Dict[str, Any]) -> bool:
+            nonlocal chunks_updated
+            metadata = filter_metadata(applicant)
+            try:
+                chunk_ids = [chunk["chunk_id"] for chunk in self.chunking_service.chunk_resume_text(applicant)]
+                await asyncio.gather(
+                    update_one(f"applicant_{applicant['_id']}", metadata),
+                    *(update_one(chunk_id, metadata) for chunk_id in chunk_ids)
+                )
+                chunks_updated += len(chunk_ids)
+                return True
+            except Exception as e:
+                print(f"[SimilarityService] 필터 메타데이터 갱신 실패 ({applicant['_id']}): {e}")
+                return False
+        
+        try:
+            batch = []
+            async for applicant in applicants_collection.find({}):
+                batch.append(applicant)
+                if len(batch) >= concurrency * 10:
+                    results = await asyncio.gather(*(update(item) for item in batch))
+                    updated += sum(results)
+                    failed += len(results) - sum(results)
+                    batch = []
+            if batch:
+                results = await asyncio.gather(*(update(item) for item in batch))
+                updated += sum(results)
+                failed += len(results) - sum(results)
+            
+            print(f"[SimilarityService] 필터 메타데이터 갱신 완료: {updated}개 성공 (청크 {chunks_updated}개), {failed}개 실패")
+            return {
+                "success": True,
+                "message": "지원자/이력서 청크 벡터 필터 메타데이터 갱신이 완료되었습니다.",
+                "updated": updated,
+                "failed": failed,
+                "chunks_updated": chunks_updated
+            }
+            
+        except Exception as e:
+            print(f"[SimilarityService] 필터 메타데이터 갱신 실패: {str(e)}")
+            return {
+                "success": False,
+                "message": f"필터 메타데이터 갱신 중 오류가 발생했습니다: {str(e)}",
+                "updated": updated,
+                "failed": failed,
+                "chunks_updated": chunks_updated
+            }
+
     async def batch_store_cover_letter_vectors(self, cover_letters_collection) -> Dict[str, Any]:
         """
         모든 자소서를 벡터 DB에 일괄 저장합니다.
@@ -1565,7 +1662,7 @@ class SimilarityService:
                     
                     # 이미 존재하는지 확인
                     try:
-                        existing_vector = self.vector_service.index.fetch([cover_letter_vector_id])
+                        existing_vector = await self.vector_service.fetch_vectors([cover_letter_vector_id])
                         if existing_vector.vectors and cover_letter_vector_id in existing_vector.vectors:
                             print(f"[SimilarityService] 스킵 (이미 존재): {cover_letter_vector_id}")
                             skipped_count += 1
@@ -1601,7 +1698,7 @@ class SimilarityService:
                         }
                     }
                     
-                    self.vector_service.index.upsert(vectors=[vector_data])
+                    await self.vector_service.upsert_vectors([vector_data])
                     stored_count += 1
                     print(f"[SimilarityService] 저장 완료: {cover_letter_vector_id} ({stored_count}/{len(cover_letters)})")
                     
@@ -1634,7 +1731,8 @@ class SimilarityService:
 
     async def find_similar_applicants(self, position: str = "", skills: str = "", 
                                     experience: str = "", department: str = "", 
-                                    limit: int = 10) -> List[Dict[str, Any]]:
+                                    limit: int = 10, filters: Optional[SearchFilters] = None,
+                                    applicants_collection: Optional[Collection] = None) -> List[Dict[str, Any]]:
         """
         검색 기준에 따라 유사한 지원자를 찾습니다.
         
@@ -1644,24 +1742,28 @@ class SimilarityService:
             experience (str): 경력
             department (str): 부서
             limit (int): 반환할 최대 결과 수
+            filters (Optional[SearchFilters]): 반드시 만족해야 하는 조건 (벡터 검색 단계에서 적용)
+            applicants_collection (Optional[Collection]): 지원자 컬렉션 (없으면 기본 DB 사용)
             
         Returns:
             List[Dict[str, Any]]: 유사한 지원자 목록
         """
         try:
+            filters = filters if filters and not filters.is_empty() else None
             print(f"[SimilarityService] === 검색 기준 기반 유사 지원자 검색 시작 ===")
             print(f"[SimilarityService] 검색 기준 - 직무: {position}, 기술: {skills}, 경력: {experience}, 부서: {department}")
+            print(f"[SimilarityService] 필터: {filters.to_dict() if filters else {}}")
             
-            # 검색 기준 텍스트 구성
+            # 검색 기준 텍스트 구성 (필터만 지정된 경우 필터 값으로 구성)
             search_criteria = []
-            if position:
-                search_criteria.append(f"직무: {position}")
-            if skills:
-                search_criteria.append(f"기술: {skills}")
+            if position or (filters and filters.position):
+                search_criteria.append(f"직무: {position or filters.position}")
+            if skills or (filters and filters.skills):
+                search_criteria.append(f"기술: {skills or ', '.join(filters.skills)}")
             if experience:
                 search_criteria.append(f"경력: {experience}")
-            if department:
-                search_criteria.append(f"부서: {department}")
+            if department or (filters and filters.department):
+                search_criteria.append(f"부서: {department or filters.department}")
             
             if not search_criteria:
                 print(f"[SimilarityService] ❌ 검색 기준이 없습니다.")
@@ -1676,49 +1778,64 @@ class SimilarityService:
                 print(f"[SimilarityService] ❌ 임베딩 생성 실패")
                 return []
             
-            # 벡터 검색 수행
+            # 벡터 검색 수행 (필터는 Pinecone 메타데이터 필터로 적용)
             vector_search_result = await self.vector_service.search_similar_vectors(
                 query_embedding=query_embedding,
-                top_k=limit * 2,  # 더 많은 결과를 가져와서 필터링
-                filter_type="applicant"
+                top_k=limit * 2,  # 유사도 임계값 적용 여유분
+                filter_type="applicant",
+                filters=filters
             )
             
             vector_matches = vector_search_result.get("matches", [])
             print(f"[SimilarityService] 벡터 검색 결과: {len(vector_matches)}개")
             
-            # MongoDB에서 지원자 정보 조회
+            # 메타데이터에서 지원자 ID 추출 (중복 제거, 벡터 점수 순 유지)
+            vector_scores = {}
+            for match in vector_matches:
+                applicant_id = match.get("metadata", {}).get("applicant_id")
+                if applicant_id and applicant_id not in vector_scores and ObjectId.is_valid(applicant_id):
+                    vector_scores[applicant_id] = match.get("score", 0.0)
+            
+            if not vector_scores:
+                return []
+            
+            # MongoDB에서 지원자 정보 일괄 조회 (필터 조건도 함께 적용)
             try:
-                from .mongo_service import MongoService
-                mongo_service = MongoService()
+                if applicants_collection is None:
+                    from .mongo_service import MongoService
+                    applicants_collection = MongoService().db.applicants
                 
-                similar_applicants = []
-                processed_ids = set()
+                query = {"_id": {"$in": [ObjectId(applicant_id) for applicant_id in vector_scores]}}
+                if filters:
+                    query.update(filters.to_mongo())
+                applicants = await applicants_collection.find(query, SEARCH_RESULT_PROJECTION).to_list(length=None)
+                applicants_by_id = {str(applicant["_id"]): applicant for applicant in applicants}
                 
-                for match in vector_matches:
-                    if len(similar_applicants) >= limit:
-                        break
-                    
-                    # 메타데이터에서 지원자 ID 추출
-                    applicant_id = match.get("metadata", {}).get("applicant_id")
-                    if not applicant_id or applicant_id in processed_ids:
+                has_criteria = any([position, skills, experience, department])
+                similar_applicants = []
+                for applicant_id, vector_score in vector_scores.items():
+                    applicant = applicants_by_id.get(applicant_id)
+                    if not applicant:
                         continue
                     
-                    # 지원자 정보 조회
-                    applicant = await mongo_service.get_applicant(applicant_id)
-                    if applicant:
+                    if has_criteria:
                         # 유사도 점수 계산 (간단한 가중치 기반)
                         similarity_score = self._calculate_similarity_score(
                             applicant, position, skills, experience, department
                         )
-                        
-                        # 유사도 점수가 일정 임계값 이상인 경우만 포함
-                        if similarity_score >= 0.3:  # 30% 이상
-                            applicant["similarity_score"] = round(similarity_score * 100, 1)
-                            similar_applicants.append(applicant)
-                            processed_ids.add(applicant_id)
+                        # 필터 없이 기준만 준 경우 유사도 점수가 일정 임계값 이상인 경우만 포함
+                        if not filters and similarity_score < 0.3:  # 30% 이상
+                            continue
+                    else:
+                        similarity_score = vector_score
+                    
+                    applicant = to_jsonable(applicant)
+                    applicant["similarity_score"] = round(similarity_score * 100, 1)
+                    similar_applicants.append(applicant)
                 
                 # 유사도 점수로 정렬
                 similar_applicants.sort(key=lambda x: x.get("similarity_score", 0), reverse=True)
+                similar_applicants = similar_applicants[:limit]
                 
                 print(f"[SimilarityService] 최종 유사 지원자: {len(similar_applicants)}명")
                 return similar_applicants
@@ -0,0 +1,112 @@
+"""
+Server-Sent Events 스트리밍 유틸리티
+
+- (이벤트 타입, 데이터) 비동기 이터레이터를 text/event-stream 응답으로 변환
+- 클라이언트 연결이 끊기면 이터레이터를 닫아 진행 중인 LLM 스트림까지 중단
+- 기존 코루틴을 그대로 실행하면서 그 안의 stream_tokens=True LLM 호출 토큰을 이벤트로 전달
+
+이벤트 형식:
+    event: token     data: {"text": "..."}
+    event: partial   data: <생성 중인 JSON을 지금까지 파싱한 값> (partial_json=True)
+    event: <타입>     data: <JSON>
+    event: error     data: {"message": "..."}
+    event: done      data: {}
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .llm_gateway import set_token_sink
+from .structured_output import StreamingJSONParser
+from .serialization import to_jsonable
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # nginx 프록시 버퍼링 해제 (토큰을 즉시 전달)
+    "X-Accel-Buffering": "no"
+}
+
+_STREAM_END = object()
+
+
+def format_sse(event: str, data: Any) -> str:
+    """SSE 이벤트 한 개를 직렬화합니다 (pydantic 모델은 dict로 변환)."""
+    if isinstance(data, BaseModel):
+        data = data.dict()
+    payload = json.dumps(to_jsonable(data), ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]], request: Optional[Request] = None) -> StreamingResponse:
+    """
+    (이벤트 타입, 데이터) 이터레이터를 SSE 응답으로 만듭니다.
+
+    이벤트를 보내기 전마다 연결 상태를 확인하고, 끊겼거나 응답 전송이 취소되면
+    이터레이터를 닫아 업스트림 작업을 중단합니다. 처리 중 예외는 error 이벤트로 보냅니다.
+    """
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for event, data in events:
+                if request is not None and await request.is_disconnected():
+                    logger.info("SSE 클라이언트 연결 종료 - 스트림 중단")
+                    return
+                yield format_sse(event, data)
+            yield format_sse("done", {})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"SSE 스트림 처리 오류: {e}")
+            yield format_sse("error", {"message": str(e)})
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(body(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+async def stream_tokens_of(awaitable: Awaitable[Any], result_event: str = "result",
+                           partial_json: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    awaitable을 별도 태스크로 실행하며 그 안의 stream_tokens=True LLM 호출 토큰을 ("token", {"text"}) 이벤트로,
+    완료 시 반환값을 (result_event, 반환값) 이벤트로 내보냅니다. 이터레이터가 닫히면 태스크를 취소합니다.
+
+    partial_json=True면 토큰을 JSON으로 누적 파싱해 값이 바뀔 때마다 ("partial", 값) 이벤트도 보냅니다
+    (JSON 응답을 스트리밍하는 LLM 호출이 하나인 경우).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    parser = StreamingJSONParser() if partial_json else None
+
+    async def run() -> Any:
+        set_token_sink(queue.put_nowait)
+        try:
+            return await awaitable
+        finally:
+            queue.put_nowait(_STREAM_END)
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                if parser is not None:
+                    value = parser.flush()
+                    if value is not None:
+                        yield "partial", value
+                break
+            yield "token", {"text": item}
+            if parser is not None:
+                value = parser.feed(item)
+                if value is not None:
+                    yield "partial", value
+        yield result_event, await task
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,258 @@
+"""
+구조화 출력 (JSON Schema 응답 형식 / 함수 호출) 유틸리티
+
+자유 형식 텍스트에서 정규식으로 JSON을 잘라내고, 실패하면 더 단순한 프롬프트로 다시 호출하던 코드를
+모델이 스키마에 맞는 JSON만 생성하도록 요청하는 방식으로 바꾸기 위한 공통 함수들입니다.
+
+- pydantic 모델 → response_format(json_schema) / tools(function) 정의 변환 (가능하면 strict 모드)
+- 응답 파싱과 pydantic 검증을 validate_output() 한 곳에서 수행
+- 스트리밍 중인 미완성 JSON을 닫아 부분 결과로 파싱 (parse_partial_json, StreamingJSONParser)
+"""
+
+import copy
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_CODE_FENCE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```\s*$', re.DOTALL)
+_SCHEMA_NAME = re.compile(r'[^a-zA-Z0-9_-]')
+# strict 모드에서 허용되지 않는 키워드
+_UNSUPPORTED_KEYWORDS = ("default", "examples", "format", "minLength", "maxLength", "pattern")
+
+
+class StructuredOutputError(ValueError):
+    """구조화 출력 응답이 JSON이 아니거나 스키마 검증에 실패한 경우"""
+
+
+def json_schema_of(model: Type[BaseModel]) -> Dict[str, Any]:
+    """pydantic 모델의 JSON Schema (pydantic v1/v2 모두 지원)"""
+    if hasattr(model, "model_json_schema"):
+        return model.model_json_schema()
+    return model.schema()
+
+
+def _make_strict(schema: Dict[str, Any]) -> bool:
+    """schema를 제자리에서 strict 형식으로 바꿉니다. 키가 자유로운 dict가 있으면 False."""
+    for keyword in _UNSUPPORTED_KEYWORDS:
+        schema.pop(keyword, None)
+    if schema.get("type") == "object" or "properties" in schema:
+        properties = schema.get("properties")
+        if not properties:
+            return False
+        if isinstance(schema.get("additionalProperties"), dict):
+            return False
+        required = set(schema.get("required", []))
+        for name, child in properties.items():
+            nullable = any(option.get("type") == "null" for option in child.get("anyOf", []))
+            if name not in required and "default" in child and child["default"] is None and not nullable:
+                # 기본값이 None인 선택 필드는 null 허용으로 (strict 모드는 모든 필드가 required여야 함)
+                properties[name] = {"anyOf": [child, {"type": "null"}]}
+        schema["required"] = list(properties)
+        schema["additionalProperties"] = False
+    children = list(schema.get("properties", {}).values())
+    children += [schema[key] for key in ("items",) if isinstance(schema.get(key), dict)]
+    children += [option for key in ("anyOf", "allOf") for option in schema.get(key, [])]
+    children += list(schema.get("$defs", {}).values()) + list(schema.get("definitions", {}).values())
+    return all(_make_strict(child) for child in children if isinstance(child, dict))
+
+
+def to_strict_schema(schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """OpenAI strict 모드용 스키마 사본 (strict 모드로 표현할 수 없으면 None)"""
+    strict = copy.deepcopy(schema)
+    return strict if _make_strict(strict) else None
+
+
+def _schema_name(model: Type[BaseModel], name: Optional[str]) -> str:
+    return _SCHEMA_NAME.sub("_", name or model.__name__)[:64]
+
+
+def response_format_for(model: Type[BaseModel], name: Optional[str] = None) -> Dict[str, Any]:
+    """pydantic 모델을 response_format={"type": "json_schema", ...} 요청 파라미터로 변환합니다."""
+    schema = json_schema_of(model)
+    strict = to_strict_schema(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": _schema_name(model, name),
+            "schema": strict or schema,
+            "strict": strict is not None
+        }
+    }
+
+
+def tool_for(model: Type[BaseModel], name: Optional[str] = None, description: Optional[str] = None) -> Dict[str, Any]:
+    """pydantic 모델(함수 인자)을 tools 요청 파라미터의 function 정의로 변환합니다."""
+    schema = json_schema_of(model)
+    strict = to_strict_schema(schema)
+    function = {
+        "name": _schema_name(model, name),
+        "description": description or (model.__doc__ or "").strip(),
+        "parameters": strict or schema
+    }
+    if strict is not None:
+        function["strict"] = True
+    return {"type": "function", "function": function}
+
+
+def parse_json(content: Any) -> Any:
+    """응답 문자열을 JSON으로 파싱합니다 (```json 코드 펜스만 벗김). 실패하면 StructuredOutputError."""
+    if not isinstance(content, str):
+        return content
+    match = _CODE_FENCE.match(content)
+    text = match.group(1) if match else content.strip()
+    try:
+        return json.loads(text)
+    except ValueError as e:
+        raise StructuredOutputError(f"JSON 파싱 실패: {e}") from e
+
+
+def validate_output(content: Any, model: Type[ModelT]) -> ModelT:
+    """응답(문자열 또는 파싱된 값)을 pydantic 모델로 검증합니다. 실패하면 StructuredOutputError."""
+    data = parse_json(content)
+    try:
+        if hasattr(model, "model_validate"):
+            return model.model_validate(data)
+        return model.parse_obj(data)
+    except ValidationError as e:
+        raise StructuredOutputError(f"{model.__name__} 스키마 검증 실패: {e}") from e
+
+
+_FENCE_HEAD = re.compile(r'```(?:json)?')
+
+
+def parse_partial_json(text: str) -> Optional[Any]:
+    """
+    스트리밍 중인 미완성 JSON을 가능한 만큼 파싱합니다.
+
+    열린 문자열과 괄호를 닫아 파싱하고, 안 되면 마지막 쉼표(문자열 밖) 앞까지 잘라 다시 시도합니다.
+    아직 파싱할 수 있는 부분이 없으면 None.
+    """
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    parser.flush()
+    return parser.value
+
+
+class StreamingJSONParser:
+    """
+    스트리밍 토큰을 누적하며 최신 부분 JSON 결과를 돌려줍니다.
+
+    문자열/괄호 상태를 조각 사이에 유지해 새로 들어온 조각만 스캔하고,
+    마지막 쉼표 위치와 그때 닫아야 할 괄호를 기억해 두어 파싱은 최대 두 번만 시도합니다.
+    본문 전체를 json.loads 하는 비용은 길이에 비례하므로 min_interval초에 한 번만 다시 파싱합니다.
+    (토큰마다 전체를 다시 파싱하면 긴 응답에서 이벤트 루프를 오래 막음)
+    """
+
+    def __init__(self, min_interval: float = 0.05):
+        self.min_interval = min_interval
+        self.buffer = ""
+        self.value: Optional[Any] = None
+        self._body = ""                    # 코드 펜스를 벗긴 JSON 본문
+        self._body_start: Optional[int] = None  # buffer에서 본문이 시작하는 위치 (펜스 판단 전에는 None)
+        self._fenced = False
+        self._ended = False                # 닫는 코드 펜스를 만남
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._comma: Optional[Tuple[int, str]] = None  # (마지막 쉼표 위치, 그 시점에 닫을 괄호)
+        self._parsed_at: Optional[float] = None
+        self._dirty = False                # 마지막 파싱 이후 새 조각이 있음
+
+    def feed(self, delta: str) -> Optional[Any]:
+        """토큰 조각을 추가하고, 부분 결과가 바뀌었으면 새 값을, 아니면 None을 반환합니다."""
+        self.buffer += delta
+        if self._body_start is None:
+            if not self._find_body_start():
+                return None
+            delta = self.buffer[self._body_start:]
+        if self._ended or not delta:
+            return None
+        self._scan(delta)
+        self._dirty = True
+        now = time.monotonic()
+        if self._parsed_at is not None and now - self._parsed_at < self.min_interval:
+            return None
+        self._parsed_at = now
+        return self._update()
+
+    def flush(self) -> Optional[Any]:
+        """스트림이 끝났을 때 호출: 간격 제한으로 건너뛴 마지막 조각까지 파싱해 바뀐 값을 반환합니다."""
+        if not self._dirty:
+            return None
+        return self._update()
+
+    def _update(self) -> Optional[Any]:
+        self._dirty = False
+        value = self._parse()
+        if value is None or value == self.value:
+            return None
+        self.value = value
+        return value
+
+    def _find_body_start(self) -> bool:
+        """앞쪽 공백과 ```json 펜스를 건너뛰어 본문 시작 위치를 정합니다 (아직 판단할 수 없으면 False)."""
+        head = self.buffer.lstrip()
+        if not head or (len(head) < 7 and "```json".startswith(head)):
+            return False
+        offset = len(self.buffer) - len(head)
+        match = _FENCE_HEAD.match(head)
+        if match:
+            self._fenced = True
+            offset += match.end()
+        self._body_start = offset
+        return True
+
+    def _scan(self, delta: str) -> None:
+        """새 조각의 문자열/괄호 상태를 이어서 추적합니다."""
+        body_len = len(self._body)
+        stack = self._stack
+        for index, char in enumerate(delta):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if stack:
+                    stack.pop()
+            elif char == ",":
+                self._comma = (body_len + index, "".join(reversed(stack)))
+            elif char == "`" and self._fenced:
+                # 닫는 코드 펜스 이후는 무시
+                self._ended = True
+                delta = delta[:index]
+                break
+        self._body += delta
+
+    def _parse(self) -> Optional[Any]:
+        """열린 문자열과 괄호를 닫아 파싱하고, 실패하면 마지막 쉼표 앞까지 잘라 한 번 더 시도합니다."""
+        text = self._body[:-1] if self._escaped else self._body
+        if self._in_string:
+            text += '"'
+        text = text.rstrip()
+        if text and not text.endswith((",", ":")):
+            try:
+                return json.loads(text + "".join(reversed(self._stack)))
+            except ValueError:
+                pass
+        if self._comma is None:
+            return None
+        position, closers = self._comma
+        try:
+            return json.loads(self._body[:position] + closers)
+        except ValueError:
+            return None
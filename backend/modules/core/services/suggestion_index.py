@@ -0,0 +1,125 @@
+"""
+키워드 자동완성용 접두어 인덱스
+
+- 정렬된 용어 배열 + 이진 탐색으로 접두어 범위를 찾고 문서 빈도(df) 상위 K개를 반환
+- 접두어별 상위 K 결과를 LRU 캐시에 보관하고, 색인 시 증분 갱신
+  (df 증가는 캐시에 바로 반영, 캐시에 있던 용어의 df 감소만 해당 접두어 캐시를 무효화)
+"""
+
+import heapq
+import threading
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+_PREFIX_END = "\U0010ffff"
+
+
+def _rank(item: Tuple[int, str]) -> Tuple[int, str]:
+    # 문서 빈도 내림차순, 같으면 사전순
+    return -item[0], item[1]
+
+
+class PrefixSuggester:
+    """문서 빈도 가중 접두어 자동완성"""
+
+    def __init__(self, top_k: int = 20, cache_size: int = 50000, warm_prefix_len: int = 1):
+        self.top_k = top_k
+        self.cache_size = cache_size
+        self.warm_prefix_len = warm_prefix_len
+        self._lock = threading.RLock()
+        self._terms: List[str] = []
+        self._df: Dict[str, int] = {}
+        # 접두어 → [(df, term)] (df 내림차순, 최대 top_k개)
+        self._cache: "OrderedDict[str, List[Tuple[int, str]]]" = OrderedDict()
+
+    def build(self, document_frequencies: Dict[str, int]) -> None:
+        """전체 용어/빈도로 다시 구성하고 짧은 접두어 결과를 미리 계산합니다."""
+        with self._lock:
+            self._df = {term: df for term, df in document_frequencies.items() if df > 0}
+            self._terms = sorted(self._df)
+            self._cache.clear()
+            self._warm_up()
+
+    def _warm_up(self) -> None:
+        # 첫 글자 입력처럼 범위가 넓은 접두어는 한 번의 순회로 미리 계산
+        groups: Dict[str, List[str]] = {}
+        for term in self._terms:
+            for length in range(1, min(self.warm_prefix_len, len(term)) + 1):
+                groups.setdefault(term[:length], []).append(term)
+        for prefix, terms in groups.items():
+            self._cache[prefix] = self._top_terms(terms)
+
+    def _top_terms(self, terms: Iterable[str]) -> List[Tuple[int, str]]:
+        return heapq.nsmallest(self.top_k, ((self._df[term], term) for term in terms), key=_rank)
+
+    def update(self, term: str, delta: int) -> None:
+        """용어의 문서 빈도를 delta만큼 변경합니다."""
+        with self._lock:
+            old = self._df.get(term, 0)
+            new = old + delta
+            if new > 0:
+                self._df[term] = new
+                if old == 0:
+                    insort(self._terms, term)
+            else:
+                if old == 0:
+                    return
+                self._df.pop(term, None)
+                idx = bisect_left(self._terms, term)
+                if idx < len(self._terms) and self._terms[idx] == term:
+                    del self._terms[idx]
+            self._update_cache(term, old, max(new, 0))
+
+    def update_many(self, terms: Iterable[str], delta: int) -> None:
+        with self._lock:
+            for term in terms:
+                self.update(term, delta)
+
+    def _update_cache(self, term: str, old: int, new: int) -> None:
+        for length in range(1, len(term) + 1):
+            prefix = term[:length]
+            cached = self._cache.get(prefix)
+            if cached is None:
+                continue
+            position = next((i for i, (_, t) in enumerate(cached) if t == term), -1)
+            if new < old:
+                # 상위 K에 있던 용어가 줄면 밖에 있던 용어가 올라올 수 있으므로 다시 계산
+                if position >= 0:
+                    del self._cache[prefix]
+                continue
+            if position >= 0:
+                cached[position] = (new, term)
+            elif len(cached) < self.top_k or _rank((new, term)) < _rank(cached[-1]):
+                cached.append((new, term))
+            else:
+                continue
+            cached.sort(key=_rank)
+            del cached[self.top_k:]
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[str]:
+        """접두어로 시작하는 용어를 문서 빈도 내림차순으로 반환합니다."""
+        prefix = (prefix or "").strip().lower()
+        if not prefix or limit <= 0:
+            return []
+        with self._lock:
+            cached = self._cache.get(prefix)
+            if cached is not None:
+                self._cache.move_to_end(prefix)
+            else:
+                lo = bisect_left(self._terms, prefix)
+                hi = bisect_left(self._terms, prefix + _PREFIX_END, lo)
+                cached = self._top_terms(self._terms[lo:hi])
+                self._cache[prefix] = cached
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            if limit <= self.top_k:
+                return [term for _, term in cached[:limit]]
+            # top_k보다 많이 요청하면 캐시 없이 직접 계산
+            lo = bisect_left(self._terms, prefix)
+            hi = bisect_left(self._terms, prefix + _PREFIX_END, lo)
+            ranked = sorted(((self._df[term], term) for term in self._terms[lo:hi]), key=_rank)
+            return [term for _, term in ranked[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._terms)
@@ -0,0 +1,286 @@
+"""
+Kiwi 형태소 분석 기반 키워드 토크나이저 (프로세스 전역 공유)
+
+- Kiwi 모델은 프로세스당 한 번만 로드
+- 검색어 토큰화 결과는 LRU 캐시에 보관하고 이벤트 루프 밖(스레드)에서 수행
+- 대량 색인은 Kiwi 배치 tokenize API를 프로세스 풀에서 실행해 모든 코어를 사용
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from kiwipiepy import Kiwi
+    KIWI_AVAILABLE = True
+except ImportError:
+    print("Warning: kiwipiepy not available, using fallback tokenizer")
+    Kiwi = None
+    KIWI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 불용어 리스트 (조사, 어미, 의미없는 단어들)
+STOPWORDS = frozenset({
+    # 조사
+    '은', '는', '이', '가', '을', '를', '에', '에서', '로', '으로', '와', '과', '도', '만', '까지', '부터',
+    '의', '도', '나', '이나', '든지', '라도', '마저', '조차', '뿐', '밖에', '처럼', '같이', '보다',
+    # 어미
+    '습니다', '했습니다', '입니다', '였습니다', '었습니다', '하다', '되다', '있다', '없다',
+    # 의미없는 단어
+    '저', '제', '저희', '우리', '그', '그것', '이것', '저것', '여기', '거기', '저기',
+    '때문', '위해', '통해', '대해', '관해', '따라', '위한', '위해서',
+    # 단위/시간
+    '년', '월', '일', '시', '분', '초', '개', '번', '차례', '번째',
+    # 기타
+    '등', '및', '또는', '그리고', '하지만', '그러나', '따라서', '그래서'
+})
+
+# IT 복합어 사전 (쪼개진 단어들을 다시 합치기 위함)
+COMPOUND_WORDS = {
+    ('프론트', '엔드'): '프론트엔드',
+    ('백', '엔드'): '백엔드',
+    ('풀', '스택'): '풀스택',
+    ('데이터', '베이스'): '데이터베이스',
+    ('소프트', '웨어'): '소프트웨어',
+    ('하드', '웨어'): '하드웨어',
+    ('클라우드', '컴퓨팅'): '클라우드컴퓨팅',
+    ('머신', '러닝'): '머신러닝',
+    ('딥', '러닝'): '딥러닝',
+    ('인공', '지능'): '인공지능',
+    ('웹', '개발'): '웹개발',
+    ('앱', '개발'): '앱개발',
+    ('모바일', '앱'): '모바일앱',
+    ('데이터', '분석'): '데이터분석',
+    ('시스템', '개발'): '시스템개발'
+}
+
+# Kiwi 품사 태그 기준 의미있는 품사
+MEANINGFUL_POS = frozenset({
+    'NNG',  # 일반명사 (회사, 개발, 프로그래밍)
+    'NNP',  # 고유명사 (React, Python, 삼성)
+    'NNB',  # 의존명사 (것, 수, 등)
+    'VV',   # 동사 (개발하다, 사용하다)
+    'VA',   # 형용사 (좋다, 빠르다)
+    'VX',   # 보조용언
+    'SL',   # 외국어 (React, JavaScript)
+    'SH',   # 한자
+    'SN'    # 숫자 (2000, 3년)
+})
+
+_SPECIAL_ONLY = re.compile(r'^[^\w가-힣]+$')
+_NON_WORD = re.compile(r'[^\w\s가-힣ㄱ-ㅎㅏ-ㅣ]')
+_SPACES = re.compile(r'\s+')
+
+
+def is_meaningful_pos(pos: str) -> bool:
+    """의미있는 품사인지 확인합니다 (세부 태그 무시)."""
+    return pos[:2] in MEANINGFUL_POS or pos[:3] in MEANINGFUL_POS
+
+
+def is_valid_keyword(word: str) -> bool:
+    """유효한 키워드인지 확인합니다."""
+    if not word or len(word.strip()) < 2:
+        return False
+
+    word = word.strip().lower()
+
+    # 불용어 제거
+    if word in STOPWORDS:
+        return False
+
+    # 숫자만 있는 경우 제외 (단, 연도는 포함)
+    if word.isdigit() and len(word) < 4:
+        return False
+
+    # 특수문자만 있는 경우 제외
+    if _SPECIAL_ONLY.match(word):
+        return False
+
+    return True
+
+
+def fallback_preprocess(text: str) -> List[str]:
+    """Kiwi를 사용할 수 없을 때의 기본 전처리 (공백 기준 분할)"""
+    if not text:
+        return []
+
+    text = _NON_WORD.sub(' ', text.lower())
+    text = _SPACES.sub(' ', text.strip())
+    return [token for token in text.split() if is_valid_keyword(token)]
+
+
+def restore_compound_words(keywords: List[str]) -> List[str]:
+    """분리된 키워드들을 복합어로 복원합니다."""
+    restored = []
+    i = 0
+    while i < len(keywords):
+        if i + 1 < len(keywords):
+            compound_word = COMPOUND_WORDS.get((keywords[i], keywords[i + 1]))
+            if compound_word:
+                restored.append(compound_word)
+                i += 2
+                continue
+        restored.append(keywords[i])
+        i += 1
+    return restored
+
+
+def _keywords_from_tokens(tokens: Iterable) -> List[str]:
+    """Kiwi 토큰 목록에서 의미있는 키워드만 골라 복합어 복원 + 중복 제거"""
+    keywords = []
+    for token_info in tokens:
+        word = token_info.form.strip()
+        if is_meaningful_pos(token_info.tag) and is_valid_keyword(word):
+            keywords.append(word.lower())
+    # 중복 제거하면서 순서 유지
+    return list(dict.fromkeys(restore_compound_words(keywords)))
+
+
+@lru_cache(maxsize=1)
+def _get_kiwi():
+    """프로세스별 Kiwi 인스턴스 (모델 로드는 프로세스당 한 번)"""
+    if not KIWI_AVAILABLE:
+        return None
+    try:
+        kiwi = Kiwi()
+        # IT 복합어를 사용자 사전에 등록해 '백'+'엔드'처럼 쪼개지지 않도록 함
+        for compound_word in COMPOUND_WORDS.values():
+            kiwi.add_user_word(compound_word, 'NNP')
+        logger.info("Kiwi 형태소 분석기 초기화 완료")
+        return kiwi
+    except Exception as e:
+        logger.error(f"Kiwi 초기화 실패: {str(e)}")
+        return None
+
+
+def tokenize_text(text: str) -> List[str]:
+    """단일 텍스트를 키워드 리스트로 변환합니다."""
+    return tokenize_texts([text])[0]
+
+
+def tokenize_texts(texts: Sequence[str]) -> List[List[str]]:
+    """
+    여러 텍스트를 Kiwi 배치 tokenize API로 한 번에 분석합니다.
+    프로세스 풀 워커에서도 그대로 호출되므로 모듈 최상위 함수로 둡니다.
+    """
+    kiwi = _get_kiwi()
+    if kiwi is None:
+        return [fallback_preprocess(text) for text in texts]
+
+    results: List[List[str]] = [[] for _ in texts]
+    targets = [i for i, text in enumerate(texts) if text and text.strip()]
+    if not targets:
+        return results
+    try:
+        for i, tokens in zip(targets, kiwi.tokenize([texts[i] for i in targets])):
+            results[i] = _keywords_from_tokens(tokens)
+    except Exception as e:
+        logger.warning(f"Kiwi 분석 실패, fallback 사용: {str(e)}")
+        return [fallback_preprocess(text) for text in texts]
+    return results
+
+
+def _warm_up_worker() -> None:
+    _get_kiwi()
+
+
+class TokenizerService:
+    """
+    공유 키워드 토크나이저
+
+    - tokenize / tokenize_query: 검색어용 (LRU 캐시)
+    - tokenize_many / tokenize_many_async: 색인용 배치 (프로세스 풀, 캐시 없음)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_size: int = 4096,
+                 chunk_size: int = 64, min_parallel_batch: int = 32):
+        self.max_workers = max_workers or int(os.getenv("KIWI_TOKENIZER_WORKERS", str(os.cpu_count() or 1)))
+        self.chunk_size = chunk_size
+        self.min_parallel_batch = min_parallel_batch
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._cached_tokenize = lru_cache(maxsize=cache_size)(self._tokenize_tuple)
+
+    @staticmethod
+    def _tokenize_tuple(text: str) -> Tuple[str, ...]:
+        return tuple(tokenize_text(text))
+
+    def tokenize(self, text: str) -> List[str]:
+        """검색어를 토큰화합니다 (LRU 캐시 사용)."""
+        if not text:
+            return []
+        return list(self._cached_tokenize(text.strip()))
+
+    async def tokenize_query(self, text: str) -> List[str]:
+        """검색어 토큰화를 이벤트 루프 밖에서 수행합니다."""
+        return await asyncio.to_thread(self.tokenize, text)
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 1:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_warm_up_worker)
+                    logger.info(f"토크나이저 프로세스 풀 시작: {self.max_workers}개 워커")
+                except Exception as e:
+                    logger.warning(f"프로세스 풀 생성 실패, 단일 프로세스로 처리합니다: {str(e)}")
+                    self.max_workers = 1
+                    return None
+            return self._pool
+
+    def _chunks(self, texts: Sequence[str]) -> List[Sequence[str]]:
+        return [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+
+    def tokenize_many(self, texts: Sequence[str]) -> List[List[str]]:
+        """여러 텍스트를 토큰화합니다 (문서 수가 많으면 프로세스 풀 사용)."""
+        texts = list(texts)
+        pool = self._get_pool() if len(texts) >= self.min_parallel_batch else None
+        if pool is None:
+            return tokenize_texts(texts)
+        results: List[List[str]] = []
+        for chunk_result in pool.map(tokenize_texts, self._chunks(texts)):
+            results.extend(chunk_result)
+        return results
+
+    async def tokenize_many_async(self, texts: Sequence[str]) -> List[List[str]]:
+        """tokenize_many의 비동기 버전 (이벤트 루프를 막지 않음)."""
+        texts = list(texts)
+        pool = self._get_pool() if len(texts) >= self.min_parallel_batch else None
+        if pool is None:
+            return await asyncio.to_thread(tokenize_texts, texts)
+        loop = asyncio.get_running_loop()
+        chunk_results = await asyncio.gather(
+            *(loop.run_in_executor(pool, tokenize_texts, chunk) for chunk in self._chunks(texts))
+        )
+        return [tokens for chunk_result in chunk_results for tokens in chunk_result]
+
+    def cache_info(self):
+        return self._cached_tokenize.cache_info()
+
+    def shutdown(self) -> None:
+        """프로세스 풀 종료 (앱 종료 시 호출)"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+_tokenizer_service: Optional[TokenizerService] = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer_service() -> TokenizerService:
+    """프로세스 전역 토크나이저 서비스를 반환합니다."""
+    global _tokenizer_service
+    if _tokenizer_service is None:
+        with _tokenizer_lock:
+            if _tokenizer_service is None:
+                _tokenizer_service = TokenizerService()
+    return _tokenizer_service
@@ -5,6 +5,10 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 
+from .io_pool import run_blocking
+from .search_cache import bump_generation
+from .search_filters import SearchFilters
+
 try:
     from pinecone import Pinecone, ServerlessSpec
     PINECONE_AVAILABLE = True
@@ -26,6 +30,9 @@ class VectorService:
         self.api_key = api_key or os.getenv("PINECONE_API_KEY")
         self.index_name = index_name or os.getenv("PINECONE_INDEX_NAME", "resume-vectors")
         self.environment = environment or os.getenv("PINECONE_ENVIRONMENT", "us-east-1")
+        # 호출별 deadline(초)과 HTTP 커넥션 풀 크기
+        self.request_timeout = float(os.getenv("PINECONE_REQUEST_TIMEOUT", "10"))
+        self.pool_threads = int(os.getenv("PINECONE_POOL_THREADS", "8"))
         
         if not PINECONE_AVAILABLE:
             raise Exception("Pinecone 라이브러리가 필요합니다. pip install pinecone-client로 설치하세요.")
@@ -65,19 +72,53 @@ class VectorService:
                 print(f"기존 인덱스 '{self.index_name}' 사용")
             
             # 인덱스 연결
-            self.index = self.pc.Index(self.index_name)
+            self.index = self.pc.Index(self.index_name, pool_threads=self.pool_threads)
             
         except Exception as e:
             print(f"Pinecone 인덱스 초기화 실패: {e}")
             raise
     
-    async def save_chunk_vectors(self, chunks: List[Dict[str, Any]], embedding_service) -> List[str]:
+    async def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> Any:
+        """벡터 upsert (전용 스레드 풀에서 deadline 적용)"""
+        try:
+            return await run_blocking(self.index.upsert, vectors=vectors, deadline=self.request_timeout)
+        finally:
+            # 벡터가 바뀌었으므로 이전 검색 결과 캐시 무효화
+            bump_generation()
+    
+    async def fetch_vectors(self, ids: List[str]) -> Any:
+        """벡터 fetch (전용 스레드 풀에서 deadline 적용)"""
+        return await run_blocking(self.index.fetch, ids=ids, deadline=self.request_timeout)
+    
+    async def query_vectors(self, **kwargs: Any) -> Any:
+        """벡터 query (전용 스레드 풀에서 deadline 적용)"""
+        return await run_blocking(self.index.query, deadline=self.request_timeout, **kwargs)
+    
+    async def delete_vectors(self, ids: List[str]) -> Any:
+        """벡터 delete (전용 스레드 풀에서 deadline 적용)"""
+        try:
+            return await run_blocking(self.index.delete, ids=ids, deadline=self.request_timeout)
+        finally:
+            bump_generation()
+    
+    async def update_vector_metadata(self, vector_id: str, metadata: Dict[str, Any]) -> Any:
+        """
+        벡터 값은 그대로 두고 메타데이터만 갱신합니다 (재임베딩 없이 필터 필드 보강).
+        필터 필드 값은 지원자 문서와 같으므로 검색 결과 캐시는 무효화하지 않습니다.
+        """
+        return await run_blocking(
+            self.index.update, id=vector_id, set_metadata=metadata, deadline=self.request_timeout
+        )
+    
+    async def save_chunk_vectors(self, chunks: List[Dict[str, Any]], embedding_service,
+                                 extra_metadata: Optional[Dict[str, Any]] = None) -> List[str]:
         """
         여러 청크의 벡터를 Pinecone에 저장합니다.
         
         Args:
             chunks (List[Dict[str, Any]]): 청크 리스트
             embedding_service: 임베딩 서비스
+            extra_metadata (Optional[Dict[str, Any]]): 모든 청크에 추가할 메타데이터 (검색 필터 필드 등)
             
         Returns:
             List[str]: 저장된 벡터 ID 리스트
@@ -121,7 +162,8 @@ class VectorService:
                         "original_field": chunk["metadata"].get("original_field", ""),
                         "item_index": chunk["metadata"].get("item_index", 0),
                         "text_preview": chunk["text"][:100] + "..." if len(chunk["text"]) > 100 else chunk["text"],
-                        "created_at": datetime.now().isoformat()
+                        "created_at": datetime.now().isoformat(),
+                        **(extra_metadata or {})
                     }
                 }
                 
@@ -137,7 +179,7 @@ class VectorService:
         # Pinecone에 배치 업로드
         if vectors_to_upsert:
             try:
-                self.index.upsert(vectors=vectors_to_upsert)
+                await self.upsert_vectors(vectors_to_upsert)
                 print(f"[VectorService] Pinecone 업로드 성공: {len(vectors_to_upsert)}개 벡터")
             except Exception as e:
                 print(f"[VectorService] Pinecone 업로드 실패: {e}")
@@ -168,7 +210,7 @@ class VectorService:
                 "metadata": metadata
             }
             
-            self.index.upsert(vectors=[vector_data])
+            await self.upsert_vectors([vector_data])
             
             print(f"[VectorService] Pinecone 벡터 저장 완료: {vector_id}")
             return vector_id
@@ -179,7 +221,8 @@ class VectorService:
 
     async def search_similar_vectors(self, query_embedding: List[float], 
                                    top_k: int = 5, 
-                                   filter_type: Optional[str] = None) -> Dict[str, Any]:
+                                   filter_type: Optional[str] = None,
+                                   filters: Optional[SearchFilters] = None) -> Dict[str, Any]:
         """
         Pinecone에서 유사한 벡터를 검색합니다.
         
@@ -187,6 +230,7 @@ class VectorService:
             query_embedding (List[float]): 쿼리 임베딩
             top_k (int): 반환할 최대 결과 수
             filter_type (Optional[str]): 필터 타입
+            filters (Optional[SearchFilters]): 검색 필터 (메타데이터 필터로 검색 단계에서 적용)
             
         Returns:
             Dict[str, Any]: 검색 결과
@@ -197,16 +241,14 @@ class VectorService:
             print(f"[VectorService] 필터 타입: {filter_type}")
             
             # 필터 구성
-            filter_dict = {}
-            if filter_type:
-                filter_dict["chunk_type"] = {"$eq": filter_type}
+            filter_dict = (filters or SearchFilters()).to_pinecone(chunk_type=filter_type)
             
             # Pinecone 검색
-            search_results = self.index.query(
+            search_results = await self.query_vectors(
                 vector=query_embedding,
                 top_k=top_k,
                 include_metadata=True,
-                filter=filter_dict if filter_dict else None
+                filter=filter_dict
             )
             
             # 결과 포맷팅
@@ -245,7 +287,7 @@ class VectorService:
             filter_dict = {"resume_id": {"$eq": resume_id}}
             
             # 해당 이력서의 모든 벡터 검색 (매우 큰 top_k 사용)
-            search_results = self.index.query(
+            search_results = await self.query_vectors(
                 vector=[0.0] * 1536,  # 더미 벡터 (검색용)
                 top_k=10000,  # 충분히 큰 수
                 include_metadata=True,
@@ -257,7 +299,7 @@ class VectorService:
             
             if vector_ids_to_delete:
                 # 벡터 삭제
-                self.index.delete(ids=vector_ids_to_delete)
+                await self.delete_vectors(vector_ids_to_delete)
                 print(f"[VectorService] Pinecone에서 {len(vector_ids_to_delete)}개 벡터 삭제 완료")
             else:
                 print(f"[VectorService] 삭제할 벡터가 없습니다.")
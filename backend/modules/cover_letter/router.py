@@ -16,6 +16,7 @@ import asyncio
 
 from modules.core.services.cover_letter_analysis.analyzer import CoverLetterAnalyzer
 from modules.core.services.llm_providers.openai_provider import OpenAIProvider
+from utils.upload_stream import MAX_PDF_PAGES, UploadLimitError, streamed_upload
 
 router = APIRouter(prefix="/api/cover-letters", tags=["자기소개서"])
 
@@ -46,19 +47,20 @@ async def analyze_cover_letter(
                 message="지원하지 않는 파일 형식입니다. PDF, DOCX, TXT 파일만 업로드 가능합니다."
             )
 
-        # 파일 내용 읽기
-        file_content = await file.read()
-
         # 자소서 분석기 초기화
         analyzer = CoverLetterAnalyzer(LLM_CONFIG)
 
-        # 자소서 분석 실행
-        analysis_result = await analyzer.analyze_cover_letter(
-            file_bytes=file_content,
-            filename=file.filename,
-            job_description=job_description,
-            analysis_type=analysis_type
-        )
+        # 파일을 메모리에 올리지 않고 임시 파일로 스트리밍한 뒤 경로로 분석
+        try:
+            async with streamed_upload(file, max_pages=MAX_PDF_PAGES) as upload:
+                analysis_result = await analyzer.analyze_cover_letter(
+                    file_bytes=upload.path,
+                    filename=file.filename,
+                    job_description=job_description,
+                    analysis_type=analysis_type
+                )
+        except UploadLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
         if analysis_result.status == "error":
             return BaseResponse(
@@ -72,6 +74,8 @@ async def analyze_cover_letter(
             data=analysis_result.dict()
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         return BaseResponse(
             success=False,
@@ -8,6 +8,7 @@ from .models import (
 from .services import HybridService
 from ..shared.models import BaseResponse, PaginationParams
 from ..shared.services import FileService, AnalysisService
+from utils.upload_stream import UploadLimitError, measure_upload
 
 router = APIRouter(prefix="/api/hybrid", tags=["하이브리드 분석"])
 
@@ -273,18 +274,21 @@ async def upload_multiple_documents(
         document_ids = {}
         
         for doc_type, file in files:
-            # 파일 내용 읽기
-            content = await file.read()
-            text_content = content.decode('utf-8') if isinstance(content, bytes) else str(content)
+            # 메타데이터만 저장하므로 디스크에 쓰지 않고 청크 단위로 읽으며 크기/해시만 계산
+            try:
+                file_size, file_hash = await measure_upload(file)
+            except UploadLimitError as e:
+                raise HTTPException(status_code=413, detail=str(e))
             
             # 파일 메타데이터 저장
             file_metadata = {
                 "filename": file.filename,
-                "file_size": len(content),
-                "content_type": file.content_type
+                "file_size": file_size,
+                "content_type": file.content_type,
+                "hash": file_hash
             }
             file_id = await file_service.save_file_metadata(
-                file.filename, len(content), file.content_type, file_metadata
+                file.filename, file_size, file.content_type, file_metadata
             )
             
             # 여기서는 실제로는 각 모듈의 서비스를 호출하여 문서를 생성해야 합니다
@@ -315,6 +319,8 @@ async def upload_multiple_documents(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         return BaseResponse(
             success=False,
@@ -1,28 +1,77 @@
 from __future__ import annotations
 
 import re
+from functools import cached_property
 from typing import Any, Dict, List, Optional
 import json
 import asyncio
 
-from .config import Settings
+from .config import Settings, get_settings
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
-    from openai_service import OpenAIService
+    from modules.core.services.llm_gateway import get_llm_gateway
 except ImportError:
-    OpenAIService = None
+    get_llm_gateway = None
+try:
+    from modules.core.services.prompt_budget import compact_text
+except ImportError:
+    compact_text = None
+
+# 작업별 관련 청크 선택 질의 / 우선 포함 패턴
+BASIC_INFO_QUERY = "이름 성명 연락처 전화 휴대폰 이메일 email phone 주소 address 학력 대학교 학교 전공 education 경력 회사 직책 직무 기술 스킬 skills experience"
+SUMMARY_QUERY = "경력 경험 프로젝트 담당 업무 성과 기술 스킬 학력 전공 자격증 experience project skills education"
+KEYWORDS_QUERY = "기술 스킬 스택 언어 프레임워크 도구 경험 프로젝트 직무 skills stack tools framework project"
+CONTACT_PATTERNS = (
+    r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}',
+    r'\d{2,3}[-.\s]?\d{3,4}[-.\s]?\d{4}'
+)
+
+
+class TextArtifacts:
+    """하나의 텍스트에서 파생되는 산출물을 단계별로 한 번씩만 계산해 재사용합니다.
+
+    - clean_text: 정규화된 텍스트
+    - basic_info: clean_text 기준 기본 정보 (analyze_text 결과에 포함)
+    - fields: 원문 기준 필드 추출 (extract_fields)
+    - analysis: analyze_text 결과 전체
+    """
+
+    def __init__(self, text: str, settings: Settings):
+        self.text = text or ""
+        self.settings = settings
+
+    @cached_property
+    def clean_text(self) -> str:
+        return clean_text_content(self.text)
+
+    @cached_property
+    def basic_info(self) -> Dict[str, Any]:
+        return extract_basic_info(self.clean_text)
 
+    @cached_property
+    def fields(self) -> Dict[str, Any]:
+        return extract_fields(self.text)
 
-def analyze_text(text: str, settings: Settings) -> Dict[str, Any]:
-    """텍스트를 분석하여 구조화된 정보를 추출합니다."""
+    @cached_property
+    def analysis(self) -> Dict[str, Any]:
+        return analyze_text(self.text, self.settings, artifacts=self)
+
+
+def analyze_text(text: str, settings: Settings, artifacts: Optional[TextArtifacts] = None) -> Dict[str, Any]:
+    """텍스트를 분석하여 구조화된 정보를 추출합니다.
+
+    artifacts를 넘기면 이미 계산된 clean_text/basic_info를 재사용합니다.
+    """
     try:
+        artifacts = artifacts or TextArtifacts(text, settings)
+
         # 기본 텍스트 정리
-        clean_text = clean_text_content(text)
+        clean_text = artifacts.clean_text
         
         # 기본 정보 추출
-        basic_info = extract_basic_info(clean_text)
+        basic_info = artifacts.basic_info
         
         # AI 분석 (설정에 따라)
         if settings.index_generate_summary or settings.index_generate_keywords:
@@ -65,6 +114,13 @@ def clean_text_content(text: str) -> str:
     return text.strip()
 
 
+def budget_document(text: str, query: str, max_tokens: int, **options) -> str:
+    """프롬프트에 넣을 문서를 토큰 예산 안으로 줄입니다 (압축 모듈이 없으면 원문)."""
+    if compact_text is None or not text:
+        return text
+    return compact_text(text, query, max_tokens, model="gpt-4o", **options)
+
+
 def extract_basic_info(text: str) -> Dict[str, Any]:
     """기본 정보를 추출합니다 (OpenAI AI 우선, 정규식 기반 폴백)."""
     info = {
@@ -83,18 +139,19 @@ def extract_basic_info(text: str) -> Dict[str, Any]:
     
     # OpenAI AI를 사용한 분석 시도
     try:
-        openai_service = OpenAIService(model_name="gpt-4o") if OpenAIService else None
+        # 공유 LLM 게이트웨이에 위임해 동기적으로 실행 (워커 스레드에서 호출)
+        gateway = get_llm_gateway()
         
-        # 비동기 함수를 동기적으로 실행
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            ai_prompt = f"""
+        # 이름·연락처가 있는 문서 앞부분과 연락처 패턴 줄을 우선 포함
+        document = budget_document(
+            text, BASIC_INFO_QUERY, get_settings().prompt_basic_info_tokens,
+            lead_chunks=2, keep_patterns=CONTACT_PATTERNS
+        )
+        ai_prompt = f"""
 다음은 이력서에서 추출한 텍스트입니다. 이 텍스트에서 다음 정보들을 정확히 추출해주세요:
 
 텍스트:
-{text}
+{document}
 
 다음 정보들을 JSON 형태로 추출해주세요:
 1. 이름 (가장 가능성이 높은 하나의 이름만)
@@ -121,44 +178,41 @@ def extract_basic_info(text: str) -> Dict[str, Any]:
 만약 특정 정보를 찾을 수 없다면 해당 필드는 빈 문자열("")로 설정해주세요.
 """
 
-            ai_response = loop.run_until_complete(
-                openai_service.generate_response(ai_prompt)
-            )
-            
-            # JSON 파싱 시도
-            try:
-                json_start = ai_response.find('{')
-                json_end = ai_response.rfind('}') + 1
-                if json_start != -1 and json_end != 0:
-                    json_str = ai_response[json_start:json_end]
-                    ai_data = json.loads(json_str)
-                    
-                    # AI 결과를 info에 매핑
-                    if ai_data.get('name'):
-                        info["names"] = [ai_data['name']]
-                    if ai_data.get('email'):
-                        info["emails"] = [ai_data['email']]
-                    if ai_data.get('phone'):
-                        info["phones"] = [ai_data['phone']]
-                    if ai_data.get('position'):
-                        info["positions"] = [ai_data['position']]
-                    if ai_data.get('company'):
-                        info["companies"] = [ai_data['company']]
-                    if ai_data.get('education'):
-                        info["education"] = [ai_data['education']]
-                    if ai_data.get('skills'):
-                        info["skills"] = [ai_data['skills']]
-                    if ai_data.get('address'):
-                        info["addresses"] = [ai_data['address']]
-                    
-                    print(f"AI 분석 결과: {ai_data}")
-                    return info
-                    
-            except Exception as e:
-                print(f"AI JSON 파싱 실패: {e}")
+        ai_response = gateway.run_sync(
+            gateway.complete(ai_prompt, model="gpt-4o", call_site="ocr_basic_info")
+        ).content
+        
+        # JSON 파싱 시도
+        try:
+            json_start = ai_response.find('{')
+            json_end = ai_response.rfind('}') + 1
+            if json_start != -1 and json_end != 0:
+                json_str = ai_response[json_start:json_end]
+                ai_data = json.loads(json_str)
+                
+                # AI 결과를 info에 매핑
+                if ai_data.get('name'):
+                    info["names"] = [ai_data['name']]
+                if ai_data.get('email'):
+                    info["emails"] = [ai_data['email']]
+                if ai_data.get('phone'):
+                    info["phones"] = [ai_data['phone']]
+                if ai_data.get('position'):
+                    info["positions"] = [ai_data['position']]
+                if ai_data.get('company'):
+                    info["companies"] = [ai_data['company']]
+                if ai_data.get('education'):
+                    info["education"] = [ai_data['education']]
+                if ai_data.get('skills'):
+                    info["skills"] = [ai_data['skills']]
+                if ai_data.get('address'):
+                    info["addresses"] = [ai_data['address']]
+                
+                print(f"AI 분석 결과: {ai_data}")
+                return info
                 
-        finally:
-            loop.close()
+        except Exception as e:
+            print(f"AI JSON 파싱 실패: {e}")
             
     except Exception as e:
         print(f"AI 분석 실패, 규칙 기반으로 폴백: {e}")
@@ -352,20 +406,23 @@ def extract_basic_info(text: str) -> Dict[str, Any]:
 def analyze_with_ai(text: str, settings: Settings) -> Dict[str, Any]:
     """AI LLM을 사용해서 텍스트를 분석합니다."""
     try:
-        # OpenAI AI를 사용한 분석
-        openai_service = OpenAIService(model_name="gpt-4o") if OpenAIService else None
+        # 공유 LLM 게이트웨이에 위임해 동기적으로 실행 (워커 스레드에서 호출)
+        gateway = get_llm_gateway()
         
-        # 비동기 함수를 동기적으로 실행
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # 프롬프트별로 작업에 필요한 부분만 예산 안에서 골라 넣음
+        basic_info_text = budget_document(
+            text, BASIC_INFO_QUERY, settings.prompt_basic_info_tokens,
+            lead_chunks=2, keep_patterns=CONTACT_PATTERNS
+        )
+        summary_text = budget_document(text, SUMMARY_QUERY, settings.prompt_summary_tokens)
+        keywords_text = budget_document(text, KEYWORDS_QUERY, settings.prompt_keywords_tokens, lead_chunks=0)
         
-        try:
-            # 기본 정보 추출을 위한 프롬프트
-            basic_info_prompt = f"""
+        # 기본 정보 추출을 위한 프롬프트
+        basic_info_prompt = f"""
 다음은 이력서에서 추출한 텍스트입니다. 이 텍스트에서 다음 정보들을 정확히 추출해주세요:
 
 텍스트:
-{text}
+{basic_info_text}
 
 다음 정보들을 JSON 형태로 추출해주세요:
 1. 이름 (가장 가능성이 높은 하나의 이름만)
@@ -392,11 +449,11 @@ def analyze_with_ai(text: str, settings: Settings) -> Dict[str, Any]:
 만약 특정 정보를 찾을 수 없다면 해당 필드는 빈 문자열("")로 설정해주세요.
 """
 
-            # 요약 생성을 위한 프롬프트
-            summary_prompt = f"""
+        # 요약 생성을 위한 프롬프트
+        summary_prompt = f"""
 다음 이력서 텍스트를 간단하고 명확하게 요약해주세요:
 
-{text}
+{summary_text}
 
 요약은 다음을 포함해야 합니다:
 - 지원자의 주요 경력과 전문 분야
@@ -406,11 +463,11 @@ def analyze_with_ai(text: str, settings: Settings) -> Dict[str, Any]:
 2-3문장으로 간결하게 작성해주세요.
 """
 
-            # 키워드 추출을 위한 프롬프트
-            keywords_prompt = f"""
+        # 키워드 추출을 위한 프롬프트
+        keywords_prompt = f"""
 다음 이력서 텍스트에서 중요한 키워드 10개를 추출해주세요:
 
-{text}
+{keywords_text}
 
 추출할 키워드 유형:
 - 기술 스킬 (예: Python, React, AWS)
@@ -423,53 +480,50 @@ JSON 형태로 응답해주세요:
 }}
 """
 
-            # OpenAI 호출
-            basic_info_response = loop.run_until_complete(
-                openai_service.chat_completion([{"role": "user", "content": basic_info_prompt}])
-            )
-            summary_response = loop.run_until_complete(
-                openai_service.chat_completion([{"role": "user", "content": summary_prompt}])
-            )
-            keywords_response = loop.run_until_complete(
-                openai_service.chat_completion([{"role": "user", "content": keywords_prompt}])
-            )
-            
-            # JSON 파싱 시도
+        # 세 프롬프트를 동시에 호출
+        async def run_prompts():
+            return await asyncio.gather(*(
+                gateway.complete(prompt, model="gpt-4o", call_site="ocr_document_analysis")
+                for prompt in (basic_info_prompt, summary_prompt, keywords_prompt)
+            ))
+        
+        basic_info_response, summary_response, keywords_response = (
+            response.content for response in gateway.run_sync(run_prompts())
+        )
+        
+        # JSON 파싱 시도
+        basic_info = {}
+        try:
+            # JSON 부분만 추출
+            json_start = basic_info_response.find('{')
+            json_end = basic_info_response.rfind('}') + 1
+            if json_start != -1 and json_end != 0:
+                json_str = basic_info_response[json_start:json_end]
+                basic_info = json.loads(json_str)
+        except:
             basic_info = {}
-            try:
-                # JSON 부분만 추출
-                json_start = basic_info_response.find('{')
-                json_end = basic_info_response.rfind('}') + 1
-                if json_start != -1 and json_end != 0:
-                    json_str = basic_info_response[json_start:json_end]
-                    basic_info = json.loads(json_str)
-            except:
-                basic_info = {}
-            
+        
+        keywords = []
+        try:
+            json_start = keywords_response.find('{')
+            json_end = keywords_response.rfind('}') + 1
+            if json_start != -1 and json_end != 0:
+                json_str = keywords_response[json_start:json_end]
+                keywords_data = json.loads(json_str)
+                keywords = keywords_data.get('keywords', [])
+        except:
             keywords = []
-            try:
-                json_start = keywords_response.find('{')
-                json_end = keywords_response.rfind('}') + 1
-                if json_start != -1 and json_end != 0:
-                    json_str = keywords_response[json_start:json_end]
-                    keywords_data = json.loads(json_str)
-                    keywords = keywords_data.get('keywords', [])
-            except:
-                keywords = []
-            
-            analysis = {
-                "summary": summary_response,
-                "keywords": keywords,
-                "structured_data": {
-                    "document_type": detect_document_type(text),
-                    "sections": extract_sections(text),
-                    "entities": extract_entities(text),
-                    "basic_info": basic_info
-                }
+        
+        analysis = {
+            "summary": summary_response,
+            "keywords": keywords,
+            "structured_data": {
+                "document_type": detect_document_type(text),
+                "sections": extract_sections(text),
+                "entities": extract_entities(text),
+                "basic_info": basic_info
             }
-            
-        finally:
-            loop.close()
+        }
         
         return analysis
         
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 import os
@@ -31,6 +32,8 @@ class Settings(BaseSettings):
     dpi: int = Field(default=400)  # PDF → 이미지 변환 DPI (300에서 400으로 증가)
     quality_threshold: float = Field(default=0.6)  # 품질 임계값 완화
     max_retries: int = Field(default=3)  # 재시도 횟수 증가
+    deskew_max_angle: float = Field(default=10.0)  # 데스큐 탐색 범위(±도)
+    deskew_min_angle: float = Field(default=0.3)  # 이보다 작은 기울기는 회전 생략
 
     # MongoDB
     mongodb_uri: str = Field(default="mongodb://localhost:27017")
@@ -39,6 +42,7 @@ class Settings(BaseSettings):
     mongodb_col_documents: str = Field(default="documents")
     mongodb_col_pages: str = Field(default="pages")
     use_dedup: bool = Field(default=True)
+    mongodb_use_transactions: bool = Field(default=False)  # 문서+페이지 저장을 트랜잭션으로 묶기 (레플리카셋 필요)
 
     # Pinecone (VectorDB)
     pinecone_api_key: Optional[str] = Field(default=None)
@@ -67,6 +71,11 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = Field(default=None)
     openai_model: str = Field(default="gpt-4o")
 
+    # LLM 프롬프트에 넣을 문서 토큰 예산 (초과하면 작업 관련 부분만 골라 넣음)
+    prompt_basic_info_tokens: int = Field(default=1200)
+    prompt_summary_tokens: int = Field(default=2500)
+    prompt_keywords_tokens: int = Field(default=2000)
+
     # LLM 제공자 설정
     llm_provider: str = Field(default="groq")  # "groq" | "openai"
     # Groq (선택)
@@ -110,4 +119,7 @@ class Settings(BaseSettings):
                     break
 
 
-
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """프로세스 전역 Settings (매 호출마다 .env를 다시 파싱하지 않도록 캐시)."""
+    return Settings()
@@ -4,7 +4,7 @@ from functools import lru_cache
 from typing import List
 import numpy as np
 
-from .config import Settings
+from .config import Settings, get_settings
 
 
 @lru_cache(maxsize=1)
@@ -49,7 +49,7 @@ def embed_texts(texts: List[str], settings: Settings) -> List[List[float]]:
 # 텍스트를 벡터(임베딩)로 변환
 # SentenceTransformer or OpenAI Embedding API 사용
 def get_embedding(text: str) -> List[float]:
-    settings = Settings()
+    settings = get_settings()
     model = _get_model(settings.embedding_model_name)
     if model is None:
         dim = 128
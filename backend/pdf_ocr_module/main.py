@@ -3,29 +3,66 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from .ai_analyzer import analyze_text, extract_keywords, summarize_text, extract_fields, clean_text
-from .config import Settings
+from .ai_analyzer import TextArtifacts, clean_text_content, extract_keywords, summarize_text
+from .config import Settings, get_settings
 from .embedder import embed_texts, get_embedding
 from .ocr_engine import ocr_images, ocr_images_with_quality
 from .pdf_extractor import extract_text_with_layout
 from .pdf_processor import save_pdf_pages_to_images, create_thumbnails
-from .storage import save_document_to_mongo, save_to_db
+from .storage import build_page_record, find_cached_document, save_document_with_pages
 from .utils import ensure_directories, write_json, file_sha256
 from .vector_storage import upsert_embeddings, store_vector
 
 
-def process_pdf(pdf_path: str | Path) -> Dict[str, Any]:
-    settings = Settings()
+# OCR/추출 로직이 바뀌면 올려서 이전 캐시 결과를 무효화합니다.
+PIPELINE_VERSION = "3"
+
+
+def _result_from_cached(cached: Dict[str, Any], settings: Settings, file_name: str) -> Dict[str, Any]:
+    """저장된 documents 레코드를 process_pdf 반환 형식으로 변환합니다 (파일명은 이번 요청의 파일명)."""
+    return {
+        "mongo_id": str(cached["_id"]),
+        "file_name": file_name,
+        "num_pages": cached.get("num_pages", 0),
+        "full_text": cached.get("text", ""),
+        "summary": cached.get("summary") if settings.index_generate_summary else None,
+        "keywords": cached.get("keywords", []) if settings.index_generate_keywords else [],
+        "doc_hash": cached.get("doc_hash"),
+        "fields": cached.get("fields", {}),
+        "analysis": {
+            "clean_text": clean_text_content(cached.get("text", "")),
+            "basic_info": cached.get("basic_info", {}),
+            "summary": cached.get("summary", ""),
+            "keywords": cached.get("keywords", []),
+            "structured_data": cached.get("structured_data", {}),
+        },
+        "cache_hit": True,
+    }
+
+
+def process_pdf(pdf_path: str | Path, doc_hash: Optional[str] = None, file_name: Optional[str] = None) -> Dict[str, Any]:
+    """PDF OCR 파이프라인 실행.
+
+    doc_hash: 업로드 스트리밍 중 이미 계산한 SHA-256이 있으면 전달 (재계산 생략)
+    file_name: 업로드된 원래 파일명 (임시 파일 경로 대신 결과/저장 레코드에 사용)
+    """
+    settings = get_settings()
     ensure_directories(settings)
 
     pdf_path = Path(pdf_path)
     if not pdf_path.exists():
         raise FileNotFoundError(f"파일을 찾을 수 없습니다: {pdf_path}")
+    file_name = file_name or pdf_path.name
 
     # 0) 중복 방지 해시 계산
-    doc_hash = file_sha256(pdf_path)
+    doc_hash = doc_hash or file_sha256(pdf_path)
+    if settings.use_dedup:
+        cached = find_cached_document(doc_hash, PIPELINE_VERSION, settings)
+        if cached:
+            print(f"[OCR] 캐시 적중: doc_hash={doc_hash[:12]} mongo_id={cached['_id']}")
+            return _result_from_cached(cached, settings, file_name)
 
     # 1) 우선 내장 텍스트/레이아웃 추출
     layout = extract_text_with_layout(pdf_path)
@@ -48,8 +85,10 @@ def process_pdf(pdf_path: str | Path) -> Dict[str, Any]:
     full_text: str = "\n\n".join(page_texts)
 
     # 3) 텍스트 분석 (요약/키워드) - 인덱싱 단계에서는 비활성화 가능
+    # 전체 텍스트 산출물(clean_text/basic_info/fields/analysis)은 한 번씩만 계산
+    artifacts = TextArtifacts(full_text, settings)
     if settings.index_generate_summary or settings.index_generate_keywords:
-        analysis = analyze_text(full_text, settings)
+        analysis = artifacts.analysis
         _summary = summarize_text(full_text) if settings.index_generate_summary else ""
         _keywords = extract_keywords(full_text) if settings.index_generate_keywords else []
     else:
@@ -61,17 +100,19 @@ def process_pdf(pdf_path: str | Path) -> Dict[str, Any]:
     # OCR은 텍스트 추출까지만 담당
 
     # 6) MongoDB 저장
-    fields = extract_fields(full_text)
+    fields = artifacts.fields
+    full_analysis = artifacts.analysis
     document = {
         "doc_id": str(uuid.uuid4()),
         "doc_hash": doc_hash,
-        "file_name": pdf_path.name,
+        "pipeline_version": PIPELINE_VERSION,
+        "file_name": file_name,
         "num_pages": len(page_texts),
         "preview": [str(p) for p in thumb_paths],
         "pages": [
             {
                 "page": i + 1,
-                "clean_text": analyze_text(t, settings).get("clean_text", t),
+                "clean_text": clean_text_content(t),
                 "quality_score": float(ocr_outputs[i]["result"].get("quality") or 0.0),
                 "trace": {
                     "attempts": ocr_outputs[i].get("attempts", []),
@@ -81,15 +122,20 @@ def process_pdf(pdf_path: str | Path) -> Dict[str, Any]:
         ],
         "text": full_text,
         "fields": fields,
+        "basic_info": full_analysis.get("basic_info", {}),
+        "structured_data": full_analysis.get("structured_data", {}),
         "summary": analysis.get("summary") or _summary,
         "keywords": analysis.get("keywords", []) or _keywords,
         "created_at": datetime.utcnow(),
     }
-    inserted_id = save_document_to_mongo(document, settings)
-
-    # 페이지 단위 몽고 저장(원본 텍스트+클린): 필요시 검증용
-    for idx, page_text in enumerate(page_texts, start=1):
-        save_to_db(pdf_path.name.lstrip('.'), idx, page_text, None, None, None, doc_hash=doc_hash)
+    # 문서 + 페이지 단위 몽고 저장(원본 텍스트+클린): 필요시 검증용, 한 번의 bulk 저장
+    page_records = [
+        build_page_record(file_name.lstrip('.'), idx, page_text, doc_hash=doc_hash)
+        for idx, page_text in enumerate(page_texts, start=1)
+    ]
+    inserted_id = save_document_with_pages(
+        document, page_records, settings, use_transaction=settings.mongodb_use_transactions
+    )
 
     # 7) 결과 저장 (선택)
     result_path = settings.results_dir / f"{pdf_path.stem}.json"
@@ -100,13 +146,15 @@ def process_pdf(pdf_path: str | Path) -> Dict[str, Any]:
 
     return {
         "mongo_id": inserted_id,
-        "file_name": pdf_path.name,
+        "file_name": file_name,
         "num_pages": len(page_texts),
         "full_text": full_text,  # 전체 텍스트 추가
         "summary": analysis.get("summary") if settings.index_generate_summary else None,
         "keywords": analysis.get("keywords", []) if settings.index_generate_keywords else [],
         "doc_hash": doc_hash,
         "fields": fields,
+        "analysis": full_analysis,  # 호출 측에서 analyze_text를 다시 돌리지 않도록 전달
+        "cache_hit": False,
     }
 
 
@@ -17,6 +17,7 @@ from models.document import (
 )
 from modules.core.services.chunking_service import ChunkingService
 from modules.core.services.embedding_service import EmbeddingService
+from modules.core.services.llm_gateway import get_llm_gateway
 from modules.core.services.mongo_service import MongoService
 from modules.core.services.vector_service import VectorService
 
@@ -62,17 +63,27 @@ class MongoSaver:
                 hash_sha256.update(chunk)
         return hash_sha256.hexdigest()
 
-    def _create_file_metadata(self, file_path: Path) -> Dict[str, Any]:
-        """파일 메타데이터를 생성합니다."""
+    def _create_file_metadata(self, file_path: Path, ocr_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """파일 메타데이터를 생성합니다.
+
+        OCR 단계에서 이미 계산한 doc_hash가 있으면 재계산하지 않고,
+        중복 업로드인 경우 기존 OCR 문서(ocr_document_id)에 연결합니다.
+        """
+        ocr_result = ocr_result or {}
         stat = file_path.stat()
-        return {
+        metadata = {
             "filename": file_path.name,
             "size": stat.st_size,
             "mime": "application/pdf",  # PDF 파일 가정
-            "hash": self._calculate_file_hash(file_path),
+            "hash": ocr_result.get("doc_hash") or self._calculate_file_hash(file_path),
             "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
             "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat()
         }
+        ocr_document_id = ocr_result.get("ocr_document_id") or ocr_result.get("mongo_id")
+        if ocr_document_id:
+            metadata["ocr_document_id"] = ocr_document_id
+            metadata["ocr_cache_hit"] = bool(ocr_result.get("cache_hit"))
+        return metadata
 
     def _extract_basic_info_from_ocr(self, ocr_result: Dict[str, Any]) -> Dict[str, Any]:
         """OCR 결과에서 기본 정보를 추출합니다."""
@@ -133,7 +144,7 @@ class MongoSaver:
 
         return basic_info
 
-    def _extract_cover_letter_fields(self, text: str) -> Dict[str, str]:
+    async def _extract_cover_letter_fields(self, text: str) -> Dict[str, str]:
         """자기소개서에서 특화된 필드들을 추출합니다."""
         fields = {
             "careerHistory": "",
@@ -144,11 +155,8 @@ class MongoSaver:
         if not text:
             return fields
 
-        # 동기식 OpenAI 클라이언트 사용
+        # 공유 LLM 게이트웨이 사용 (연결 풀, rate limit, 재시도)
         try:
-            from openai import OpenAI
-            sync_client = OpenAI()
-
             ai_prompt = f"""다음은 자기소개서 텍스트입니다. 이 텍스트에서 다음 정보들을 추출해주세요:
 
 텍스트:
@@ -171,19 +179,20 @@ class MongoSaver:
     "motivation": "지원동기 요약"
 }}"""
 
-            response = sync_client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
+            response = await get_llm_gateway().chat(
+                [
                     {"role": "system", "content": "너는 자기소개서 분석 AI야. 텍스트에서 경력사항, 성장배경, 지원동기를 정확히 추출해."},
                     {"role": "user", "content": ai_prompt}
                 ],
-                max_tokens=500
+                model="gpt-4o",
+                max_tokens=500,
+                call_site="ocr_cover_letter_fields"
             )
 
             # JSON 파싱 시도
             try:
                 import json
-                content = response.choices[0].message.content.strip()
+                content = (response.content or "").strip()
                 json_start = content.find('{')
                 json_end = content.rfind('}') + 1
                 if json_start != -1 and json_end > json_start:
@@ -215,7 +224,7 @@ class MongoSaver:
             # 2. 파일 메타데이터 생성
             file_metadata = {}
             if file_path:
-                file_metadata = self._create_file_metadata(file_path)
+                file_metadata = self._create_file_metadata(file_path, ocr_result)
 
             # 3. 기본 정보 추출
             basic_info = self._extract_basic_info_from_ocr(ocr_result)
@@ -311,13 +320,13 @@ class MongoSaver:
             # 2. 파일 메타데이터 생성
             file_metadata = {}
             if file_path:
-                file_metadata = self._create_file_metadata(file_path)
+                file_metadata = self._create_file_metadata(file_path, ocr_result)
 
             # 3. 기본 정보 추출
             basic_info = self._extract_basic_info_from_ocr(ocr_result)
 
             # 4. 자기소개서 특화 필드 추출 (AI 분석)
-            cover_letter_fields = self._extract_cover_letter_fields(ocr_result.get("extracted_text", ""))
+            cover_letter_fields = await self._extract_cover_letter_fields(ocr_result.get("extracted_text", ""))
 
             # 5. 지원자 데이터에 기술 스택 정보 업데이트 (기존 기술 스택에 추가)
             if basic_info.get("skills"):
@@ -422,7 +431,7 @@ class MongoSaver:
             # 2. 파일 메타데이터 생성
             file_metadata = {}
             if file_path:
-                file_metadata = self._create_file_metadata(file_path)
+                file_metadata = self._create_file_metadata(file_path, ocr_result)
 
             # 3. 기본 정보 추출
             basic_info = self._extract_basic_info_from_ocr(ocr_result)
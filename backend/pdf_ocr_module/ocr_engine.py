@@ -7,7 +7,7 @@ import pytesseract
 from PIL import Image, ImageFilter, ImageOps
 import numpy as np
 
-from .config import Settings
+from .config import Settings, get_settings
 
 
 def _configure_tesseract(settings: Settings) -> None:
@@ -17,7 +17,7 @@ def _configure_tesseract(settings: Settings) -> None:
 
 def _preprocess_for_ocr(pil_image: Image.Image, profile: str = "default") -> Image.Image:
     # 기본 전처리 (단순화)
-    img = pil_image.convert("L")  # 그레이스케일
+    img = pil_image if pil_image.mode == "L" else pil_image.convert("L")  # 그레이스케일
     
     # 이미지 크기 확대 (해상도 향상)
     width, height = img.size
@@ -39,7 +39,8 @@ def _preprocess_for_ocr(pil_image: Image.Image, profile: str = "default") -> Ima
 def _guess_psm_for_layout(pil_image: Image.Image) -> int:
     # 간단한 히스토그램 분석으로 다단/단일 추정 (고급화 여지)
     width, height = pil_image.size
-    gray = np.array(pil_image.convert("L"))
+    # 전처리 단계에서 이미 L 모드이면 버퍼를 복사 없이 그대로 사용
+    gray = np.asarray(pil_image if pil_image.mode == "L" else pil_image.convert("L"))
     col_sum = (255 - gray).sum(axis=0)
     # 칼럼 최소값 분포를 보고 다단 가능성 추정
     valleys = (col_sum < col_sum.mean() * 0.5).sum()
@@ -108,10 +109,19 @@ def perform_ocr_with_retries(pil_image: Image.Image, settings: Settings) -> Dict
     profiles = ["default", "low_contrast"]
     attempts: List[Dict[str, Any]] = []
     best: Dict[str, Any] | None = None
+    # 프로파일별 전처리/레이아웃 추정은 한 번만 수행
+    prepared: Dict[str, Tuple[Image.Image, int]] = {}
+    tried: set[Tuple[str, int]] = set()
     for attempt_idx in range(settings.max_retries + 1):
         profile = profiles[min(attempt_idx, len(profiles) - 1)]
-        preprocessed = _preprocess_for_ocr(pil_image, profile=profile)
-        psm = _guess_psm_for_layout(preprocessed) or settings.ocr_default_psm
+        if profile not in prepared:
+            preprocessed = _preprocess_for_ocr(pil_image, profile=profile)
+            prepared[profile] = (preprocessed, _guess_psm_for_layout(preprocessed) or settings.ocr_default_psm)
+        preprocessed, psm = prepared[profile]
+        # 동일한 입력/설정의 재시도는 결과가 같으므로 생략
+        if (profile, psm) in tried:
+            break
+        tried.add((profile, psm))
         config = _tesseract_config(psm, settings)
         text = pytesseract.image_to_string(preprocessed, lang=settings.ocr_lang, config=config)
         data = pytesseract.image_to_data(preprocessed, lang=settings.ocr_lang, config=config)
@@ -139,7 +149,7 @@ def ocr_images_with_quality(image_paths: List[Path], settings: Settings) -> List
 # 이미지에서 텍스트를 추출하는 OCR 기능
 # pytesseract 사용, Tesseract 설치 필요
 def extract_text_from_image(image: Image.Image) -> str:
-    settings = Settings()
+    settings = get_settings()
     _configure_tesseract(settings)
     img = image.convert("L")
     return pytesseract.image_to_string(img, lang=settings.ocr_lang)
@@ -1,12 +1,47 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pymongo import MongoClient
 from pymongo.collection import Collection
 
-from .config import Settings
+from .config import Settings, get_settings
+
+
+# 프로세스 전역 MongoClient (내부적으로 커넥션 풀을 유지하므로 재사용)
+_client: MongoClient | None = None
+_client_uri: str | None = None
+
+
+def _get_client(settings: Settings) -> MongoClient:
+    global _client, _client_uri
+    if _client is not None and _client_uri == settings.mongodb_uri:
+        return _client
+    if _client is not None:
+        _client.close()
+    _client = MongoClient(settings.mongodb_uri)
+    _client_uri = settings.mongodb_uri
+    _ensure_indexes(_client, settings)
+    return _client
+
+
+def _ensure_indexes(client: MongoClient, settings: Settings) -> None:
+    """캐시 조회용 인덱스를 클라이언트 생성 시 한 번만 만듭니다 (조회마다 create_index 왕복 방지)."""
+    col_docs, _ = _get_collections(client, settings)
+    try:
+        col_docs.create_index([("doc_hash", 1), ("pipeline_version", 1)], background=True)
+    except Exception as e:
+        print(f"[OCR] documents 인덱스 생성 실패: {e}")
+
+
+def close_client() -> None:
+    """공유 MongoClient를 종료합니다 (앱 종료 시 호출)."""
+    global _client, _client_uri
+    if _client is not None:
+        _client.close()
+    _client = None
+    _client_uri = None
 
 
 def _get_collections(client: MongoClient, settings: Settings) -> tuple[Collection, Collection]:
@@ -15,17 +50,74 @@ def _get_collections(client: MongoClient, settings: Settings) -> tuple[Collectio
 
 
 def save_document_to_mongo(document: Dict[str, Any], settings: Settings) -> str:
-    client = MongoClient(settings.mongodb_uri)
-    try:
-        col_docs, _ = _get_collections(client, settings)
-        payload = {
-            **document,
-            "created_at": document.get("created_at", datetime.utcnow()),
-        }
-        result = col_docs.insert_one(payload)
+    col_docs, _ = _get_collections(_get_client(settings), settings)
+    payload = {
+        **document,
+        "created_at": document.get("created_at", datetime.utcnow()),
+    }
+    result = col_docs.insert_one(payload)
+    return str(result.inserted_id)
+
+
+def save_document_with_pages(
+    document: Dict[str, Any],
+    pages: List[Dict[str, Any]],
+    settings: Settings,
+    *,
+    use_transaction: bool = False,
+) -> str:
+    """문서 1건과 페이지 N건을 insert_one + insert_many 두 번의 왕복으로 저장합니다.
+
+    use_transaction=True이면 하나의 트랜잭션으로 묶습니다 (레플리카셋 필요).
+    """
+    client = _get_client(settings)
+    col_docs, col_pages = _get_collections(client, settings)
+    now = datetime.utcnow()
+    doc_payload = {**document, "created_at": document.get("created_at", now)}
+    page_payloads = [{**page, "created_at": page.get("created_at", now)} for page in pages]
+
+    def _write(session=None) -> str:
+        result = col_docs.insert_one(doc_payload, session=session)
+        if page_payloads:
+            col_pages.insert_many(page_payloads, ordered=False, session=session)
         return str(result.inserted_id)
-    finally:
-        client.close()
+
+    if not use_transaction:
+        return _write()
+    with client.start_session() as session:
+        return session.with_transaction(_write)
+
+
+# 동일 파일(doc_hash)+동일 파이프라인 버전으로 이미 처리된 문서 조회 (중복 업로드 단축)
+def find_cached_document(doc_hash: str, pipeline_version: str, settings: Settings) -> Optional[Dict[str, Any]]:
+    col_docs, _ = _get_collections(_get_client(settings), settings)
+    return col_docs.find_one(
+        {"doc_hash": doc_hash, "pipeline_version": pipeline_version},
+        projection={"pages": 0},
+        sort=[("created_at", -1)],
+    )
+
+
+def build_page_record(
+    pdf_filename: str,
+    page_number: int,
+    text: str,
+    summary: str | None = None,
+    keywords: list[str] | None = None,
+    *,
+    doc_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "file_name": pdf_filename,
+        "page": page_number,
+        "text": text,
+        "summary": summary,
+        "keywords": keywords or [],
+        "created_at": datetime.utcnow(),
+    }
+    if doc_hash:
+        payload["doc_hash"] = doc_hash
+    return payload
 
 
 # MongoDB에 원본 텍스트, 요약, 키워드, 메타데이터 저장
@@ -39,26 +131,9 @@ def save_to_db(
     *,
     doc_hash: Optional[str] = None,
 ) -> str:
-    settings = Settings()
-    client = db_conn or MongoClient(settings.mongodb_uri)
-    created_client = db_conn is None
-    try:
-        _, col_pages = _get_collections(client, settings)
-        payload: Dict[str, Any] = {
-            "file_name": pdf_filename,
-            "page": page_number,
-            "text": text,
-            "summary": summary,
-            "keywords": keywords or [],
-            "created_at": datetime.utcnow(),
-        }
-        if doc_hash:
-            payload["doc_hash"] = doc_hash
-        result = col_pages.insert_one(payload)
-        return str(result.inserted_id)
-    finally:
-        if created_client:
-            client.close()
-
-
-
+    settings = get_settings()
+    client = db_conn or _get_client(settings)
+    _, col_pages = _get_collections(client, settings)
+    payload = build_page_record(pdf_filename, page_number, text, summary, keywords, doc_hash=doc_hash)
+    result = col_pages.insert_one(payload)
+    return str(result.inserted_id)
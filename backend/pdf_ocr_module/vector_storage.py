@@ -11,7 +11,7 @@ except ImportError:
     Pinecone = None
     ServerlessSpec = None
 
-from .config import Settings
+from .config import Settings, get_settings
 
 
 _pc: Pinecone | None = None
@@ -70,7 +70,7 @@ def upsert_embeddings(
 
 # ChromaDB 등 VectorDB에 벡터와 메타데이터 저장
 def store_vector(embedding: List[float], metadata: dict) -> None:
-    settings = Settings()
+    settings = get_settings()
     upsert_embeddings(ids=[metadata.get("id") or metadata.get("doc_hash") or "temp"], embeddings=[embedding], metadatas=[metadata], settings=settings, documents=[metadata.get("document") or ""])  # type: ignore
 
 
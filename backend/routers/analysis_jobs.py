@@ -0,0 +1,202 @@
+"""
+분석 작업 큐 API
+
+이력서/자소서/종합 분석을 요청 안에서 실행하지 않고 작업 큐에 제출합니다.
+공고 마감 후 지원자 전체 평가는 /bulk 한 번으로 제출하고 배치 진행률/ETA를 조회합니다.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from modules.core.services.analysis_queue import JobRejected, get_analysis_queue
+from modules.core.services.serialization import to_jsonable
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/analysis-jobs", tags=["analysis-jobs"])
+
+# 작업 처리/공고 지원자 조회에 사용할 DB (앱 시작 시 register_analysis_handlers에서 지정)
+_db = None
+
+# 공고 지원자 전체 제출 시 작업 종류별 payload 키 ← 지원자 문서 필드
+POSTING_TARGET_FIELDS = {
+    "cover_letter": ("applicant_id", "_id"),
+    "resume": ("resume_id", "resume_id")
+}
+
+
+class AnalysisJobRequest(BaseModel):
+    kind: str = Field(..., description="작업 종류 (resume, cover_letter, hybrid)")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="작업 입력")
+    priority: str = Field(default="interactive", description="우선순위 (interactive, bulk)")
+    job_key: Optional[str] = Field(default=None, description="멱등 작업 키 (없으면 종류+payload로 생성)")
+    force: bool = Field(default=False, description="이미 완료된 같은 작업도 다시 실행 (문서가 바뀐 경우)")
+
+
+class BulkAnalysisRequest(BaseModel):
+    kind: str = Field(..., description="작업 종류 (resume, cover_letter, hybrid)")
+    items: List[Dict[str, Any]] = Field(default_factory=list, description="항목별 작업 입력")
+    job_posting_id: Optional[str] = Field(default=None, description="지정하면 해당 공고의 지원자 전체를 대상으로 제출")
+    options: Dict[str, Any] = Field(default_factory=dict, description="모든 항목에 공통으로 적용할 입력 (analysis_type 등)")
+    priority: str = Field(default="bulk", description="우선순위 (interactive, bulk)")
+    force: bool = Field(default=False, description="이미 완료된 같은 작업도 다시 실행 (문서가 바뀐 경우)")
+
+
+def _object_id(value: str) -> ObjectId:
+    try:
+        return ObjectId(value)
+    except Exception:
+        raise JobRejected(f"잘못된 ID: {value}")
+
+
+def register_analysis_handlers(queue, db) -> None:
+    """작업 종류별 처리 함수를 큐에 등록합니다 (결과는 JSON 호환 dict로 저장)."""
+    global _db
+    _db = db
+
+    async def analyze_resume(payload: Dict[str, Any]) -> Dict[str, Any]:
+        from modules.resume.models import ResumeAnalysisRequest
+        from modules.resume.services import ResumeService
+
+        if not payload.get("resume_id"):
+            raise JobRejected("resume_id가 필요합니다.")
+        result = await ResumeService(db).analyze_resume(ResumeAnalysisRequest(**payload))
+        return to_jsonable(result.dict())
+
+    async def analyze_cover_letter(payload: Dict[str, Any]) -> Dict[str, Any]:
+        from modules.core.services.cover_letter_analysis.analyzer import CoverLetterAnalyzer
+        from modules.cover_letter.router import LLM_CONFIG
+
+        applicant = await db.applicants.find_one({"_id": _object_id(payload.get("applicant_id", ""))})
+        if not applicant:
+            raise JobRejected("지원자를 찾을 수 없습니다.")
+        if not applicant.get("cover_letter_id"):
+            raise JobRejected("자소서가 없습니다.")
+        cover_letter = await db.cover_letters.find_one({"_id": _object_id(str(applicant["cover_letter_id"]))})
+        text = (cover_letter or {}).get("extracted_text") or (cover_letter or {}).get("content")
+        if not text:
+            raise JobRejected("자소서 본문이 없습니다.")
+
+        job_description = payload.get("job_description")
+        if job_description is None and applicant.get("job_posting_id"):
+            posting = await db.job_postings.find_one(
+                {"_id": _object_id(str(applicant["job_posting_id"]))},
+                {"description": 1, "requirements": 1}
+            )
+            job_description = "\n".join(filter(None, [(posting or {}).get("description"), (posting or {}).get("requirements")]))
+
+        analysis = await CoverLetterAnalyzer(LLM_CONFIG).analyze_cover_letter_text(
+            text,
+            filename=cover_letter.get("filename") or f"{applicant.get('name', '지원자')}_자소서",
+            job_description=job_description or "",
+            analysis_type=payload.get("analysis_type", "comprehensive"),
+            file_size=cover_letter.get("file_size") or 0
+        )
+        if analysis.status == "error":
+            # 분석기는 LLM 오류를 error 상태로 반환하므로 재시도 대상으로 올림
+            raise RuntimeError("자소서 분석 중 오류가 발생했습니다.")
+        return to_jsonable(analysis.dict())
+
+    async def analyze_hybrid(payload: Dict[str, Any]) -> Dict[str, Any]:
+        from modules.hybrid.services import HybridService
+
+        if not payload.get("hybrid_id"):
+            raise JobRejected("hybrid_id가 필요합니다.")
+        try:
+            analysis = await HybridService(db).perform_comprehensive_analysis(payload["hybrid_id"])
+        except HTTPException as e:
+            if e.status_code < 500:
+                raise JobRejected(e.detail)
+            raise
+        return to_jsonable(analysis.dict())
+
+    queue.register_handler("resume", analyze_resume)
+    queue.register_handler("cover_letter", analyze_cover_letter)
+    queue.register_handler("hybrid", analyze_hybrid)
+
+
+@router.post("")
+async def submit_analysis_job(request: AnalysisJobRequest):
+    """분석 작업 하나 제출 (같은 작업이 이미 있으면 기존 작업 ID 반환)"""
+    try:
+        result = await get_analysis_queue().submit(
+            request.kind, request.payload, request.priority, request.job_key, force=request.force
+        )
+        return {"success": True, "data": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/bulk")
+async def submit_bulk_analysis(request: BulkAnalysisRequest):
+    """여러 지원자 분석을 한 번에 제출 (job_posting_id를 주면 해당 공고 지원자 전체)"""
+    queue = get_analysis_queue()
+    try:
+        items = list(request.items)
+        if request.job_posting_id:
+            if request.kind not in POSTING_TARGET_FIELDS:
+                raise ValueError(f"공고 단위 제출을 지원하지 않는 작업 종류: {request.kind}")
+            if _db is None:
+                raise RuntimeError("분석 작업 큐가 시작되지 않았습니다.")
+
+            payload_key, applicant_field = POSTING_TARGET_FIELDS[request.kind]
+            cursor = _db.applicants.find({"job_posting_id": request.job_posting_id}, {applicant_field: 1})
+            async for applicant in cursor:
+                if applicant.get(applicant_field):
+                    items.append({payload_key: str(applicant[applicant_field])})
+
+        payloads = [{**request.options, **item} for item in items]
+        result = await queue.submit_batch(request.kind, payloads, request.priority, force=request.force)
+        return {"success": True, "data": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/stats")
+async def get_analysis_queue_stats():
+    """작업 큐 상태 (동시 실행 한도, rate limit 감지 횟수 등)"""
+    return {"success": True, "data": get_analysis_queue().stats()}
+
+
+@router.get("/batches/{batch_id}")
+async def get_batch_progress(batch_id: str):
+    """배치 진행률과 예상 남은 시간"""
+    progress = await get_analysis_queue().batch_progress(batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="배치를 찾을 수 없습니다")
+    return {"success": True, "data": progress}
+
+
+@router.get("/batches/{batch_id}/results")
+async def get_batch_results(
+    batch_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """배치 작업별 상태와 결과"""
+    jobs = await get_analysis_queue().batch_results(batch_id, skip, limit)
+    return {"success": True, "data": to_jsonable(jobs)}
+
+
+@router.post("/batches/{batch_id}/cancel")
+async def cancel_batch(batch_id: str):
+    """배치의 대기 중 작업 취소"""
+    cancelled = await get_analysis_queue().cancel_batch(batch_id)
+    return {"success": True, "data": {"batch_id": batch_id, "cancelled": cancelled}}
+
+
+@router.get("/{job_id}")
+async def get_analysis_job(job_id: str):
+    """작업 상태와 결과"""
+    job = await get_analysis_queue().get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return {"success": True, "data": to_jsonable(job)}
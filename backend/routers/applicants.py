@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from models.applicant import Applicant, ApplicantCreate
 from modules.core.services.embedding_service import EmbeddingService
+from modules.core.services.search_filters import SearchFilters
 from modules.core.services.similarity_service import SimilarityService
 from modules.core.services.vector_service import VectorService
 from modules.core.services.mongo_service import MongoService
@@ -134,6 +135,7 @@ async def search_similar_applicants(
         skills = search_criteria.get("skills", "")
         experience = search_criteria.get("experience", "")
         department = search_criteria.get("department", "")
+        filters = SearchFilters.from_dict(search_criteria.get("filters"))
 
         # 유사도 서비스 초기화
         similarity_service = get_similarity_service()
@@ -144,7 +146,9 @@ async def search_similar_applicants(
             skills=skills,
             experience=experience,
             department=department,
-            limit=10
+            limit=10,
+            filters=filters,
+            applicants_collection=mongo_service.db.applicants
         )
 
         return {
@@ -1,8 +1,7 @@
+import asyncio
 import json
 import os
-import tempfile
 from datetime import datetime
-from pathlib import Path
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
@@ -10,11 +9,12 @@ from fastapi.responses import JSONResponse
 from models.applicant import ApplicantCreate
 from modules.core.services.chunking_service import ChunkingService
 from pdf_ocr_module.ai_analyzer import analyze_text
-from pdf_ocr_module.config import Settings
+from pdf_ocr_module.config import get_settings
 
 # GPT-4o Vision API 기반 PDF OCR 모듈 import
 from pdf_ocr_module.main import process_pdf
 from pdf_ocr_module.mongo_saver import MongoSaver
+from utils.upload_stream import MAX_PDF_PAGES, StreamedUpload, UploadLimitError, stream_upload_to_disk
 
 router = APIRouter(tags=["integrated-ocr"])
 
@@ -47,6 +47,19 @@ def serialize_mongo_data(data):
         else:
             return data
 
+async def _stream_pdf_upload(file: UploadFile) -> StreamedUpload:
+    """업로드 PDF를 메모리에 올리지 않고 임시 파일로 스트리밍 저장합니다 (제한 초과 시 413)."""
+    try:
+        return await stream_upload_to_disk(file, max_pages=MAX_PDF_PAGES, suffix='.pdf')
+    except UploadLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+def _remove_temp_files(temp_files) -> None:
+    """업로드 처리 중 만든 임시 파일들을 삭제합니다."""
+    for temp_file_path in temp_files:
+        if temp_file_path.exists():
+            temp_file_path.unlink()
+
 # MongoDB 서비스 의존성
 def get_mongo_saver():
     mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
@@ -295,19 +308,16 @@ async def upload_resume_with_ocr(
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다")
 
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = Path(temp_file.name)
+        # 임시 파일로 스트리밍 저장 (크기/페이지 수 제한, 해시 동시 계산)
+        upload = await _stream_pdf_upload(file)
+        temp_file_path = upload.path
 
         try:
             # GPT-4o Vision API를 사용한 PDF OCR 처리
-            ocr_result = process_pdf(str(temp_file_path))
+            ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=file.filename)
 
             # AI 분석 결과 가져오기
-            settings = Settings()
-            ai_analysis = analyze_text(ocr_result.get("full_text", ""), settings)
+            ai_analysis = ocr_result.get("analysis") or await asyncio.to_thread(analyze_text, ocr_result.get("full_text", ""), get_settings())
 
             # OCR 결과에 AI 분석 결과 추가
             enhanced_ocr_result = {
@@ -316,7 +326,10 @@ async def upload_resume_with_ocr(
                 "keywords": ai_analysis.get("keywords", []),
                 "basic_info": ai_analysis.get("basic_info", {}),
                 "document_type": ai_analysis.get("structured_data", {}).get("document_type", "resume"),
-                "pages": ocr_result.get("num_pages", 0)
+                "pages": ocr_result.get("num_pages", 0),
+                "doc_hash": ocr_result.get("doc_hash"),
+                "ocr_document_id": ocr_result.get("mongo_id"),
+                "cache_hit": ocr_result.get("cache_hit", False)
             }
 
             # 지원자 데이터 생성 (OCR 기반 자동 추출)
@@ -342,6 +355,8 @@ async def upload_resume_with_ocr(
             if temp_file_path.exists():
                 temp_file_path.unlink()
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"이력서 처리 실패: {str(e)}")
     finally:
@@ -362,19 +377,16 @@ async def upload_cover_letter_with_ocr(
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다")
 
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = Path(temp_file.name)
+        # 임시 파일로 스트리밍 저장 (크기/페이지 수 제한, 해시 동시 계산)
+        upload = await _stream_pdf_upload(file)
+        temp_file_path = upload.path
 
         try:
             # GPT-4o Vision API를 사용한 PDF OCR 처리
-            ocr_result = process_pdf(str(temp_file_path))
+            ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=file.filename)
 
             # AI 분석 결과 가져오기
-            settings = Settings()
-            ai_analysis = analyze_text(ocr_result.get("full_text", ""), settings)
+            ai_analysis = ocr_result.get("analysis") or await asyncio.to_thread(analyze_text, ocr_result.get("full_text", ""), get_settings())
 
             # OCR 결과에 AI 분석 결과 추가
             enhanced_ocr_result = {
@@ -383,7 +395,10 @@ async def upload_cover_letter_with_ocr(
                 "keywords": ai_analysis.get("keywords", []),
                 "basic_info": ai_analysis.get("basic_info", {}),
                 "document_type": ai_analysis.get("structured_data", {}).get("document_type", "cover_letter"),
-                "pages": ocr_result.get("num_pages", 0)
+                "pages": ocr_result.get("num_pages", 0),
+                "doc_hash": ocr_result.get("doc_hash"),
+                "ocr_document_id": ocr_result.get("mongo_id"),
+                "cache_hit": ocr_result.get("cache_hit", False)
             }
 
             # 지원자 데이터 생성 (OCR 기반 자동 추출)
@@ -409,6 +424,8 @@ async def upload_cover_letter_with_ocr(
             if temp_file_path.exists():
                 temp_file_path.unlink()
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"자기소개서 처리 실패: {str(e)}")
     finally:
@@ -429,19 +446,16 @@ async def upload_portfolio_with_ocr(
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다")
 
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = Path(temp_file.name)
+        # 임시 파일로 스트리밍 저장 (크기/페이지 수 제한, 해시 동시 계산)
+        upload = await _stream_pdf_upload(file)
+        temp_file_path = upload.path
 
         try:
             # GPT-4o Vision API를 사용한 PDF OCR 처리
-            ocr_result = process_pdf(str(temp_file_path))
+            ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=file.filename)
 
             # AI 분석 결과 가져오기
-            settings = Settings()
-            ai_analysis = analyze_text(ocr_result.get("full_text", ""), settings)
+            ai_analysis = ocr_result.get("analysis") or await asyncio.to_thread(analyze_text, ocr_result.get("full_text", ""), get_settings())
 
             # OCR 결과에 AI 분석 결과 추가
             enhanced_ocr_result = {
@@ -450,7 +464,10 @@ async def upload_portfolio_with_ocr(
                 "keywords": ai_analysis.get("keywords", []),
                 "basic_info": ai_analysis.get("basic_info", {}),
                 "document_type": ai_analysis.get("structured_data", {}).get("document_type", "portfolio"),
-                "pages": ocr_result.get("num_pages", 0)
+                "pages": ocr_result.get("num_pages", 0),
+                "doc_hash": ocr_result.get("doc_hash"),
+                "ocr_document_id": ocr_result.get("mongo_id"),
+                "cache_hit": ocr_result.get("cache_hit", False)
             }
 
             # 지원자 데이터 생성 (OCR 기반 자동 추출)
@@ -476,6 +493,8 @@ async def upload_portfolio_with_ocr(
             if temp_file_path.exists():
                 temp_file_path.unlink()
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"포트폴리오 처리 실패: {str(e)}")
     finally:
@@ -493,9 +512,9 @@ async def upload_multiple_documents(
     mongo_saver: MongoSaver = Depends(get_mongo_saver)
 ):
     """여러 문서를 한 번에 업로드하고 OCR 처리 후 DB에 저장합니다."""
+    temp_files = []
     try:
         results = {}
-        temp_files = []
 
         # 지원자 데이터 생성은 첫 번째 처리된 문서의 OCR 결과로 자동 추출
         applicant_data: Optional[ApplicantCreate] = None
@@ -505,13 +524,11 @@ async def upload_multiple_documents(
             if not resume_file.filename.lower().endswith('.pdf'):
                 raise HTTPException(status_code=400, detail="이력서는 PDF 파일만 업로드 가능합니다")
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                content = await resume_file.read()
-                temp_file.write(content)
-                temp_file_path = Path(temp_file.name)
-                temp_files.append(temp_file_path)
+            upload = await _stream_pdf_upload(resume_file)
+            temp_file_path = upload.path
+            temp_files.append(temp_file_path)
 
-            ocr_result = process_pdf(str(temp_file_path))
+            ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=resume_file.filename)
             if not applicant_data:
                 applicant_data = _build_applicant_data(name, email, phone, ocr_result, job_posting_id)
             result = await mongo_saver.save_resume_with_ocr(
@@ -527,13 +544,11 @@ async def upload_multiple_documents(
             if not cover_letter_file.filename.lower().endswith('.pdf'):
                 raise HTTPException(status_code=400, detail="자기소개서는 PDF 파일만 업로드 가능합니다")
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                content = await cover_letter_file.read()
-                temp_file.write(content)
-                temp_file_path = Path(temp_file.name)
-                temp_files.append(temp_file_path)
+            upload = await _stream_pdf_upload(cover_letter_file)
+            temp_file_path = upload.path
+            temp_files.append(temp_file_path)
 
-            ocr_result = process_pdf(str(temp_file_path))
+            ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=cover_letter_file.filename)
             if not applicant_data:
                 applicant_data = _build_applicant_data(name, email, phone, ocr_result, job_posting_id)
             result = await mongo_saver.save_cover_letter_with_ocr(
@@ -549,13 +564,11 @@ async def upload_multiple_documents(
             if not portfolio_file.filename.lower().endswith('.pdf'):
                 raise HTTPException(status_code=400, detail="포트폴리오는 PDF 파일만 업로드 가능합니다")
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                content = await portfolio_file.read()
-                temp_file.write(content)
-                temp_file_path = Path(temp_file.name)
-                temp_files.append(temp_file_path)
+            upload = await _stream_pdf_upload(portfolio_file)
+            temp_file_path = upload.path
+            temp_files.append(temp_file_path)
 
-            ocr_result = process_pdf(str(temp_file_path))
+            ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=portfolio_file.filename)
             if not applicant_data:
                 applicant_data = _build_applicant_data(name, email, phone, ocr_result, job_posting_id)
             result = await mongo_saver.save_portfolio_with_ocr(
@@ -567,9 +580,7 @@ async def upload_multiple_documents(
             results["portfolio"] = result
 
         # 임시 파일들 정리
-        for temp_file_path in temp_files:
-            if temp_file_path.exists():
-                temp_file_path.unlink()
+        _remove_temp_files(temp_files)
 
         # 지원자 정보 가져오기 (첫 번째 결과에서)
         applicant_info = None
@@ -589,11 +600,13 @@ async def upload_multiple_documents(
             }
         })
 
+    except HTTPException:
+        # 413(용량/페이지 초과), 400 등은 상태 코드를 그대로 전달
+        _remove_temp_files(temp_files)
+        raise
     except Exception as e:
         # 임시 파일들 정리
-        for temp_file_path in temp_files:
-            if temp_file_path.exists():
-                temp_file_path.unlink()
+        _remove_temp_files(temp_files)
 
         raise HTTPException(status_code=500, detail=f"문서 처리 실패: {str(e)}")
     finally:
@@ -611,6 +624,7 @@ async def upload_multiple_documents(
     mongo_saver: MongoSaver = Depends(get_mongo_saver)
 ):
     """여러 문서를 한 번에 업로드하고 OCR 처리 후 하나의 지원자 레코드로 통합 저장합니다."""
+    temp_files = []
     try:
         # 최소 하나의 파일은 필요
         if not resume_file and not cover_letter_file and not portfolio_file:
@@ -621,7 +635,6 @@ async def upload_multiple_documents(
             job_posting_id = "default_job_posting"
 
         results = {}
-        temp_files = []
         applicant_id = None
 
         # 1. 이력서 처리 (우선순위 1)
@@ -633,21 +646,18 @@ async def upload_multiple_documents(
             print(f"📄 이력서 파일 크기: {resume_file.size} bytes")
             print(f"📄 이력서 파일 타입: {resume_file.content_type}")
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                content = await resume_file.read()
-                temp_file.write(content)
-                temp_file_path = Path(temp_file.name)
-                temp_files.append(temp_file_path)
+            upload = await _stream_pdf_upload(resume_file)
+            temp_file_path = upload.path
+            temp_files.append(temp_file_path)
 
             try:
                 # OCR 처리
                 print(f"🔍 이력서 OCR 처리 중...")
-                ocr_result = process_pdf(str(temp_file_path))
+                ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=resume_file.filename)
 
                 # AI 분석 결과 가져오기
                 print(f"🤖 이력서 AI 분석 중...")
-                settings = Settings()
-                ai_analysis = analyze_text(ocr_result.get("full_text", ""), settings)
+                ai_analysis = ocr_result.get("analysis") or await asyncio.to_thread(analyze_text, ocr_result.get("full_text", ""), get_settings())
 
                 # OCR 결과에 AI 분석 결과 추가
                 enhanced_ocr_result = {
@@ -657,7 +667,10 @@ async def upload_multiple_documents(
                     "basic_info": ai_analysis.get("basic_info", {}),
                     "structured_data": ai_analysis.get("structured_data", {}),
                     "document_type": "resume",
-                    "pages": ocr_result.get("num_pages", 0)
+                    "pages": ocr_result.get("num_pages", 0),
+                    "doc_hash": ocr_result.get("doc_hash"),
+                    "ocr_document_id": ocr_result.get("mongo_id"),
+                    "cache_hit": ocr_result.get("cache_hit", False)
                 }
 
                 # 지원자 데이터 생성
@@ -678,6 +691,8 @@ async def upload_multiple_documents(
                 print(f"📊 이력서 결과: {result.get('message', 'N/A')}")
                 print(f"👤 지원자 정보: {result.get('applicant', {}).get('name', 'N/A')} ({result.get('applicant', {}).get('email', 'N/A')})")
 
+            except HTTPException:
+                raise
             except Exception as e:
                 import traceback
                 error_traceback = traceback.format_exc()
@@ -708,21 +723,18 @@ async def upload_multiple_documents(
             print(f"📝 자기소개서 파일 크기: {cover_letter_file.size} bytes")
             print(f"📝 자기소개서 파일 타입: {cover_letter_file.content_type}")
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                content = await cover_letter_file.read()
-                temp_file.write(content)
-                temp_file_path = Path(temp_file.name)
-                temp_files.append(temp_file_path)
+            upload = await _stream_pdf_upload(cover_letter_file)
+            temp_file_path = upload.path
+            temp_files.append(temp_file_path)
 
             try:
                 # OCR 처리
                 print(f"🔍 자기소개서 OCR 처리 중...")
-                ocr_result = process_pdf(str(temp_file_path))
+                ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=cover_letter_file.filename)
 
                 # AI 분석 결과 가져오기
                 print(f"🤖 자기소개서 AI 분석 중...")
-                settings = Settings()
-                ai_analysis = analyze_text(ocr_result.get("full_text", ""), settings)
+                ai_analysis = ocr_result.get("analysis") or await asyncio.to_thread(analyze_text, ocr_result.get("full_text", ""), get_settings())
 
                 # OCR 결과에 AI 분석 결과 추가
                 enhanced_ocr_result = {
@@ -732,7 +744,10 @@ async def upload_multiple_documents(
                     "basic_info": ai_analysis.get("basic_info", {}),
                     "structured_data": ai_analysis.get("structured_data", {}),
                     "document_type": "cover_letter",
-                    "pages": ocr_result.get("num_pages", 0)
+                    "pages": ocr_result.get("num_pages", 0),
+                    "doc_hash": ocr_result.get("doc_hash"),
+                    "ocr_document_id": ocr_result.get("mongo_id"),
+                    "cache_hit": ocr_result.get("cache_hit", False)
                 }
 
                 # 기존 지원자 데이터 사용 또는 새로 생성
@@ -777,6 +792,8 @@ async def upload_multiple_documents(
                 print(f"📊 자기소개서 결과: {result.get('message', 'N/A')}")
                 print(f"👤 지원자 정보: {result.get('applicant', {}).get('name', 'N/A')} ({result.get('applicant', {}).get('email', 'N/A')})")
 
+            except HTTPException:
+                raise
             except Exception as e:
                 import traceback
                 error_traceback = traceback.format_exc()
@@ -794,21 +811,18 @@ async def upload_multiple_documents(
             print(f"📁 포트폴리오 파일 크기: {portfolio_file.size} bytes")
             print(f"📁 포트폴리오 파일 타입: {portfolio_file.content_type}")
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                content = await portfolio_file.read()
-                temp_file.write(content)
-                temp_file_path = Path(temp_file.name)
-                temp_files.append(temp_file_path)
+            upload = await _stream_pdf_upload(portfolio_file)
+            temp_file_path = upload.path
+            temp_files.append(temp_file_path)
 
             try:
                 # OCR 처리
                 print(f"🔍 포트폴리오 OCR 처리 중...")
-                ocr_result = process_pdf(str(temp_file_path))
+                ocr_result = await asyncio.to_thread(process_pdf, str(temp_file_path), doc_hash=upload.sha256, file_name=portfolio_file.filename)
 
                 # AI 분석 결과 가져오기
                 print(f"🤖 포트폴리오 AI 분석 중...")
-                settings = Settings()
-                ai_analysis = analyze_text(ocr_result.get("full_text", ""), settings)
+                ai_analysis = ocr_result.get("analysis") or await asyncio.to_thread(analyze_text, ocr_result.get("full_text", ""), get_settings())
 
                 # OCR 결과에 AI 분석 결과 추가
                 enhanced_ocr_result = {
@@ -818,7 +832,10 @@ async def upload_multiple_documents(
                     "basic_info": ai_analysis.get("basic_info", {}),
                     "structured_data": ai_analysis.get("structured_data", {}),
                     "document_type": "portfolio",
-                    "pages": ocr_result.get("num_pages", 0)
+                    "pages": ocr_result.get("num_pages", 0),
+                    "doc_hash": ocr_result.get("doc_hash"),
+                    "ocr_document_id": ocr_result.get("mongo_id"),
+                    "cache_hit": ocr_result.get("cache_hit", False)
                 }
 
                 # 기존 지원자 데이터 사용 또는 새로 생성
@@ -863,6 +880,8 @@ async def upload_multiple_documents(
                 print(f"📊 포트폴리오 결과: {result.get('message', 'N/A')}")
                 print(f"👤 지원자 정보: {result.get('applicant', {}).get('name', 'N/A')} ({result.get('applicant', {}).get('email', 'N/A')})")
 
+            except HTTPException:
+                raise
             except Exception as e:
                 import traceback
                 error_traceback = traceback.format_exc()
@@ -899,11 +918,13 @@ async def upload_multiple_documents(
             }
         })
 
+    except HTTPException:
+        # 413(용량/페이지 초과), 400 등은 상태 코드를 그대로 전달
+        _remove_temp_files(temp_files)
+        raise
     except Exception as e:
         # 임시 파일들 정리
-        for temp_file_path in temp_files:
-            if temp_file_path.exists():
-                temp_file_path.unlink()
+        _remove_temp_files(temp_files)
 
         import traceback
         error_traceback = traceback.format_exc()
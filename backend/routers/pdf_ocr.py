@@ -1,14 +1,15 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
-import tempfile
+import asyncio
 import os
 from pathlib import Path
 from typing import Dict, Any
 import logging
 
 from pdf_ocr_module.main import process_pdf
-from pdf_ocr_module.config import Settings
+from pdf_ocr_module.config import get_settings
 from pdf_ocr_module.ai_analyzer import analyze_text
+from utils.upload_stream import MAX_PDF_PAGES, UploadLimitError, stream_upload_to_disk
 
 router = APIRouter()
 
@@ -22,19 +23,19 @@ async def upload_and_process_pdf(file: UploadFile = File(...)) -> Dict[str, Any]
         if not file.filename.lower().endswith('.pdf'):
             raise HTTPException(status_code=400, detail="PDF 파일만 업로드 가능합니다.")
         
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # 임시 파일로 스트리밍 저장 (크기/페이지 수 제한, 해시 동시 계산)
+        try:
+            upload = await stream_upload_to_disk(file, max_pages=MAX_PDF_PAGES, suffix='.pdf')
+        except UploadLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        temp_file_path = str(upload.path)
         
         try:
             # PDF 처리
-            result = process_pdf(temp_file_path)
+            result = await asyncio.to_thread(process_pdf, temp_file_path, doc_hash=upload.sha256, file_name=file.filename)
             
             # AI 분석 결과 가져오기
-            settings = Settings()
-            ai_analysis = analyze_text(result.get("full_text", ""), settings)
+            ai_analysis = result.get("analysis") or await asyncio.to_thread(analyze_text, result.get("full_text", ""), get_settings())
             
             # 결과에서 필요한 정보만 추출
             processed_result = {
@@ -45,6 +46,7 @@ async def upload_and_process_pdf(file: UploadFile = File(...)) -> Dict[str, Any]
                 "keywords": ai_analysis.get("keywords", []),
                 "pages": result.get("num_pages", 0),
                 "document_id": result.get("mongo_id", ""),
+                "cache_hit": result.get("cache_hit", False),
                 "processing_time": 0,
                 # AI 분석 결과 추가
                 "document_type": ai_analysis.get("structured_data", {}).get("document_type", "general"),
@@ -60,6 +62,8 @@ async def upload_and_process_pdf(file: UploadFile = File(...)) -> Dict[str, Any]
             if os.path.exists(temp_file_path):
                 os.unlink(temp_file_path)
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"PDF 처리 중 오류 발생: {str(e)}")
         raise HTTPException(status_code=500, detail=f"PDF 처리 실패: {str(e)}")
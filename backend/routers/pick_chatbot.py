@@ -5,11 +5,11 @@ import time
 import uuid
 from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel, Field
 
 # 기존 서비스들 import
 try:
@@ -18,6 +18,9 @@ try:
 except ImportError:
     from modules.core.services.llm_service import LLMService
     from modules.core.services.mongo_service import MongoService
+from modules.core.services.search_cache import bump_generation
+from modules.core.services.search_filters import with_experience_years
+from modules.core.services.sse import sse_response, stream_tokens_of
 
 # 웹 자동화를 위한 추가 import
 import asyncio
@@ -185,6 +188,22 @@ class ToolExecutor:
         else:
             raise ValueError(f"알 수 없는 GitHub 액션: {action}")
 
+    @staticmethod
+    def _mongo_filter(query: Dict[str, Any]) -> Dict[str, Any]:
+        """툴 인자(today_only, status)를 실제 MongoDB 필터로 변환 (false/None 조건은 필터에서 제외)"""
+        filter_query = {}
+
+        # 오늘자 필터링
+        if query.get("today_only"):
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            filter_query["created_at"] = {"$gte": today}
+
+        # 상태 필터링
+        if query.get("status"):
+            filter_query["status"] = query["status"]
+
+        return filter_query
+
     async def mongodb_tool(self, action, **params):
         """MongoDB 관련 툴 - 실제 데이터베이스 연결"""
         try:
@@ -194,21 +213,8 @@ class ToolExecutor:
 
                 # 채용공고 조회인 경우
                 if collection == "job_postings":
-                    from datetime import datetime, timedelta
-
-                    from bson import ObjectId
-
                     # 실제 데이터베이스에서 조회
-                    filter_query = {}
-
-                    # 오늘자 필터링
-                    if query.get("today_only"):
-                        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                        filter_query["created_at"] = {"$gte": today}
-
-                    # 상태 필터링
-                    if query.get("status"):
-                        filter_query["status"] = query["status"]
+                    filter_query = self._mongo_filter(query)
 
                     # 실제 MongoDB 조회
                     cursor = self.mongo_service.db.job_postings.find(filter_query).sort("created_at", -1)
@@ -232,7 +238,7 @@ class ToolExecutor:
 
                 # 기타 컬렉션
                 else:
-                    cursor = self.mongo_service.db[collection].find(query)
+                    cursor = self.mongo_service.db[collection].find(self._mongo_filter(query))
                     documents = await cursor.to_list(100)
                     return {"documents": documents}
 
@@ -408,8 +414,10 @@ class ToolExecutor:
                 applicant_data = params.get("applicant_data", {})
                 applicant_data["created_at"] = datetime.now()
                 applicant_data["status"] = "pending"
+                with_experience_years(applicant_data)
 
                 result = await self.mongo_service.db.applicants.insert_one(applicant_data)
+                bump_generation()
                 logger.info(f"✅ [지원자툴] 생성 완료: {result.inserted_id}")
                 return {
                     "applicant_id": str(result.inserted_id),
@@ -453,7 +461,7 @@ class ToolExecutor:
             elif action == "update":
                 # 지원자 수정
                 applicant_id = params.get("applicant_id")
-                update_data = params.get("update_data", {})
+                update_data = with_experience_years(params.get("update_data", {}))
 
                 result = await self.mongo_service.db.applicants.update_one(
                     {"_id": ObjectId(applicant_id)},
@@ -461,6 +469,7 @@ class ToolExecutor:
                 )
 
                 if result.modified_count > 0:
+                    bump_generation()
                     logger.info(f"✅ [지원자툴] 수정 완료: {applicant_id}")
                     return {"message": "지원자 정보가 성공적으로 수정되었습니다."}
                 else:
@@ -473,6 +482,7 @@ class ToolExecutor:
                 result = await self.mongo_service.db.applicants.delete_one({"_id": ObjectId(applicant_id)})
 
                 if result.deleted_count > 0:
+                    bump_generation()
                     logger.info(f"✅ [지원자툴] 삭제 완료: {applicant_id}")
                     return {"message": "지원자가 성공적으로 삭제되었습니다."}
                 else:
@@ -490,6 +500,7 @@ class ToolExecutor:
                 )
 
                 if result.modified_count > 0:
+                    bump_generation()
                     logger.info(f"✅ [지원자툴] 상태 변경 완료: {applicant_id} -> {new_status}")
                     return {"message": f"지원자 상태가 {new_status}로 변경되었습니다."}
                 else:
@@ -1259,6 +1270,40 @@ def extract_context_keywords(message: str) -> List[str]:
 
     return keywords
 
+# 툴 사용 가능성이 있는 메시지 판별용 키워드 (github / mongodb / search 툴)
+TOOL_INTENT_KEYWORDS = [
+    "github", "깃허브", "깃헙", "레포", "repo", "커밋", "commit", "포트폴리오", "portfolio",
+    "데이터베이스", "db", "mongodb", "컬렉션", "collection", "문서", "조회", "목록", "몇 명", "몇명", "개수",
+    "검색", "search", "찾아", "찾기", "뉴스", "news", "이미지", "최신", "트렌드"
+]
+
+# 이전 툴 결과를 이어받는 후속 질문 표현
+FOLLOW_UP_KEYWORDS = ["더 ", "다른", "그 사람", "그 사용자", "이 사람", "이 사용자", "계속", "다음", "나머지", "자세히"]
+
+# 진행 중인 백그라운드 작업 참조 (완료 전 가비지 컬렉션 방지)
+_background_tasks = set()
+
+def needs_tool_detection(message: str, session_context: Dict[str, Any] = None) -> bool:
+    """
+    LLM 툴 감지가 필요한 메시지인지 로컬 키워드로 빠르게 판별
+
+    툴 관련 키워드가 있거나, 직전에 툴을 사용한 세션의 후속 질문인 경우에만 True를 반환합니다.
+    일반 대화/시스템 사용법 질문은 LLM 툴 감지 호출 없이 바로 답변을 생성합니다.
+    """
+    message_lower = message.lower()
+    if any(keyword in message_lower for keyword in TOOL_INTENT_KEYWORDS):
+        return True
+    if session_context and session_context.get("last_tool_used"):
+        return any(keyword in message_lower for keyword in FOLLOW_UP_KEYWORDS)
+    return False
+
+def run_in_background(coro) -> asyncio.Task:
+    """응답을 기다리게 하지 않고 코루틴을 백그라운드에서 실행"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
 async def generate_search_based_response(
     user_message: str,
     openai_service,
@@ -1311,7 +1356,7 @@ async def generate_search_based_response(
                 llm_response = await openai_service.chat_completion([
                     {"role": "system", "content": "당신은 웹 검색 결과를 바탕으로 정확하고 도움이 되는 답변을 제공하는 AI입니다."},
                     {"role": "user", "content": response_prompt}
-                ])
+                ], call_site="chat_search_response")
 
                 return llm_response
 
@@ -1323,6 +1368,35 @@ async def generate_search_based_response(
 
 
 
+class GithubToolArgs(BaseModel):
+    """GitHub 관련 정보 조회 및 분석 (포트폴리오 분석 포함)"""
+    action: Literal["get_user_info", "get_repos", "get_commits", "search_repos"]
+    username: str = Field(description="메시지나 이전 대화의 GitHub 사용자명 (알 수 없으면 빈 문자열)")
+    repo: Optional[str] = Field(default=None, description="get_commits 대상 레포지토리명")
+
+
+class MongoQueryArgs(BaseModel):
+    today_only: bool = Field(default=False, description="오늘 등록된 문서만 조회")
+    status: Optional[str] = Field(default=None, description="상태 필터 (예: published, draft)")
+
+
+class MongoToolArgs(BaseModel):
+    """채용 공고/지원자 등 데이터베이스 조회"""
+    action: Literal["find_documents", "count_documents"]
+    collection: str = Field(description="컬렉션명 (job_postings, applicants 등)")
+    query: MongoQueryArgs = Field(default_factory=MongoQueryArgs)
+
+
+class SearchToolArgs(BaseModel):
+    """웹/뉴스/이미지 검색"""
+    action: Literal["web_search", "news_search", "image_search"]
+    query: str = Field(description="검색어")
+
+
+# 툴 감지 함수 호출 정의 (함수 이름 = 툴 이름)
+TOOL_FUNCTIONS = {"github": GithubToolArgs, "mongodb": MongoToolArgs, "search": SearchToolArgs}
+
+
 async def detect_tool_usage_with_ai(
     user_message: str,
     openai_service,
@@ -1330,7 +1404,7 @@ async def detect_tool_usage_with_ai(
     recent_messages: List[Dict[str, Any]] = None,
     session_context: Dict[str, Any] = None
 ) -> Optional[Dict[str, Any]]:
-    """AI를 사용하여 사용자 메시지에서 툴 사용 의도 감지 (순수 AI 기반)"""
+    """AI 함수 호출로 사용자 메시지에서 툴 사용 의도 감지 (도구가 필요 없으면 None)"""
 
     # 컨텍스트 정보 구성
     context_info = ""
@@ -1352,129 +1426,43 @@ async def detect_tool_usage_with_ai(
         ])
         context_info += f"\n최근 대화:\n{recent_context}"
 
-    # 순수 AI 기반 툴 선택 프롬프트
+    # 도구 목록과 인자 형식은 함수 정의(TOOL_FUNCTIONS)로 전달
     tool_detection_prompt = f"""
-당신은 채용 관리 시스템의 지능형 어시스턴트입니다. 사용자의 요청을 이해하고 적절한 도구를 선택해주세요.
+당신은 채용 관리 시스템의 지능형 어시스턴트입니다. 사용자의 요청을 이해하고 필요한 경우에만 적절한 도구를 호출해주세요.
 
 시스템 컨텍스트:
 - 이 시스템은 채용 공고 관리, 지원자 관리, 포트폴리오 분석 등을 지원합니다
 - 포트폴리오 분석은 현재 GitHub 기반으로 이루어집니다
 - 사용자는 자연어로 다양한 요청을 할 수 있습니다
-
-사용 가능한 도구들:
-1. github: GitHub 관련 정보 조회 및 분석
-   - get_user_info: 사용자 프로필 정보
-   - get_repos: 레포지토리 목록
-   - get_commits: 커밋 내역
-   - search_repos: 레포지토리 검색
-
-2. mongodb: 데이터베이스 조회
-   - find_documents: 문서 조회
-   - count_documents: 문서 개수 확인
-
-3. search: 웹 검색
-   - web_search: 일반 웹 검색
-   - news_search: 뉴스 검색
-   - image_search: 이미지 검색
-
 {context_info}
 
 사용자 요청: "{user_message}"
 
-사용자의 의도를 파악하여 다음 중 하나로 응답해주세요:
-
-1. 도구가 필요한 경우:
-   - 사용자의 의도를 분석하여 가장 적절한 도구와 액션을 선택
-   - 컨텍스트에서 필요한 정보(사용자명, 컬렉션명 등)를 추출
-   - 정보가 부족하면 합리적인 추론을 통해 보완
-
-2. 도구가 필요하지 않은 경우:
-   - 일반적인 대화나 질문인 경우 null 반환
-
-JSON 형식으로만 응답:
-- 도구 불필요: null
-- 도구 필요: {{"tool": "도구명", "action": "액션명", "params": {{"매개변수": "값"}}}}
+- 도구가 필요하면 가장 적절한 도구와 액션을 선택하고, 컨텍스트에서 필요한 정보(사용자명, 컬렉션명 등)를 추출해 인자로 넣어주세요
+- 일반적인 대화나 질문이면 도구를 호출하지 마세요
 """
 
-    try:
-        # AI에게 툴 선택 요청
-        response = await openai_service.chat_completion([
-            {"role": "system", "content": "당신은 사용자 메시지를 분석하여 적절한 툴을 선택하는 AI입니다. JSON 형식으로만 응답해주세요."},
-            {"role": "user", "content": tool_detection_prompt}
-        ])
-
-        print(f"🔍 [DEBUG] AI 툴 감지 응답: {response}")
-
-        # JSON 파싱 시도
-        import json
-        import re
+    called = await openai_service.function_call([
+        {"role": "system", "content": "당신은 사용자 메시지를 분석하여 적절한 툴을 선택하는 AI입니다."},
+        {"role": "user", "content": tool_detection_prompt}
+    ], TOOL_FUNCTIONS, call_site="chat_tool_detection")
 
-        # JSON 부분만 추출
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            tool_usage = json.loads(json_match.group())
-
-            # 사용자명 추출이 필요한 경우 (AI 기반)
-            if tool_usage and tool_usage.get("tool") == "github":
-                if "username" not in tool_usage.get("params", {}) or not tool_usage["params"]["username"] or tool_usage["params"]["username"] == "사용자명":
-                    username = await extract_username_with_ai(user_message, openai_service, session_context)
-                    tool_usage["params"]["username"] = username
-
-            return tool_usage
-        else:
-            print(f"🔍 [DEBUG] AI 응답에서 JSON을 찾을 수 없음: {response}")
-            # AI가 JSON을 반환하지 않았을 때 재시도
-            return await retry_tool_detection_with_simpler_prompt(user_message, openai_service, context_info)
-
-    except Exception as e:
-        print(f"🔍 [DEBUG] AI 툴 감지 오류: {str(e)}")
-        # AI 실패 시 간단한 프롬프트로 재시도
-        return await retry_tool_detection_with_simpler_prompt(user_message, openai_service, context_info)
-
-async def retry_tool_detection_with_simpler_prompt(
-    user_message: str,
-    openai_service,
-    context_info: str
-) -> Optional[Dict[str, Any]]:
-    """AI 툴 감지 실패 시 더 간단한 프롬프트로 재시도"""
-
-    simple_prompt = f"""
-사용자 요청을 분석하여 필요한 도구를 선택해주세요.
-
-도구 목록:
-- github: GitHub/포트폴리오 관련
-- mongodb: 데이터베이스 관련
-- search: 웹검색 관련
-- null: 도구 불필요
-
-{context_info}
-
-요청: "{user_message}"
-
-JSON만 응답: {{"tool": "도구명", "action": "액션명", "params": {{"key": "value"}}}} 또는 null
-"""
-
-    try:
-        response = await openai_service.chat_completion([
-            {"role": "user", "content": simple_prompt}
-        ])
-
-        import json
-        import re
+    print(f"🔍 [DEBUG] AI 툴 감지 결과: {called}")
+    if called is None:
+        return None
 
-        # JSON 추출 시도
-        json_match = re.search(r'\{.*\}|null', response, re.DOTALL)
-        if json_match:
-            result = json_match.group()
-            if result == "null":
-                return None
-            return json.loads(result)
+    tool_name, args = called
+    tool_usage = {
+        "tool": tool_name,
+        "action": args.action,
+        "params": args.dict(exclude={"action"}, exclude_none=True)
+    }
 
-        return None
+    # 사용자명을 찾지 못한 GitHub 요청만 사용자명 추출 (AI → 정규식 → 세션 컨텍스트)
+    if tool_name == "github" and not tool_usage["params"].get("username"):
+        tool_usage["params"]["username"] = await extract_username_with_ai(user_message, openai_service, session_context)
 
-    except Exception as e:
-        print(f"🔍 [DEBUG] 간단한 프롬프트로도 실패: {str(e)}")
-        return None
+    return tool_usage
 
 async def extract_username_with_ai(
     message: str,
@@ -1505,7 +1493,7 @@ GitHub 사용자명만 추출하여 응답해주세요.
     try:
         response = await openai_service.chat_completion([
             {"role": "user", "content": prompt}
-        ])
+        ], call_site="chat_username_extraction")
 
         username = response.strip()
         if username and username != "UNKNOWN":
@@ -1533,6 +1521,22 @@ GitHub 사용자명만 추출하여 응답해주세요.
 
     return "UNKNOWN"
 
+# 페이지 이동/빠른 액션으로 선택할 수 있는 페이지 경로
+PagePath = Literal["/dashboard", "/applicants", "/github-test", "/job-posting", "/interview", "/resume", "/portfolio", "/settings"]
+
+
+class PageDecision(BaseModel):
+    target: Optional[PagePath] = Field(default=None, description="이동할 페이지 경로 (페이지가 필요 없으면 null)")
+    message: str = Field(description="사용자에게 보여줄 안내 메시지")
+    auto_action: Optional[str] = Field(default=None, description="자동 실행할 액션 (없으면 null)")
+
+
+class ContextUpdate(BaseModel):
+    last_mentioned_user: Optional[str] = Field(default=None, description="언급된 GitHub 사용자명 (없으면 null)")
+    conversation_topic: str = Field(description="대화의 주요 주제")
+    extracted_entities: List[str] = Field(description="회사명, 기술명 등 개체명")
+
+
 async def determine_target_page_with_ai(
     user_message: str,
     tool_name: str,
@@ -1579,59 +1583,47 @@ async def determine_target_page_with_ai(
 2. 실행된 도구의 결과를 가장 잘 활용할 수 있는 페이지
 3. 사용자가 다음에 할 가능성이 높은 작업을 지원하는 페이지
 
-JSON 형식으로 응답:
-{{"target": "/페이지경로", "message": "사용자에게 보여줄 안내 메시지", "auto_action": "자동 실행할 액션 (선택사항)"}}
-
-페이지가 필요하지 않으면: null
+페이지가 필요하지 않으면 target을 null로 응답해주세요.
 """
 
-    try:
-        response = await openai_service.chat_completion([
-            {"role": "user", "content": prompt}
-        ])
-
-        import json
-        import re
-
-        json_match = re.search(r'\{.*\}|null', response, re.DOTALL)
-        if json_match:
-            result = json_match.group()
-            if result == "null":
-                return None
-
-            page_info = json.loads(result)
-            return {
-                "action": "navigate",
-                "target": page_info["target"],
-                "message": f"🎯 {page_info['message']}",
-                "auto_action": page_info.get("auto_action")
-            }
+    page_info = await openai_service.structured_completion([
+        {"role": "user", "content": prompt}
+    ], PageDecision, call_site="chat_page_action")
 
+    if page_info is None:
+        print(f"🔍 [DEBUG] AI 페이지 결정 실패, 도구 기반 기본 페이지 사용")
+        return _default_page_action(tool_name)
+    if page_info.target is None:
         return None
+    return {
+        "action": "navigate",
+        "target": page_info.target,
+        "message": f"🎯 {page_info.message}",
+        "auto_action": page_info.auto_action
+    }
 
-    except Exception as e:
-        print(f"🔍 [DEBUG] AI 페이지 결정 실패: {str(e)}")
-        # 폴백: 도구 기반 기본 페이지 선택
-        if tool_name == "github":
-            return {
-                "action": "navigate",
-                "target": "/github-test",
-                "message": "🎯 GitHub 관련 정보를 확인할 수 있는 페이지로 이동합니다."
-            }
-        elif tool_name == "mongodb":
-            return {
-                "action": "navigate",
-                "target": "/applicants",
-                "message": "🎯 데이터베이스 정보를 확인할 수 있는 페이지로 이동합니다."
-            }
-        elif tool_name == "search":
-            return {
-                "action": "navigate",
-                "target": "/dashboard",
-                "message": "🎯 검색 결과를 확인할 수 있는 페이지로 이동합니다."
-            }
+def _default_page_action(tool_name: str) -> Optional[Dict[str, Any]]:
+    """도구별 기본 이동 페이지 (AI 페이지 결정 실패 시 폴백)"""
+    if tool_name == "github":
+        return {
+            "action": "navigate",
+            "target": "/github-test",
+            "message": "🎯 GitHub 관련 정보를 확인할 수 있는 페이지로 이동합니다."
+        }
+    elif tool_name == "mongodb":
+        return {
+            "action": "navigate",
+            "target": "/applicants",
+            "message": "🎯 데이터베이스 정보를 확인할 수 있는 페이지로 이동합니다."
+        }
+    elif tool_name == "search":
+        return {
+            "action": "navigate",
+            "target": "/dashboard",
+            "message": "🎯 검색 결과를 확인할 수 있는 페이지로 이동합니다."
+        }
 
-        return None
+    return None
 
 async def update_conversation_context_with_ai(
     session_id: str,
@@ -1657,40 +1649,28 @@ AI 응답: "{ai_response[:200]}..."
 1. 언급된 사용자명 (GitHub 사용자명 등)
 2. 대화의 주요 주제
 3. 추출된 개체명들 (회사명, 기술명 등)
-
-JSON 형식으로 응답:
-{{
-  "last_mentioned_user": "사용자명 또는 null",
-  "conversation_topic": "주요 주제",
-  "extracted_entities": ["개체1", "개체2"]
-}}
 """
 
-    try:
-        response = await openai_service.chat_completion([
-            {"role": "user", "content": prompt}
-        ])
-
-        import json
-        import re
+    context_update = await openai_service.structured_completion([
+        {"role": "user", "content": prompt}
+    ], ContextUpdate, call_site="chat_context_update")
 
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            context_update = json.loads(json_match.group())
-
-            # 도구 사용 정보 추가
-            if tool_usage:
-                context_update["last_tool_used"] = tool_usage["tool"]
-
-            # 컨텍스트 업데이트
-            session_manager.update_context(session_id, context_update)
-            print(f"🔍 [DEBUG] AI 기반 컨텍스트 업데이트: {context_update}")
-
-    except Exception as e:
-        print(f"🔍 [DEBUG] AI 컨텍스트 업데이트 실패: {str(e)}")
+    if context_update is None:
         # 폴백: 기본 컨텍스트 업데이트
         if tool_usage:
             session_manager.update_context(session_id, {"last_tool_used": tool_usage["tool"]})
+        return
+
+    # 언급된 사용자가 없으면(null) 이전 값을 유지
+    context_update = context_update.dict(exclude_none=True)
+
+    # 도구 사용 정보 추가
+    if tool_usage:
+        context_update["last_tool_used"] = tool_usage["tool"]
+
+    # 컨텍스트 업데이트
+    session_manager.update_context(session_id, context_update)
+    print(f"🔍 [DEBUG] AI 기반 컨텍스트 업데이트: {context_update}")
 
 def create_error_aware_response(tool_results: Dict[str, Any], user_message: str) -> str:
     """
@@ -1908,42 +1888,39 @@ def format_tool_data(data: Dict[str, Any]) -> str:
     # 기타 데이터
     return "✅ 요청하신 작업이 성공적으로 완료되었습니다!"
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat_with_help_bot(
-    chat_message: ChatMessage,
-    openai_service: LLMService = Depends(get_openai_service),
-    agent_system: AgentSystem = Depends(get_agent_system)
-):
-    """
-    에이전트과 대화
+async def prepare_chat_turn(chat_message: ChatMessage, openai_service) -> Dict[str, Any]:
     """
-    print(f"🔍 [DEBUG] 에이전트 호출됨 - 세션: {chat_message.session_id}, 메시지: {chat_message.message}")
+    응답 생성 전 단계 (일반/스트리밍 채팅 공통)
 
-    try:
-        # 세션 정리 (만료된 세션 삭제)
-        session_manager.cleanup_sessions()
-        print(f"🔍 [DEBUG] 세션 정리 완료")
+    세션 준비, 툴 감지 및 실행, 응답 생성 메시지 구성을 수행하고
+    툴 결과로 이동할 페이지 결정은 응답 생성과 동시에 진행되도록 태스크로 시작합니다.
+    """
+    # 세션 정리 (만료된 세션 삭제)
+    session_manager.cleanup_sessions()
+    print(f"🔍 [DEBUG] 세션 정리 완료")
 
-        # 세션 관리
-        session_id = get_or_create_session(chat_message.session_id)
-        print(f"🔍 [DEBUG] 세션 ID: {session_id}")
+    # 세션 관리
+    session_id = get_or_create_session(chat_message.session_id)
+    print(f"🔍 [DEBUG] 세션 ID: {session_id}")
 
-        # 사용자 메시지 저장
-        update_session(session_id, chat_message.message, is_user=True)
-        print(f"🔍 [DEBUG] 사용자 메시지 저장 완료")
+    # 사용자 메시지 저장
+    update_session(session_id, chat_message.message, is_user=True)
+    print(f"🔍 [DEBUG] 사용자 메시지 저장 완료")
 
-        # 대화 컨텍스트 가져오기 (개선된 버전)
-        conversation_context = get_conversation_context(session_id)
-        print(f"🔍 [DEBUG] 대화 컨텍스트 정보: {conversation_context.get('context_summary', [])}")
+    # 대화 컨텍스트 가져오기 (개선된 버전)
+    conversation_context = get_conversation_context(session_id)
+    print(f"🔍 [DEBUG] 대화 컨텍스트 정보: {conversation_context.get('context_summary', [])}")
 
-        # 컨텍스트 기반 툴 감지 개선
-        context_keywords = conversation_context.get('context_summary', [])
-        recent_messages = conversation_context.get('recent_messages', [])
+    # 컨텍스트 기반 툴 감지 개선
+    context_keywords = conversation_context.get('context_summary', [])
+    recent_messages = conversation_context.get('recent_messages', [])
 
-        # 세션 컨텍스트 가져오기
-        session_context = session_manager.get_context(session_id)
+    # 세션 컨텍스트 가져오기
+    session_context = session_manager.get_context(session_id)
 
-        # AI 기반 툴 사용 의도 감지 (순수 AI 기반)
+    # AI 기반 툴 사용 의도 감지 (툴 관련 메시지로 판별된 경우에만 LLM 호출)
+    tool_usage = None
+    if needs_tool_detection(chat_message.message, session_context):
         tool_usage = await detect_tool_usage_with_ai(
             chat_message.message,
             openai_service,
@@ -1952,83 +1929,85 @@ async def chat_with_help_bot(
             session_context=session_context
         )
         print(f"🔍 [DEBUG] AI 기반 툴 사용 감지 결과: {tool_usage}")
+    else:
+        print(f"🔍 [DEBUG] 툴 관련 키워드 없음 - AI 툴 감지 생략")
 
-        # 툴 실행 결과 초기화
-        tool_results = None
-        error_info = None
+    # 툴 실행 결과 초기화
+    tool_results = None
+    error_info = None
 
-        if tool_usage:
-            print(f"🔍 [DEBUG] 툴 사용 감지됨: {tool_usage}")
-            try:
-                logger.info(f"툴 사용 감지: {tool_usage}")
-            except (ValueError, OSError):
-                pass  # detached buffer 오류 무시
-            try:
-                print(f"🔍 [DEBUG] 툴 실행 시작 - 툴: {tool_usage['tool']}, 액션: {tool_usage['action']}, 파라미터: {tool_usage['params']}")
-
-                # 비동기 툴 실행 (성능 최적화)
-                result = await tool_executor.execute_async(
-                    tool_usage["tool"],
-                    tool_usage["action"],
-                    session_id=session_id,  # 세션 ID 추가
-                    **tool_usage["params"]
-                )
+    if tool_usage:
+        print(f"🔍 [DEBUG] 툴 사용 감지됨: {tool_usage}")
+        try:
+            logger.info(f"툴 사용 감지: {tool_usage}")
+        except (ValueError, OSError):
+            pass  # detached buffer 오류 무시
+        try:
+            print(f"🔍 [DEBUG] 툴 실행 시작 - 툴: {tool_usage['tool']}, 액션: {tool_usage['action']}, 파라미터: {tool_usage['params']}")
+
+            # 비동기 툴 실행 (성능 최적화)
+            result = await tool_executor.execute_async(
+                tool_usage["tool"],
+                tool_usage["action"],
+                session_id=session_id,  # 세션 ID 추가
+                **tool_usage["params"]
+            )
 
-                print(f"🔍 [DEBUG] 툴 실행 결과: {result}")
+            print(f"🔍 [DEBUG] 툴 실행 결과: {result}")
+
+            tool_results = {
+                "tool": tool_usage["tool"],
+                "action": tool_usage["action"],
+                "result": result
+            }
 
-                tool_results = {
+            # 에러 정보 추출
+            if result.get("status") == "error":
+                print(f"🔍 [DEBUG] 툴 실행 에러: {result.get('message')}")
+                error_info = {
                     "tool": tool_usage["tool"],
                     "action": tool_usage["action"],
-                    "result": result
+                    "error_message": result.get("message"),
+                    "retryable": result.get("retryable", False),
+                    "fallback_suggestion": result.get("fallback_suggestion")
                 }
+            else:
+                print(f"🔍 [DEBUG] 툴 실행 성공: {result.get('status')}")
 
-                # 에러 정보 추출
-                if result.get("status") == "error":
-                    print(f"🔍 [DEBUG] 툴 실행 에러: {result.get('message')}")
-                    error_info = {
-                        "tool": tool_usage["tool"],
-                        "action": tool_usage["action"],
-                        "error_message": result.get("message"),
-                        "retryable": result.get("retryable", False),
-                        "fallback_suggestion": result.get("fallback_suggestion")
-                    }
-                else:
-                    print(f"🔍 [DEBUG] 툴 실행 성공: {result.get('status')}")
-
-                    # 성공적인 툴 실행 후 컨텍스트 업데이트
-                    context_update = {
-                        "last_tool_used": tool_usage["tool"]
-                    }
+                # 성공적인 툴 실행 후 컨텍스트 업데이트
+                context_update = {
+                    "last_tool_used": tool_usage["tool"]
+                }
 
-                    # GitHub 툴 사용 시 사용자명 컨텍스트 업데이트
-                    if tool_usage["tool"] == "github" and "username" in tool_usage["params"]:
-                        username = tool_usage["params"]["username"]
-                        if username != "UNKNOWN":
-                            context_update["last_mentioned_user"] = username
+                # GitHub 툴 사용 시 사용자명 컨텍스트 업데이트
+                if tool_usage["tool"] == "github" and "username" in tool_usage["params"]:
+                    username = tool_usage["params"]["username"]
+                    if username != "UNKNOWN":
+                        context_update["last_mentioned_user"] = username
 
-                    session_manager.update_context(session_id, context_update)
+                session_manager.update_context(session_id, context_update)
 
-                try:
-                    logger.info(f"툴 실행 완료: {result['status']}")
-                except (ValueError, OSError):
-                    pass  # detached buffer 오류 무시
-            except Exception as e:
-                print(f"🔍 [DEBUG] 툴 실행 예외 발생: {str(e)}")
-                logger.error(f"툴 실행 실패: {str(e)}")
-                tool_results = {
-                    "tool": tool_usage["tool"],
-                    "action": tool_usage["action"],
-                    "error": str(e)
-                }
-                error_info = {
-                    "tool": tool_usage["tool"],
-                    "action": tool_usage["action"],
-                    "error_message": str(e),
-                    "retryable": True
-                }
+            try:
+                logger.info(f"툴 실행 완료: {result['status']}")
+            except (ValueError, OSError):
+                pass  # detached buffer 오류 무시
+        except Exception as e:
+            print(f"🔍 [DEBUG] 툴 실행 예외 발생: {str(e)}")
+            logger.error(f"툴 실행 실패: {str(e)}")
+            tool_results = {
+                "tool": tool_usage["tool"],
+                "action": tool_usage["action"],
+                "error": str(e)
+            }
+            error_info = {
+                "tool": tool_usage["tool"],
+                "action": tool_usage["action"],
+                "error_message": str(e),
+                "retryable": True
+            }
 
-        # 시스템 프롬프트 정의
-        system_prompt = """당신은 AI 채용 관리 시스템의 에이전트입니다.
+    # 시스템 프롬프트 정의
+    system_prompt = """당신은 AI 채용 관리 시스템의 에이전트입니다.
 
 주요 기능:
 1. 채용공고 등록 및 관리
@@ -2059,102 +2038,150 @@ async def chat_with_help_bot(
 - "주요 기술 스택으로는..." 같은 문장 추가 금지
 - 프로젝트 이름 뒤에 언어 정보 추가 금지"""
 
-        # AI 응답 생성
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"대화 기록:\n{conversation_context}\n\n현재 질문: {chat_message.message}"}
-        ]
+    # AI 응답 생성
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"대화 기록:\n{conversation_context}\n\n현재 질문: {chat_message.message}"}
+    ]
 
-        # 툴 결과가 있으면 프롬프트에 추가
-        if tool_results:
-            if tool_results.get("result", {}).get("status") == "success":
-                # 툴 결과를 자연어로 변환
-                natural_language_result = format_tool_data(tool_results["result"]["data"])
-                messages.append({
-                    "role": "assistant",
-                    "content": f"툴 실행 결과: {natural_language_result}"
-                })
-            else:
-                # 에러가 발생한 경우 에러 정보 추가
-                error_message = create_error_aware_response(tool_results, chat_message.message)
-                messages.append({
-                    "role": "assistant",
-                    "content": f"툴 실행 중 오류 발생: {error_message}"
-                })
-
-        print(f"🔍 [DEBUG] AI 응답 생성 시작 - 메시지 수: {len(messages)}")
-        response = await openai_service.chat_completion(messages)
-        print(f"🔍 [DEBUG] AI 응답 생성 완료: {response[:100]}...")
+    # 툴 결과가 있으면 프롬프트에 추가
+    if tool_results:
+        if tool_results.get("result", {}).get("status") == "success":
+            # 툴 결과를 자연어로 변환
+            natural_language_result = format_tool_data(tool_results["result"]["data"])
+            messages.append({
+                "role": "assistant",
+                "content": f"툴 실행 결과: {natural_language_result}"
+            })
+        else:
+            # 에러가 발생한 경우 에러 정보 추가
+            error_message = create_error_aware_response(tool_results, chat_message.message)
+            messages.append({
+                "role": "assistant",
+                "content": f"툴 실행 중 오류 발생: {error_message}"
+            })
+
+    # 툴 사용 시 관련 페이지로 이동하는 액션 추가
+    # 페이지 결정은 툴 결과에만 의존하므로 AI 응답 생성과 동시에 실행
+    page_action = None
+    page_action_task = None
+
+    # AI 채용공고 등록 액션 처리
+    if tool_results and tool_results.get("mode") == "action" and tool_results.get("action") == "openAIJobRegistration":
+        # 사용자 메시지에서 채용공고 정보 추출
+        auto_fill_data = extract_job_posting_info(chat_message.message)
+        page_action = {
+            "action": "openAIJobRegistration",
+            "message": "📝 채용공고 등록 페이지로 이동합니다.\n\n추출된 정보를 기반으로 폼이 자동으로 채워지며, 추가 정보 입력 후 최종 등록하실 수 있습니다.",
+            "auto_fill_data": auto_fill_data,
+            "target_url": "/job-posting"
+        }
+    elif tool_results and tool_results.get("tool"):
+        # AI 기반 동적 페이지 결정
+        page_action_task = asyncio.create_task(determine_target_page_with_ai(
+            user_message=chat_message.message,
+            tool_name=tool_results["tool"],
+            action_type=tool_results.get("action", ""),
+            tool_results=tool_results.get("result", tool_results),
+            openai_service=openai_service,
+            session_context=session_context
+        ))
 
-        # 툴 사용 시 관련 페이지로 이동하는 액션 추가
-        page_action = None
-
-        # AI 채용공고 등록 액션 처리
-        if tool_results and tool_results.get("mode") == "action" and tool_results.get("action") == "openAIJobRegistration":
-            # 사용자 메시지에서 채용공고 정보 추출
-            auto_fill_data = extract_job_posting_info(chat_message.message)
-            page_action = {
-                "action": "openAIJobRegistration",
-                "message": "📝 채용공고 등록 페이지로 이동합니다.\n\n추출된 정보를 기반으로 폼이 자동으로 채워지며, 추가 정보 입력 후 최종 등록하실 수 있습니다.",
-                "auto_fill_data": auto_fill_data,
-                "target_url": "/job-posting"
-            }
-        elif tool_results and tool_results.get("tool"):
-            tool_name = tool_results["tool"]
-            action_type = tool_results.get("action", "")
-
-            # AI 기반 동적 페이지 결정
-            page_action = await determine_target_page_with_ai(
-                user_message=chat_message.message,
-                tool_name=tool_name,
-                action_type=action_type,
-                tool_results=result,
-                openai_service=openai_service,
-                session_context=session_context
-            )
+    return {
+        "session_id": session_id,
+        "session_context": session_context,
+        "tool_usage": tool_usage,
+        "tool_results": tool_results,
+        "error_info": error_info,
+        "messages": messages,
+        "page_action": page_action,
+        "page_action_task": page_action_task
+    }
 
-        # AI 응답 저장
-        update_session(session_id, response, is_user=False)
-        print(f"🔍 [DEBUG] AI 응답 저장 완료")
+async def complete_chat_turn(turn: Dict[str, Any], chat_message: ChatMessage, response: str, openai_service):
+    """
+    응답 생성 후 단계 (일반/스트리밍 채팅 공통)
 
-        # AI 기반 추천 질문 생성
-        suggestions = await generate_suggestions_with_ai(
-            chat_message.message,
-            response,
-            openai_service,
-            session_context
-        )
-        print(f"🔍 [DEBUG] AI 추천 질문 생성: {suggestions}")
+    응답을 저장하고 추천 질문 / 빠른 액션 / 페이지 액션을 완료되는 순서대로 (이벤트 타입, 값)으로 반환합니다.
+    대화 컨텍스트 업데이트는 다음 턴에만 사용되므로 백그라운드에서 실행합니다.
+    """
+    session_id = turn["session_id"]
+    session_context = turn["session_context"]
+
+    # AI 응답 저장
+    update_session(session_id, response, is_user=False)
+    print(f"🔍 [DEBUG] AI 응답 저장 완료")
+
+    # AI 기반 추천 질문 / 빠른 액션 생성 (응답에만 의존하므로 동시 실행)
+    pending = {
+        asyncio.create_task(generate_suggestions_with_ai(
+            chat_message.message, response, openai_service, session_context
+        )): "suggestions",
+        asyncio.create_task(generate_quick_actions_with_ai(
+            chat_message.message, response, openai_service, session_context
+        )): "quick_actions"
+    }
+    if turn["page_action_task"]:
+        pending[turn["page_action_task"]] = "page_action"
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                event = pending.pop(task)
+                print(f"🔍 [DEBUG] AI {event} 생성: {task.result()}")
+                yield event, task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+    # AI 기반 컨텍스트 업데이트 (응답을 기다리게 하지 않음)
+    run_in_background(update_conversation_context_with_ai(
+        session_id=session_id,
+        user_message=chat_message.message,
+        ai_response=response,
+        tool_usage=turn["tool_usage"],
+        openai_service=openai_service,
+        session_manager=session_manager
+    ))
 
-        # AI 기반 빠른 액션 생성
-        quick_actions = await generate_quick_actions_with_ai(
-            chat_message.message,
-            response,
-            openai_service,
-            session_context
-        )
-        print(f"🔍 [DEBUG] AI 빠른 액션 생성: {quick_actions}")
+@router.post("/chat", response_model=ChatResponse)
+async def chat_with_help_bot(
+    chat_message: ChatMessage,
+    openai_service: LLMService = Depends(get_openai_service),
+    agent_system: AgentSystem = Depends(get_agent_system)
+):
+    """
+    에이전트과 대화
+    """
+    print(f"🔍 [DEBUG] 에이전트 호출됨 - 세션: {chat_message.session_id}, 메시지: {chat_message.message}")
 
-        # AI 기반 컨텍스트 업데이트
-        await update_conversation_context_with_ai(
-            session_id=session_id,
-            user_message=chat_message.message,
-            ai_response=response,
-            tool_usage=tool_usage,
-            openai_service=openai_service,
-            session_manager=session_manager
-        )
+    try:
+        turn = await prepare_chat_turn(chat_message, openai_service)
+        session_id = turn["session_id"]
+
+        print(f"🔍 [DEBUG] AI 응답 생성 시작 - 메시지 수: {len(turn['messages'])}")
+        try:
+            response = await openai_service.chat_completion(turn["messages"], call_site="chat_reply")
+        except BaseException:
+            if turn["page_action_task"]:
+                turn["page_action_task"].cancel()
+            raise
+        print(f"🔍 [DEBUG] AI 응답 생성 완료: {response[:100]}...")
+
+        followups = {"suggestions": [], "quick_actions": [], "page_action": turn["page_action"]}
+        async for event, value in complete_chat_turn(turn, chat_message, response, openai_service):
+            followups[event] = value
 
         final_response = ChatResponse(
             response=response,
             session_id=session_id,
             timestamp=datetime.now(),
-            suggestions=suggestions,
-            quick_actions=quick_actions,
+            suggestions=followups["suggestions"],
+            quick_actions=followups["quick_actions"],
             confidence=0.95,
-            tool_results=tool_results,
-            error_info=error_info,
-            page_action=page_action
+            tool_results=turn["tool_results"],
+            error_info=turn["error_info"],
+            page_action=followups["page_action"]
         )
 
         print(f"🔍 [DEBUG] 최종 응답 생성 완료 - 세션: {session_id}")
@@ -2165,6 +2192,53 @@ async def chat_with_help_bot(
         logger.error(f"에이전트 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"챗봇 처리 중 오류가 발생했습니다: {str(e)}")
 
+@router.post("/chat/stream")
+async def chat_with_help_bot_stream(
+    chat_message: ChatMessage,
+    request: Request,
+    openai_service: LLMService = Depends(get_openai_service)
+):
+    """
+    에이전트과 대화 (SSE 스트리밍)
+
+    이벤트 순서: session → tool_result(툴 사용 시) → token(응답 조각) ... → response(전체 응답)
+    → suggestions / quick_actions / page_action(완료 순) → done
+    클라이언트 연결이 끊기면 진행 중인 LLM 호출도 중단됩니다.
+    """
+    print(f"🔍 [DEBUG] 에이전트 스트리밍 호출됨 - 세션: {chat_message.session_id}, 메시지: {chat_message.message}")
+
+    async def events():
+        turn = await prepare_chat_turn(chat_message, openai_service)
+        yield "session", {"session_id": turn["session_id"]}
+        if turn["tool_results"]:
+            yield "tool_result", {"tool_results": turn["tool_results"], "error_info": turn["error_info"]}
+
+        response = ""
+        try:
+            async for event, data in stream_tokens_of(
+                openai_service.chat_completion(turn["messages"], stream_tokens=True, call_site="chat_reply"), "response"
+            ):
+                if event == "response":
+                    response = data
+                    yield "response", {"response": response, "timestamp": datetime.now()}
+                else:
+                    yield event, data
+        except BaseException:
+            if turn["page_action_task"]:
+                turn["page_action_task"].cancel()
+            raise
+
+        if turn["page_action"]:
+            yield "page_action", turn["page_action"]
+        async for event, value in complete_chat_turn(turn, chat_message, response, openai_service):
+            yield event, value
+
+    return sse_response(events(), request)
+
+class SuggestedQuestions(BaseModel):
+    questions: List[str] = Field(description="다음에 물어볼 만한 질문 3개")
+
+
 async def generate_suggestions_with_ai(
     user_message: str,
     ai_response: str,
@@ -2200,26 +2274,14 @@ AI 응답: "{ai_response[:200]}..."
 1. 현재 대화 맥락과 자연스럽게 이어지는 질문
 2. 사용자가 실제로 궁금해할 만한 실용적인 질문
 3. 시스템의 다양한 기능을 탐색할 수 있는 질문
-
-JSON 배열로 응답: ["질문1", "질문2", "질문3"]
 """
 
-    try:
-        response = await openai_service.chat_completion([
-            {"role": "user", "content": prompt}
-        ])
-
-        import json
-        import re
-
-        # JSON 배열 추출
-        json_match = re.search(r'\[.*\]', response, re.DOTALL)
-        if json_match:
-            suggestions = json.loads(json_match.group())
-            return suggestions[:3]  # 최대 3개
+    suggestions = await openai_service.structured_completion([
+        {"role": "user", "content": prompt}
+    ], SuggestedQuestions, temperature=0.7, call_site="chat_suggestions")
 
-    except Exception as e:
-        print(f"🔍 [DEBUG] AI 추천 질문 생성 실패: {str(e)}")
+    if suggestions is not None and suggestions.questions:
+        return suggestions.questions[:3]  # 최대 3개
 
     # 폴백: 기본 추천 질문
     return [
@@ -2278,6 +2340,15 @@ def format_response_text(text: str) -> str:
 
     return text
 
+class QuickActionChoice(BaseModel):
+    target: PagePath = Field(description="이동할 페이지 경로")
+    title: str = Field(description="액션명")
+
+
+class QuickActionList(BaseModel):
+    actions: List[QuickActionChoice] = Field(description="다음에 할 가능성이 높은 액션 (최대 2개, 없으면 빈 배열)")
+
+
 async def generate_quick_actions_with_ai(
     user_message: str,
     ai_response: str,
@@ -2318,46 +2389,24 @@ AI 응답: "{ai_response[:200]}..."
 2. 사용자가 실제로 필요로 할 가능성이 높은 기능
 3. 현재 응답과 관련된 추가 작업
 
-JSON 배열로 응답:
-[
-  {{"target": "/페이지경로", "title": "액션명"}},
-  {{"target": "/페이지경로", "title": "액션명"}}
-]
-
-액션이 필요하지 않으면: []
+액션이 필요하지 않으면 빈 배열로 응답해주세요.
 """
 
-    try:
-        response = await openai_service.chat_completion([
-            {"role": "user", "content": prompt}
-        ])
-
-        import json
-        import re
+    quick_actions = await openai_service.structured_completion([
+        {"role": "user", "content": prompt}
+    ], QuickActionList, temperature=0.7, call_site="chat_quick_actions")
 
-        # JSON 배열 추출
-        json_match = re.search(r'\[.*\]', response, re.DOTALL)
-        if json_match:
-            actions_data = json.loads(json_match.group())
-
-            # 액션 정보 구성
-            actions = []
-            for action_data in actions_data[:2]:  # 최대 2개
-                target = action_data["target"]
-                title = action_data["title"]
-                icon = available_pages.get(target, {}).get("icon", "🔗")
-
-                actions.append({
-                    "title": title,
-                    "action": "navigate",
-                    "target": target,
-                    "icon": icon
-                })
-
-            return actions
-
-    except Exception as e:
-        print(f"🔍 [DEBUG] AI 빠른 액션 생성 실패: {str(e)}")
+    if quick_actions is not None:
+        # 액션 정보 구성
+        return [
+            {
+                "title": action.title,
+                "action": "navigate",
+                "target": action.target,
+                "icon": available_pages.get(action.target, {}).get("icon", "🔗")
+            }
+            for action in quick_actions.actions[:2]  # 최대 2개
+        ]
 
     # 폴백: 현재 대화와 관련된 기본 액션
     if "포트폴리오" in user_message or "github" in user_message.lower():
@@ -2514,6 +2563,9 @@ class TitleRecommendation(BaseModel):
     title: str
     description: str
 
+class GeneratedTitles(BaseModel):
+    titles: List[TitleRecommendation]
+
 class TitleRecommendationResponse(BaseModel):
     titles: List[TitleRecommendation]
     message: str
@@ -2558,53 +2610,21 @@ async def generate_title_recommendations(
 4. 창의형: 독특하고 눈에 띄는 제목
 
 각 제목은 20자 이내로 작성하고, 한국어로 자연스럽게 작성해주세요.
-JSON 형태로 응답해주세요:
-
-{{
-    "titles": [
-        {{"concept": "신입친화형", "title": "제목1", "description": "설명1"}},
-        {{"concept": "전문가형", "title": "제목2", "description": "설명2"}},
-        {{"concept": "일반형", "title": "제목3", "description": "설명3"}},
-        {{"concept": "창의형", "title": "제목4", "description": "설명4"}}
-    ]
-}}
+concept에는 컨셉 이름(신입친화형/전문가형/일반형/창의형), description에는 제목 설명을 넣어주세요.
 """
 
-        # LLM 서비스를 통한 제목 생성
-        response = await openai_service.chat_completion([{"role": "user", "content": prompt}])
+        # LLM 서비스를 통한 제목 생성 (스키마에 맞는 JSON으로 바로 받음)
+        # 같은 채용공고 내용이면 이전 추천을 재사용
+        generated = await openai_service.structured_completion([{"role": "user", "content": prompt}],
+                                                               GeneratedTitles, temperature=0.7, cache=True,
+                                                               call_site="job_title_recommendation")
 
-        try:
-            # JSON 응답 파싱
-            import json
-            import re
-
-            # JSON 부분 추출
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                result = json.loads(json_str)
-
-                if 'titles' in result and isinstance(result['titles'], list):
-                    titles = []
-                    for title_data in result['titles']:
-                        if isinstance(title_data, dict) and 'concept' in title_data and 'title' in title_data:
-                            titles.append(TitleRecommendation(
-                                concept=title_data['concept'],
-                                title=title_data['title'],
-                                description=title_data.get('description', '')
-                            ))
-
-                    if titles:
-                        return TitleRecommendationResponse(
-                            titles=titles,
-                            message="AI가 생성한 제목 추천입니다."
-                        )
-
-            # JSON 파싱 실패 시 기본 제목 생성
-            print(f"[API] JSON 파싱 실패, 기본 제목 생성")
-
-        except Exception as parse_error:
-            print(f"[API] JSON 파싱 오류: {parse_error}")
+        if generated is not None and generated.titles:
+            return TitleRecommendationResponse(
+                titles=generated.titles,
+                message="AI가 생성한 제목 추천입니다."
+            )
+        print(f"[API] 제목 생성 실패, 기본 제목 생성")
 
         # 기본 제목 생성 (LLM 응답이 실패하거나 파싱이 실패한 경우)
         default_titles = [
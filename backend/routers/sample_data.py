@@ -10,6 +10,9 @@ from faker import Faker
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from modules.core.services.search_cache import bump_generation
+from modules.core.services.search_filters import with_experience_years
+
 router = APIRouter(prefix="/api/sample", tags=["샘플 데이터"])
 
 # Faker 초기화 (한국어)
@@ -100,12 +103,13 @@ async def generate_sample_applicants(
                 "created_at": datetime.now(),
                 "updated_at": datetime.now()
             }
-            applicants.append(applicant)
+            applicants.append(with_experience_years(applicant))
 
         # DB에 삽입
         if applicants:
             result = await db.applicants.insert_many(applicants)
             generated_count = len(result.inserted_ids)
+            bump_generation()
 
             # 채용공고별 지원자 수 업데이트
             job_posting_counts = {}
@@ -282,7 +286,8 @@ async def upload_excel_file(
                         continue
 
                     # DB에 삽입
-                    await db.applicants.insert_one(applicant_data)
+                    await db.applicants.insert_one(with_experience_years(applicant_data))
+                    bump_generation()
                     uploaded_count += 1
 
                 except Exception as e:
@@ -344,6 +349,7 @@ async def reset_all_data(db: AsyncIOMotorClient = Depends(get_database)):
         for collection_name in collections_to_reset:
             result = await db[collection_name].delete_many({})
             deleted_counts[collection_name] = result.deleted_count
+        bump_generation()
 
         return {
             "success": True,
@@ -527,6 +533,7 @@ async def generate_sample_cover_letters(
                     {"_id": ObjectId(cover_letter["applicant_id"])},
                     {"$set": {"cover_letter_id": str(result.inserted_ids[i])}}
                 )
+            bump_generation()
 
         return {"message": f"{len(cover_letters)}개의 자소서 데이터가 성공적으로 생성되었습니다.", "count": len(cover_letters)}
 
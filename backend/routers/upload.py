@@ -1,19 +1,20 @@
 import asyncio
 import os
 import sys
-import tempfile
 from datetime import datetime
 from typing import Dict, List, Optional
 
 import aiofiles
 from dotenv import load_dotenv
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import JSONResponse
 
 sys.path.append('..')  # 상위 디렉토리의 openai_service.py 사용
 import re
 
 from modules.core.services.openai_service import OpenAIService
+from modules.core.services.sse import sse_response, stream_tokens_of
+from utils.upload_stream import UploadLimitError, stream_upload_to_disk
 from pydantic import BaseModel
 
 # .env 파일 로드 (현재 디렉토리에서)
@@ -328,8 +329,8 @@ async def generate_summary_with_openai(content: str, summary_type: str = "genera
 
         prompt = prompts.get(summary_type, prompts["general"])
 
-        # OpenAI API 호출
-        summary = await openai_service.generate_response(prompt)
+        # OpenAI API 호출 (스트리밍 요청이면 요약 토큰을 바로 전달)
+        summary = await openai_service.generate_response(prompt, stream_tokens=True, call_site="document_summary")
 
         # 키워드 추출을 위한 추가 요청
         keyword_prompt = f"""
@@ -340,7 +341,7 @@ async def generate_summary_with_openai(content: str, summary_type: str = "genera
         키워드는 쉼표로 구분하여 나열해주세요.
         """
 
-        keyword_response = await openai_service.generate_response(keyword_prompt)
+        keyword_response = await openai_service.generate_response(keyword_prompt, call_site="document_keywords")
 
         keywords = [kw.strip() for kw in keyword_response.split(',')]
 
@@ -370,22 +371,17 @@ async def upload_and_summarize_file(
                 detail="지원하지 않는 파일 형식입니다. PDF, DOC, DOCX, TXT 파일만 업로드 가능합니다."
             )
 
-        # 파일 크기 확인
-        file_size = 0
-        content = await file.read()
-        file_size = len(content)
-
-        if file_size > MAX_FILE_SIZE:
+        # 임시 파일로 스트리밍 저장 (크기 제한 초과 시 복사 도중 즉시 거부)
+        file_ext = os.path.splitext(file.filename.lower())[1]
+        try:
+            upload = await stream_upload_to_disk(file, max_bytes=MAX_FILE_SIZE, suffix=file_ext)
+        except UploadLimitError:
             raise HTTPException(
                 status_code=400,
                 detail="파일 크기가 너무 큽니다. 최대 50MB까지 업로드 가능합니다."
             )
-
-        # 임시 파일로 저장
-        file_ext = os.path.splitext(file.filename.lower())[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        file_size = upload.size
+        temp_file_path = str(upload.path)
 
         try:
             # 파일에서 텍스트 추출
@@ -439,6 +435,17 @@ async def summarize_text(request: SummaryRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"요약 생성 실패: {str(e)}")
 
+@router.post("/summarize/stream")
+async def summarize_text_stream(request: SummaryRequest, http_request: Request):
+    """텍스트 직접 요약 (SSE 스트리밍: 요약 token 이벤트 → summary 이벤트(키워드 포함) → done)"""
+    if not request.content or len(request.content.strip()) == 0:
+        raise HTTPException(status_code=400, detail="요약할 텍스트가 없습니다.")
+
+    return sse_response(
+        stream_tokens_of(generate_summary_with_openai(request.content, request.summary_type), "summary"),
+        http_request
+    )
+
 @router.get("/health")
 async def upload_health_check():
     """업로드 서비스 헬스 체크"""
@@ -1,19 +1,29 @@
 import os
-import json
 import logging
 from typing import List, Dict, Any
-import openai
-from openai import AsyncOpenAI
+from pydantic import BaseModel, Field
+from modules.core.services.llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
+
+class CultureRecommendation(BaseModel):
+    name: str = Field(description="인재상 이름")
+    description: str = Field(description="인재상에 대한 상세한 설명")
+
+
+class CultureRecommendationList(BaseModel):
+    cultures: List[CultureRecommendation] = Field(description="추천 인재상 5-7개")
+
+
 class LLMService:
     """LLM 서비스 클래스"""
 
     def __init__(self):
         # 기본 API 키 (기존 방식)
         self.default_api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
-        self.default_client = AsyncOpenAI(api_key=self.default_api_key)
+        # 공유 LLM 게이트웨이 (연결 풀, rate limit, 재시도)
+        self.gateway = get_llm_gateway()
         self.model = "gpt-4o"
         print(f"🔍 [LLMService] 초기화 - 기본 API 키 길이: {len(self.default_api_key) if self.default_api_key else 0}")
         print(f"🔍 [LLMService] 모델: {self.model}")
@@ -39,26 +49,20 @@ class LLMService:
             load_dotenv()
             # fallback 제거하고 직접 환경변수만 사용
             culture_api_key = os.getenv("OPENAI_API_KEY")
-            if not culture_api_key:
+            if not culture_api_key and self.gateway.api_key_required:
                 raise Exception("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
 
-            culture_client = AsyncOpenAI(api_key=culture_api_key)
-
             print(f"🔍 [LLMService] 인재상 추천용 API 키 길이: {len(culture_api_key) if culture_api_key else 0}")
-            print(f"🔍 [LLMService] 인재상 추천용 API 키 미리보기: {culture_api_key[:20] if culture_api_key else 'None'}...")
-            print(f"🔍 [LLMService] DEBUG OPENAI KEY: {culture_api_key}")
-            print(f"🔍 [LLMService] 키 타입 확인: {'sk-proj-' if culture_api_key and culture_api_key.startswith('sk-proj-') else 'sk-' if culture_api_key and culture_api_key.startswith('sk-') else 'unknown'}")
 
             # 프롬프트 구성
             print(f"🔍 [LLMService] 프롬프트 구성 시작")
             prompt = self._build_prompt(keywords, job, department, trends)
             print(f"🔍 [LLMService] 프롬프트 구성 완료 (길이: {len(prompt)})")
 
-            # LLM 호출
+            # LLM 호출 (JSON Schema 구조화 출력 → 검증된 모델로 바로 받음)
             print(f"🔍 [LLMService] OpenAI API 호출 시작")
-            response = await culture_client.chat.completions.create(
-                model=self.model,
-                messages=[
+            result = await self.gateway.chat_structured(
+                [
                     {
                         "role": "system",
                         "content": "당신은 회사 인재상 전문가입니다. 사용자의 키워드와 직무 정보를 바탕으로 맞춤형 인재상을 추천해주세요."
@@ -68,19 +72,20 @@ class LLMService:
                         "content": prompt
                     }
                 ],
+                CultureRecommendationList,
+                model=self.model,
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=1000,
+                cache=True,  # 같은 키워드/직무/부서/트렌드 조합이면 추천 재사용
+                call_site="culture_recommendation"
             )
             print(f"🔍 [LLMService] OpenAI API 호출 완료")
 
-            # 응답 파싱
-            content = response.choices[0].message.content
-            print(f"🔍 [LLMService] 응답 내용 길이: {len(content)}")
-            print(f"🔍 [LLMService] 응답 미리보기: {content[:100]}...")
-
-            result = self._parse_response(content)
-            print(f"🔍 [LLMService] 파싱된 결과: {len(result)}개")
-            return result
+            cultures = [culture.dict() for culture in result.cultures]
+            print(f"🔍 [LLMService] 추천 결과: {len(cultures)}개")
+            if not cultures:
+                return self._fallback_recommendations(keywords, job, department)
+            return cultures
 
         except Exception as e:
             print(f"❌ [LLMService] LLM 호출 실패: {str(e)}")
@@ -112,11 +117,7 @@ class LLMService:
 
         {chr(10).join(prompt_parts)}
 
-        각 인재상은 다음 형식으로 JSON 배열로 응답해주세요:
-        [
-            {{"name": "인재상 이름", "description": "인재상에 대한 상세한 설명"}},
-            ...
-        ]
+        각 인재상은 이름(name)과 상세한 설명(description)으로 작성해주세요.
 
         인재상은 다음 기준으로 생성해주세요:
         1. 사용자 키워드를 반영한 맞춤형 인재상
@@ -127,54 +128,6 @@ class LLMService:
 
         return prompt
 
-    def _parse_response(self, content: str) -> List[Dict[str, str]]:
-        """LLM 응답 파싱"""
-        try:
-            # JSON 추출 시도
-            if '[' in content and ']' in content:
-                start = content.find('[')
-                end = content.rfind(']') + 1
-                json_str = content[start:end]
-                return json.loads(json_str)
-            else:
-                # JSON이 아닌 경우 기본 형식으로 파싱
-                return self._parse_text_response(content)
-        except json.JSONDecodeError:
-            logger.warning("JSON 파싱 실패, 텍스트 파싱으로 폴백")
-            return self._parse_text_response(content)
-
-    def _parse_text_response(self, content: str) -> List[Dict[str, str]]:
-        """텍스트 응답 파싱 (JSON이 아닌 경우)"""
-        cultures = []
-        lines = content.split('\n')
-
-        current_name = ""
-        current_description = ""
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith('"name"') or line.startswith('name'):
-                # 이름 추출
-                if ':' in line:
-                    current_name = line.split(':', 1)[1].strip().strip('"').strip(',')
-            elif line.startswith('"description"') or line.startswith('description'):
-                # 설명 추출
-                if ':' in line:
-                    current_description = line.split(':', 1)[1].strip().strip('"').strip(',')
-
-                    if current_name and current_description:
-                        cultures.append({
-                            "name": current_name,
-                            "description": current_description
-                        })
-                        current_name = ""
-                        current_description = ""
-
-        return cultures
-
     def _fallback_recommendations(self, keywords: List[str], job: str, department: str) -> List[Dict[str, str]]:
         """LLM 실패 시 기본 규칙 기반 추천"""
         cultures = []
@@ -4,8 +4,9 @@
 
 import io
 import logging
+import os
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 try:
     import pdfplumber
@@ -30,6 +31,20 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# 파일 바이트 데이터 또는 디스크에 저장된 파일 경로 (경로를 넘기면 파일 전체를 메모리에 올리지 않음)
+FileSource = Union[bytes, memoryview, str, Path]
+
+
+def _is_path(source: FileSource) -> bool:
+    return isinstance(source, (str, Path))
+
+
+def _open_source(source: FileSource):
+    """라이브러리에 넘길 입력 (경로는 그대로, 바이트는 BytesIO로 감싸서)"""
+    if _is_path(source):
+        return str(source)
+    return io.BytesIO(source)
+
 
 class TextExtractor:
     """다양한 파일 형식에서 텍스트를 추출하는 클래스"""
@@ -42,12 +57,12 @@ class TextExtractor:
             '.doc': self._extract_doc,
         }
 
-    def extract_text(self, file_bytes: bytes, filename: str) -> Tuple[str, str]:
+    def extract_text(self, file_bytes: FileSource, filename: str) -> Tuple[str, str]:
         """
         파일에서 텍스트를 추출
 
         Args:
-            file_bytes: 파일 바이트 데이터
+            file_bytes: 파일 바이트 데이터 또는 임시 파일 경로
             filename: 파일명
 
         Returns:
@@ -73,8 +88,12 @@ class TextExtractor:
             logger.error(f"텍스트 추출 실패: {filename}, 오류: {str(e)}")
             raise
 
-    def _extract_text(self, file_bytes: bytes, filename: str) -> str:
+    def _extract_text(self, file_bytes: FileSource, filename: str) -> str:
         """일반 텍스트 파일 추출"""
+        if _is_path(file_bytes):
+            file_bytes = Path(file_bytes).read_bytes()
+        else:
+            file_bytes = bytes(file_bytes)
         try:
             return file_bytes.decode('utf-8', errors='ignore')
         except UnicodeDecodeError:
@@ -86,7 +105,7 @@ class TextExtractor:
                     continue
             raise ValueError("텍스트 파일의 인코딩을 확인할 수 없습니다.")
 
-    def _extract_pdf(self, file_bytes: bytes, filename: str) -> str:
+    def _extract_pdf(self, file_bytes: FileSource, filename: str) -> str:
         """PDF 파일에서 텍스트 추출"""
         if not PDFPLUMBER_AVAILABLE and not PYPDF2_AVAILABLE:
             raise ImportError("PDF 처리를 위한 라이브러리가 설치되지 않았습니다.")
@@ -96,7 +115,7 @@ class TextExtractor:
         # pdfplumber 우선 사용 (더 정확한 텍스트 추출)
         if PDFPLUMBER_AVAILABLE:
             try:
-                with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+                with pdfplumber.open(_open_source(file_bytes)) as pdf:
                     for page_num, page in enumerate(pdf.pages):
                         page_text = page.extract_text()
                         if page_text:
@@ -110,7 +129,7 @@ class TextExtractor:
         # PyPDF2로 대체
         if PYPDF2_AVAILABLE:
             try:
-                pdf_reader = PdfReader(io.BytesIO(file_bytes))
+                pdf_reader = PdfReader(_open_source(file_bytes))
                 for page_num, page in enumerate(pdf_reader.pages):
                     page_text = page.extract_text()
                     if page_text:
@@ -124,13 +143,13 @@ class TextExtractor:
 
         raise ValueError("PDF 텍스트 추출에 실패했습니다.")
 
-    def _extract_docx(self, file_bytes: bytes, filename: str) -> str:
+    def _extract_docx(self, file_bytes: FileSource, filename: str) -> str:
         """DOCX 파일에서 텍스트 추출"""
         if not DOCX_AVAILABLE:
             raise ImportError("DOCX 처리를 위한 python-docx가 설치되지 않았습니다.")
 
         try:
-            doc = docx.Document(io.BytesIO(file_bytes))
+            doc = docx.Document(_open_source(file_bytes))
             text_parts = []
 
             # 제목 추출
@@ -158,7 +177,7 @@ class TextExtractor:
             logger.error(f"DOCX 텍스트 추출 실패: {str(e)}")
             raise
 
-    def _extract_doc(self, file_bytes: bytes, filename: str) -> str:
+    def _extract_doc(self, file_bytes: FileSource, filename: str) -> str:
         """DOC 파일 처리 (현재는 지원하지 않음)"""
         raise ValueError("DOC 파일 형식은 현재 지원하지 않습니다. DOCX로 변환 후 업로드해주세요.")
 
@@ -182,10 +201,10 @@ class TextExtractor:
 
         return '\n'.join(cleaned_lines)
 
-    def get_file_info(self, file_bytes: bytes, filename: str) -> dict:
+    def get_file_info(self, file_bytes: FileSource, filename: str) -> dict:
         """파일 정보 반환"""
         file_path = Path(filename)
-        file_size = len(file_bytes)
+        file_size = os.path.getsize(file_bytes) if _is_path(file_bytes) else len(file_bytes)
         file_extension = file_path.suffix.lower()
 
         return {
@@ -195,7 +214,7 @@ class TextExtractor:
             "is_supported": file_extension in self.supported_formats
         }
 
-    def validate_file(self, file_bytes: bytes, filename: str) -> bool:
+    def validate_file(self, file_bytes: FileSource, filename: str) -> bool:
         """파일 유효성 검사"""
         try:
             file_info = self.get_file_info(file_bytes, filename)
@@ -221,11 +240,16 @@ class TextExtractor:
 text_extractor = TextExtractor()
 
 
-def extract_text_from_file(file_bytes: bytes, filename: str) -> Tuple[str, str]:
+def extract_text_from_file(file_bytes: FileSource, filename: str) -> Tuple[str, str]:
     """파일에서 텍스트 추출 (편의 함수)"""
     return text_extractor.extract_text(file_bytes, filename)
 
 
-def validate_upload_file(file_bytes: bytes, filename: str) -> bool:
+def validate_upload_file(file_bytes: FileSource, filename: str) -> bool:
     """업로드 파일 유효성 검사 (편의 함수)"""
     return text_extractor.validate_file(file_bytes, filename)
+
+
+def get_upload_file_size(file_bytes: FileSource, filename: str) -> int:
+    """업로드 파일 크기 (편의 함수)"""
+    return text_extractor.get_file_info(file_bytes, filename)["file_size"]
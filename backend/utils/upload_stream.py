@@ -0,0 +1,155 @@
+"""
+업로드 파일을 메모리에 통째로 올리지 않고 디스크로 스트리밍하는 유틸리티
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 기본 제한값 (환경변수로 조정 가능)
+MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50")) * 1024 * 1024
+MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "100"))
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadLimitError(ValueError):
+    """업로드 크기/페이지 수 제한 초과"""
+
+
+@dataclass
+class StreamedUpload:
+    """디스크에 저장된 업로드 파일 정보"""
+    path: Path
+    filename: str
+    size: int
+    sha256: str
+    content_type: Optional[str] = None
+
+    def cleanup(self) -> None:
+        """임시 파일 삭제"""
+        try:
+            if self.path.exists():
+                self.path.unlink()
+        except OSError as e:
+            logger.warning(f"임시 파일 삭제 실패: {self.path}, 오류: {str(e)}")
+
+
+def _copy_to_disk(src: BinaryIO, dst: Optional[BinaryIO], max_bytes: int, chunk_size: int) -> Tuple[int, str]:
+    """청크 단위로 복사하면서 SHA-256을 계산하고 크기 제한을 검사합니다 (dst가 None이면 계산만)."""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadLimitError(f"파일 크기가 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 업로드 가능합니다.")
+        digest.update(chunk)
+        if dst is not None:
+            dst.write(chunk)
+    return size, digest.hexdigest()
+
+
+def check_pdf_page_limit(path: Path, max_pages: int = MAX_PDF_PAGES) -> int:
+    """PDF 페이지 수를 확인하고 제한을 넘으면 UploadLimitError를 발생시킵니다."""
+    import fitz  # PyMuPDF: 경로로 열어 xref만 읽으므로 파일 전체를 메모리에 올리지 않음
+
+    with fitz.open(str(path)) as doc:
+        page_count = doc.page_count
+    if page_count > max_pages:
+        raise UploadLimitError(f"페이지 수가 너무 많습니다. 최대 {max_pages}페이지까지 업로드 가능합니다.")
+    return page_count
+
+
+def _check_declared_size(upload: Any, max_bytes: int) -> None:
+    declared_size = getattr(upload, "size", None)
+    if declared_size is not None and declared_size > max_bytes:
+        raise UploadLimitError(f"파일 크기가 너무 큽니다. 최대 {max_bytes // (1024 * 1024)}MB까지 업로드 가능합니다.")
+
+
+async def measure_upload(
+    upload: Any,
+    *,
+    max_bytes: int = MAX_UPLOAD_SIZE,
+    chunk_size: int = CHUNK_SIZE,
+) -> Tuple[int, str]:
+    """
+    업로드 파일을 디스크에 쓰지 않고 청크 단위로 읽어 크기와 SHA-256만 계산
+
+    파일 내용이 필요 없고 메타데이터만 저장하는 경로에서 사용합니다.
+
+    Returns:
+        (크기, SHA-256)
+    """
+    _check_declared_size(upload, max_bytes)
+    upload.file.seek(0)
+    size, sha256 = await asyncio.to_thread(_copy_to_disk, upload.file, None, max_bytes, chunk_size)
+    upload.file.seek(0)
+    return size, sha256
+
+
+async def stream_upload_to_disk(
+    upload: Any,
+    *,
+    max_bytes: int = MAX_UPLOAD_SIZE,
+    max_pages: Optional[int] = None,
+    suffix: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> StreamedUpload:
+    """
+    FastAPI UploadFile을 임시 파일로 스트리밍 저장
+
+    Args:
+        upload: UploadFile (.filename, .file 속성 필요)
+        max_bytes: 최대 파일 크기
+        max_pages: PDF 최대 페이지 수 (None이면 검사하지 않음)
+        suffix: 임시 파일 확장자 (기본값: 원본 파일 확장자)
+        chunk_size: 복사 청크 크기
+
+    Returns:
+        저장된 파일 정보 (경로, 크기, SHA-256)
+    """
+    filename = getattr(upload, "filename", None) or "upload"
+    _check_declared_size(upload, max_bytes)
+
+    suffix = suffix if suffix is not None else Path(filename).suffix.lower()
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    path = Path(temp_file.name)
+    try:
+        with temp_file:
+            upload.file.seek(0)
+            # 블로킹 파일 I/O와 해싱은 스레드에서 수행해 이벤트 루프를 막지 않음
+            size, sha256 = await asyncio.to_thread(_copy_to_disk, upload.file, temp_file, max_bytes, chunk_size)
+        streamed = StreamedUpload(
+            path=path,
+            filename=filename,
+            size=size,
+            sha256=sha256,
+            content_type=getattr(upload, "content_type", None),
+        )
+        if max_pages is not None and suffix == ".pdf":
+            await asyncio.to_thread(check_pdf_page_limit, path, max_pages)
+        return streamed
+    except BaseException:
+        if path.exists():
+            path.unlink()
+        raise
+
+
+@asynccontextmanager
+async def streamed_upload(upload: Any, **kwargs: Any) -> AsyncIterator[StreamedUpload]:
+    """stream_upload_to_disk 후 블록을 벗어나면 임시 파일을 삭제하는 컨텍스트 매니저"""
+    streamed = await stream_upload_to_disk(upload, **kwargs)
+    try:
+        yield streamed
+    finally:
+        streamed.cleanup()